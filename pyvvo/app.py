@@ -13,6 +13,13 @@ import dateutil
 # Setup log.
 LOG = logging.getLogger(__name__)
 
+# GLMManager methods (and their keyword arguments) called by _prep_glm.
+# Listed here so they can also key the cache of prepped models (see
+# GLMManager.from_cache).
+PREP_GLM_STEPS = (('remove_all_solar', {}),
+                  ('set_inverter_v_and_i', {}),
+                  ('convert_switch_status_to_three_phase', {'banked': False}))
+
 
 def main(sim_id, sim_request):
     LOG.debug("Simulation ID: {}".format(sim_id))
@@ -128,10 +135,20 @@ def main(sim_id, sim_request):
 
     # Get model, instantiate GLMManager.
     model = platform.get_glm(model_id=feeder_mrid)
-    glm_mgr = GLMManager(model=model, model_is_path=False)
+    cache_dir = ga.CONFIG['glm_cache']['directory']
+    if cache_dir is None:
+        glm_mgr = GLMManager(model=model, model_is_path=False)
 
-    # Tweak the model (one time setup).
-    _prep_glm(glm_mgr)
+        # Tweak the model (one time setup).
+        _prep_glm(glm_mgr)
+    else:
+        # Load the parsed and tweaked model from the cache if it's
+        # there, else parse, tweak, and cache it.
+        max_size = ga.CONFIG['glm_cache']['max_size_mb']
+        glm_mgr = GLMManager.from_cache(
+            model=model, cache_dir=cache_dir, model_is_path=False,
+            prep=PREP_GLM_STEPS,
+            max_size=None if max_size is None else max_size * 2**20)
 
     # Extract the duration for which GridLAB-D models will be run in the
     # genetic algorithm.
@@ -148,83 +165,149 @@ def main(sim_id, sim_request):
         f'All individual inverter log levels changed to {log_level} to reduce '
         'output.')
 
-    # Run the genetic algorithm.
-    # TODO: Manage loop exit, etc. Should exit when simulation is
-    #   complete.
-    iterations = 0
-    while True:
-        LOG.info('*'*200)
-        # Update the inverter, switches, and machines in the GridLAB-D
-        # model with the current states from the platform.
-        _update_glm_inverters_switches_machines(
-            glm_mgr, inverter_objects, switch_objects, machine_objects)
-
-        # Get the most recent simulation time from the clock. The
-        # platform operates in UTC.
-        starttime = datetime.fromtimestamp(clock.sim_time,
-                                           tz=dateutil.tz.tzutc())
-
-        # Compute stop time.
-        stoptime = starttime + timedelta(seconds=model_run_time)
-
-        LOG.info('Starting genetic algorithm to compute set points for '
-                 f'{starttime} through {stoptime}.')
-
-        # Initialize manager for genetic algorithm.
-        ga_mgr = ga.GA(regulators=reg_objects, capacitors=cap_objects,
-                       starttime=starttime, stoptime=stoptime)
-
-        # Create a GAStopper to ensure that the GA stops if a switch
-        # opens.
-        # noinspection PyUnusedLocal
-        ga_stopper = GAStopper(ga_obj=ga_mgr, eq_mgr=switch_mgr,
-                               eq_type='switch')
-
-        # Start the genetic algorithm.
-        ga_mgr.run(glm_mgr=glm_mgr)
-
-        # Wait for the genetic algorithm to complete.
-        ga_mgr.wait()
-
-        # Extract equipment settings.
-        reg_forward = ga_mgr.regulators
-        cap_forward = ga_mgr.capacitors
-
-        # Get the commands.
-        reg_cmd = reg_mgr.build_equipment_commands(reg_forward)
-        cap_cmd = cap_mgr.build_equipment_commands(cap_forward)
-
-        # Send 'em!
-        reg_msg = platform.send_command(sim_id=sim_id, **reg_cmd)
-        if reg_msg is not None:
-            LOG.info('Regulator commands sent in.')
-
-        cap_msg = platform.send_command(sim_id=sim_id, **cap_cmd)
-        if cap_msg is not None:
-            LOG.info('Capacitor commands sent in.')
-
-        # Verify that the equipment was properly updated. At present,
-        # the simulator emits messages every 3 simulation seconds. So,
-        # using a wait_duration of 12 will wait 3 time steps. Using a
-        # timeout of 5 essentially gives a 2 second grace period for
-        # all the processing in between simulation time steps.
-        # TODO: regulator and capacitor command verification should be
-        #   done concurrently, rather than in series like this.
-        # TODO: Attempt to command inoperable equipment to bring it
-        #   back into the fold.
-        if reg_msg is not None:
-            inoperable_regs = _verify_commands(
-                mgr=reg_mgr, eq_type='regulator', wait_duration=12, timeout=5)
-
-        if cap_msg is not None:
-            inoperable_caps = _verify_commands(
-                mgr=cap_mgr, eq_type='capacitor', wait_duration=12, timeout=5)
-
-        iterations += 1
-
-        if (iterations % 5) == 0:
-            LOG.warning("I'm tired! I've ran the genetic algorithm "
-                        f"{iterations} times! When does it end?")
+    # Create a fitness cache which persists between runs of the
+    # genetic algorithm, so that chromosomes aren't re-evaluated if the
+    # model hasn't changed.
+    fitness_cache = ga.FitnessCache()
+
+    # Optionally, learn a surrogate model which is used to avoid
+    # running GridLAB-D for unpromising offspring. Like the cache, it
+    # persists between runs.
+    if ga.CONFIG['ga']['surrogate']['enabled']:
+        surrogate = ga.Surrogate()
+    else:
+        surrogate = None
+
+    # Evaluation processes are started once and reused by every run
+    # of the genetic algorithm. Each run sends its updated model to the
+    # workers, rather than forking a fresh set of processes.
+    evaluator_pool = ga.EvaluatorPool()
+
+    # Make sure the workers are shut down no matter how we leave,
+    # otherwise the process will hang on exit.
+    try:
+        # Each worker reuses its own recorder tables, so any others were
+        # left behind by a previous (possibly crashed) run.
+        evaluator_pool.drop_orphaned_tables()
+
+        # The previous GA object. Its best chromosomes are used to warm
+        # start the next run, since the optimum rarely moves much from one
+        # interval to the next.
+        prev_ga = None
+
+        # Run the genetic algorithm.
+        # TODO: Manage loop exit, etc. Should exit when simulation is
+        #   complete.
+        iterations = 0
+        while True:
+            LOG.info('*'*200)
+            # Update the inverter, switches, and machines in the GridLAB-D
+            # model with the current states from the platform.
+            _update_glm_inverters_switches_machines(
+                glm_mgr, inverter_objects, switch_objects, machine_objects)
+
+            # Get the most recent simulation time from the clock. The
+            # platform operates in UTC.
+            starttime = datetime.fromtimestamp(clock.sim_time,
+                                               tz=dateutil.tz.tzutc())
+
+            # Compute stop time.
+            stoptime = starttime + timedelta(seconds=model_run_time)
+
+            LOG.info('Starting genetic algorithm to compute set points for '
+                     f'{starttime} through {stoptime}.')
+
+            # Results are needed before the simulation reaches the end of
+            # this interval, less a margin for sending commands. Convert
+            # from simulation time to wall-clock time, since the clock may
+            # have moved on since starttime was computed.
+            deadline = (time.time() + stoptime.timestamp() - clock.sim_time
+                        - ga.CONFIG['ga']['intervals']['deadline_margin'])
+
+            # Initialize manager for genetic algorithm.
+            ga_mgr = ga.GA(regulators=reg_objects, capacitors=cap_objects,
+                           starttime=starttime, stoptime=stoptime,
+                           fitness_cache=fitness_cache, surrogate=surrogate,
+                           deadline=deadline, evaluator_pool=evaluator_pool)
+
+            # Create a GAStopper to ensure that the GA stops if a switch
+            # opens.
+            # noinspection PyUnusedLocal
+            ga_stopper = GAStopper(ga_obj=ga_mgr, eq_mgr=switch_mgr,
+                                   eq_type='switch')
+
+            # Start the genetic algorithm.
+            ga_mgr.run(glm_mgr=glm_mgr, seeds=prev_ga)
+
+            # Wait for the genetic algorithm to complete.
+            ga_mgr.wait()
+
+            # If the algorithm ran past the deadline, it won't have updated
+            # the equipment. Use the best it came up with rather than
+            # sending no commands at all. If it was stopped for any other
+            # reason (e.g. by the GAStopper after a switch changed state),
+            # its results were computed for an outdated model, so leave
+            # the equipment alone.
+            if ga_mgr.interrupted and ga_mgr.deadline_hit:
+                ga_mgr.best_so_far()
+
+            LOG.info(f'Fitness cache: {len(fitness_cache)} entries, '
+                     f'{fitness_cache.hits} hits, '
+                     f'{fitness_cache.misses} misses.')
+
+            if surrogate is not None:
+                LOG.info(f'Surrogate: {len(surrogate)} samples, mean absolute '
+                         f'error {surrogate.mae}, rank correlation '
+                         f'{surrogate.rank_correlation}.')
+
+            # Keep this run around for warm starting the next one.
+            prev_ga = ga_mgr
+
+            # Extract equipment settings.
+            reg_forward = ga_mgr.regulators
+            cap_forward = ga_mgr.capacitors
+
+            # Get the commands.
+            reg_cmd = reg_mgr.build_equipment_commands(reg_forward)
+            cap_cmd = cap_mgr.build_equipment_commands(cap_forward)
+
+            # Send 'em!
+            reg_msg = platform.send_command(sim_id=sim_id, **reg_cmd)
+            if reg_msg is not None:
+                LOG.info('Regulator commands sent in.')
+
+            cap_msg = platform.send_command(sim_id=sim_id, **cap_cmd)
+            if cap_msg is not None:
+                LOG.info('Capacitor commands sent in.')
+
+            # Verify that the equipment was properly updated. At present,
+            # the simulator emits messages every 3 simulation seconds. So,
+            # using a wait_duration of 12 will wait 3 time steps. Using a
+            # timeout of 5 essentially gives a 2 second grace period for
+            # all the processing in between simulation time steps.
+            # TODO: regulator and capacitor command verification should be
+            #   done concurrently, rather than in series like this.
+            # TODO: Attempt to command inoperable equipment to bring it
+            #   back into the fold.
+            if reg_msg is not None:
+                inoperable_regs = _verify_commands(
+                    mgr=reg_mgr, eq_type='regulator', wait_duration=12,
+                    timeout=5)
+
+            if cap_msg is not None:
+                inoperable_caps = _verify_commands(
+                    mgr=cap_mgr, eq_type='capacitor', wait_duration=12,
+                    timeout=5)
+
+            iterations += 1
+
+            if (iterations % 5) == 0:
+                LOG.warning("I'm tired! I've ran the genetic algorithm "
+                            f"{iterations} times! When does it end?")
+    finally:
+        evaluator_pool.shutdown()
+        evaluator_pool.wait(
+            timeout=ga.CONFIG['ga']['process_shutdown_timeout'])
 
 
 def _verify_commands(mgr: equipment.EquipmentManager, eq_type: str,
@@ -266,12 +349,13 @@ def _prep_glm(glm_mgr: GLMManager):
     TODO: Ensure all inverters are in the right mode and set to be
         online.
 
+    The steps are defined in PREP_GLM_STEPS.
+
     :param glm_mgr: GLMManager to update.
     :returns: None. glm_mgr is updated in place.
     """
-    glm_mgr.remove_all_solar()
-    glm_mgr.set_inverter_v_and_i()
-    glm_mgr.convert_switch_status_to_three_phase(banked=False)
+    for name, kwargs in PREP_GLM_STEPS:
+        getattr(glm_mgr, name)(**kwargs)
 
 
 def _update_glm_inverters_switches_machines(glm_mgr: GLMManager,
@@ -308,6 +392,11 @@ def _update_inverter_state_in_glm(glm_mgr: GLMManager, inverters):
 
     :returns: None. The GLMManager is updated directly.
     """
+    # Collect updates keyed by PV name, and map PV names to battery
+    # names in case the PV name can't be found.
+    updates = {}
+    bat_names = {}
+
     # Loop over the inverters/dicts of inverters.
     for inv_or_dict in inverters.values():
         # Dictionary implies three phase.
@@ -338,29 +427,26 @@ def _update_inverter_state_in_glm(glm_mgr: GLMManager, inverters):
         # that's more common than batteries.
         name_pv = ga.cim_to_glm_name(prefix=ga.INVERTER_PV_PREFIX,
                                      cim_name=inv_name)
-        inv_dict = {'object': 'inverter', 'P_Out': p, 'Q_Out': q,
-                    'name': name_pv}
-
-        try:
-            glm_mgr.modify_item(inv_dict)
-        except KeyError:
-            # Try again with the battery prefix.
-            name_bat = ga.cim_to_glm_name(
-                prefix=ga.INVERTER_BAT_PREFIX, cim_name=inv_name)
-
-            # Completely reconstruct the inverter dict since the
-            # modify_item method modifies the input dictionary.
-            inv_dict = {'object': 'inverter', 'P_Out': p, 'Q_Out': q,
-                        'name': name_bat}
-
-            try:
-                glm_mgr.modify_item(inv_dict)
-            except KeyError:
-                # TODO: Should we raise an exception?
-                m = ('When attempting to update the .glm with inverter power '
-                     f'measurements, neither {name_pv} nor {name_bat} could '
-                     'be found in the model. They have thus not been updated.')
-                LOG.error(m)
+        updates[name_pv] = {'P_Out': p, 'Q_Out': q}
+        bat_names[name_pv] = ga.cim_to_glm_name(
+            prefix=ga.INVERTER_BAT_PREFIX, cim_name=inv_name)
+
+    # Update all the PV inverters at once.
+    missing_pv = glm_mgr.modify_items('inverter', updates, strict=False)
+
+    # Try again with the battery prefix.
+    missing_bat = set(glm_mgr.modify_items(
+        'inverter', {bat_names[n]: updates[n] for n in missing_pv},
+        strict=False))
+
+    for name_pv in missing_pv:
+        name_bat = bat_names[name_pv]
+        if name_bat in missing_bat:
+            # TODO: Should we raise an exception?
+            m = ('When attempting to update the .glm with inverter power '
+                 f'measurements, neither {name_pv} nor {name_bat} could '
+                 'be found in the model. They have thus not been updated.')
+            LOG.error(m)
 
     LOG.info('All inverters in the .glm have been updated with the current '
              'inverter state.')
@@ -386,10 +472,14 @@ def _update_switch_state_in_glm(glm_mgr: GLMManager, switches):
 
         ud[f'phase_{switch.phase}_state'] = switch.GLM_STATES[switch.state]
 
+    # Collect updates keyed by name so the model can be updated in one
+    # go.
+    updates = {}
+
     # Loop over the switches/dicts of switches.
     for sw_or_dict in switches.values():
         # Initialize dictionary for performing updates.
-        update_dict = {'object': 'switch'}
+        update_dict = {}
 
         # Dictionary implies three phase.
         if isinstance(sw_or_dict, dict):
@@ -406,16 +496,17 @@ def _update_switch_state_in_glm(glm_mgr: GLMManager, switches):
         # Get the switch name.
         # noinspection PyUnboundLocalVariable
         name = ga.cim_to_glm_name(prefix=ga.SWITCH_PREFIX, cim_name=sw.name)
-        update_dict['name'] = name
+        updates[name] = update_dict
 
-        # Update!
-        try:
-            glm_mgr.modify_item(update_dict)
-        except KeyError:
-            # TODO: Should we raise an exception?
-            m = (f"The switch {name} could not be found in the "
-                 "model and thus its state has not been updated.")
-            LOG.error(m)
+    # Update! States are already strings.
+    missing = glm_mgr.modify_items('switch', updates, strict=False,
+                                   cast=False)
+
+    for name in missing:
+        # TODO: Should we raise an exception?
+        m = (f"The switch {name} could not be found in the "
+             "model and thus its state has not been updated.")
+        LOG.error(m)
 
     LOG.info('All switches in the .glm have been updated with current states.')
 
@@ -432,6 +523,10 @@ def _update_diesel_dg_state_in_glm(glm_mgr: GLMManager, machines: dict):
     :param machines:
     :return:
     """
+    # Collect updates keyed by name so the model can be updated in one
+    # go.
+    updates = {}
+
     # Loop over the machines.
     for mach_dict in machines.values():
         # Raise exception if our balanced three phase assumption is not
@@ -442,7 +537,7 @@ def _update_diesel_dg_state_in_glm(glm_mgr: GLMManager, machines: dict):
                              'of phases.')
 
         # Initialize dictionary for performing updates.
-        update_dict = {'object': 'diesel_dg'}
+        update_dict = {}
 
         # Loop over the phases and extract their state.
         for phase, s_mach in mach_dict.items():
@@ -456,16 +551,17 @@ def _update_diesel_dg_state_in_glm(glm_mgr: GLMManager, machines: dict):
         # noinspection PyUnboundLocalVariable
         name = ga.cim_to_glm_name(prefix=ga.SYNCH_MACH_PREFIX,
                                   cim_name=s_mach.name)
-        update_dict['name'] = name
+        updates[name] = update_dict
 
-        # Update the object in the model.
-        try:
-            glm_mgr.modify_item(update_dict)
-        except KeyError:
-            # TODO: Should we raise an exception?
-            m = (f"The machine/diesel_dg {name} could not be found in the "
-                 "model and thus its state has not been updated.")
-            LOG.error(m)
+    # Update the objects in the model. Values are already strings.
+    missing = glm_mgr.modify_items('diesel_dg', updates, strict=False,
+                                   cast=False)
+
+    for name in missing:
+        # TODO: Should we raise an exception?
+        m = (f"The machine/diesel_dg {name} could not be found in the "
+             "model and thus its state has not been updated.")
+        LOG.error(m)
 
     LOG.info('All machines/diesel_dgs in the .glm have been updated with '
              'current states.')
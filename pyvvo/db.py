@@ -111,3 +111,135 @@ def execute_and_fetch_all(db_conn, query):
         db_conn.commit()
 
     return out
+
+
+def list_tables(db_conn, pattern=None):
+    """List the tables in the database.
+
+    :param db_conn: Active database connection.
+    :param pattern: Optional pattern for SHOW TABLES LIKE, e.g.
+        'triplex\\_%'. Note that '_' is a wildcard.
+
+    :returns: List of table names.
+    """
+    query = 'SHOW TABLES'
+    if pattern is not None:
+        query += " LIKE '{}'".format(pattern)
+
+    return [row[0] for row in execute_and_fetch_all(db_conn=db_conn,
+                                                     query=query)]
+
+
+def drop_tables(db_conn, tables):
+    """Drop tables, if they exist.
+
+    :param db_conn: Active database connection.
+    :param tables: Iterable of table names.
+    """
+    tables = list(tables)
+    if len(tables) == 0:
+        return
+
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute('DROP TABLE IF EXISTS ' + ', '.join(tables))
+    finally:
+        cursor.close()
+        db_conn.commit()
+
+
+def create_table(db_conn, table, columns, primary_key=None, indexes=None,
+                 engine=None):
+    """Create a table if it doesn't already exist.
+
+    :param db_conn: Active database connection.
+    :param table: Name of the table.
+    :param columns: Dictionary mapping column names to their type
+        definitions, e.g. {'id': 'INT AUTO_INCREMENT', 't': 'DATETIME'}.
+    :param primary_key: Optional column to use as the primary key.
+    :param indexes: Optional dictionary mapping index names to the
+        column they index. BTREE indexes are used, as the default for
+        the MEMORY engine (HASH) can't be used for range queries.
+    :param engine: Optional storage engine, e.g. 'MEMORY' or 'InnoDB'.
+        If None, the server's default is used.
+    """
+    definitions = ['{} {}'.format(k, v) for k, v in columns.items()]
+
+    if primary_key is not None:
+        definitions.append('PRIMARY KEY ({})'.format(primary_key))
+
+    if indexes is not None:
+        definitions.extend('INDEX {} ({}) USING BTREE'.format(k, v)
+                           for k, v in indexes.items())
+
+    query = 'CREATE TABLE IF NOT EXISTS {} ({})'.format(
+        table, ', '.join(definitions))
+
+    if engine is not None:
+        query += ' ENGINE={}'.format(engine)
+
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute(query)
+    finally:
+        cursor.close()
+        db_conn.commit()
+
+
+class PersistentConnection:
+    """Hold a database connection for reuse, e.g. by an evaluation
+    process which would otherwise connect for every Individual it
+    evaluates.
+
+    The connection is made on the first call to get. After that, the
+    connection is checked (via ping) each time it's handed out, and
+    replaced if the server has gone away.
+    """
+
+    def __init__(self, timeout=10, retry_interval=0.1):
+        """
+        :param timeout: Passed to connect_loop when (re)connecting.
+        :param retry_interval: Passed to connect_loop when
+            (re)connecting.
+        """
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._conn = None
+
+    @property
+    def connected(self):
+        """True if a connection has been made and not closed. Note the
+        connection isn't checked here.
+        """
+        return self._conn is not None
+
+    def get(self):
+        """Get a healthy connection, (re)connecting if necessary.
+
+        :raises MySQLdb.Error: if connect_loop fails.
+        """
+        if self._conn is not None:
+            try:
+                self._conn.ping()
+            except MySQLdb.Error:
+                # The connection is dead, start over.
+                self.close()
+
+        if self._conn is None:
+            self._conn = connect_loop(timeout=self.timeout,
+                                      retry_interval=self.retry_interval)
+
+        return self._conn
+
+    def close(self):
+        """Close the connection, if there is one."""
+        if self._conn is None:
+            return
+
+        try:
+            self._conn.close()
+        except MySQLdb.Error:
+            # Already gone, which is fine.
+            pass
+        finally:
+            self._conn = None
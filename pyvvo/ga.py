@@ -11,6 +11,10 @@ import operator
 import math
 import itertools
 import copy
+import hashlib
+import pickle
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from functools import wraps
 from typing import Union
 
@@ -19,6 +23,8 @@ import numpy as np
 import pandas as pd
 import simplejson as json
 import MySQLdb
+from scipy.stats import spearmanr
+from sklearn.linear_model import Ridge
 
 # pyvvo:
 from pyvvo import db, equipment, glm, utils
@@ -29,6 +35,8 @@ TRIPLEX_TABLE = 'triplex'
 TRIPLEX_RECORDER = 'triplex_recorder'
 SUBSTATION_TABLE = 'substation'
 SUBSTATION_RECORDER = 'substation_recorder'
+TRIPLEX_LOW_COLLECTOR = 'triplex_low_collector'
+TRIPLEX_HIGH_COLLECTOR = 'triplex_high_collector'
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 # TODO: We may want to read the config file dynamically, so that a user
 #   can change the config in between runs.
@@ -51,6 +59,14 @@ SUBSTATION_REAL_POWER = 'measured_real_power'
 SUBSTATION_REACTIVE_POWER = 'measured_reactive_power'
 SUBSTATION_COLUMNS = {SUBSTATION_ENERGY, SUBSTATION_REAL_POWER,
                       SUBSTATION_REACTIVE_POWER, TIME_COL}
+# Column definitions for the recorder tables, matching what GridLAB-D
+# writes. See create_recorder_tables.
+RECORDER_COLUMNS = {ID_COL: 'INT NOT NULL AUTO_INCREMENT',
+                    TIME_COL: 'DATETIME NOT NULL'}
+TRIPLEX_TABLE_COLUMNS = {**RECORDER_COLUMNS, TRIPLEX_PROPERTY_DB: 'DOUBLE'}
+SUBSTATION_TABLE_COLUMNS = {**RECORDER_COLUMNS, SUBSTATION_ENERGY: 'DOUBLE',
+                            SUBSTATION_REAL_POWER: 'DOUBLE',
+                            SUBSTATION_REACTIVE_POWER: 'DOUBLE'}
 # The GridLAB-D models from the platform have prefixes on object names,
 # and thus don't precisely line up with the names from the CIM.
 # https://github.com/GRIDAPPSD/GOSS-GridAPPS-D/blob/v2019.10.0/services/fncsgossbridge/service/fncs_goss_bridge.py
@@ -66,6 +82,17 @@ SYNCH_MACH_PREFIX = 'dg'
 TO_KW_FACTOR = 1/1000
 # Map capacitor states to GridLAB-D strings.
 CAP_STATE_MAP = {0: "OPEN", 1: "CLOSED"}
+# Penalties which depend only on the chromosome and the present state
+# of the equipment, rather than on the results of a GridLAB-D run.
+# These are never stored in a FitnessCache.
+SWITCHING_PENALTIES = ('regulator_tap', 'capacitor_switch')
+# Objects in the model which differ from one Individual's evaluation to
+# the next (see Individual._update_model_compute_costs and _Evaluator).
+# Everything else is pre-rendered via glm.GLMManager.compile_template.
+TEMPLATE_OBJECTS = (('regulator', None), ('regulator_configuration', None),
+                    ('capacitor', None), ('mysql.recorder', None),
+                    ('group_recorder', TRIPLEX_RECORDER),
+                    ('recorder', SUBSTATION_RECORDER), ('collector', None))
 
 LOG = logging.getLogger(__name__)
 
@@ -273,6 +300,172 @@ def _reg_bin_length(reg):
     return _int_bin_length(reg.raise_taps + reg.lower_taps)
 
 
+class ChromosomeLayout:
+    """Array based view of a chromosome map (see map_chromosome), used
+    to convert between chromosomes and gene values and to apply
+    genetic operators to many chromosomes at once with NumPy rather
+    than by looping over the map in Python.
+
+    Genes are numbered in the order they're encountered when iterating
+    over the chromosome map (equipment, then phase), which is the same
+    order used by Individual.crossover_by_gene.
+
+    All methods accept either a single chromosome (shape (chrom_len,))
+    or a 2D array of chromosomes (shape (n, chrom_len)), and similarly
+    a single set of gene values (shape (num_genes,)) or a 2D array of
+    gene values (shape (n, num_genes)).
+    """
+
+    def __init__(self, chrom_map, chrom_len=None):
+        """
+        :param chrom_map: First return from map_chromosome.
+        :param chrom_len: Second return from map_chromosome. If None,
+            it's inferred from the largest index in chrom_map.
+        """
+        self._chrom_map = chrom_map
+
+        genes = [g for phase_dict in chrom_map.values()
+                 for g in phase_dict.values()]
+
+        if len(genes) == 0:
+            raise ValueError('chrom_map must contain at least one gene.')
+
+        self._starts = np.array([g['idx'][0] for g in genes], dtype=int)
+        self._stops = np.array([g['idx'][1] for g in genes], dtype=int)
+        self._low = np.array([g['range'][0] for g in genes], dtype=int)
+        self._high = np.array([g['range'][1] for g in genes], dtype=int)
+        self._eq_objs = [g['eq_obj'] for g in genes]
+
+        # Capacitors straight from the CIM have no state, so
+        # 'current_state' may be None. Track that separately.
+        current = [g['current_state'] for g in genes]
+        self._current_missing = np.array([c is None for c in current],
+                                         dtype=bool)
+        self._current = np.array([0 if c is None else c for c in current],
+                                 dtype=int)
+
+        if chrom_len is None:
+            chrom_len = int(self._stops.max())
+        elif chrom_len < self._stops.max():
+            raise ValueError('chrom_len is too short for chrom_map.')
+
+        self._chrom_len = chrom_len
+
+        # For each bit in the chromosome, track which gene it belongs
+        # to (-1 for none), and how far it needs shifted to get its
+        # place value in the gene (the first bit is most significant).
+        self._bit_gene = np.full(chrom_len, -1, dtype=int)
+        self._bit_shift = np.zeros(chrom_len, dtype=int)
+        for k, (start, stop) in enumerate(zip(self._starts, self._stops)):
+            self._bit_gene[start:stop] = k
+            self._bit_shift[start:stop] = np.arange(stop - start - 1, -1, -1)
+
+        self._covered = self._bit_gene >= 0
+
+        # Positions of the covered bits, grouped by gene, and where each
+        # gene's group starts. Used with np.add.reduceat in to_ints.
+        self._order = np.argsort(self._bit_gene, kind='stable')[
+            np.count_nonzero(~self._covered):]
+        self._group_starts = np.searchsorted(self._bit_gene[self._order],
+                                             np.arange(len(genes)))
+
+    @property
+    def chrom_map(self):
+        return self._chrom_map
+
+    @property
+    def chrom_len(self):
+        return self._chrom_len
+
+    @property
+    def num_genes(self):
+        return len(self._eq_objs)
+
+    @property
+    def low(self):
+        """Array of the lowest valid value for each gene."""
+        return self._low
+
+    @property
+    def high(self):
+        """Array of the highest valid value for each gene."""
+        return self._high
+
+    @property
+    def current(self):
+        """Array of the current state for each gene. See also
+        current_missing."""
+        return self._current
+
+    @property
+    def current_missing(self):
+        """Boolean array, True for genes whose equipment had no current
+        state at the time of mapping."""
+        return self._current_missing
+
+    @property
+    def eq_objs(self):
+        """List of the equipment object for each gene."""
+        return self._eq_objs
+
+    def to_ints(self, chromosomes):
+        """Convert chromosome(s) to gene values."""
+        chromosomes = np.asarray(chromosomes)
+        weighted = chromosomes.astype(np.int64) << self._bit_shift
+        return np.add.reduceat(weighted[..., self._order],
+                               self._group_starts, axis=-1)
+
+    def to_bits(self, ints):
+        """Convert gene values to chromosome(s)."""
+        ints = np.asarray(ints, dtype=np.int64)
+        out = np.zeros(ints.shape[:-1] + (self.chrom_len,), dtype=bool)
+        bits = ((ints[..., self._bit_gene[self._covered]]
+                 >> self._bit_shift[self._covered]) & 1).astype(bool)
+        out[..., self._covered] = bits
+        return out
+
+    def clip(self, ints):
+        """Clamp gene values to their valid ranges."""
+        return np.clip(ints, self.low, self.high)
+
+    def gene_mask_to_bit_mask(self, gene_mask):
+        """Expand a boolean mask over genes (shape (..., num_genes)) to
+        a mask over chromosome bits (shape (..., chrom_len)). Bits which
+        don't belong to a gene are False.
+        """
+        gene_mask = np.asarray(gene_mask, dtype=bool)
+        return gene_mask[..., self._bit_gene] & self._covered
+
+
+def _reg_tap_penalty(reg, tap_pos):
+    """Compute the penalty for moving a single phase regulator from its
+    present tap position to tap_pos. The penalty is per tap.
+
+    :param reg: equipment.RegulatorSinglePhase object.
+    :param tap_pos: New tap position on the interval
+        [-reg.lower_taps, reg.raise_taps].
+    """
+    return abs(tap_pos - reg.tap_pos) * CONFIG['costs']['regulator_tap']
+
+
+def _cap_switch_penalty(cap, state):
+    """Compute the penalty for moving a single phase capacitor from its
+    present state to the given state.
+
+    :param cap: equipment.CapacitorSinglePhase object.
+    :param state: New state, 0 or 1 (see CAP_STATE_MAP).
+
+    :raises ValueError: if cap.state is invalid.
+    """
+    # Ensure this state is valid. This check really shouldn't need to
+    # be here, but more checks more better.
+    if cap.state not in equipment.CapacitorSinglePhase.STATES:
+        raise ValueError('Equipment {} has invalid state attribute, {}.'
+                         .format(cap, cap.state))
+
+    return abs(state - cap.state) * CONFIG['costs']['capacitor_switch']
+
+
 def prep_glm_mgr(glm_mgr, starttime, stoptime):
     """Helper to get a glm.GLMManager object ready to run.
 
@@ -290,17 +483,16 @@ def prep_glm_mgr(glm_mgr, starttime, stoptime):
     2) Ensure all regulators are set to MANUAL control.
     3) Ensure all capacitors are set to MANUAL control.
     4) Add all triplex_load objects to a group.
-    5) Add the MySQL module to the model.
-    6) Add database object. The following environment variables (
-        at present defined in docker-compose.yml) are necessary:
-            DB_HOST: hostname of the MySQL database.
-            DB_USER: User to use to connect to MySQL.
-            DB_PASS: Password for DB_USER.
-            DB_DB: Database to use.
-            DB_PORT: Port to connect to MySQL.
-    7) Add a recorder for the triplex group.
-    8) Add a meter to the substation object.
-    9) Add a recorder for the substation meter.
+    5) Add a meter to the substation object.
+    6) Add recorders for the triplex group and the substation meter.
+        These depend on CONFIG['ga']['results_backend'] (see
+        get_evaluator_class):
+            'mysql': See _Evaluator.add_recorders.
+            'file': See _FileEvaluator.add_recorders.
+    7) Compact the model (see glm.GLMManager.compact), since it'll be
+        copied to every evaluation worker.
+    8) Compile a render template for the model, so that only the
+        objects in TEMPLATE_OBJECTS need rendered for each Individual.
     """
     ####################################################################
     # 1)
@@ -315,103 +507,117 @@ def prep_glm_mgr(glm_mgr, starttime, stoptime):
 
     ####################################################################
     # 2)
-    # Lookup regulator_configuration objects.
-    reg_conf_objs = glm_mgr.get_objects_by_type('regulator_configuration')
-    # Switch control to MANUAL.
-    for reg_conf in reg_conf_objs:
-        # Note that Regulators have a capital 'C' in control, while caps
-        # don't. Yay for consistency.
-        glm_mgr.modify_item({'object': 'regulator_configuration',
-                             'name': reg_conf['name'],
-                             'Control': 'MANUAL'})
+    # Switch regulator control to MANUAL.
+    # Note that Regulators have a capital 'C' in control, while caps
+    # don't. Yay for consistency.
+    reg_conf_objs = glm_mgr.get_items_by_type(
+        item_type='object', object_type='regulator_configuration')
+    if reg_conf_objs is not None:
+        glm_mgr.modify_items('regulator_configuration',
+                             dict.fromkeys(reg_conf_objs,
+                                           {'Control': 'MANUAL'}),
+                             cast=False)
     ####################################################################
 
     ####################################################################
     # 3)
-    # Lookup capacitor configuration objects.
-    cap_objs = glm_mgr.get_objects_by_type('capacitor')
-    # Switch control to MANUAL.
-    for cap in cap_objs:
-        glm_mgr.modify_item({'object': 'capacitor',
-                             'name': cap['name'],
-                             'control': 'MANUAL'})
+    # Switch capacitor control to MANUAL.
+    cap_objs = glm_mgr.get_items_by_type(item_type='object',
+                                         object_type='capacitor')
+    if cap_objs is not None:
+        glm_mgr.modify_items('capacitor',
+                             dict.fromkeys(cap_objs, {'control': 'MANUAL'}),
+                             cast=False)
     ####################################################################
 
     ####################################################################
     # 4)
-    # Lookup triplex_load objects.
-    tl_objs = glm_mgr.get_objects_by_type('triplex_load')
-    # Add the 'groupid' property to each load.
-    for tl in tl_objs:
-        glm_mgr.modify_item({'object': 'triplex_load',
-                             'name': tl['name'],
-                             'groupid': TRIPLEX_GROUP})
+    # Add the 'groupid' property to each triplex_load.
+    tl_objs = glm_mgr.get_items_by_type(item_type='object',
+                                        object_type='triplex_load')
+    if tl_objs is not None:
+        glm_mgr.modify_items('triplex_load',
+                             dict.fromkeys(tl_objs,
+                                           {'groupid': TRIPLEX_GROUP}),
+                             cast=False)
     ####################################################################
 
     ####################################################################
     # 5)
-    # Add 'mysql' module.
-    glm_mgr.add_item({'module': 'mysql'})
+    # Add a meter at the head of the feeder.
+    sub_meter = glm_mgr.add_substation_meter()
     ####################################################################
 
     ####################################################################
     # 6)
-    # Add a 'database' object.
-    glm_mgr.add_item({'object': 'database',
-                      'hostname': os.environ['DB_HOST'],
-                      'username': os.environ['DB_USER'],
-                      'password': os.environ['DB_PASS'],
-                      'port': os.environ['DB_PORT'],
-                      'schema': os.environ['DB_DB']})
+    # Add recorders for the chosen results backend.
+    get_evaluator_class().add_recorders(glm_mgr=glm_mgr, sub_meter=sub_meter)
     ####################################################################
 
     ####################################################################
     # 7)
-    # Add a MySQL recorder for the triplex loads.
-    glm_mgr.add_item(
-        # We use the mysql.group_recorder syntax to be very careful
-        # avoiding collisions with the tape module.
-        {'object': 'mysql.recorder',
-         'table': TRIPLEX_TABLE,
-         'name': TRIPLEX_RECORDER,
-         'group': '"groupid={}"'.format(TRIPLEX_GROUP),
-         'property': '"{}"'.format(TRIPLEX_PROPERTY_IN),
-         'interval': CONFIG['ga']['intervals']['sample'],
-         'limit': -1,
-         'mode': 'a',
-         'query_buffer_limit': CONFIG['database']['query_buffer_limit']
-         })
-    ####################################################################
-
-    ####################################################################
-    # 8)
-    # Add a meter at the head of the feeder.
-    sub_meter = glm_mgr.add_substation_meter()
+    # Share property names and values between objects to cut down the
+    # memory used by each worker's copy of the model.
+    glm_mgr.compact()
     ####################################################################
 
     ####################################################################
     # 8)
-    # Add a recorder for the new meter.
-    glm_mgr.add_item(
-        # We use the mysql.group_recorder syntax to be very careful
-        # avoiding collisions with the tape module.
-        {'object': 'mysql.recorder',
-         'table': SUBSTATION_TABLE,
-         'name': SUBSTATION_RECORDER,
-         'parent': sub_meter,
-         'property': '"{}, {}, {}"'.format(SUBSTATION_ENERGY,
-                                           SUBSTATION_REAL_POWER,
-                                           SUBSTATION_REACTIVE_POWER),
-         'interval': CONFIG['ga']['intervals']['sample'],
-         'limit': -1,
-         'mode': 'a',
-         'query_buffer_limit': CONFIG['database']['query_buffer_limit']
-         })
+    # Pre-render everything that doesn't change between individuals.
+    glm_mgr.compile_template(TEMPLATE_OBJECTS)
     ####################################################################
 
     pass
 
 
+def model_fingerprint(glm_mgr, chrom_map, starttime, stoptime):
+    """Compute a fingerprint of everything that feeds into a GridLAB-D
+    evaluation EXCEPT the chromosome itself. Two evaluations of the
+    same chromosome with the same fingerprint will produce the same
+    simulation penalties, which is what makes a FitnessCache safe.
+
+    The fingerprint covers:
+    1) The full text of the model with the exception of the clock. The
+        clock changes every control interval, but the simulation
+        duration (see 3) is what actually matters for the results.
+        Switch states, inverter outputs, etc. all live in the model,
+        so changes to them change the fingerprint.
+    2) The layout of the chromosome (which bits map to which phase of
+        which piece of equipment).
+    3) The duration of the simulation, in seconds.
+
+    :param glm_mgr: glm.GLMManager object which has already been
+        updated via prep_glm_mgr.
+    :param chrom_map: Chromosome map, as returned by map_chromosome.
+    :param starttime: Python datetime object for simulation start.
+    :param stoptime: Python datetime object for simulation end.
+
+    :returns: Hexadecimal string.
+    """
+    h = hashlib.sha256()
+
+    # 1) Hash the model, skipping the clock.
+    try:
+        clock_key = glm_mgr.model_map['clock'][0]
+    except IndexError:
+        clock_key = None
+
+    model = {k: v for k, v in glm_mgr.model_dict.items() if k != clock_key}
+    h.update(glm.sorted_write(model).encode('utf-8'))
+
+    # 2) Hash the chromosome layout.
+    for name, phase_dict in chrom_map.items():
+        for phase, sp_dict in phase_dict.items():
+            h.update('{}|{}|{}|{}\n'.format(name, phase, sp_dict['idx'],
+                                            sp_dict['range']).encode('utf-8'))
+
+    # 3) Hash the duration.
+    h.update('duration={}'.format((stoptime - starttime).total_seconds())
+             .encode('utf-8'))
+
+    return h.hexdigest()
+
+
 class Individual:
     """Class for representing an individual in the genetic algorithm."""
 
@@ -419,7 +625,7 @@ class Individual:
     SPECIAL_INIT_OPTIONS = (None, 'max', 'min', 'current_state')
 
     def __init__(self, uid, chrom_len, num_eq, chrom_map, chrom_override=None,
-                 special_init=None):
+                 special_init=None, layout=None):
         """Initialize an individual for the genetic algorithm.
 
         :param uid: Unique identifier for this individual. Integer.
@@ -451,6 +657,10 @@ class Individual:
 
             NOTE: special_init will be ignored if chrom_override is not
                 None.
+        :param layout: ChromosomeLayout built from chrom_map and
+            chrom_len. If None, one will be created when first needed.
+            Pass a shared layout when creating many individuals to
+            avoid rebuilding it for each one.
 
         NOTE: It is expected that chrom_len, num_eq, and chrom_map come
             from the same call to map_chromosome. Thus, there will be no
@@ -493,6 +703,12 @@ class Individual:
 
         self._chrom_map = chrom_map
 
+        if (layout is not None) and (not isinstance(layout,
+                                                    ChromosomeLayout)):
+            raise TypeError('layout must be None or a ChromosomeLayout.')
+
+        self._layout = layout
+
         # Lazily raise a ValueError if special_init is not valid.
         if special_init not in self.SPECIAL_INIT_OPTIONS:
             raise ValueError('special_init must be one of {}.'
@@ -523,6 +739,10 @@ class Individual:
         # Initialize penalties to None.
         self._penalties = None
 
+        # Time spent in evaluation, if it was evaluated by an
+        # EvaluatorPool.
+        self._eval_time = None
+
     def __repr__(self):
         if self.fitness is None:
             f_str = 'None'
@@ -551,6 +771,15 @@ class Individual:
     def chrom_map(self):
         return self._chrom_map
 
+    @property
+    def layout(self):
+        """ChromosomeLayout for this individual's chromosome map."""
+        if self._layout is None:
+            self._layout = ChromosomeLayout(chrom_map=self.chrom_map,
+                                            chrom_len=self.chrom_len)
+
+        return self._layout
+
     @property
     def fitness(self):
         return self._fitness
@@ -559,6 +788,10 @@ class Individual:
     def penalties(self):
         return self._penalties
 
+    @property
+    def eval_time(self):
+        return self._eval_time
+
     @property
     def special_init(self):
         return self._special_init
@@ -583,49 +816,38 @@ class Individual:
         draws a valid number for each piece of equipment and circumvents
         these issues.
 
-        NOTE/TODO: We could easily compute the tap changing/cap
-            switching costs in this function - we're already looping
-            over the equipment.
-        """
-        # Start by initializing a chromosome of 0's of the correct\
-        # length.
-        c = np.zeros(self.chrom_len, dtype=np.bool)
-        # Loop over the map.
-        for phase_dict in self.chrom_map.values():
-            # Loop over the dictionary for each equipment phase.
-            for eq_dict in phase_dict.values():
-                # Select a valid number based on special_init.
-                if self.special_init is None:
-                    # Draw a random number in the given range. Note that
-                    # the interval for np.random.randint is [low, high)
-                    n = np.random.randint(eq_dict['range'][0],
-                                          eq_dict['range'][1] + 1,
-                                          None)
-                elif self.special_init == 'max':
-                    n = eq_dict['range'][1]
-                elif self.special_init == 'min':
-                    n = eq_dict['range'][0]
-                elif self.special_init == 'current_state':
-                    n = eq_dict['current_state']
-                    # The capacitors from the CIM triplestore query
-                    # don't have any state information, so we need to
-                    # ensure the state is not None here.
-                    if n is None:
-                        raise ValueError('Equipment {} has an associated '
-                                         'current_state of None.'
-                                         .format(eq_dict['eq_obj']))
-                else:
-                    raise ValueError('Some bad programming is afoot. '
-                                     'The value of self.special_init '
-                                     'is not in the if/else block of '
-                                     '_initialize_chromosome.')
-
-                # Place the binary representation into the chromosome.
-                c[eq_dict['idx'][0]:eq_dict['idx'][1]] = \
-                    _int_to_binary_list(n=n, m=eq_dict['range'][1])
+        All equipment is handled at once via self.layout.
+        """
+        layout = self.layout
+
+        # Select valid numbers based on special_init.
+        if self.special_init is None:
+            # Draw a random number in the given range for each piece of
+            # equipment. Note that the interval for np.random.randint
+            # is [low, high)
+            n = np.random.randint(layout.low, layout.high + 1, None)
+        elif self.special_init == 'max':
+            n = layout.high
+        elif self.special_init == 'min':
+            n = layout.low
+        elif self.special_init == 'current_state':
+            # The capacitors from the CIM triplestore query don't have
+            # any state information, so we need to ensure the state is
+            # not None here.
+            if layout.current_missing.any():
+                k = np.flatnonzero(layout.current_missing)[0]
+                raise ValueError('Equipment {} has an associated '
+                                 'current_state of None.'
+                                 .format(layout.eq_objs[k]))
+            n = layout.current
+        else:
+            raise ValueError('Some bad programming is afoot. '
+                             'The value of self.special_init '
+                             'is not in the if/else block of '
+                             '_initialize_chromosome.')
 
-        # Return the chromosome.
-        return c
+        # Return the binary representation.
+        return layout.to_bits(n)
 
     def _check_and_fix_chromosome(self, chromosome):
         """Helper method to ensure a given chromosome is acceptable.
@@ -646,44 +868,23 @@ class Individual:
         if chromosome.shape != (self.chrom_len,):
             raise ValueError('chromosome shape must match self.chrom_len.')
 
-        # Start by assuming the chromosome does not need modified.
-        mod = False
-
-        # Loop over the map and ensure all values are in range.
-        for phase_dict in self.chrom_map.values():
-            for eq_dict in phase_dict.values():
-                # Convert the appropriate slice from binary to an
-                # integer.
-                idx = eq_dict['idx']
-                n = _binary_array_to_scalar(chromosome[idx[0]:idx[1]])
-
-                # Ensure the value is in range.
-                if n < eq_dict['range'][0]:
-                    flag = True
-                    new_n = eq_dict['range'][0]
-                elif n > eq_dict['range'][1]:
-                    flag = True
-                    new_n = eq_dict['range'][1]
-                else:
-                    flag = False
-
-                if flag:
-                    # Need to modify the chromosome.
-                    mod = True
+        # Convert to gene values, and clamp to the valid ranges.
+        n = self.layout.to_ints(chromosome)
+        new_n = self.layout.clip(n)
+        bad = new_n != n
 
-                    # noinspection PyUnboundLocalVariable
-                    self.log.debug('For equipment {} for Individual {}, '
-                                   'resetting the state '
-                                   'in the chromosome from {} to {}.'
-                                   .format(eq_dict['eq_obj'], self.uid,
-                                           n, new_n))
+        if bad.any():
+            for k in np.flatnonzero(bad):
+                self.log.debug('For equipment {} for Individual {}, '
+                               'resetting the state '
+                               'in the chromosome from {} to {}.'
+                               .format(self.layout.eq_objs[k], self.uid,
+                                       n[k], new_n[k]))
 
-                    # Update the chromosome.
-                    chromosome[eq_dict['idx'][0]:eq_dict['idx'][1]] = \
-                        _int_to_binary_list(n=new_n, m=eq_dict['range'][1])
+            # Update the chromosome, only touching the offending genes.
+            mask = self.layout.gene_mask_to_bit_mask(bad)
+            chromosome[mask] = self.layout.to_bits(new_n)[mask]
 
-        # Do some final logging.
-        if mod:
             self.log.debug("Individual {}'s chromosome has been modified "
                            "to ensure all equipment states are in range."
                            .format(self.uid))
@@ -723,22 +924,14 @@ class Individual:
         :param uid1: uid to give to first child of crossover.
         :param uid2: uid to give to second child of crossover.
         """
-        # Initialize a mask for the entire chromosome.
-        chrom_mask = np.empty(self.chrom_len, dtype=np.bool)
-
         # Our map represents how many pieces of equipment we're coding
         # for. Randomly draw between zero and one to pick which child
         # will get which equipment from which parent.
         gene_mask = np.random.randint(low=0, high=2, size=self.num_eq,
                                       dtype=np.bool)
 
-        # Loop over the map and fill in the chromosome mask.
-        c = 0  # c for counter
-        for value in self.chrom_map.values():
-            # ed for equipment dictionary
-            for ed in value.values():
-                chrom_mask[ed['idx'][0]:ed['idx'][1]] = gene_mask[c]
-                c += 1
+        # Expand to a mask for the entire chromosome.
+        chrom_mask = self.layout.gene_mask_to_bit_mask(gene_mask)
 
         # Use the _crossover helper to create two individuals.
         return self._crossover(mask=chrom_mask, other=other, uid1=uid1,
@@ -776,10 +969,10 @@ class Individual:
         # be truncated to the top of the allowable range.
         child1 = Individual(uid=uid1, chrom_len=self.chrom_len,
                             chrom_override=chrom1, chrom_map=self.chrom_map,
-                            num_eq=self.num_eq)
+                            num_eq=self.num_eq, layout=self.layout)
         child2 = Individual(uid=uid2, chrom_len=self.chrom_len,
                             chrom_override=chrom2, chrom_map=self.chrom_map,
-                            num_eq=self.num_eq)
+                            num_eq=self.num_eq, layout=self.layout)
 
         # All done.
         return child1, child2
@@ -807,15 +1000,21 @@ class Individual:
         # mutation.
         self._chromosome = self._check_and_fix_chromosome(self.chromosome)
 
-    def evaluate(self, glm_mgr, db_conn):
+    def evaluate(self, glm_mgr, db_conn, slot=None, cancel_event=None):
         """Write + run GridLAB-D model, compute costs.
 
         :param glm_mgr: Initialized glm.GLMManager object, which has
             already been updated via this module's prep_glm_mgr
             function. NOTE: This manager WILL BE MODIFIED, so ensure a
-            copy is passed in.
+            copy is passed in. A glm.GLMOverlay from the manager's
+            fork method is the cheapest option.
         :param db_conn: Active database connection which follows
-            PEP 249.
+            PEP 249. May be None if the results backend doesn't use the
+            database (see get_evaluator_class).
+        :param slot: Optional slot (e.g. worker index) for naming the
+            evaluator's tables. See _Evaluator.__init__.
+        :param cancel_event: Optional event for cancelling the
+            GridLAB-D run. See _Evaluator.__init__.
         """
         try:
             # First, update regulators and capacitors in the glm_mgr's
@@ -825,10 +1024,12 @@ class Individual:
             reg_penalty, cap_penalty = \
                 self._update_model_compute_costs(glm_mgr=glm_mgr)
 
-            # Create an _Evaluator to do the work of running the model
+            # Create an _Evaluator (or _FileEvaluator, depending on
+            # the results backend) to do the work of running the model
             # and computing associated costs.
-            evaluator = _Evaluator(uid=self.uid, glm_mgr=glm_mgr,
-                                   db_conn=db_conn)
+            evaluator = get_evaluator_class()(uid=self.uid, glm_mgr=glm_mgr,
+                                              db_conn=db_conn, slot=slot,
+                                              cancel_event=cancel_event)
             penalties = evaluator.evaluate()
 
             # Add the regulator tap changing and capacitor switching
@@ -851,6 +1052,68 @@ class Individual:
             # Re-raise the exception.
             raise e from None
 
+    def evaluate_from_cache(self, penalties):
+        """Compute fitness without running GridLAB-D, using simulation
+        penalties which were previously computed for an identical
+        chromosome (see FitnessCache).
+
+        Regulator tapping and capacitor switching costs depend on the
+        present state of the equipment, which changes from interval to
+        interval. So, they are always computed fresh here.
+
+        :param penalties: Dictionary of penalties as returned by
+            _Evaluator.evaluate. Any switching penalties (see
+            SWITCHING_PENALTIES) included will be overwritten.
+        """
+        penalties = dict(penalties)
+        penalties['regulator_tap'], penalties['capacitor_switch'] = \
+            self._compute_switching_costs()
+
+        # An individual's fitness is the sum of their penalties.
+        self._fitness = 0
+        for p in penalties.values():
+            self._fitness += p
+
+        self._penalties = penalties
+
+    def evaluate_from_result(self, fitness, penalties, eval_time=None):
+        """Take on the results of an evaluation which was performed
+        elsewhere (see EvaluatorPool), on a copy of this Individual
+        rebuilt from its uid and chromosome.
+
+        :param fitness: Fitness, as computed by evaluate.
+        :param penalties: Penalties, as computed by evaluate. None if
+            the evaluation failed.
+        :param eval_time: Time in seconds the evaluation took.
+        """
+        self._fitness = fitness
+        self._penalties = penalties
+        self._eval_time = eval_time
+
+    def _compute_switching_costs(self):
+        """Compute regulator tapping and capacitor switching costs for
+        this Individual's chromosome without touching a model.
+
+        :returns: reg_penalty, cap_penalty.
+        """
+        reg_penalty = 0
+        cap_penalty = 0
+
+        ints = self.layout.to_ints(self.chromosome)
+
+        for n, eq_obj in zip(ints, self.layout.eq_objs):
+            if isinstance(eq_obj, equipment.RegulatorSinglePhase):
+                reg_penalty += _reg_tap_penalty(eq_obj,
+                                                n - eq_obj.lower_taps)
+            elif isinstance(eq_obj, equipment.CapacitorSinglePhase):
+                cap_penalty += _cap_switch_penalty(eq_obj, n)
+            else:
+                raise TypeError('Something has gone horribly wrong. The '
+                                'chrom_map has an eq_obj which is not '
+                                'a regulator or capacitor!')
+
+        return reg_penalty, cap_penalty
+
     def _update_model_compute_costs(self, glm_mgr):
         """Helper to update a glm.GLMManager's model via this
         Individual's chromosome. Costs associated with capacitor
@@ -912,10 +1175,8 @@ class Individual:
             # is going to be a numpy int64.
             update_dict[phase] = int(tap_pos)
 
-            # The tap changing penalty is per tap, so multiply by the
-            # difference.
-            penalty += (abs(tap_pos - sp_dict['eq_obj'].tap_pos)
-                        * CONFIG['costs']['regulator_tap'])
+            # The tap changing penalty is per tap.
+            penalty += _reg_tap_penalty(sp_dict['eq_obj'], tap_pos)
 
         # Add the prefix to the regulator name.
         # noinspection PyUnboundLocalVariable
@@ -940,16 +1201,6 @@ class Individual:
 
         # Loop over the phases. 'sp' for 'single phase'
         for phase, sp_dict in phase_dict.items():
-
-            # Ensure this state is valid. This check really shouldn't
-            # need to be here, but more checks more better.
-            if sp_dict['eq_obj'].state not in \
-                    equipment.CapacitorSinglePhase.STATES:
-                raise ValueError('Equipment {} has invalid state attribute, '
-                                 '{}.'
-                                 .format(sp_dict['eq_obj'],
-                                         sp_dict['eq_obj'].state))
-
             # Extract the relevant chromosome bit. Note this relies
             # on the fact that each capacitor only has a single bit.
             bit = self.chromosome[sp_dict['idx'][0]:sp_dict['idx'][1]][0]
@@ -961,8 +1212,7 @@ class Individual:
             update_dict[phase] = state_str
 
             # Increment the switching cost.
-            penalty += (abs(bit - sp_dict['eq_obj'].state)
-                        * CONFIG['costs']['capacitor_switch'])
+            penalty += _cap_switch_penalty(sp_dict['eq_obj'], bit)
 
         # Update the capacitor in the model.
 
@@ -986,9 +1236,19 @@ class _Evaluator:
     with actually running the GridLAB-D model and interpreting results.
     The Individual which calls this will be responsible for computing
     costs associated with changing tap positions or capacitor switching.
+
+    GridLAB-D results are recorded to MySQL. See _FileEvaluator for an
+    alternative which doesn't need a database.
     """
 
-    def __init__(self, uid, glm_mgr, db_conn):
+    # Whether or not evaluation needs a database connection.
+    uses_db = True
+
+    # Slots whose tables have been recreated by this process (see
+    # __init__).
+    _recreated_slots = set()
+
+    def __init__(self, uid, glm_mgr, db_conn, slot=None, cancel_event=None):
         """Initialize an _Evaluator object. Not all inputs will be
             checked, as they'll be coming directly from an Individual.
 
@@ -998,10 +1258,25 @@ class _Evaluator:
             function. ADDITIONALLY, the Individual should have already
             updated relevant objects, e.g. regulator tap positions.
             NOTE: This manager is coming from an Individual. That
-            individual should have received a COPY of a GLMManager, as
-            objects will be further modified here.
+            individual should have received a COPY of a GLMManager (or
+            a glm.GLMOverlay), as objects will be further modified
+            here.
         :param db_conn: Active database connection which follows
             PEP 249.
+        :param slot: Optional integer used to name this evaluator's
+            tables instead of uid, e.g. the index of the worker process
+            (see _evaluate_worker). A worker evaluates one Individual
+            at a time, so it can reuse the same pair of tables rather
+            than creating a new pair for every Individual. Tables are
+            truncated here, so leftover results are never read. If
+            CONFIG['database']['recorder_engine'] is set, a slot's
+            tables are dropped and recreated the first time a process
+            uses them, since they may be left over from a previous run
+            (e.g. created by GridLAB-D, or with a different engine).
+        :param cancel_event: Optional object with an is_set method
+            (e.g. threading.Event). If it's set while GridLAB-D is
+            running, GridLAB-D is killed and evaluate raises a
+            utils.GLDCancelledError.
         """
         # Set up log.
         # TODO: The issue is this gets run in multiprocessing.
@@ -1010,10 +1285,12 @@ class _Evaluator:
         # Don't check uid, it's been validated by an Individual.
         self.uid = uid
 
-        # Ensure glm_mgr is indeed a GLMManager. It's expected that it
-        # has been updated via prep_glm_mgr, but we won't test for that.
-        if not isinstance(glm_mgr, glm.GLMManager):
-            raise TypeError('glm_mgr must be a glm.GLMManager object.')
+        # Ensure glm_mgr is indeed a GLMManager (or a view of one). It's
+        # expected that it has been updated via prep_glm_mgr, but we
+        # won't test for that.
+        if not isinstance(glm_mgr, (glm.GLMManager, glm.GLMOverlay)):
+            raise TypeError('glm_mgr must be a glm.GLMManager or '
+                            'glm.GLMOverlay object.')
 
         self.glm_mgr = glm_mgr
 
@@ -1023,9 +1300,13 @@ class _Evaluator:
 
         self.db_conn = db_conn
 
-        # We'll be creating tables suffixed with '_<uid>'
-        self.triplex_table = TRIPLEX_TABLE + '_' + str(self.uid)
-        self.substation_table = SUBSTATION_TABLE + '_' + str(self.uid)
+        self.cancel_event = cancel_event
+
+        # We'll be using tables suffixed with '_<slot>' or '_<uid>'
+        self.slot = slot
+        suffix = '_' + str(self.uid if slot is None else slot)
+        self.triplex_table = TRIPLEX_TABLE + suffix
+        self.substation_table = SUBSTATION_TABLE + suffix
 
         # Extract the clock from the glm_mgr's model, as we'll need to
         # do some time filtering. No need to check the date format, as
@@ -1033,6 +1314,19 @@ class _Evaluator:
         clock = glm_mgr.get_items_by_type('clock')
         self.starttime = clock['starttime'].replace('"', '').replace("'", '')
 
+        # Create the tables rather than leaving it to GridLAB-D, so the
+        # engine and indexing are ours to choose.
+        if CONFIG['database']['recorder_engine'] is not None:
+            if (slot is not None) and (slot not in self._recreated_slots):
+                db.drop_tables(db_conn=self.db_conn,
+                               tables=[self.triplex_table,
+                                       self.substation_table])
+                self._recreated_slots.add(slot)
+
+            create_recorder_tables(db_conn=self.db_conn,
+                                   triplex_table=self.triplex_table,
+                                   substation_table=self.substation_table)
+
         # Ensure we're starting with fresh tables. Truncate if they
         # exist.
         db.truncate_table(db_conn=self.db_conn, table=self.triplex_table)
@@ -1047,6 +1341,69 @@ class _Evaluator:
                                   'name': SUBSTATION_RECORDER,
                                   'table': self.substation_table})
 
+    @staticmethod
+    def add_recorders(glm_mgr, sub_meter):
+        """Add the recorders used by this class to a model. Called by
+        prep_glm_mgr.
+
+        1) Add the MySQL module to the model.
+        2) Add database object. The following environment variables (
+            at present defined in docker-compose.yml) are necessary:
+                DB_HOST: hostname of the MySQL database.
+                DB_USER: User to use to connect to MySQL.
+                DB_PASS: Password for DB_USER.
+                DB_DB: Database to use.
+                DB_PORT: Port to connect to MySQL.
+        3) Add a recorder for the triplex group.
+        4) Add a recorder for the substation meter.
+
+        :param glm_mgr: glm.GLMManager being prepped.
+        :param sub_meter: Name of the meter at the substation, as
+            returned by glm_mgr.add_substation_meter.
+        """
+        # Add 'mysql' module.
+        glm_mgr.add_item({'module': 'mysql'})
+
+        # Add a 'database' object.
+        glm_mgr.add_item({'object': 'database',
+                          'hostname': os.environ['DB_HOST'],
+                          'username': os.environ['DB_USER'],
+                          'password': os.environ['DB_PASS'],
+                          'port': os.environ['DB_PORT'],
+                          'schema': os.environ['DB_DB']})
+
+        # Add a MySQL recorder for the triplex loads.
+        glm_mgr.add_item(
+            # We use the mysql.group_recorder syntax to be very careful
+            # avoiding collisions with the tape module.
+            {'object': 'mysql.recorder',
+             'table': TRIPLEX_TABLE,
+             'name': TRIPLEX_RECORDER,
+             'group': '"groupid={}"'.format(TRIPLEX_GROUP),
+             'property': '"{}"'.format(TRIPLEX_PROPERTY_IN),
+             'interval': CONFIG['ga']['intervals']['sample'],
+             'limit': -1,
+             'mode': 'a',
+             'query_buffer_limit': CONFIG['database']['query_buffer_limit']
+             })
+
+        # Add a recorder for the substation meter.
+        glm_mgr.add_item(
+            # We use the mysql.group_recorder syntax to be very careful
+            # avoiding collisions with the tape module.
+            {'object': 'mysql.recorder',
+             'table': SUBSTATION_TABLE,
+             'name': SUBSTATION_RECORDER,
+             'parent': sub_meter,
+             'property': '"{}, {}, {}"'.format(SUBSTATION_ENERGY,
+                                               SUBSTATION_REAL_POWER,
+                                               SUBSTATION_REACTIVE_POWER),
+             'interval': CONFIG['ga']['intervals']['sample'],
+             'limit': -1,
+             'mode': 'a',
+             'query_buffer_limit': CONFIG['database']['query_buffer_limit']
+             })
+
     def evaluate(self):
         """This is the 'main' method of this class. Write + run
         a GridLAB-D model and compute costs associated with it.
@@ -1055,19 +1412,21 @@ class _Evaluator:
         model = 'model_{}.glm'.format(self.uid)
         self.glm_mgr.write_model(model)
 
-        # Run it.
-        result = utils.run_gld(model)
-
-        # Clean up the model file - it's no longer needed.
+        # Run it. A run which hangs or is cancelled raises an error.
         try:
-            os.remove(model)
-        except FileNotFoundError:
-            # We don't want everything to come crashing down if we
-            # can't find the model. This happens in testing when we
-            # patch things. The testing case can be worked around, but
-            # it's compelling to add this safety net for a non-critical
-            # procedure.
-            pass
+            result = utils.run_gld(model, timeout=CONFIG['ga']['gld_timeout'],
+                                   cancel_event=self.cancel_event)
+        finally:
+            # Clean up the model file - it's no longer needed.
+            try:
+                os.remove(model)
+            except FileNotFoundError:
+                # We don't want everything to come crashing down if we
+                # can't find the model. This happens in testing when we
+                # patch things. The testing case can be worked around,
+                # but it's compelling to add this safety net for a
+                # non-critical procedure.
+                pass
 
         # TODO: Best way to handle failed runs? Maybe make costs
         #  infinite? Make sure to add logging.
@@ -1252,24 +1611,384 @@ class _Evaluator:
                 * TO_KW_FACTOR * CONFIG['costs']['energy'])
 
 
-def _evaluate_worker(input_queue, output_queue, logging_queue, glm_mgr):
+class _FileEvaluator(_Evaluator):
+    """Alternative to _Evaluator which has GridLAB-D record results to
+    files with the tape module rather than to MySQL. The files are put
+    in a directory for each process under CONFIG['ga']['results_dir'],
+    ideally on a tmpfs (e.g. /dev/shm), and penalties are computed
+    in-process. So, evaluation doesn't involve the database at all.
+    """
+
+    uses_db = False
+
+    # (object type, object name, file prefix) for each of the tape
+    # objects added by add_recorders. Their files are set in __init__.
+    TAPE_OBJECTS = (('group_recorder', TRIPLEX_RECORDER, TRIPLEX_TABLE),
+                    ('recorder', SUBSTATION_RECORDER, SUBSTATION_TABLE))
+
+    def __init__(self, uid, glm_mgr, db_conn=None, slot=None,
+                 cancel_event=None):
+        """Initialize a _FileEvaluator object.
+
+        :param uid: Integer, uid attribute of an Individual.
+        :param glm_mgr: See _Evaluator.__init__.
+        :param db_conn: Ignored, and may be None. Only present so this
+            class can be used interchangeably with _Evaluator.
+        :param slot: See _Evaluator.__init__. Used to name the files.
+        :param cancel_event: See _Evaluator.__init__.
+        """
+        self.uid = uid
+        self.slot = slot
+        self.cancel_event = cancel_event
+
+        if not isinstance(glm_mgr, (glm.GLMManager, glm.GLMOverlay)):
+            raise TypeError('glm_mgr must be a glm.GLMManager or '
+                            'glm.GLMOverlay object.')
+
+        self.glm_mgr = glm_mgr
+        self.db_conn = None
+
+        # Put output files in a directory for this process.
+        out_dir = os.path.join(CONFIG['ga']['results_dir'], str(os.getpid()))
+        os.makedirs(out_dir, exist_ok=True)
+        suffix = self.uid if slot is None else slot
+        # Map object names to their files.
+        self.files = {
+            name: os.path.join(out_dir, '{}_{}.csv'.format(prefix, suffix))
+            for _, name, prefix in self.TAPE_OBJECTS}
+        self.triplex_file = self.files.get(TRIPLEX_RECORDER)
+        self.substation_file = self.files[SUBSTATION_RECORDER]
+
+        clock = glm_mgr.get_items_by_type('clock')
+        self.starttime = clock['starttime'].replace('"', '').replace("'", '')
+
+        # Ensure we're starting fresh.
+        self._remove_files()
+
+        # Triplex voltages, read on demand by _get_triplex_data.
+        self._triplex_data = None
+
+        # Point the recorders at our files.
+        for obj_type, name, _ in self.TAPE_OBJECTS:
+            self.glm_mgr.modify_item({'object': obj_type, 'name': name,
+                                      'file': self.files[name]})
+
+    @classmethod
+    def add_recorders(cls, glm_mgr, sub_meter):
+        """Add the recorders used by this class to a model. Called by
+        prep_glm_mgr.
+
+        1) Add the tape module to the model, if it isn't there.
+        2) Add the triplex recorder(s) (see _add_triplex_recorders).
+        3) Add a recorder for the substation meter.
+
+        The recorders' files are set for each Individual in __init__.
+
+        :param glm_mgr: glm.GLMManager being prepped.
+        :param sub_meter: Name of the meter at the substation, as
+            returned by glm_mgr.add_substation_meter.
+        """
+        if not glm_mgr.module_present('tape'):
+            glm_mgr.add_item({'module': 'tape'})
+
+        cls._add_triplex_recorders(glm_mgr)
+
+        glm_mgr.add_item(
+            {'object': 'recorder',
+             'name': SUBSTATION_RECORDER,
+             'parent': sub_meter,
+             'property': '"{},{},{}"'.format(SUBSTATION_ENERGY,
+                                             SUBSTATION_REAL_POWER,
+                                             SUBSTATION_REACTIVE_POWER),
+             'interval': CONFIG['ga']['intervals']['sample'],
+             'limit': -1,
+             'file': '{}.csv'.format(SUBSTATION_TABLE)
+             })
+
+    @staticmethod
+    def _add_triplex_recorders(glm_mgr):
+        """Add a group_recorder for the triplex group. Called by
+        add_recorders.
+        """
+        # The group_recorder records a single property, so ask for the
+        # magnitude via complex_part.
+        glm_mgr.add_item(
+            {'object': 'group_recorder',
+             'name': TRIPLEX_RECORDER,
+             'group': '"groupid={}"'.format(TRIPLEX_GROUP),
+             'property': TRIPLEX_PROPERTY_IN.split('.')[0],
+             'complex_part': 'MAG',
+             'interval': CONFIG['ga']['intervals']['sample'],
+             'limit': -1,
+             'file': '{}.csv'.format(TRIPLEX_TABLE)
+             })
+
+    def evaluate(self):
+        """See _Evaluator.evaluate. The output files are removed after
+        the penalties are computed.
+        """
+        try:
+            return super().evaluate()
+        finally:
+            self._remove_files()
+
+    def _remove_files(self):
+        """Helper to remove this evaluator's output files."""
+        for f in self.files.values():
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+
+    def _get_triplex_data(self):
+        """Helper to read the triplex voltages (once), skipping the
+        first time step as the queries in _Evaluator do.
+
+        :returns: 2D NumPy array of voltage magnitudes, with a row per
+            time step and a column per triplex load.
+        """
+        if self._triplex_data is None:
+            times, self._triplex_data = \
+                _read_tape_csv(self.triplex_file, starttime=self.starttime)
+
+        return self._triplex_data
+
+    def _low_voltage_penalty(self):
+        """Compute low voltage penalty for triplex loads. Called by
+        'evaluate'. See _Evaluator._low_voltage_penalty.
+        """
+        v = self._get_triplex_data()
+        return float(((TRIPLEX_LOW_VOLTAGE - v[v < TRIPLEX_LOW_VOLTAGE])
+                      * CONFIG['costs']['voltage_violation_low']).sum())
+
+    def _high_voltage_penalty(self):
+        """Compute high voltage penalty for triplex loads. Called by
+        'evaluate'. See _Evaluator._high_voltage_penalty.
+        """
+        v = self._get_triplex_data()
+        return float(((v[v > TRIPLEX_HIGH_VOLTAGE] - TRIPLEX_HIGH_VOLTAGE)
+                      * CONFIG['costs']['voltage_violation_high']).sum())
+
+    def _get_substation_data(self):
+        """Helper to read the substation data, and ensure not empty.
+        Returns a DataFrame with the same columns as
+        _Evaluator._get_substation_data.
+        """
+        times, values = _read_tape_csv(self.substation_file,
+                                       starttime=self.starttime)
+
+        if values.shape[0] < 1:
+            raise ValueError('No substation data was received! This likely '
+                             'indicates something is wrong with the configured'
+                             ' start/stop time, sample interval, and/or '
+                             'minimum timestep.')
+
+        if values.shape[1] != 3:
+            raise ValueError('Unexpected number of substation data columns. '
+                             'Expected: 3, Actual: {}'.format(values.shape[1]))
+
+        sub_data = pd.DataFrame(values, columns=[SUBSTATION_ENERGY,
+                                                 SUBSTATION_REAL_POWER,
+                                                 SUBSTATION_REACTIVE_POWER])
+        sub_data[TIME_COL] = times
+        return sub_data
+
+
+class _AggregateEvaluator(_FileEvaluator):
+    """Variant of _FileEvaluator which has GridLAB-D aggregate the
+    triplex voltages during the simulation. Rather than recording the
+    voltage of every triplex load at every sample, a tape collector for
+    each voltage limit records the sum and count of the voltages beyond
+    the limit, which is all the penalties need. So, the output no longer
+    grows with the number of triplex loads.
+
+    The collectors' groups select triplex loads by voltage.
+    """
+
+    TAPE_OBJECTS = (('collector', TRIPLEX_LOW_COLLECTOR,
+                     TRIPLEX_TABLE + '_low'),
+                    ('collector', TRIPLEX_HIGH_COLLECTOR,
+                     TRIPLEX_TABLE + '_high'),
+                    ('recorder', SUBSTATION_RECORDER, SUBSTATION_TABLE))
+
+    @staticmethod
+    def _add_triplex_recorders(glm_mgr):
+        """Add a collector for each voltage limit. Called by
+        add_recorders.
+        """
+        for name, op, limit in (
+                (TRIPLEX_LOW_COLLECTOR, '<', TRIPLEX_LOW_VOLTAGE),
+                (TRIPLEX_HIGH_COLLECTOR, '>', TRIPLEX_HIGH_VOLTAGE)):
+            glm_mgr.add_item(
+                {'object': 'collector',
+                 'name': name,
+                 'group': '"groupid={} AND {}{}{}"'.format(
+                     TRIPLEX_GROUP, TRIPLEX_PROPERTY_IN, op, limit),
+                 'property': '"sum({0}),count({0})"'.format(
+                     TRIPLEX_PROPERTY_IN),
+                 'interval': CONFIG['ga']['intervals']['sample'],
+                 'limit': -1,
+                 'file': '{}.csv'.format(name)
+                 })
+
+    def _get_aggregates(self, name):
+        """Helper to read a collector's output, skipping the first time
+        step as the queries in _Evaluator do.
+
+        :param name: Name of the collector.
+
+        :returns: sums, counts. NumPy arrays with an element per time
+            step. Time steps with no violations have a count of 0.
+        """
+        times, values = _read_tape_csv(self.files[name],
+                                       starttime=self.starttime)
+
+        if values.shape[1] != 2:
+            raise ValueError('Unexpected number of columns from collector '
+                             '{}. Expected: 2, Actual: {}'
+                             .format(name, values.shape[1]))
+
+        counts = values[:, 1]
+        # The sum of an empty group may not come out as 0.
+        sums = np.where(counts > 0, values[:, 0], 0)
+        return sums, counts
+
+    def _low_voltage_penalty(self):
+        """Compute low voltage penalty for triplex loads. Called by
+        'evaluate'. See _Evaluator._low_voltage_penalty.
+        """
+        sums, counts = self._get_aggregates(TRIPLEX_LOW_COLLECTOR)
+        return float((TRIPLEX_LOW_VOLTAGE * counts - sums).sum()
+                     * CONFIG['costs']['voltage_violation_low'])
+
+    def _high_voltage_penalty(self):
+        """Compute high voltage penalty for triplex loads. Called by
+        'evaluate'. See _Evaluator._high_voltage_penalty.
+        """
+        sums, counts = self._get_aggregates(TRIPLEX_HIGH_COLLECTOR)
+        return float((sums - TRIPLEX_HIGH_VOLTAGE * counts).sum()
+                     * CONFIG['costs']['voltage_violation_high'])
+
+
+def _read_tape_csv(path, starttime):
+    """Read the output of a GridLAB-D tape recorder or group_recorder.
+
+    Lines starting with '#' (the headers) are skipped. Each remaining
+    line holds a timestamp, e.g. '2013-04-01 12:00:05 UTC', followed by
+    one value per recorded property or object.
+
+    :param path: Path to the file.
+    :param starttime: String, 'YYYY-mm-dd HH:MM:SS'. Only rows after
+        this time are returned.
+
+    :returns: times, values. times is a NumPy array of timestamp
+        strings, and values is a 2D NumPy array of floats with a row
+        per time.
+    """
+    data = pd.read_csv(path, comment='#', header=None, index_col=0)
+
+    # Values with units (e.g. '+1234.5 W') come through as strings.
+    for c in data.columns:
+        if not pd.api.types.is_numeric_dtype(data[c]):
+            data[c] = data[c].str.split(' ', n=1).str[0].astype(float)
+
+    # Timestamps sort as strings, so no need to convert them.
+    times = data.index.astype(str).str[:19]
+    mask = np.asarray(times > starttime)
+
+    return (np.asarray(data.index.astype(str))[mask],
+            data.to_numpy(dtype=float)[mask])
+
+
+# Evaluators for each results backend (CONFIG['ga']['results_backend']).
+EVALUATORS = {'mysql': _Evaluator, 'file': _FileEvaluator,
+              'aggregate': _AggregateEvaluator}
+
+
+def get_evaluator_class():
+    """Get the evaluator class (_Evaluator, _FileEvaluator, or
+    _AggregateEvaluator) for the results backend in
+    CONFIG['ga']['results_backend'].
+
+    :raises ValueError: if the backend isn't in EVALUATORS.
+    """
+    backend = CONFIG['ga']['results_backend']
+    try:
+        return EVALUATORS[backend]
+    except KeyError:
+        raise ValueError('Unknown results_backend {}. Valid options: {}'
+                         .format(backend, list(EVALUATORS))) from None
+
+
+def create_recorder_tables(db_conn, triplex_table, substation_table):
+    """Create the recorder tables used by _Evaluator ahead of
+    GridLAB-D, which then appends to them. The tables use the engine in
+    CONFIG['database']['recorder_engine'] and are indexed on the time
+    column, which the penalty queries filter on. Tables which already
+    exist are left as they are.
+
+    :param db_conn: Active database connection.
+    :param triplex_table: Name of the triplex table.
+    :param substation_table: Name of the substation table.
+    """
+    for table, columns in ((triplex_table, TRIPLEX_TABLE_COLUMNS),
+                           (substation_table, SUBSTATION_TABLE_COLUMNS)):
+        db.create_table(db_conn=db_conn, table=table, columns=columns,
+                        primary_key=ID_COL, indexes={'i_t': TIME_COL},
+                        engine=CONFIG['database']['recorder_engine'])
+
+
+def drop_orphaned_tables(db_conn, slots=()):
+    """Drop recorder tables (see _Evaluator) left behind by previous
+    runs, e.g. per-Individual tables from before tables were reused, or
+    tables from a crashed run with more workers.
+
+    :param db_conn: Active database connection.
+    :param slots: Slots (see _Evaluator.__init__) whose tables should
+        be kept, e.g. range(number of workers).
+
+    :returns: List of dropped tables.
+    """
+    keep = {str(slot) for slot in slots}
+    orphans = []
+    for prefix in (TRIPLEX_TABLE, SUBSTATION_TABLE):
+        for table in db.list_tables(db_conn=db_conn,
+                                    pattern=prefix + '\\_%'):
+            suffix = table[len(prefix) + 1:]
+            if suffix.isdigit() and (suffix not in keep):
+                orphans.append(table)
+
+    db.drop_tables(db_conn=db_conn, tables=orphans)
+    return orphans
+
+
+def _evaluate_worker(input_queue, output_queue, logging_queue, glm_mgr,
+                     control_queue=None, busy=None, worker_id=None,
+                     model_version=0, chrom_map=None, chrom_len=None,
+                     patches=(), cancelled=None, slot=None):
     """'Worker' function for evaluating individuals in parallel.
 
     This method is designed to be used in a multi-threaded or
     multi-processing environment.
 
     :param input_queue: Multiprocessing.JoinableQueue instance. The
-        objects in this queue are expected to only be of type
-        ga.Individual. Note that we can't do an explicit type check
-        on this object, so we'll instead check for the task_done
-        attribute. You're asking for trouble if this is a simple
-        queue.Queue object (which is multi-threading safe, but not
-        multi-processing safe).
+        objects in this queue are expected to be of type ga.Individual,
+        or tuples of (model_version, task_id, batch) as put in the
+        queue by EvaluatorPool.submit_many. Each item in a batch is
+        either a ga.Individual or, if this worker has a chrom_map, a
+        (uid, packed chromosome) tuple (see _pack_chromosome). Note
+        that we can't do an explicit type check on this object, so
+        we'll instead check for the task_done attribute. You're asking
+        for trouble if this is a simple queue.Queue object (which is
+        multi-threading safe, but not multi-processing safe).
 
         If None is received in the queue, the process will terminate.
     :param output_queue: Multiprocessing.Queue instance. The input
         Individuals will be placed into the output queue after they've
-        been evaluated.
+        been evaluated. For tuple inputs, (task_id, results) is placed
+        in the queue instead, with one item in results per item in the
+        batch. Individuals are returned as is, and (uid, chromosome)
+        items become (uid, fitness, penalties, evaluation time).
     :param logging_queue: Multiprocessing.Queue instance for which
         dictionaries with logging information will be placed. See the
         _logging_thread function for further reference.
@@ -1277,13 +1996,45 @@ def _evaluate_worker(input_queue, output_queue, logging_queue, glm_mgr):
         to the ga.Individual's evaluate method. So, read the comment
         there for more details on requirements.
 
-    IMPORTANT NOTE ON THE glm_mgr: The glm_mgr will be re-used for each
-        subsequent individual. At the time of writing (2019-07-16), this
-        is just fine, because none of the updates that happen care about
-        the previous value. HOWEVER, if you go and change this to use
-        multi-threading instead of multi-processing, you're going to
-        enter a special kind of hell. The work-around is to create a
-        deepcopy for each individual.
+    NOTE ON THE glm_mgr: Each individual is evaluated with a
+        copy-on-write view of the glm_mgr (see glm.GLMManager.fork),
+        so the glm_mgr itself is never modified and individuals don't
+        see each other's updates. This also means individuals could be
+        evaluated in threads without copying the model.
+    :param control_queue: Optional Multiprocessing.Queue instance,
+        used by EvaluatorPool to send model updates to this worker.
+        Updates are tuples of (model_version, kind, payload), where
+        kind is 'model' and payload is a pickled tuple of
+        (glm.GLMManager, chrom_map, chrom_len), or kind is 'patch' and
+        payload is a pickled tuple of (patch, chrom_map, chrom_len),
+        where the patch (see glm.GLMManager.diff) is applied to the
+        current glm_mgr.
+        When a task with a newer model_version than this worker has
+        arrives, the worker blocks on this queue until it catches up
+        (see _catch_up_model).
+    :param busy: Shared multiprocessing.Array, required for tuple
+        inputs. While this worker evaluates a task, busy[worker_id]
+        holds the task_id, otherwise -1. Used by EvaluatorPool to
+        resubmit the task if this worker dies.
+    :param worker_id: Index into busy for this worker.
+    :param model_version: Version of the given glm_mgr.
+    :param chrom_map: Optional chromosome map (see map_chromosome) for
+        rebuilding Individuals from packed chromosomes.
+    :param chrom_len: Chromosome length to go with chrom_map.
+    :param patches: Patches (see glm.GLMManager.diff) to apply to
+        glm_mgr before starting, e.g. for a respawned worker.
+    :param cancelled: Optional shared multiprocessing.Value holding the
+        id of the last task cancelled by EvaluatorPool.cancel. Tasks
+        with ids up to and including this are abandoned, killing
+        GridLAB-D if it's running (see _TaskCancelled).
+    :param slot: Slot for naming recorder tables (see
+        _Evaluator.__init__), so each worker reuses its own pair of
+        tables. Defaults to worker_id.
+
+    NOTE ON THE DATABASE: A single connection (see
+        db.PersistentConnection) is used for all evaluations, and is
+        checked before each use rather than reconnecting for each
+        Individual.
     """
     # Ensure our input_queue is joinable.
     try:
@@ -1291,43 +2042,85 @@ def _evaluate_worker(input_queue, output_queue, logging_queue, glm_mgr):
     except AttributeError:
         raise TypeError('input_queue must be multiprocessing.JoinableQueue')
 
+    if slot is None:
+        slot = worker_id
+
+    # The layout is only needed for rebuilding Individuals.
+    layout = _worker_layout(chrom_map, chrom_len)
+
+    for patch in patches:
+        glm_mgr.apply(patch)
+
+    # Connect on demand, and reuse the connection.
+    db_conn = db.PersistentConnection(timeout=10, retry_interval=0.1)
+
     # Loop forever.
     while True:
         # Grab an individual from the queue. Wait forever.
-        ind = input_queue.get(block=True, timeout=None)
+        task = input_queue.get(block=True, timeout=None)
 
         # Terminate if None is received.
-        if ind is None:
+        if task is None:
+            db_conn.close()
             # Mark the task as done so joins won't hang later.
             input_queue.task_done()
             # We're done here. Deuces.
             return
 
+        if isinstance(task, tuple):
+            version, task_id, batch = task
+        else:
+            version, task_id, batch = None, None, [task]
+
+        if task_id is not None:
+            busy[worker_id] = task_id
+
+        if (cancelled is not None) and (task_id is not None):
+            cancel_event = _TaskCancelled(cancelled=cancelled,
+                                          task_id=task_id)
+        else:
+            cancel_event = None
+
+        results = []
+
         try:
-            t0 = time.time()
-            # So, we now have an individual. Evaluate.
-            ind.evaluate(glm_mgr=glm_mgr,
-                         db_conn=db.connect_loop(timeout=10,
-                                                 retry_interval=0.1))
-            t1 = time.time()
-
-            # Dump information into the logging queue.
-            logging_queue.put({'uid': ind.uid, 'fitness': ind.fitness,
-                               'penalties': ind.penalties,
-                               'time': t1 - t0})
-        except Exception as e:
-            # This is intentionally broad, and is here to ensure that
-            # the process attached to this method (or when this method
-            # is attached to a process?) doesn't crash and burn.
-            logging_queue.put({'error': e,
-                               'uid': ind.uid})
+            # Catch up on model updates, if necessary.
+            if (version is not None) and (model_version < version):
+                try:
+                    model_version, glm_mgr, chrom_map, chrom_len = \
+                        _catch_up_model(control_queue=control_queue,
+                                        model_version=model_version,
+                                        version=version, glm_mgr=glm_mgr,
+                                        chrom_map=chrom_map,
+                                        chrom_len=chrom_len)
+                except Exception as e:
+                    # Without a model, nothing in the batch can be
+                    # evaluated. Fail every item (like _evaluate_item
+                    # does) so the batch isn't lost, then let this
+                    # worker die. It'll be respawned with the pool's
+                    # model.
+                    logging_queue.put({'error': e, 'uid': None})
+                    results = [(_item_uid(item), np.inf, None, 0.0)
+                               for item in batch]
+                    raise
+
+                layout = _worker_layout(chrom_map, chrom_len)
+
+            for item in batch:
+                results.append(_evaluate_item(
+                    item=item, glm_mgr=glm_mgr, layout=layout,
+                    logging_queue=logging_queue, db_conn=db_conn,
+                    slot=slot, cancel_event=cancel_event))
         finally:
             try:
-                # Put the (possibly) fully evaluated individual in the
-                # output queue. Error handling in ind.evaluate will
-                # ensure a failed evaluation results in a fitness of
-                # infinity.
-                output_queue.put(ind)
+                # Put the evaluated individual(s) in the output queue.
+                # Error handling in _evaluate_item will ensure a failed
+                # evaluation results in a fitness of infinity.
+                if task_id is None:
+                    output_queue.put(results[0])
+                else:
+                    output_queue.put((task_id, results))
+                    busy[worker_id] = -1
             finally:
                 # Mark this task as complete. Putting this in a finally
                 # block should avoid us getting in a stuck state where
@@ -1336,37 +2129,204 @@ def _evaluate_worker(input_queue, output_queue, logging_queue, glm_mgr):
                 input_queue.task_done()
 
 
-def _logging_thread(logging_queue):
-    """Function intended to be the target of a thread, used to log
-    the progress of genetic algorithm fitness evaluation.
+def _catch_up_model(control_queue, model_version, version, glm_mgr,
+                    chrom_map, chrom_len):
+    """Helper for _evaluate_worker to bring its model up to the given
+    version, using the updates in its control_queue.
 
-    :param logging_queue: Multiprocessing.Queue object, which will have
-        dictionaries of the following format placed in it:
-        {'uid': <uid, integer>, 'fitness': <fitness, float>,
-        'penalties': <penalties, dictionary>}.
+    A worker which hasn't had any tasks for a while may have several
+    whole models waiting. Only the newest one (and any patches after
+    it) is unpickled, since each model is several MB.
 
-        In the case of an upstream exception, the dictionary will look
-        like {'error': <exception object>}
+    :param control_queue: See _evaluate_worker. Updates past version
+        are left in the queue.
+    :param model_version: Current version of glm_mgr.
+    :param version: Version to catch up to.
+    :param glm_mgr: Current glm.GLMManager.
+    :param chrom_map: Current chromosome map (or None).
+    :param chrom_len: Current chromosome length (or None).
 
-        If None is received in the queue, the thread will terminate.
+    :returns: Tuple of (model_version, glm_mgr, chrom_map, chrom_len)
+        after catching up.
     """
-    # Loop forever
-    while True:
-        # Get dictionary from the queue.
-        log_dict = logging_queue.get(block=True, timeout=None)
+    updates = []
+    while model_version < version:
+        model_version, kind, payload = control_queue.get(block=True,
+                                                         timeout=None)
+        if kind == 'model':
+            # Everything before this is stale.
+            updates = []
+
+        updates.append((kind, payload))
+
+    for kind, payload in updates:
+        update = pickle.loads(payload)
+        if kind == 'model':
+            glm_mgr, chrom_map, chrom_len = update
+        else:
+            patch, chrom_map, chrom_len = update
+            glm_mgr.apply(patch)
 
-        # Terminate on receiving None.
-        if log_dict is None:
-            return
+    return model_version, glm_mgr, chrom_map, chrom_len
 
-        try:
-            # See if we have an error.
-            log_dict['error']
 
-        except KeyError:
-            # Log the individual completion.
-            LOG.debug(
-                'Individual {} evaluated in {:.2f} seconds. Fitness: {:.2f}.\n'
+class _TaskCancelled:
+    """Event-like object (it has an is_set method) for _evaluate_worker
+    to pass to utils.run_gld, which is set once the given task has been
+    cancelled by EvaluatorPool.cancel. Task ids only increase, so a
+    single shared value covers every cancelled task.
+    """
+
+    def __init__(self, cancelled, task_id):
+        """
+        :param cancelled: Shared multiprocessing.Value with the id of
+            the last cancelled task.
+        :param task_id: Id of the task to check.
+        """
+        self.cancelled = cancelled
+        self.task_id = task_id
+
+    def is_set(self):
+        return self.task_id <= self.cancelled.value
+
+
+def _worker_layout(chrom_map, chrom_len):
+    """Helper for _evaluate_worker to build a ChromosomeLayout, if
+    there's a chrom_map to build it from.
+    """
+    if chrom_map is None:
+        return None
+
+    return ChromosomeLayout(chrom_map=chrom_map, chrom_len=chrom_len)
+
+
+def _item_uid(item):
+    """Helper for _evaluate_worker to get the uid of a batch item.
+
+    :param item: ga.Individual, or (uid, packed chromosome) tuple.
+    """
+    if isinstance(item, tuple):
+        return item[0]
+
+    return item.uid
+
+
+def _evaluate_item(item, glm_mgr, layout, logging_queue, db_conn=None,
+                   slot=None, cancel_event=None):
+    """Helper for _evaluate_worker to evaluate a single item from a
+    batch.
+
+    :param item: ga.Individual, or (uid, packed chromosome) tuple. In
+        the latter case, an Individual is rebuilt using layout.
+    :param glm_mgr: See _evaluate_worker.
+    :param layout: ChromosomeLayout, required for tuple items.
+    :param logging_queue: See _evaluate_worker.
+    :param db_conn: Optional db.PersistentConnection. If not given, a
+        new connection is made (if the results backend needs one).
+    :param slot: Passed along to Individual.evaluate.
+    :param cancel_event: Passed along to Individual.evaluate. If it's
+        already set, the item isn't evaluated at all.
+
+    :returns: The evaluated Individual if item was an Individual,
+        otherwise (uid, fitness, penalties, evaluation time).
+    """
+    if isinstance(item, tuple):
+        uid, packed = item
+        ind = None
+    else:
+        uid, ind = item.uid, item
+
+    t0 = time.time()
+
+    if (cancel_event is not None) and cancel_event.is_set():
+        # The result would be discarded anyway.
+        if ind is None:
+            return uid, np.inf, None, 0.0
+
+        return ind
+
+    try:
+        if ind is None:
+            chrom = np.unpackbits(np.frombuffer(packed, dtype=np.uint8),
+                                  count=layout.chrom_len).astype(bool)
+            ind = Individual(uid=uid, chrom_len=layout.chrom_len,
+                             num_eq=layout.num_genes,
+                             chrom_map=layout.chrom_map,
+                             chrom_override=chrom, layout=layout)
+
+        # So, we now have an individual. Evaluate with a view of the
+        # model, so the individual's updates don't touch glm_mgr.
+        if isinstance(glm_mgr, glm.GLMManager):
+            view = glm_mgr.fork()
+        else:
+            view = glm_mgr
+
+        if not get_evaluator_class().uses_db:
+            conn = None
+        elif db_conn is None:
+            conn = db.connect_loop(timeout=10, retry_interval=0.1)
+        else:
+            conn = db_conn.get()
+
+        ind.evaluate(glm_mgr=view, db_conn=conn, slot=slot,
+                     cancel_event=cancel_event)
+        t1 = time.time()
+
+        # Dump information into the logging queue.
+        logging_queue.put({'uid': uid, 'fitness': ind.fitness,
+                           'penalties': ind.penalties,
+                           'time': t1 - t0})
+    except utils.GLDCancelledError:
+        # Not an error, the task was cancelled mid-run.
+        pass
+    except Exception as e:
+        # This is intentionally broad, and is here to ensure that
+        # the process attached to this method (or when this method
+        # is attached to a process?) doesn't crash and burn.
+        logging_queue.put({'error': e,
+                           'uid': uid})
+
+    if item is ind:
+        return ind
+
+    if (ind is None) or (ind.fitness is None):
+        # We never got as far as evaluating.
+        return uid, np.inf, None, time.time() - t0
+
+    return uid, ind.fitness, ind.penalties, time.time() - t0
+
+
+def _logging_thread(logging_queue):
+    """Function intended to be the target of a thread, used to log
+    the progress of genetic algorithm fitness evaluation.
+
+    :param logging_queue: Multiprocessing.Queue object, which will have
+        dictionaries of the following format placed in it:
+        {'uid': <uid, integer>, 'fitness': <fitness, float>,
+        'penalties': <penalties, dictionary>}.
+
+        In the case of an upstream exception, the dictionary will look
+        like {'error': <exception object>}
+
+        If None is received in the queue, the thread will terminate.
+    """
+    # Loop forever
+    while True:
+        # Get dictionary from the queue.
+        log_dict = logging_queue.get(block=True, timeout=None)
+
+        # Terminate on receiving None.
+        if log_dict is None:
+            return
+
+        try:
+            # See if we have an error.
+            log_dict['error']
+
+        except KeyError:
+            # Log the individual completion.
+            LOG.debug(
+                'Individual {} evaluated in {:.2f} seconds. Fitness: {:.2f}.\n'
                 'Penalties:\n{}'
                 .format(log_dict['uid'], log_dict['time'], log_dict['fitness'],
                         json.dumps(log_dict['penalties'], indent=4))
@@ -1418,12 +2378,972 @@ def _progress_thread(input_queue, output_queue, log, processes: list,
         time.sleep(interval)
 
 
+def _pack_chromosome(chromosome):
+    """Pack a chromosome (or a 2D array of chromosomes, one per row)
+    into bytes, eight genes per byte. Any non-zero gene is treated as
+    True.
+    """
+    return np.packbits(np.asarray(chromosome, dtype=bool), axis=-1)
+
+
+class ChromosomeRegistry:
+    """Record of every chromosome seen over the course of a genetic
+    algorithm run, used to avoid evaluating the same chromosome twice.
+
+    Chromosomes are packed (see _pack_chromosome) and stored as bytes,
+    so membership tests are hash lookups rather than element-by-element
+    comparisons against every chromosome we've ever seen. For the 9500
+    node model, this is the difference between ~hundreds of Python
+    comparisons per stored chromosome and a single dictionary lookup.
+
+    By default the registry is unbounded. For long runs, max_size can
+    be used to bound memory, in which case the oldest chromosomes are
+    forgotten first.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        :param max_size: Maximum number of chromosomes to remember, or
+            None (the default) to remember everything.
+        """
+        if max_size is not None:
+            if not isinstance(max_size, int):
+                raise TypeError('max_size must be None or an integer.')
+
+            if max_size < 1:
+                raise ValueError('max_size must be at least 1.')
+
+        self._max_size = max_size
+        # Keys are (chromosome length, packed bytes). Values are unused,
+        # but an OrderedDict gives us cheap first-in-first-out eviction.
+        self._registry = OrderedDict()
+
+    @property
+    def max_size(self):
+        """Maximum number of chromosomes to remember. None means
+        unbounded."""
+        return self._max_size
+
+    def __len__(self):
+        return len(self._registry)
+
+    def __contains__(self, chromosome):
+        return self._key(chromosome) in self._registry
+
+    def __iter__(self):
+        """Iterate over the stored chromosomes (as boolean arrays),
+        oldest first."""
+        for length, packed in self._registry:
+            yield np.unpackbits(np.frombuffer(packed, dtype=np.uint8),
+                                count=length).astype(bool)
+
+    @staticmethod
+    def _key(chromosome):
+        return len(chromosome), _pack_chromosome(chromosome).tobytes()
+
+    @staticmethod
+    def _keys(chromosomes):
+        """Build keys for many chromosomes of equal length at once."""
+        chromosomes = np.asarray(chromosomes)
+        if chromosomes.ndim != 2:
+            raise ValueError('chromosomes must be two dimensional, or a '
+                             'list of equal length chromosomes.')
+
+        length = chromosomes.shape[1]
+        return [(length, row.tobytes())
+                for row in _pack_chromosome(chromosomes)]
+
+    def _insert(self, key):
+        """Insert a key, evicting if necessary. Returns True if the key
+        was not already present."""
+        if key in self._registry:
+            return False
+
+        self._registry[key] = None
+
+        if (self.max_size is not None) and (len(self) > self.max_size):
+            self._registry.popitem(last=False)
+
+        return True
+
+    def add(self, chromosome):
+        """Add a chromosome to the registry.
+
+        :param chromosome: Chromosome (one dimensional array) to add.
+
+        :returns: True if the chromosome was added, False if it was
+            already present.
+        """
+        return self._insert(self._key(chromosome))
+
+    def add_many(self, chromosomes):
+        """Add many chromosomes to the registry at once.
+
+        :param chromosomes: Two dimensional array (one chromosome per
+            row) or list of equal length chromosomes.
+
+        :returns: Number of chromosomes which were not already present.
+        """
+        if len(chromosomes) == 0:
+            return 0
+
+        return sum(self._insert(k) for k in self._keys(chromosomes))
+
+    def contains_many(self, chromosomes):
+        """Check many chromosomes for membership at once.
+
+        :param chromosomes: Two dimensional array (one chromosome per
+            row) or list of equal length chromosomes.
+
+        :returns: Boolean numpy array, True where the corresponding
+            chromosome is in the registry.
+        """
+        if len(chromosomes) == 0:
+            return np.zeros(0, dtype=bool)
+
+        return np.array([k in self._registry
+                         for k in self._keys(chromosomes)], dtype=bool)
+
+
+class FitnessCache:
+    """Bounded, least recently used (LRU) cache of simulation penalties
+    for chromosomes which have already been run through GridLAB-D.
+
+    Entries are keyed by the packed chromosome bits and a fingerprint
+    of all the other model inputs (see model_fingerprint), so a single
+    cache can safely be shared by every GA run the application makes:
+    if the switch states, inverter outputs, etc. change between control
+    intervals, the fingerprint changes and old entries simply stop
+    matching. They then age out as new entries are added.
+
+    Only the penalties which come from the simulation are stored.
+    Switching penalties (SWITCHING_PENALTIES) depend on the state of
+    the equipment at the time of evaluation, and are recomputed by
+    Individual.evaluate_from_cache.
+
+    Instances are thread-safe.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        :param max_size: Maximum number of entries to hold. Once this
+            is exceeded, the least recently used entry is evicted.
+            Defaults to CONFIG['ga']['fitness_cache']['max_size'].
+        """
+        if max_size is None:
+            max_size = CONFIG['ga']['fitness_cache']['max_size']
+
+        if not isinstance(max_size, int):
+            raise TypeError('max_size must be an integer.')
+
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1.')
+
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics.
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self):
+        """Maximum number of entries in the cache."""
+        return self._max_size
+
+    @property
+    def hits(self):
+        """Number of successful lookups."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of failed lookups."""
+        return self._misses
+
+    @property
+    def evictions(self):
+        """Number of entries evicted to keep the cache under max_size.
+        """
+        return self._evictions
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def _key(chromosome, fingerprint):
+        """Build a cache key from a chromosome and a fingerprint."""
+        return _pack_chromosome(chromosome).tobytes(), fingerprint
+
+    def get(self, chromosome, fingerprint):
+        """Look up the penalties for a chromosome.
+
+        :param chromosome: Boolean numpy array.
+        :param fingerprint: String, as returned by model_fingerprint.
+
+        :returns: Copy of the penalties dictionary, or None if the
+            chromosome/fingerprint combination is not in the cache.
+        """
+        key = self._key(chromosome, fingerprint)
+        with self._lock:
+            try:
+                penalties = self._cache[key]
+            except KeyError:
+                self._misses += 1
+                return None
+
+            # Mark as most recently used.
+            self._cache.move_to_end(key)
+            self._hits += 1
+
+        return dict(penalties)
+
+    def put(self, chromosome, fingerprint, penalties):
+        """Add or refresh an entry in the cache.
+
+        :param chromosome: Boolean numpy array.
+        :param fingerprint: String, as returned by model_fingerprint.
+        :param penalties: Dictionary of penalties, as found in
+            Individual.penalties. Switching penalties will not be
+            stored.
+        """
+        key = self._key(chromosome, fingerprint)
+        value = {k: v for k, v in penalties.items()
+                 if k not in SWITCHING_PENALTIES}
+
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all entries. Statistics are not reset."""
+        with self._lock:
+            self._cache.clear()
+
+
+class Surrogate:
+    """Online regression model used to pre-screen offspring before they
+    are sent off for (expensive) evaluation with GridLAB-D.
+
+    The model is a ridge regression from an individual's gene values
+    (see ChromosomeLayout.to_ints) to the sum of its simulation
+    penalties. Like the FitnessCache, switching penalties
+    (SWITCHING_PENALTIES) are not learned, since they are cheap to
+    compute exactly and depend on the present state of the equipment.
+
+    A single instance is meant to be shared by successive GA runs so
+    that it doesn't start from scratch every control interval. Training
+    samples are held in a bounded first in, first out buffer, so
+    samples from old intervals (with old loading conditions) age out.
+
+    Accuracy is tracked by recording (predicted, actual) fitness pairs
+    for individuals which were screened and then evaluated. See the
+    mae and rank_correlation properties.
+
+    Instances are thread-safe.
+    """
+
+    def __init__(self, min_samples=None, max_samples=None, alpha=None,
+                 history=None):
+        """
+        :param min_samples: Minimum number of training samples before
+            the model will be fit. Defaults to
+            CONFIG['ga']['surrogate']['min_samples'].
+        :param max_samples: Maximum number of training samples to hold.
+            Defaults to CONFIG['ga']['surrogate']['max_samples'].
+        :param alpha: Regularization strength for the ridge
+            regression. Defaults to CONFIG['ga']['surrogate']['alpha'].
+        :param history: Number of (predicted, actual) pairs to keep for
+            accuracy tracking. Defaults to
+            CONFIG['ga']['surrogate']['history'].
+        """
+        config = CONFIG['ga']['surrogate']
+        if min_samples is None:
+            min_samples = config['min_samples']
+        if max_samples is None:
+            max_samples = config['max_samples']
+        if alpha is None:
+            alpha = config['alpha']
+        if history is None:
+            history = config['history']
+
+        for name, value in (('min_samples', min_samples),
+                            ('max_samples', max_samples),
+                            ('history', history)):
+            if not isinstance(value, int):
+                raise TypeError('{} must be an integer.'.format(name))
+
+            if value < 1:
+                raise ValueError('{} must be at least 1.'.format(name))
+
+        if min_samples > max_samples:
+            raise ValueError('min_samples cannot exceed max_samples.')
+
+        self._min_samples = min_samples
+        self._alpha = alpha
+        self._lock = threading.Lock()
+
+        # Training data.
+        self._x = deque(maxlen=max_samples)
+        self._y = deque(maxlen=max_samples)
+        self._num_genes = None
+
+        # Fitted model, and whether there's data it hasn't seen.
+        self._model = None
+        self._stale = False
+
+        # (predicted, actual) pairs.
+        self._predicted = deque(maxlen=history)
+        self._actual = deque(maxlen=history)
+
+    @property
+    def min_samples(self):
+        """Minimum number of samples required to fit the model."""
+        return self._min_samples
+
+    @property
+    def max_samples(self):
+        """Maximum number of training samples held."""
+        return self._x.maxlen
+
+    @property
+    def ready(self):
+        """True if the model has been fit and can make predictions."""
+        return self._model is not None
+
+    def __len__(self):
+        return len(self._y)
+
+    def add(self, genes, value):
+        """Add a training sample.
+
+        :param genes: One dimensional array of gene values.
+        :param value: Sum of the simulation penalties for the genes.
+
+        If the number of genes doesn't match the existing samples (e.g.
+        equipment was added or removed), all existing samples and the
+        fitted model are discarded.
+        """
+        genes = np.asarray(genes, dtype=float)
+        with self._lock:
+            if (self._num_genes is not None) \
+                    and (genes.shape[0] != self._num_genes):
+                LOG.warning('Number of genes changed from {} to {}, '
+                            'resetting the surrogate model.'
+                            .format(self._num_genes, genes.shape[0]))
+                self._x.clear()
+                self._y.clear()
+                self._model = None
+
+            self._num_genes = genes.shape[0]
+            self._x.append(genes)
+            self._y.append(value)
+            self._stale = True
+
+    def fit(self):
+        """Fit the model to the current samples, if there are enough
+        samples and there's anything new since the last fit.
+
+        :returns: self.ready
+        """
+        with self._lock:
+            if self._stale and (len(self._y) >= self.min_samples):
+                model = Ridge(alpha=self._alpha)
+                model.fit(np.array(self._x), np.array(self._y))
+                self._model = model
+                self._stale = False
+
+        return self.ready
+
+    def predict(self, genes):
+        """Predict the sum of the simulation penalties.
+
+        :param genes: Two dimensional array of gene values, one row
+            per individual.
+
+        :returns: One dimensional array of predictions.
+
+        :raises ValueError: if the model has not been fit.
+        """
+        with self._lock:
+            if self._model is None:
+                raise ValueError('The surrogate model has not been fit.')
+
+            return self._model.predict(np.asarray(genes, dtype=float))
+
+    def record(self, predicted, actual):
+        """Record a predicted fitness alongside the actual fitness from
+        evaluation for accuracy tracking.
+        """
+        with self._lock:
+            self._predicted.append(predicted)
+            self._actual.append(actual)
+
+    @property
+    def mae(self):
+        """Mean absolute error of recorded predictions, or None if
+        nothing has been recorded."""
+        with self._lock:
+            if len(self._actual) == 0:
+                return None
+
+            return float(np.mean(np.abs(np.array(self._predicted)
+                                        - np.array(self._actual))))
+
+    @property
+    def rank_correlation(self):
+        """Spearman rank correlation between recorded predictions and
+        actual fitness, or None if fewer than 3 pairs have been
+        recorded. Since the surrogate is only used for ranking, this is
+        the more meaningful accuracy measure.
+        """
+        with self._lock:
+            if len(self._actual) < 3:
+                return None
+
+            return float(spearmanr(self._predicted, self._actual)[0])
+
+
+class EvaluatorPool:
+    """Pool of worker processes (see _evaluate_worker) for evaluating
+    Individuals.
+
+    Starting processes (and re-importing everything in them) takes
+    time, so a single pool is meant to be created once and shared by
+    successive Populations. Rather than re-forking the workers when the
+    model changes, set_model sends the new model to each worker, and
+    each task is tagged with the model version it needs. For small
+    changes (e.g. updated inverter outputs or switch states),
+    patch_model sends just the changes (see glm.GLMManager.diff).
+    update_model picks between the two.
+
+    Workers which die are respawned by check_health, and the task they
+    were working on (if any) is resubmitted.
+
+    Use submit or submit_many to send Individuals off for evaluation
+    and get to retrieve them. Results for tasks which were cancelled
+    (see cancel) are discarded by get.
+
+    If the model comes with a chromosome map, the chromosome map is
+    sent to each worker once per model, and Individuals are sent as
+    just their uid and packed chromosome. Workers send back the uid,
+    fitness, penalties, and evaluation time, which get copied into the
+    original Individual (see Individual.evaluate_from_result). Without
+    a chromosome map, whole Individuals (which drag their chromosome
+    map, equipment, and loggers along) are pickled in both directions.
+    """
+
+    def __init__(self, processes=None, glm_mgr=None, chrom_map=None,
+                 chrom_len=None, batch_size=None, respawn=True):
+        """
+        :param processes: Number of worker processes. Defaults to
+            CONFIG['ga']['processes'].
+        :param glm_mgr: Optional glm.GLMManager to start the workers
+            with. It's inherited by the processes rather than sent
+            through a queue. Otherwise, call set_model before
+            submitting anything.
+        :param chrom_map: Optional chromosome map (see map_chromosome)
+            for the individuals which will be evaluated with glm_mgr.
+        :param chrom_len: Chromosome length to go with chrom_map.
+        :param batch_size: Default number of individuals per message
+            for submit_many. Defaults to CONFIG['ga']['batch_size'].
+        :param respawn: Whether or not check_health should respawn
+            dead workers.
+        """
+        self.log = logging.getLogger(self.__class__.__name__)
+
+        if processes is None:
+            processes = CONFIG['ga']['processes']
+
+        if not isinstance(processes, int):
+            raise TypeError('processes must be an integer.')
+
+        if processes < 1:
+            raise ValueError('processes must be at least 1.')
+
+        if batch_size is None:
+            batch_size = CONFIG['ga']['batch_size']
+
+        if not isinstance(batch_size, int):
+            raise TypeError('batch_size must be an integer.')
+
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1.')
+
+        self._batch_size = batch_size
+        self._respawn = respawn
+        self._lock = threading.Lock()
+
+        # Queues shared by all workers.
+        self._input_queue = mp.JoinableQueue()
+        self._output_queue = mp.Queue()
+        self._logging_queue = mp.Queue()
+
+        # Start the logging thread. It's stopped by wait, but is a
+        # daemon so that it can't keep the interpreter alive if the
+        # pool is never waited on.
+        self._logging_thread = \
+            threading.Thread(target=_logging_thread,
+                             kwargs={'logging_queue': self.logging_queue},
+                             daemon=True)
+        self.logging_thread.start()
+
+        # Model, and its version. Tasks are tagged with the version.
+        self._glm_mgr = glm_mgr
+        self._chrom_map = chrom_map
+        self._chrom_len = chrom_len
+        self._model_version = 0
+        # Patches sent since the model was last set, for respawning
+        # workers.
+        self._patches = []
+
+        # Tasks which have been submitted, but not yet retrieved, keyed
+        # by task id. Values are (task, list of Individuals).
+        self._task_counter = itertools.count()
+        self._outstanding = {}
+
+        # Evaluated individuals from batches which have been received,
+        # but not yet handed out by get.
+        self._ready = deque()
+
+        # Task id each worker is working on (-1 for none).
+        self._busy = mp.Array('q', [-1] * processes)
+
+        # Id of the last task submitted, and of the last task cancelled
+        # (see cancel). Workers abandon cancelled tasks.
+        self._last_task_id = -1
+        self._cancelled_through = mp.Value('q', -1)
+
+        # Per-worker control queues for model updates, and the workers
+        # themselves.
+        self._control_queues = [None] * processes
+        self._processes = [None] * processes
+
+        # Slot (see _Evaluator.__init__) for each worker. A respawned
+        # worker gets a new slot: GridLAB-D runs in its own session, so
+        # it outlives a worker which dies, and would otherwise keep
+        # writing into the replacement worker's tables.
+        self._slot_counter = itertools.count()
+        self._slots = [None] * processes
+        for i in range(processes):
+            self._start_worker(i)
+
+    @property
+    def input_queue(self):
+        """JoinableQueue which tasks are put into."""
+        return self._input_queue
+
+    @property
+    def output_queue(self):
+        """Queue which evaluated tasks are put into."""
+        return self._output_queue
+
+    @property
+    def logging_queue(self):
+        """Queue used for logging individual evaluations."""
+        return self._logging_queue
+
+    @property
+    def logging_thread(self):
+        """Thread for logging individual evaluation."""
+        return self._logging_thread
+
+    @property
+    def processes(self):
+        """List of worker processes."""
+        return self._processes
+
+    @property
+    def model_version(self):
+        """Version of the model most recently given to set_model."""
+        return self._model_version
+
+    @property
+    def batch_size(self):
+        """Default number of individuals per message for submit_many."""
+        return self._batch_size
+
+    @property
+    def n_outstanding(self):
+        """Number of individuals submitted but not yet retrieved."""
+        return (sum(len(inds) for _, inds in self._outstanding.values())
+                + len(self._ready))
+
+    @property
+    def all_alive(self):
+        """True if all workers are alive."""
+        return all(p.is_alive() for p in self.processes)
+
+    @property
+    def all_dead(self):
+        """True if all workers are dead."""
+        return not any(p.is_alive() for p in self.processes)
+
+    def _start_worker(self, i):
+        """Start (or restart) worker i with the current model."""
+        self._control_queues[i] = mp.Queue()
+        self._busy[i] = -1
+        self._slots[i] = next(self._slot_counter)
+        p = mp.Process(target=_evaluate_worker, name=str(i),
+                       kwargs={'input_queue': self.input_queue,
+                               'output_queue': self.output_queue,
+                               'logging_queue': self.logging_queue,
+                               'glm_mgr': self._glm_mgr,
+                               'control_queue': self._control_queues[i],
+                               'busy': self._busy, 'worker_id': i,
+                               'model_version': self._model_version,
+                               'chrom_map': self._chrom_map,
+                               'chrom_len': self._chrom_len,
+                               'patches': list(self._patches),
+                               'cancelled': self._cancelled_through,
+                               'slot': self._slots[i]})
+        self._processes[i] = p
+        p.start()
+
+    def set_model(self, glm_mgr, chrom_map=None, chrom_len=None):
+        """Send a new model to all the workers. Tasks submitted after
+        this call will be evaluated with this model.
+
+        :param glm_mgr: glm.GLMManager. It is pickled once here, so
+            later changes to it are not seen by the workers.
+        :param chrom_map: Optional chromosome map (see map_chromosome)
+            for the individuals which will be evaluated with glm_mgr.
+            If given, individuals are sent to the workers in compact
+            form. Like the glm_mgr, it's pickled once here.
+        :param chrom_len: Chromosome length to go with chrom_map.
+        """
+        payload = pickle.dumps((glm_mgr, chrom_map, chrom_len),
+                               protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Keep a private copy (from the payload, which is cheaper than
+        # a deepcopy) for respawned workers and for update_model to
+        # diff against, since the caller may change glm_mgr.
+        glm_mgr = pickle.loads(payload)[0]
+
+        with self._lock:
+            self._glm_mgr = glm_mgr
+            self._chrom_map = chrom_map
+            self._chrom_len = chrom_len
+            self._patches = []
+            self._model_version += 1
+            for q in self._control_queues:
+                q.put((self._model_version, 'model', payload))
+
+        self.log.debug('Model version {} sent to {} workers.'
+                       .format(self._model_version, len(self.processes)))
+
+    def patch_model(self, patch, chrom_map=None, chrom_len=None):
+        """Send a patch for the current model to all the workers,
+        which is much cheaper than sending a whole new model via
+        set_model. Tasks submitted after this call will be evaluated
+        with the patched model.
+
+        :param patch: Patch for the model most recently given to
+            set_model (or __init__), as created by glm.GLMManager.diff.
+            Workers apply it with glm.GLMManager.apply.
+        :param chrom_map: See set_model. The chromosome map is small
+            (but includes the equipment states), so it's always sent
+            whole.
+        :param chrom_len: Chromosome length to go with chrom_map.
+        """
+        self._patch_model(patch=patch, chrom_map=chrom_map,
+                          chrom_len=chrom_len)
+
+    def update_model(self, glm_mgr, chrom_map=None, chrom_len=None):
+        """Send a new model to all the workers: as a patch (see
+        patch_model) if possible, otherwise whole (see set_model). From
+        one control interval to the next, only a handful of objects
+        (e.g. inverters and switches) change, so a patch is much
+        smaller than the model.
+
+        A patch is used if the workers' model came from __init__,
+        set_model, or update_model (rather than patch_model), and
+        glm.GLMManager.diff can express the changes.
+
+        :param glm_mgr: glm.GLMManager. The next update is computed
+            relative to it, and respawned workers may start from it, so
+            it must not be modified afterwards.
+        :param chrom_map: See set_model.
+        :param chrom_len: See set_model.
+
+        :returns: True if a patch was sent, False if the whole model
+            was.
+        """
+        with self._lock:
+            current = self._glm_mgr if len(self._patches) == 0 else None
+
+        patch = None
+        if isinstance(current, glm.GLMManager) \
+                and isinstance(glm_mgr, glm.GLMManager):
+            try:
+                patch = current.diff(glm_mgr)
+            except ValueError as e:
+                self.log.debug('Unable to patch the model, sending it whole: '
+                               '{}'.format(e))
+
+        if patch is None:
+            self.set_model(glm_mgr, chrom_map=chrom_map, chrom_len=chrom_len)
+            return False
+
+        self._patch_model(patch=patch, chrom_map=chrom_map,
+                          chrom_len=chrom_len, glm_mgr=glm_mgr)
+        return True
+
+    def _patch_model(self, patch, chrom_map, chrom_len, glm_mgr=None):
+        """Helper for patch_model and update_model.
+
+        :param glm_mgr: The patched model, if available. Respawned
+            workers start from it, rather than re-applying patches.
+        """
+        payload = pickle.dumps((patch, chrom_map, chrom_len),
+                               protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            if glm_mgr is None:
+                self._patches.append(patch)
+            else:
+                self._glm_mgr = glm_mgr
+                self._patches = []
+
+            self._chrom_map = chrom_map
+            self._chrom_len = chrom_len
+            self._model_version += 1
+            for q in self._control_queues:
+                q.put((self._model_version, 'patch', payload))
+
+        self.log.debug('Model version {} ({} byte patch) sent to {} workers.'
+                       .format(self._model_version, len(payload),
+                               len(self.processes)))
+
+    def submit(self, ind):
+        """Submit an individual for evaluation.
+
+        :param ind: Individual to evaluate.
+        """
+        self.submit_many([ind], batch_size=1)
+
+    def submit_many(self, individuals, batch_size=None):
+        """Submit individuals for evaluation, in batches. Each batch is
+        evaluated in series by a single worker, so larger batches mean
+        fewer messages at the cost of coarser load balancing.
+
+        :param individuals: List of Individuals to evaluate.
+        :param batch_size: Number of individuals per batch. Defaults to
+            the batch_size given at initialization.
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        with self._lock:
+            for i in range(0, len(individuals), batch_size):
+                inds = individuals[i:i + batch_size]
+
+                if self._chrom_map is None:
+                    batch = inds
+                else:
+                    batch = [(ind.uid,
+                              _pack_chromosome(ind.chromosome).tobytes())
+                             for ind in inds]
+
+                task = (self._model_version, next(self._task_counter), batch)
+                self._last_task_id = task[1]
+                self._outstanding[task[1]] = (task, inds)
+                self.input_queue.put(task)
+
+    def get(self, timeout=None):
+        """Get an evaluated individual.
+
+        :param timeout: Seconds to wait.
+
+        :returns: Evaluated Individual.
+
+        :raises queue.Empty: if nothing is available within the timeout.
+        """
+        t_stop = None if timeout is None else time.time() + timeout
+
+        while True:
+            with self._lock:
+                if len(self._ready) > 0:
+                    return self._ready.popleft()
+
+            remaining = None if t_stop is None else max(0.0,
+                                                        t_stop - time.time())
+            task_id, results = self.output_queue.get(block=True,
+                                                     timeout=remaining)
+
+            with self._lock:
+                # Results of cancelled tasks are discarded.
+                entry = self._outstanding.pop(task_id, None)
+                if entry is None:
+                    continue
+
+                for ind, result in zip(entry[1], results):
+                    if isinstance(result, tuple):
+                        # Compact result: uid, fitness, penalties, time.
+                        ind.evaluate_from_result(*result[1:])
+                    else:
+                        # Whole individual.
+                        ind = result
+
+                    self._ready.append(ind)
+
+    def cancel(self):
+        """Cancel all outstanding tasks. Tasks which haven't started are
+        removed from the queue, and GridLAB-D is killed for tasks in
+        progress (whose results are discarded).
+        """
+        with self._lock:
+            self._cancelled_through.value = self._last_task_id
+            self._outstanding.clear()
+            self._ready.clear()
+
+        utils.drain_queue(self.input_queue)
+
+    def check_health(self):
+        """Check that all workers are alive. If respawn was True at
+        initialization, dead workers are restarted, and the task they
+        were working on is resubmitted. The dead worker's recorder
+        tables are dropped, so GridLAB-D (which may outlive the worker)
+        fails rather than running on.
+
+        :returns: True if all workers are alive (after respawning).
+        """
+        if self.all_alive:
+            return True
+
+        if not self._respawn:
+            return False
+
+        for i, p in enumerate(self.processes):
+            if p.is_alive():
+                continue
+
+            self.log.warning('Evaluation worker {} died with exit code {}, '
+                             'respawning.'.format(i, p.exitcode))
+
+            # Resubmit the lost task, if it hasn't been cancelled. The
+            # dead worker never marked it done.
+            task_id = self._busy[i]
+            if task_id != -1:
+                self.input_queue.task_done()
+                with self._lock:
+                    entry = self._outstanding.get(task_id)
+                    if entry is not None:
+                        self.input_queue.put(entry[0])
+
+            slot = self._slots[i]
+            self._start_worker(i)
+            self._drop_slot_tables(slot)
+
+        return self.all_alive
+
+    def drop_orphaned_tables(self):
+        """Drop recorder tables which don't belong to one of this
+        pool's workers (see drop_orphaned_tables). Does nothing if the
+        results backend doesn't use the database.
+
+        :returns: List of dropped tables.
+        """
+        if not get_evaluator_class().uses_db:
+            return []
+
+        db_conn = db.connect_loop()
+        try:
+            tables = drop_orphaned_tables(db_conn=db_conn,
+                                          slots=list(self._slots))
+        finally:
+            db_conn.close()
+
+        if len(tables) > 0:
+            self.log.info('Dropped {} orphaned recorder tables.'
+                          .format(len(tables)))
+
+        return tables
+
+    def _drop_slot_tables(self, slot):
+        """Helper for check_health to drop the recorder tables for the
+        given slot. Does nothing if the results backend doesn't use the
+        database.
+        """
+        if not get_evaluator_class().uses_db:
+            return
+
+        db_conn = db.connect_loop()
+        try:
+            db.drop_tables(db_conn=db_conn,
+                           tables=[TRIPLEX_TABLE + '_' + str(slot),
+                                   SUBSTATION_TABLE + '_' + str(slot)])
+        finally:
+            db_conn.close()
+
+    def shutdown(self):
+        """Cancel all outstanding tasks, and tell the workers to stop.
+        Use wait to wait for them.
+        """
+        self.cancel()
+        utils.drain_queue(self.output_queue)
+
+        for _ in range(len(self.processes)):
+            self.input_queue.put_nowait(None)
+
+    def wait(self, timeout: Union[float, int]):
+        """Wait for the workers to terminate after shutdown. Once they
+        have, the logging thread is stopped too.
+
+        :param timeout: Time in seconds to wait for each individual
+            process.
+
+        :raises TimeoutError: if any process does not terminate within
+            the given timeout.
+        """
+        for p in self.processes:
+            p.join(timeout=timeout)
+
+            if p.exitcode is None:
+                # Process has not terminated.
+                raise TimeoutError('Process did not terminate within {} '
+                                   'seconds.'.format(timeout))
+
+        # Nothing is left to log.
+        if self.logging_thread.is_alive():
+            self.logging_queue.put(None)
+
+
 class Population:
     """Class for managing a population of individuals for the GA."""
 
-    def __init__(self, regulators, capacitors, glm_mgr, starttime, stoptime):
+    # Options for CONFIG['ga']['mode']
+    MODES = ('generational', 'steady_state')
+
+    def __init__(self, regulators, capacitors, glm_mgr, starttime, stoptime,
+                 fitness_cache=None, surrogate=None, evaluator_pool=None):
         """
         TODO: Document params.
+
+        :param fitness_cache: Optional FitnessCache. If given, it will
+            be checked before individuals are sent off for evaluation
+            and updated with the results of each evaluation. Pass the
+            same cache to successive Populations so that results can be
+            reused across control intervals.
+        :param surrogate: Optional Surrogate. If given, it will be
+            trained with the results of each evaluation and, once it is
+            ready, used by crossover_and_mutate to pick the most
+            promising offspring from an oversized batch. Like the
+            fitness_cache, pass the same object to successive
+            Populations.
+        :param evaluator_pool: Optional EvaluatorPool used to evaluate
+            individuals. The pool is sent this Population's model (as
+            a patch for the previous Population's model, if possible,
+            see EvaluatorPool.update_model), and is left running by
+            graceful_shutdown so it can be reused by the next
+            Population. If not given, a private pool is started, which
+            is shut down by graceful_shutdown.
         """
         ################################################################
         # Setup logging.
@@ -1446,64 +3366,81 @@ class Population:
                      stoptime=self.stoptime)
 
         ################################################################
-        # Initialize uid integer (to be incremented and passed to
-        # individuals)
-        self._uid_counter = itertools.count()
+        # Fitness cache. Only compute the fingerprint if we have a
+        # cache, as it requires writing out the whole model.
+        self._fitness_cache = fitness_cache
+        if self.fitness_cache is not None:
+            self._fingerprint = model_fingerprint(
+                glm_mgr=self.glm_mgr, chrom_map=self.chrom_map,
+                starttime=self.starttime, stoptime=self.stoptime)
+        else:
+            self._fingerprint = None
 
         ################################################################
-        # Setup queues and lock.
-        # Queue for individual evaluation.
-        self._input_queue = mp.JoinableQueue()
+        # Surrogate model, and its predictions for individuals which
+        # have not yet been evaluated (keyed by uid).
+        self._surrogate = surrogate
+        self._surrogate_oversample = CONFIG['ga']['surrogate']['oversample']
+        self._predictions = {}
 
-        # Queue for retrieving individuals after evaluation.
-        self._output_queue = mp.Queue()
+        ################################################################
+        # Best individual evaluated so far. Kept separately from the
+        # population so that it's available at any point, even if the
+        # algorithm is interrupted mid-generation.
+        self._best = None
 
-        # Queue for logging evaluation as it proceeds.
-        self._logging_queue = mp.Queue()
+        # Fraction of offspring from the last call to
+        # crossover_and_mutate which had to be force-mutated since they
+        # duplicated an existing chromosome.
+        self._forced_mutation_share = None
+        self._last_n_forced = 0
 
-        # Lock used to avoid collisions when stopping the algorithm.
-        self._lock = threading.Lock()
-        ################################################################
-        # Threads and processes.
+        # Whether the last call to evaluate_steady_state stopped early
+        # to meet its deadline.
+        self._out_of_time = False
 
-        # Start the logging thread.
-        self._logging_thread = \
-            threading.Thread(target=_logging_thread,
-                             kwargs={'logging_queue': self.logging_queue})
+        ################################################################
+        # Initialize uid integer (to be incremented and passed to
+        # individuals)
+        self._uid_counter = itertools.count()
 
-        self.logging_thread.start()
+        ################################################################
+        # Lock used to avoid collisions when stopping the algorithm.
+        self._lock = threading.Lock()
 
-        # On to processes.
-        n_jobs = CONFIG['ga']['processes']
-
-        # Initialize processes.
-        # TODO: Move this to a method like load_model.LoadModelManager.
-        # TODO: Should probably have a method
-        self._processes = []
-        for n in range(n_jobs):
-            # Initialize process, attaching it to the _evaluate_worker
-            # method.
-            p = mp.Process(target=_evaluate_worker, name=str(n),
-                           kwargs={'input_queue': self.input_queue,
-                                   'output_queue': self.output_queue,
-                                   'logging_queue': self.logging_queue,
-                                   'glm_mgr': self.glm_mgr})
-
-            # Add this process to the list.
-            self._processes.append(p)
-            # Start this process.
-            p.start()
+        # Event which gets set by graceful_shutdown, so that long
+        # running loops (e.g. evaluate_steady_state) know to bail.
+        self._shutdown_event = threading.Event()
+        ################################################################
+        # Threads and processes. These are all managed by the
+        # EvaluatorPool. A private pool inherits the model when its
+        # processes start, and doesn't respawn dead workers.
+        if evaluator_pool is None:
+            self._evaluator_pool = EvaluatorPool(glm_mgr=self.glm_mgr,
+                                                 chrom_map=self.chrom_map,
+                                                 chrom_len=self.chrom_len,
+                                                 respawn=False)
+            self._own_pool = True
+        else:
+            evaluator_pool.update_model(self.glm_mgr,
+                                        chrom_map=self.chrom_map,
+                                        chrom_len=self.chrom_len)
+            self._evaluator_pool = evaluator_pool
+            self._own_pool = False
 
         ################################################################
         # For convenience, create a dictionary with inputs for
         # initializing individuals. These inputs won't change from
         # individual to individual.
+        self._layout = ChromosomeLayout(chrom_map=self.chrom_map,
+                                        chrom_len=self.chrom_len)
         self._ind_init = {'chrom_len': self.chrom_len, 'num_eq': self.num_eq,
-                          'chrom_map': self.chrom_map}
+                          'chrom_map': self.chrom_map, 'layout': self.layout}
 
         ################################################################
         # Track all chromosomes we've ever encountered.
-        self._all_chromosomes = []
+        self._all_chromosomes = ChromosomeRegistry(
+            max_size=CONFIG['ga']['chromosome_registry']['max_size'])
 
         # Initialize the population.
         self._population = []
@@ -1519,6 +3456,20 @@ class Population:
         # Misc.
         self._population_size = CONFIG['ga']['population_size']
         self._generations = CONFIG['ga']['generations']
+        # Generational or steady-state? Steady-state mode uses an
+        # evaluation budget instead of a number of generations.
+        self._mode = CONFIG['ga']['mode']
+        if self._mode not in self.MODES:
+            raise ValueError("CONFIG['ga']['mode'] must be one of {}."
+                             .format(self.MODES))
+        self._evaluations = CONFIG['ga']['evaluations']
+        # Warm starting: at most top_k seed chromosomes are injected by
+        # initialize_population, and at least random_fraction of the
+        # non-special individuals are always randomly initialized to
+        # maintain diversity.
+        self._warm_start_top_k = CONFIG['ga']['warm_start']['top_k']
+        self._warm_start_random_fraction = \
+            CONFIG['ga']['warm_start']['random_fraction']
         # How many of the best/elite individuals to absolutely keep for
         # each generation.
         self._top_fraction = CONFIG['ga']['top_fraction']
@@ -1550,6 +3501,50 @@ class Population:
     ####################################################################
     # Convenience numbers.
 
+    @property
+    def fitness_cache(self):
+        """FitnessCache object, or None if caching is not in use."""
+        return self._fitness_cache
+
+    @property
+    def surrogate(self):
+        """Surrogate object, or None if pre-screening is not in use."""
+        return self._surrogate
+
+    @property
+    def forced_mutation_share(self):
+        """Fraction of the offspring from the most recent call to
+        crossover_and_mutate which had to be force-mutated since they
+        duplicated a chromosome which had already existed. A high value
+        means the algorithm is struggling to find anything new. None
+        if crossover_and_mutate hasn't been called."""
+        return self._forced_mutation_share
+
+    @property
+    def out_of_time(self):
+        """True if the most recent call to evaluate_steady_state stopped
+        submitting new individuals early to meet its deadline."""
+        return self._out_of_time
+
+    @property
+    def best(self):
+        """The Individual with the lowest fitness evaluated so far, or
+        None if no individuals have been evaluated."""
+        return self._best
+
+    @property
+    def surrogate_oversample(self):
+        """When the surrogate is in use, crossover_and_mutate breeds
+        this many times more offspring than needed, and keeps the best
+        according to the surrogate."""
+        return self._surrogate_oversample
+
+    @property
+    def fingerprint(self):
+        """Fingerprint of the model used for the fitness_cache (see
+        model_fingerprint), or None if caching is not in use."""
+        return self._fingerprint
+
     @property
     def prob_mutate_individual(self):
         """Probability an individual enters the mutation phase. Does not
@@ -1583,6 +3578,31 @@ class Population:
         """Number of generations of the genetic algorithm to run."""
         return self._generations
 
+    @property
+    def mode(self):
+        """Either 'generational' or 'steady_state'. See
+        evaluate_steady_state for details on the latter."""
+        return self._mode
+
+    @property
+    def evaluations(self):
+        """Total number of evaluations (including the initial
+        population) to perform in steady-state mode."""
+        return self._evaluations
+
+    @property
+    def warm_start_top_k(self):
+        """Maximum number of seed chromosomes used by
+        initialize_population."""
+        return self._warm_start_top_k
+
+    @property
+    def warm_start_random_fraction(self):
+        """Minimum fraction of the population (excluding the 'max',
+        'min', and 'current_state' individuals) which is randomly
+        initialized when warm starting."""
+        return self._warm_start_random_fraction
+
     @property
     def top_fraction(self):
         """Fraction of the most fit individuals that are guaranteed to
@@ -1668,6 +3688,11 @@ class Population:
         """Dictionary output from map_chromosome."""
         return self._chrom_map
 
+    @property
+    def layout(self):
+        """ChromosomeLayout shared by all Individuals."""
+        return self._layout
+
     @property
     def chrom_len(self):
         """Integer representing the length of each Individual's
@@ -1700,46 +3725,51 @@ class Population:
         """Queue which initialized individuals are put into for
         evaluation in a separate process.
         """
-        return self._input_queue
+        return self.evaluator_pool.input_queue
 
     @property
     def output_queue(self):
         """Queue which individuals are placed in after evaluation is
         complete.
         """
-        return self._output_queue
+        return self.evaluator_pool.output_queue
 
     @property
     def logging_queue(self):
         """Queue used for logging when individuals complete their
         evaluation.
         """
-        return self._logging_queue
+        return self.evaluator_pool.logging_queue
 
     ####################################################################
     # Threads and processes
 
+    @property
+    def evaluator_pool(self):
+        """EvaluatorPool used for evaluating individuals."""
+        return self._evaluator_pool
+
     @property
     def logging_thread(self):
         """Thread for loggin individual evaluation."""
-        return self._logging_thread
+        return self.evaluator_pool.logging_thread
 
     @property
     def processes(self):
         """List of processes for performing individual evaluation."""
-        return self._processes
+        return self.evaluator_pool.processes
 
     @property
     def all_processes_alive(self):
         """True if all processes return True on is_alive(), else False.
         """
-        return np.array([p.is_alive() for p in self.processes]).all()
+        return self.evaluator_pool.all_alive
 
     @property
     def all_processes_dead(self):
         """True if all processes return False on is_alive(), else True.
         """
-        return np.array([not p.is_alive() for p in self.processes]).all()
+        return self.evaluator_pool.all_dead
 
     ####################################################################
 
@@ -1752,11 +3782,11 @@ class Population:
 
     @property
     def all_chromosomes(self):
-        """List of all chromosomes which have occurred over the course
-        of the genetic algorithm. For the 8500 node model, evaluation
-        takes on the order of 20 or so seconds for a 20 second
-        simulation (lots of overhead to start simulation), so it's
-        almost certainly faster to ensure we never have duplicates.
+        """ChromosomeRegistry of all chromosomes which have occurred
+        over the course of the genetic algorithm. For the 8500 node
+        model, evaluation takes on the order of 20 or so seconds for a
+        20 second simulation (lots of overhead to start simulation), so
+        it's almost certainly faster to ensure we never have duplicates.
         """
         return self._all_chromosomes
 
@@ -1828,42 +3858,111 @@ class Population:
 
             # At this point, we've successfully initialized a unique
             # individual. Track its chromosome.
-            self._all_chromosomes.append(ind.chromosome.copy())
+            self.all_chromosomes.add(ind.chromosome)
         else:
-            # In the case of a non-None chrom_override, only track the
-            # chromosome if it's unique. Since it's expensive to search
-            # through the all_chromosomes list, we don't want
-            # duplicates.
-            if not self._chrom_already_existed(ind.chromosome):
-                self._all_chromosomes.append(ind.chromosome.copy())
+            # In the case of a non-None chrom_override, track the
+            # chromosome. The registry ignores duplicates.
+            self.all_chromosomes.add(ind.chromosome)
 
         # All done - return our new individual.
         return ind
 
+    def _init_random_individuals(self, n):
+        """Helper to randomly initialize many individuals at once. This
+        is the batch equivalent of calling _init_individual n times
+        with no inputs.
+
+        :param n: Number of individuals to initialize.
+
+        :returns: List of Individuals.
+
+        :raises ChromosomeAlreadyExistedError: if after 100 attempts
+            we're unable to draw n chromosomes which have not already
+            existed.
+        """
+        if n <= 0:
+            return []
+
+        chroms = np.zeros((n, self.chrom_len), dtype=bool)
+        self._random_rows(chroms, np.ones(n, dtype=bool))
+        chroms = self._make_unique(chroms, redraw=self._random_rows)
+        self.all_chromosomes.add_many(chroms)
+
+        return [Individual(uid=next(self.uid_counter), chrom_override=c.copy(),
+                           **self.ind_init) for c in chroms]
+
+    def _init_seed_individuals(self, seeds):
+        """Helper used by initialize_population to create individuals
+        from seed chromosomes.
+
+        At most self.warm_start_top_k seeds are used, and enough room
+        is always left for self.warm_start_random_fraction of the
+        population to be randomly initialized. Seeds with the wrong
+        shape (e.g. the equipment changed between runs) are dropped
+        with a warning. Seeds are passed through the Individual's
+        chromosome checking, and seeds which are duplicates of a
+        chromosome that has already existed are skipped.
+
+        :param seeds: Iterable of chromosomes, best first.
+
+        :returns: List of Individuals.
+        """
+        n_free = self.population_size - len(self.population)
+        n_random = int(np.ceil(self.warm_start_random_fraction * n_free))
+        n_max = max(0, min(self.warm_start_top_k, n_free - n_random))
+
+        out = []
+        n_dropped = 0
+        for c in seeds:
+            if len(out) >= n_max:
+                break
+
+            c = np.asarray(c)
+            if c.shape != (self.chrom_len,):
+                n_dropped += 1
+                continue
+
+            ind = Individual(uid=next(self.uid_counter),
+                             chrom_override=c.astype(bool), **self.ind_init)
+
+            # add returns False for chromosomes which have already
+            # existed.
+            if self.all_chromosomes.add(ind.chromosome):
+                out.append(ind)
+
+        if n_dropped > 0:
+            self.log.warning('{} seed chromosome(s) were dropped since '
+                             'their shape did not match ({},).'
+                             .format(n_dropped, self.chrom_len))
+
+        self.log.info('Warm starting the population with {} seed '
+                      'individual(s).'.format(len(out)))
+
+        return out
+
+    def best_chromosomes(self, k=None):
+        """Get the chromosomes of the evaluated individuals in the
+        population, best first. The output is suitable for the seeds
+        input to initialize_population (and thus GA.run).
+
+        :param k: Maximum number of chromosomes to return. If None,
+            return all of them.
+
+        :returns: List of np.ndarrays.
+        """
+        evaluated = sorted((ind for ind in self.population
+                            if ind.fitness is not None),
+                           key=lambda ind: ind.fitness)
+
+        return [ind.chromosome.copy() for ind in evaluated[:k]]
+
     def _chrom_already_existed(self, c):
         """Helper to check if a given chromosome has ever been present
         in the population.
 
         :param c: chromosome from an individual.
         """
-        # Loop over all the chromosomes. We may be more likely to get
-        # a hit for more recent individuals, though I don't have the
-        # maths to prove it.
-        for chrom in reversed(self.all_chromosomes):
-            # Loop over the chromosomes element by element.
-            all_match = True
-            for i in range(len(c)):
-                if chrom[i] != c[i]:
-                    # These chromosome aren't equal. Break to outer
-                    # loop.
-                    all_match = False
-                    break
-
-            if all_match:
-                return True
-
-        # If we're here, we didn't have any hits.
-        return False
+        return c in self.all_chromosomes
 
     def _get_two_parents(self):
         """Simple helper to get two parents via a tournament for
@@ -1886,7 +3985,8 @@ class Population:
 
         :param ind: Individual object to mutate.
 
-        :returns: None. The individual is mutated in place.
+        :returns: None. The individual is mutated in place, and its new
+            chromosome is added to all_chromosomes.
         :raises ChromosomeAlreadyExistedError if 100 mutation attempts
             don't get us an individual which hasn't already existed.
         """
@@ -1904,7 +4004,8 @@ class Population:
                 'existed.'.format(c + 1, ind.uid)
             )
 
-        # All done.
+        # Track the new chromosome.
+        self.all_chromosomes.add(ind.chromosome)
 
     def _crossover_and_mutate(self, parent1, parent2):
         """Given two parents, perform crossover to create children, and
@@ -1924,21 +4025,19 @@ class Population:
         # probability to see if each of the children will be mutated.
         m = np.random.rand(2) < self.prob_mutate_individual
 
+        # Check both children against the registry in one go.
+        existed = self.all_chromosomes.contains_many(
+            [ind.chromosome for ind in children])
+
         # Possibly mutate each child. If we're not mutating but their
-        # chromosome has already existed, force mutation.
-        for tf, ind in zip(m, children):
-            # While it may look like this if/else should be one
-            # if statement with an "or," the way it's written
-            # now avoids an extra call to _chrom_already_existed
-            # in some cases, which is good, because that can be
-            # expensive.
-            if tf:
-                # Perform the mutation.
+        # chromosome has already existed, force mutation. This keeps
+        # the logic simpler than excluding the child. Note that _mutate
+        # takes care of tracking the chromosome.
+        for tf, ex, ind in zip(m, existed, children):
+            if tf or ex:
                 self._mutate(ind=ind)
-            elif self._chrom_already_existed(ind.chromosome):
-                # Force mutation if this individual isn't unique.
-                # This keeps the logic simpler than excluding the
-                # child.
+            elif not self.all_chromosomes.add(ind.chromosome):
+                # This child is identical to its sibling.
                 self._mutate(ind=ind)
 
         return children
@@ -1969,11 +4068,18 @@ class Population:
     # Public methods
     ####################################################################
 
-    def initialize_population(self):
+    def initialize_population(self, seeds=None):
         """Initialize and the first generation. To keep methods simple
         and modular, evaluation will not occur.
 
         The population will be seeded with three individuals.
+
+        :param seeds: Optional iterable of chromosomes (np.ndarrays
+            with dtype np.bool) used to warm start the population,
+            ordered best first. Typically these come from calling
+            best_chromosomes on the Population from the previous
+            control interval, since consecutive intervals tend to have
+            similar optima. See _init_seed_individuals.
         """
         if len(self.population) > 0:
             raise ValueError('initialize_population should only be '
@@ -1996,11 +4102,16 @@ class Population:
         # We just added three individuals.
         i += 3
 
+        # Warm start.
+        if seeds is not None:
+            seeded = self._init_seed_individuals(seeds)
+            self.population.extend(seeded)
+            i += len(seeded)
+
         # Fill the rest of the population with randomly initialized
-        # individuals.
-        while i < self.population_size:
-            self.population.append(self._init_individual())
-            i += 1
+        # individuals, all drawn at once.
+        self.population.extend(
+            self._init_random_individuals(self.population_size - i))
 
         # All done.
 
@@ -2014,27 +4125,40 @@ class Population:
             raise ValueError('evaluate_population should only be '
                              'called when the population is full.')
 
-        # Throw an error if all of our processes aren't alive.
-        # Technically this can run if just one is alive, but that would
-        # cause the algorithm to run very slowly.
-        if not self.all_processes_alive:
+        # Throw an error if all of our processes aren't alive (and
+        # can't be respawned). Technically this can run if just one is
+        # alive, but that would cause the algorithm to run very slowly.
+        if not self.evaluator_pool.check_health():
             m = 'evaluate_population called, but not all processes are alive!'
             self.log.error(m)
             raise DeadProcessError(m)
 
         # Initialize list of indices for individuals we're evaluating.
         idx = []
+        # Count individuals evaluated via the fitness cache.
+        n_cached = 0
 
-        # Put all eligible individuals in the queue.
+        # Put all eligible individuals in the queue, unless we've
+        # already seen their chromosome and can pull their penalties
+        # straight from the cache.
         for i in range(self.population_size):
             if self.population[i].fitness is None:
-                # Put this individual in the queue.
-                self.input_queue.put(self.population[i])
+                if self._evaluate_from_cache(self.population[i]):
+                    n_cached += 1
+                    continue
+
                 # Track its index - we need to remove it from the
                 # population since we'll be retrieving the evaluated
                 # version later.
                 idx.append(i)
 
+        if n_cached > 0:
+            self.log.debug('{} individual(s) evaluated via the fitness '
+                           'cache.'.format(n_cached))
+
+        # Put the rest in the queue, in batches.
+        self.evaluator_pool.submit_many([self.population[i] for i in idx])
+
         # Start a thread to log progress.
         # TODO: are we okay with the consequences if this thread doesn't
         #   ever get properly shut down? I think so. Eventually the
@@ -2053,16 +4177,19 @@ class Population:
                             for i in range(self.population_size)
                             if i not in idx]
 
-        # For multiprocessing queues, there can be a slight delay. Avoid
-        # it by sleeping. This is probably unnecessary, but safety
-        # first.
-        time.sleep(0.05)
+        # Transfer the evaluated individuals into the population as
+        # they come back. The freshly evaluated individuals land at the
+        # end.
+        n_kept = len(self.population)
+        self._collect_into_population(len(idx))
 
-        # Wait for processing to finish.
-        self.input_queue.join()
+        # Store the new results in the cache, and train the surrogate.
+        self._update_cache(self.population[n_kept:])
+        self._update_surrogate(self.population[n_kept:])
 
-        # Transfer the evaluated individuals into the population.
-        self._dump_queue_into_population()
+        # Individuals evaluated via the cache are in the first part of
+        # the population, so just check everyone.
+        self._update_best(self.population)
 
         # Check to see if we were interrupted.
         if len(self.population) != self.population_size:
@@ -2072,13 +4199,345 @@ class Population:
 
         # All done.
 
+    def _evaluate_from_cache(self, ind):
+        """Helper used by evaluate_population to evaluate an individual
+        using the fitness_cache.
+
+        :param ind: Individual to evaluate.
+
+        :returns: True if the individual was found in the cache and has
+            been evaluated, False otherwise.
+        """
+        if self.fitness_cache is None:
+            return False
+
+        penalties = self.fitness_cache.get(chromosome=ind.chromosome,
+                                           fingerprint=self.fingerprint)
+
+        if penalties is None:
+            return False
+
+        ind.evaluate_from_cache(penalties)
+        return True
+
+    def _update_cache(self, individuals):
+        """Helper used by evaluate_population to put the simulation
+        penalties of freshly evaluated individuals into the
+        fitness_cache. Individuals whose evaluation failed are skipped.
+
+        :param individuals: Iterable of evaluated Individuals.
+        """
+        if self.fitness_cache is None:
+            return
+
+        for ind in individuals:
+            if ind.penalties is None:
+                continue
+
+            self.fitness_cache.put(chromosome=ind.chromosome,
+                                   fingerprint=self.fingerprint,
+                                   penalties=ind.penalties)
+
+    def _update_best(self, individuals):
+        """Helper to keep track of the best individual evaluated so
+        far.
+
+        :param individuals: Iterable of Individuals. Unevaluated
+            individuals are ignored.
+        """
+        for ind in individuals:
+            if ind.fitness is None:
+                continue
+
+            if (self._best is None) or (ind.fitness < self._best.fitness):
+                self._best = ind
+
+    def _update_surrogate(self, individuals):
+        """Helper used by evaluate_population to train the surrogate
+        with freshly evaluated individuals, and to record the accuracy
+        of any predictions which were made for them.
+
+        :param individuals: Iterable of evaluated Individuals.
+        """
+        if self.surrogate is None:
+            return
+
+        for ind in individuals:
+            predicted = self._predictions.pop(ind.uid, None)
+
+            # Skip failed evaluations.
+            if (ind.penalties is None) or (not np.isfinite(ind.fitness)):
+                continue
+
+            if predicted is not None:
+                self.surrogate.record(predicted=predicted,
+                                      actual=ind.fitness)
+
+            self.surrogate.add(
+                genes=self.layout.to_ints(ind.chromosome),
+                value=sum(v for k, v in ind.penalties.items()
+                          if k not in SWITCHING_PENALTIES))
+
+    def _screen_offspring(self, individuals, n):
+        """Helper used by crossover_and_mutate to keep the n most
+        promising individuals according to the surrogate. Switching
+        costs are computed exactly and added to the surrogate's
+        prediction of the simulation penalties.
+
+        :param individuals: List of unevaluated Individuals.
+        :param n: Number of individuals to keep.
+
+        :returns: List of the n Individuals with the best predicted
+            fitness, best first.
+        """
+        genes = self.layout.to_ints(np.array([ind.chromosome
+                                              for ind in individuals]))
+        predicted = self.surrogate.predict(genes)
+        predicted += np.array([sum(ind._compute_switching_costs())
+                               for ind in individuals])
+
+        keep = np.argsort(predicted, kind='stable')[0:n]
+
+        for i in keep:
+            self._predictions[individuals[i].uid] = float(predicted[i])
+
+        self.log.debug('Surrogate kept {} of {} offspring.'
+                       .format(len(keep), len(individuals)))
+
+        return [individuals[i] for i in keep]
+
+    def evaluate_steady_state(self, evaluations=None, deadline=None):
+        """Asynchronous, steady-state alternative to the generational
+        loop of evaluate_population, natural_selection, and
+        crossover_and_mutate.
+
+        Rather than waiting for every individual in a generation to be
+        evaluated (and leaving workers idle while the slowest GridLAB-D
+        runs finish), a new offspring is bred and submitted as soon as
+        a worker frees up. Parents are selected via tournament from the
+        pool of evaluated individuals. Each returned individual joins
+        the pool if the pool isn't full yet. Otherwise, it replaces the
+        worst individual in the pool if it's better.
+
+        Call initialize_population first. When this method returns,
+        self.population holds the final pool, all of which have been
+        evaluated.
+
+        :param evaluations: Total number of individuals to evaluate,
+            including the initial population. Individuals found in the
+            fitness_cache do not count against this budget. Defaults to
+            self.evaluations.
+        :param deadline: Optional wall-clock time (seconds since the
+            epoch, as from time.time()). New individuals will not be
+            submitted if the average time per evaluation so far
+            indicates they won't finish before the deadline.
+            Evaluations already in progress are still collected. If
+            the deadline stopped submission, self.out_of_time will be
+            True afterwards.
+
+        :returns: Number of evaluations performed. This may be less
+            than requested if graceful_shutdown was called or the
+            deadline was hit. Breeding also stops if it turns up
+            more cache hits than evaluations (i.e. the algorithm has
+            converged).
+
+        :raises DeadProcessError: if any evaluation process dies.
+        """
+        if evaluations is None:
+            evaluations = self.evaluations
+
+        if len(self.population) != self.population_size:
+            raise ValueError('evaluate_steady_state should only be '
+                             'called when the population is full.')
+
+        if not self.evaluator_pool.check_health():
+            m = ('evaluate_steady_state called, but not all processes are '
+                 'alive!')
+            self.log.error(m)
+            raise DeadProcessError(m)
+
+        # Split the population into the evaluated pool and those who
+        # still need evaluated.
+        pending = []
+        pool = []
+        for ind in self.population:
+            if (ind.fitness is None) and (not self._evaluate_from_cache(ind)):
+                pending.append(ind)
+            else:
+                pool.append(ind)
+
+        self._population = pool
+        self._update_best(pool)
+
+        # Submit the initial individuals.
+        submitted = 0
+        completed = 0
+        for ind in pending:
+            self.evaluator_pool.submit(ind)
+            submitted += 1
+
+        # Children are bred in pairs. Hang on to the extra.
+        children = []
+        n_jobs = len(self.processes)
+        t0 = t_log = time.time()
+        self._out_of_time = False
+        cache_hits = 0
+
+        while True:
+            # Stop breeding if another evaluation (which takes about
+            # n_jobs times the average time between completions) won't
+            # finish in time.
+            if (deadline is not None) and (completed > 0) \
+                    and (not self.out_of_time):
+                per_eval = (time.time() - t0) * n_jobs / completed
+                if time.time() + per_eval > deadline:
+                    self._steady_state_out_of_time(submitted)
+
+            # Keep the workers busy. Two evaluated individuals are
+            # needed to breed. Cache hits don't occupy a worker, so
+            # check for interruption and the deadline on every pass.
+            while ((submitted - completed < n_jobs)
+                   and (submitted < evaluations)
+                   and (cache_hits < evaluations)
+                   and (len(self.population) >= 2)
+                   and (not self.out_of_time)
+                   and (not self._shutdown_event.is_set())):
+                if (deadline is not None) and (time.time() >= deadline):
+                    self._steady_state_out_of_time(submitted)
+                    break
+
+                if len(children) == 0:
+                    children = list(self._breed_pair())
+
+                child = children.pop(0)
+
+                if self._evaluate_from_cache(child):
+                    cache_hits += 1
+                    self._insert_steady_state(child)
+                else:
+                    self.evaluator_pool.submit(child)
+                    submitted += 1
+
+            if completed >= submitted:
+                break
+
+            try:
+                ind = self.evaluator_pool.get(timeout=0.1)
+            except queue.Empty:
+                if self._shutdown_event.is_set():
+                    self.log.warning('Steady-state evaluation interrupted '
+                                     'after {} evaluations.'
+                                     .format(completed))
+                    break
+
+                if not self.evaluator_pool.check_health():
+                    m = 'An evaluation process died during steady-state ' \
+                        'evaluation!'
+                    self.log.error(m)
+                    raise DeadProcessError(m)
+
+                continue
+
+            completed += 1
+            self._update_cache([ind])
+            self._update_surrogate([ind])
+            self._insert_steady_state(ind)
+
+            if time.time() - t_log >= self.log_interval:
+                t_log = time.time()
+                self.log.info('{} of {} evaluations complete. Best fitness '
+                              'so far: {:.2f}.'
+                              .format(completed, evaluations,
+                                      min(i.fitness
+                                          for i in self.population)))
+
+        return completed
+
+    def _steady_state_out_of_time(self, submitted):
+        """Helper used by evaluate_steady_state to flag that no more
+        individuals should be submitted because of the deadline.
+
+        :param submitted: Number of individuals submitted so far.
+        """
+        self._out_of_time = True
+        self.log.info('Stopping steady-state evaluation after {} '
+                      'submissions to meet the deadline.'.format(submitted))
+
+    def _breed_pair(self):
+        """Helper used by evaluate_steady_state to create two new
+        (unevaluated) children from the current pool.
+
+        :returns: child1, child2
+        """
+        # The pool may not be full yet, so the tournament can't be
+        # larger than it.
+        parents = _tournament(population=self.population,
+                              tournament_size=min(self.tournament_size,
+                                                  len(self.population)),
+                              n=2)
+        parent1 = self.population[parents[0]]
+        parent2 = self.population[parents[1]]
+
+        if np.random.rand() < self.prob_crossover:
+            return self._crossover_and_mutate(parent1, parent2)
+        else:
+            return self._asexual_reproduction(parent1, parent2)
+
+    @utils.wait_for_lock
+    def _insert_steady_state(self, ind):
+        """Helper used by evaluate_steady_state to put an evaluated
+        individual into the pool. If the pool is full, the individual
+        replaces the worst member of the pool if it's better.
+
+        :param ind: Evaluated Individual.
+        """
+        self._update_best([ind])
+
+        if len(self._population) < self.population_size:
+            self._population.append(ind)
+            return
+
+        worst = max(range(len(self._population)),
+                    key=lambda i: self._population[i].fitness)
+
+        if ind.fitness < self._population[worst].fitness:
+            self._population[worst] = ind
+
+    def _collect_into_population(self, n):
+        """Helper used by evaluate_population to retrieve evaluated
+        individuals from the evaluator_pool and put them into the
+        population list.
+
+        :param n: Number of individuals to retrieve. Fewer will be
+            retrieved if graceful_shutdown is called.
+
+        :raises DeadProcessError: if an evaluation process dies and
+            can't be respawned.
+        """
+        collected = 0
+        while collected < n:
+            try:
+                ind = self.evaluator_pool.get(timeout=0.1)
+            except queue.Empty:
+                if self._shutdown_event.is_set():
+                    break
+
+                if not self.evaluator_pool.check_health():
+                    m = 'An evaluation process died during evaluation!'
+                    self.log.error(m)
+                    raise DeadProcessError(m)
+
+                continue
+
+            self._append_to_population(ind)
+            collected += 1
+
     @utils.wait_for_lock
-    def _dump_queue_into_population(self):
-        """Simple helper used by evaluate_population to put the contents
-        of the output_queue into the population list. This is put into a
-        helper function so it can be wrapped by wait_for_lock."""
-        self._population = utils.dump_queue(q=self.output_queue,
-                                            i=self._population)
+    def _append_to_population(self, ind):
+        """Simple helper to put an evaluated individual into the
+        population list. This is put into a helper function so it can
+        be wrapped by wait_for_lock."""
+        self._population.append(ind)
 
     def natural_selection(self):
         """Trim the population via both elitism and tournaments."""
@@ -2108,36 +4567,159 @@ class Population:
         # Done.
 
     def crossover_and_mutate(self):
-        """Replenish the population via crossover and mutation."""
-        # Initialize list to hold offspring.
-        offspring = []
-
-        while len(self.population) + len(offspring) < self.population_size:
-            # Get two parents from a tournament.
-            parent1, parent2 = self._get_two_parents()
-
-            # Perform crossover with some probability.
-            if np.random.rand() < self.prob_crossover:
-                # Call the _crossover_and_mutate helper.
-                children = self._crossover_and_mutate(parent1, parent2)
-            else:
-                # Get mutated versions of the parents.
-                children = self._asexual_reproduction(parent1, parent2)
-
-            # Add the children to the list of offspring.
-            offspring.extend(children)
+        """Replenish the population via crossover and mutation.
+
+        All offspring for the generation are bred at once: parents are
+        picked via vectorized tournaments, and crossover (by gene),
+        mutation, and range clamping are each applied to the whole
+        offspring matrix with NumPy. Pairs of parents which aren't
+        selected for crossover produce mutated clones (see
+        _asexual_reproduction for the one-at-a-time equivalent).
+        """
+        n_needed = self.population_size - len(self.population)
+        if n_needed <= 0:
+            return
 
-        # While this could waste some effort, we want to keep our
-        # population at the correct size to avoid any surprises. Call
-        # it infant mortality. Genetic algorithm joke, nice.
-        if len(self.population) + len(offspring) > self.population_size:
-            offspring = offspring[0:-1]
+        # If the surrogate is ready, breed extra offspring so we can
+        # keep only the most promising ones.
+        screen = (self.surrogate is not None) and self.surrogate.fit()
+        if screen:
+            n_bred = n_needed * self.surrogate_oversample
+        else:
+            n_bred = n_needed
+
+        layout = self.layout
+        n_pairs = math.ceil(n_bred / 2)
+
+        # Gene values for the current population.
+        ints = layout.to_ints(np.array([ind.chromosome
+                                        for ind in self.population]))
+
+        # Pick two parents for each pair via tournaments.
+        fitness = np.array([ind.fitness for ind in self.population],
+                           dtype=float)
+        parents = _tournaments(fitness=fitness,
+                               tournament_size=self.tournament_size,
+                               n_tournaments=n_pairs, n=2)
+        p1 = ints[parents[:, 0]]
+        p2 = ints[parents[:, 1]]
+
+        # Crossover by gene for the pairs selected for crossover. The
+        # others keep the parents' genes unchanged.
+        crossover = np.random.rand(n_pairs) < self.prob_crossover
+        gene_mask = (np.random.randint(low=0, high=2,
+                                       size=(n_pairs, layout.num_genes),
+                                       dtype=np.bool)
+                     | ~crossover[:, np.newaxis])
+        children = np.concatenate((np.where(gene_mask, p1, p2),
+                                   np.where(gene_mask, p2, p1)))
+        chroms = layout.to_bits(children)
+
+        # Crossover children are mutated with some probability, while
+        # clones are always mutated so they differ from their parent.
+        mutate = np.concatenate((crossover, crossover))
+        mutate[mutate] = (np.random.rand(np.count_nonzero(mutate))
+                          < self.prob_mutate_individual)
+        mutate |= ~np.concatenate((crossover, crossover))
+        self._mutate_rows(chroms, mutate)
+
+        # Force mutation of any offspring which have already existed
+        # (or which are duplicated within this batch), and register
+        # the rest.
+        chroms = self._make_unique(chroms, redraw=self._mutate_rows)
+        self._forced_mutation_share = self._last_n_forced / chroms.shape[0]
+
+        # Infant mortality: we may have produced one child too many.
+        # Genetic algorithm joke, nice.
+        chroms = chroms[0:n_bred]
+        offspring = [Individual(uid=next(self.uid_counter),
+                                chrom_override=c.copy(), **self.ind_init)
+                     for c in chroms]
+
+        # More infant mortality, courtesy of the surrogate.
+        if screen:
+            offspring = self._screen_offspring(offspring, n_needed)
 
         # Merge the offspring into the population.
+        self.all_chromosomes.add_many(np.array([ind.chromosome
+                                                for ind in offspring]))
         self._population.extend(offspring)
 
         # All done.
 
+    def _mutate_rows(self, chroms, rows):
+        """Helper to perform bit-flip mutation on the given rows of a
+        2D array of chromosomes in place, and then clamp each gene to
+        its valid range.
+
+        :param chroms: 2D boolean array, one chromosome per row.
+        :param rows: Boolean array indicating which rows to mutate.
+        """
+        n = np.count_nonzero(rows)
+        if n == 0:
+            return
+
+        flip = (np.random.random_sample(size=(n, self.layout.chrom_len))
+                <= self.prob_mutate_bit)
+        mutated = chroms[rows] ^ flip
+        chroms[rows] = self.layout.to_bits(
+            self.layout.clip(self.layout.to_ints(mutated)))
+
+    def _random_rows(self, chroms, rows):
+        """Helper to replace the given rows of a 2D array of
+        chromosomes with new random (valid) chromosomes, in place.
+        """
+        n = np.count_nonzero(rows)
+        if n == 0:
+            return
+
+        chroms[rows] = self.layout.to_bits(
+            np.random.randint(self.layout.low, self.layout.high + 1,
+                              size=(n, self.layout.num_genes)))
+
+    def _make_unique(self, chroms, redraw, max_attempts=100):
+        """Helper to ensure none of the given chromosomes have already
+        existed and that there are no duplicates among them.
+
+        :param chroms: 2D boolean array, one chromosome per row. Will
+            be modified in place.
+        :param redraw: Function with signature redraw(chroms, rows),
+            used to modify the offending rows. E.g. _mutate_rows or
+            _random_rows.
+        :param max_attempts: Number of calls to redraw before giving
+            up.
+
+        :returns: chroms
+
+        :raises ChromosomeAlreadyExistedError: if max_attempts is
+            exceeded.
+        """
+        # Track which rows needed to be redrawn.
+        forced = np.zeros(chroms.shape[0], dtype=bool)
+
+        for _ in range(max_attempts):
+            # Rows which have already existed.
+            bad = self.all_chromosomes.contains_many(chroms)
+
+            # Rows which duplicate an earlier row.
+            _, first = np.unique(_pack_chromosome(chroms), axis=0,
+                                 return_index=True)
+            dup = np.ones(chroms.shape[0], dtype=bool)
+            dup[first] = False
+            bad |= dup
+
+            if not bad.any():
+                self._last_n_forced = int(np.count_nonzero(forced))
+                return chroms
+
+            forced |= bad
+            redraw(chroms, bad)
+
+        raise ChromosomeAlreadyExistedError(
+            'After {} attempts, we failed to create {} chromosome(s) which '
+            'had not already existed.'.format(max_attempts,
+                                              chroms.shape[0]))
+
     def sort_population(self):
         """Helper to sort the population in place. After this method
         is called, the individual with the lowest fitness (the best)
@@ -2169,20 +4751,25 @@ class Population:
 
         Check the all_processes_dead attribute to ensure everything's
         been killed.
+
+        If an evaluator_pool was given at initialization, its
+        outstanding work is cancelled, but its processes are left
+        running for reuse.
         """
         self.log.info('Gracefully stopping genetic algorithm evaluation.')
 
-        # Drain the input queue. This will prevent any further
-        # individuals from being evaluated.
-        utils.drain_queue(self.input_queue)
+        # Signal any running evaluation loops to stop.
+        self._shutdown_event.set()
 
-        # Drain the output queue. This will prevent extra work from
-        # being done later.
-        utils.drain_queue(self.output_queue)
+        if not self._own_pool:
+            # Drop any remaining work, but leave the pool running.
+            self.evaluator_pool.cancel()
+            self.log.debug('Outstanding evaluations have been cancelled.')
+            return None
 
-        # Send in the shutdown signal to all the processes.
-        for _ in range(len(self.processes)):
-            self.input_queue.put_nowait(None)
+        # Drain the queues, and send in the shutdown signal to all the
+        # processes.
+        self.evaluator_pool.shutdown()
 
         # Log.
         self.log.debug(
@@ -2194,22 +4781,14 @@ class Population:
         return None
 
     def forceful_shutdown(self):
-        """This is a bit tricky due to (probably) bad design. We have
-        each process attached to a target, in this case that target is
-        _evaluate_worker. During the course of running, the process
-        opens up a subprocess to run GridLAB-D. Currently, that's done
-        with subprocess.run, which doesn't allow us to kill the
-        running subprocess. I'm concerned that if we just send the
-        terminate or kill signal to the process, the GridLAB-D process
-        will either keep running or die in a way that causes issues
-        (like bad stuff with MySQL). In the former case (GLD keeps
-        running), the forceful shutdown is practically pointless. Sure,
-        it'll save some queries to the database during evaluation, but
-        that's not where the heavy lifting is. In the latter case (the
-        GLD process is forcefully stopped), we could totally hose
-        things. So, until there's a compelling reason to implement a
-        forceful shutdown, let's call it good with the graceful
-        shutdown.
+        """Not implemented, since there's no need to terminate the
+        evaluation processes themselves. To stop evaluations which are
+        in progress, call cancel on the evaluator_pool (graceful_shutdown
+        already does this for a shared pool). Each worker then kills
+        the process group of its running GridLAB-D instance (see
+        utils.run_gld_async), and moves on to its next task. Killing
+        the worker processes instead could leave GridLAB-D running, and
+        a shared pool would have to be respawned.
         """
         raise NotImplementedError
 
@@ -2224,13 +4803,10 @@ class Population:
 
         :returns: None
         """
-        for p in self.processes:
-            p.join(timeout=timeout)
-
-            if p.exitcode is None:
-                # Process has not terminated.
-                raise TimeoutError('Process did not terminate within {} '
-                                   'seconds.'.format(timeout))
+        # A shared evaluator_pool isn't shut down, so there's nothing
+        # to wait for.
+        if self._own_pool:
+            self.evaluator_pool.wait(timeout=timeout)
 
         # All done.
         return None
@@ -2285,6 +4861,35 @@ def _tournament(population, tournament_size, n):
     return [challenger_indices[sort_idx[i]] for i in range(n)]
 
 
+def _tournaments(fitness, tournament_size, n_tournaments, n):
+    """Vectorized tournament selection: run many independent
+    tournaments at once.
+
+    :param fitness: Array of fitness values for the population.
+    :param tournament_size: Integer indicating how many individuals
+        participate in each tournament. Participants in a single
+        tournament are drawn without replacement.
+    :param n_tournaments: Number of tournaments to run.
+    :param n: Integer. Top n individuals from each tournament will be
+        returned.
+
+    :returns: Array of indices into the population with shape
+        (n_tournaments, n). Each row is ordered by fitness, so
+        fitness[out[i, 0]] is the winner of tournament i.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+
+    # The tournament_size smallest of a row of uniform random keys is a
+    # uniform draw without replacement.
+    keys = np.random.random_sample(size=(n_tournaments, fitness.shape[0]))
+    challengers = np.argpartition(keys, tournament_size - 1,
+                                  axis=1)[:, 0:tournament_size]
+
+    # Sort each tournament by fitness and keep the top n.
+    order = np.argsort(fitness[challengers], axis=1, kind='stable')[:, 0:n]
+    return np.take_along_axis(challengers, order, axis=1)
+
+
 def _update_equipment_with_individual(ind, regs, caps):
     """Given an individual, update the states of equipment.
 
@@ -2393,12 +4998,158 @@ def _clear_and_set_event(method):
     return wrapper
 
 
+class StoppingCriterion(ABC):
+    """Base class for criteria used to stop the genetic algorithm
+    before all CONFIG['ga']['generations'] have run.
+
+    GA calls reset at the beginning of each run, then check after
+    each generation has been evaluated. Subclasses must implement
+    check, and override reset if they hold state between generations.
+    """
+
+    def reset(self):
+        """Clear any state from a previous run."""
+        pass
+
+    @abstractmethod
+    def check(self, population):
+        """Check whether the algorithm should stop.
+
+        :param population: Population object, which has been fully
+            evaluated.
+
+        :returns: None if the algorithm should continue, otherwise a
+            string describing why it should stop.
+        """
+        pass
+
+
+class StagnationCriterion(StoppingCriterion):
+    """Stop if the best fitness hasn't improved for a number of
+    consecutive generations."""
+
+    def __init__(self, generations, tolerance=0.0):
+        """
+        :param generations: Number of consecutive generations without
+            improvement after which to stop.
+        :param tolerance: Improvements no larger than this don't count.
+        """
+        if not isinstance(generations, int):
+            raise TypeError('generations must be an integer.')
+
+        if generations < 1:
+            raise ValueError('generations must be at least 1.')
+
+        self.generations = generations
+        self.tolerance = tolerance
+        self._best = None
+        self._count = 0
+
+    def reset(self):
+        self._best = None
+        self._count = 0
+
+    def check(self, population):
+        fitness = population.best.fitness
+
+        if (self._best is None) or (fitness < self._best - self.tolerance):
+            self._best = fitness
+            self._count = 0
+            return None
+
+        self._count += 1
+
+        if self._count >= self.generations:
+            return ('Best fitness of {:.2f} has not improved in {} '
+                    'generation(s).'.format(self._best, self._count))
+
+        return None
+
+
+class VarianceCriterion(StoppingCriterion):
+    """Stop if the variance of the fitness across the population falls
+    below a threshold, indicating the population has converged. Failed
+    evaluations (infinite fitness) are ignored."""
+
+    def __init__(self, threshold):
+        """
+        :param threshold: Stop when the variance is below this.
+        """
+        self.threshold = threshold
+
+    def check(self, population):
+        fitness = np.array([ind.fitness for ind in population.population],
+                           dtype=float)
+        fitness = fitness[np.isfinite(fitness)]
+
+        if fitness.shape[0] < 2:
+            return None
+
+        var = np.var(fitness)
+
+        if var < self.threshold:
+            return ('Population fitness variance of {:.4g} is below {:.4g}.'
+                    .format(var, self.threshold))
+
+        return None
+
+
+class ForcedMutationCriterion(StoppingCriterion):
+    """Stop if too many offspring have to be force-mutated because
+    they duplicate a chromosome which has already existed, indicating
+    the search space around the population is exhausted. See
+    Population.forced_mutation_share."""
+
+    def __init__(self, share):
+        """
+        :param share: Stop when the share of forced mutations exceeds
+            this (0 to 1).
+        """
+        self.share = share
+
+    def check(self, population):
+        share = population.forced_mutation_share
+
+        if (share is not None) and (share > self.share):
+            return ('{:.0%} of offspring were force-mutated duplicates, '
+                    'exceeding {:.0%}.'.format(share, self.share))
+
+        return None
+
+
+def stopping_criteria_from_config():
+    """Build the list of StoppingCriterion objects described by
+    CONFIG['ga']['stopping_criteria']. Criteria whose settings are
+    null are disabled.
+
+    :returns: List of StoppingCriterion objects.
+    """
+    config = CONFIG['ga']['stopping_criteria']
+    out = []
+
+    if config['stagnation']['generations'] is not None:
+        out.append(StagnationCriterion(
+            generations=config['stagnation']['generations'],
+            tolerance=config['stagnation']['tolerance']))
+
+    if config['variance']['threshold'] is not None:
+        out.append(VarianceCriterion(
+            threshold=config['variance']['threshold']))
+
+    if config['forced_mutation']['share'] is not None:
+        out.append(ForcedMutationCriterion(
+            share=config['forced_mutation']['share']))
+
+    return out
+
+
 class GA:
     """Class for managing the genetic algorithm. Use the "run" and
     "stop" methods to start/stop the algorithm."""
 
     def __init__(self, regulators, capacitors, starttime, stoptime,
-                 stop_timeout=120.0):
+                 stop_timeout=120.0, fitness_cache=None, surrogate=None,
+                 deadline=None, stopping_criteria=None, evaluator_pool=None):
         """
         :param regulators: dictionary as returned by
             equipment.initialize_regulators. Since the states of
@@ -2415,6 +5166,32 @@ class GA:
         :param stop_timeout: Timeout (seconds) for waiting on the
             algorithm to stop after the "stop" method is called. If this
             timeout is exceeded, future calls to "run" will do nothing.
+        :param fitness_cache: Optional FitnessCache object, which is
+            passed along to the Population. Reuse the same cache for
+            successive GA objects to avoid re-running GridLAB-D for
+            chromosomes which have already been evaluated against an
+            unchanged model.
+        :param surrogate: Optional Surrogate object, which is passed
+            along to the Population. Like the fitness_cache, reuse the
+            same object for successive GA objects so that it keeps
+            learning.
+        :param deadline: Optional wall-clock time (seconds since the
+            epoch, as from time.time()) by which the algorithm should
+            finish. Generations (or, in steady-state mode, evaluations)
+            which are not expected to finish in time are skipped. If
+            the algorithm is still running when the deadline passes,
+            it gets stopped, and best_so_far can be used to get
+            results.
+        :param stopping_criteria: Optional list of StoppingCriterion
+            objects, checked after each generation. The algorithm
+            stops as soon as any of them is met. Defaults to the
+            criteria given by CONFIG['ga']['stopping_criteria'] (see
+            stopping_criteria_from_config). Only used in generational
+            mode.
+        :param evaluator_pool: Optional EvaluatorPool, which is passed
+            along to the Population. Reuse the same pool for successive
+            GA objects to avoid starting new processes (and the
+            database connections that come with them) for every run.
         """
         # Set up logging.
         self.log = logging.getLogger(__class__.__name__)
@@ -2426,6 +5203,44 @@ class GA:
         self._starttime = starttime
         self._stoptime = stoptime
         self.stop_timeout = stop_timeout
+        self._fitness_cache = fitness_cache
+        self._surrogate = surrogate
+
+        if (evaluator_pool is not None) and \
+                (not isinstance(evaluator_pool, EvaluatorPool)):
+            raise TypeError('evaluator_pool must be None or an '
+                            'EvaluatorPool.')
+
+        self._evaluator_pool = evaluator_pool
+
+        if (deadline is not None) and (not isinstance(deadline,
+                                                      (int, float))):
+            raise TypeError('deadline must be None or a number.')
+
+        self._deadline = deadline
+
+        # Timer used to stop the algorithm if the deadline passes.
+        self._deadline_timer = None
+
+        if stopping_criteria is None:
+            stopping_criteria = stopping_criteria_from_config()
+
+        for c in stopping_criteria:
+            if not isinstance(c, StoppingCriterion):
+                raise TypeError('stopping_criteria must be a list of '
+                                'StoppingCriterion objects.')
+
+        self._stopping_criteria = stopping_criteria
+
+        # Why the last run finished.
+        self._stop_reason = None
+
+        # Flag for whether the last run was interrupted.
+        self._interrupted = False
+
+        # Flag for whether the last run was stopped by the deadline
+        # (as opposed to some other call to "stop").
+        self._deadline_hit = False
 
         # Initialize attribute which will be replaced with a Population
         # object once the algorithm is running.
@@ -2473,6 +5288,58 @@ class GA:
         details, see the docstring for prep_glm_mgr."""
         return self._stoptime
 
+    @property
+    def fitness_cache(self):
+        """FitnessCache object, or None if caching is not in use."""
+        return self._fitness_cache
+
+    @property
+    def surrogate(self):
+        """Surrogate object, or None if pre-screening is not in use."""
+        return self._surrogate
+
+    @property
+    def evaluator_pool(self):
+        """EvaluatorPool object, or None if each run starts its own
+        processes."""
+        return self._evaluator_pool
+
+    @property
+    def deadline(self):
+        """Wall-clock time (seconds since the epoch) by which the
+        algorithm should finish, or None."""
+        return self._deadline
+
+    @property
+    def stopping_criteria(self):
+        """List of StoppingCriterion objects."""
+        return self._stopping_criteria
+
+    @property
+    def stop_reason(self):
+        """String describing why the last run finished (e.g. all
+        generations completed, a stopping criterion was met, the
+        deadline, or interruption). None if the algorithm has not
+        finished a run."""
+        return self._stop_reason
+
+    @property
+    def interrupted(self):
+        """True if the last run was interrupted (e.g. by "stop" or
+        hitting the deadline) before it could update self.regulators
+        and self.capacitors. If it was interrupted by the deadline
+        (see deadline_hit), best_so_far can be used instead."""
+        return self._interrupted
+
+    @property
+    def deadline_hit(self):
+        """True if the last run was stopped because the deadline
+        passed. Unlike other interruptions (e.g. a GAStopper stopping
+        the algorithm after a switch changes state), the results are
+        still valid, so best_so_far can be used.
+        """
+        return self._deadline_hit
+
     @property
     def population(self):
         """ga.Population object, or None if the algorithm has not yet
@@ -2499,7 +5366,7 @@ class GA:
         """
         return self._run_event
 
-    def run(self, glm_mgr):
+    def run(self, glm_mgr, seeds=None):
         """Run the genetic algorithm. This runs the algorithm in a
         thread for easy interruption. It will return before the genetic
         algorithm is complete (as soon as the thread is started).
@@ -2522,20 +5389,49 @@ class GA:
             should just be the raw model from the platform. Since the
             states of these objects will be altered after the algorithm
             has run, a deepcopy will be made.
+        :param seeds: Optional chromosomes to warm start the population
+            with. This can be a GA object or Population object from a
+            previous run (in which case its best chromosomes are used),
+            or an iterable of chromosomes ordered best first. See
+            Population.initialize_population.
         """
         # Copy the GLMManager.
         mgr_copy = copy.deepcopy(glm_mgr)
 
+        # Reset before the thread (and deadline timer) start.
+        self._deadline_hit = False
+
+        # Extract chromosomes from a previous run, if given one.
+        if seeds is not None:
+            if isinstance(seeds, GA):
+                seeds = seeds.population
+
+            if isinstance(seeds, Population):
+                seeds = seeds.best_chromosomes(
+                    k=CONFIG['ga']['warm_start']['top_k'])
+
         # Create and start thread.
         self._run_thread = threading.Thread(target=self._run,
-                                            kwargs={'glm_mgr': mgr_copy})
+                                            kwargs={'glm_mgr': mgr_copy,
+                                                    'seeds': seeds})
         self._run_thread.start()
 
+        # Stop the algorithm if it's still running at the deadline.
+        if self.deadline is not None:
+            if self._deadline_timer is not None:
+                self._deadline_timer.cancel()
+
+            self._deadline_timer = threading.Timer(
+                interval=max(0.0, self.deadline - time.time()),
+                function=self._deadline_expired)
+            self._deadline_timer.daemon = True
+            self._deadline_timer.start()
+
         # That's it!
         return None
 
     @_clear_and_set_event
-    def _run(self, glm_mgr):
+    def _run(self, glm_mgr, seeds=None):
         """Private method for running the genetic algorithm. Don't ever
         use this directly, use the public "run" method instead.
 
@@ -2556,46 +5452,49 @@ class GA:
         :param glm_mgr: glm.GLMManager object. The model will be updated
             via this modules 'prep_glm_mgr' function, so this object
             should just be the raw model from the platform.
+        :param seeds: None, or iterable of chromosomes passed along to
+            Population.initialize_population.
 
         :returns: None
         """
         # We'll time the algorithm runtime.
         t0 = time.time()
+        self._interrupted = False
+        self._stop_reason = None
 
         # Initialize the Population object.
         self._population = Population(regulators=self.regulators,
                                       capacitors=self.capacitors,
                                       glm_mgr=glm_mgr,
                                       starttime=self.starttime,
-                                      stoptime=self.stoptime)
+                                      stoptime=self.stoptime,
+                                      fitness_cache=self.fitness_cache,
+                                      surrogate=self.surrogate,
+                                      evaluator_pool=self.evaluator_pool)
 
         try:
             # Fill the population with individuals.
-            self._run_if_set(self.population.initialize_population)
+            self._run_if_set(self.population.initialize_population,
+                             seeds=seeds)
             self.log.debug('Population initialized.')
 
-            # Evaluate each individual. This will take some time.
-            self._run_if_set(self.population.evaluate_population)
-            self.log.debug('Initial population evaluation complete.')
-
-            # Loop over the generations to perform natural selection,
-            # crossover, and mutation.
-            g = 1
-            while g <= CONFIG['ga']['generations']:
-                self._run_if_set(self.population.natural_selection)
-                self.log.debug('Natural selection for generation {} complete.'
-                               .format(g))
-                # The best individual will always be in position 0 after
-                # natural selection.
-                self._run_if_set(self._log_best_each_gen, g)
-
-                self._run_if_set(self.population.crossover_and_mutate)
-                self.log.debug('Crossover and mutation for generation {} '
-                               'complete.'.format(g))
-                self._run_if_set(self.population.evaluate_population)
-                self.log.debug('Population evaluation for new individuals '
-                               'for generation {} complete.'.format(g))
-                g += 1
+            if self.population.mode == 'steady_state':
+                # Evaluate, breed, and select asynchronously until the
+                # evaluation budget is spent.
+                n = self._run_if_set(self.population.evaluate_steady_state,
+                                     deadline=self.deadline)
+                if self.population.out_of_time:
+                    self._stop_reason = ('Completed {} steady-state '
+                                         'evaluations before stopping to '
+                                         'meet the deadline.'.format(n))
+                else:
+                    self._stop_reason = ('Completed {} steady-state '
+                                         'evaluations.'.format(n))
+                self.log.debug('Steady-state evaluation complete.')
+            else:
+                self._run_generations()
+
+            self.log.info(self.stop_reason)
 
             # Shut down the population processes. Putting this in a
             # _run_if_set call so that we don't incidentally call this
@@ -2625,6 +5524,11 @@ class GA:
             # method. In that case, we do not need to shut down the
             # population processes.
             self.log.debug('Caught GAInterruptedError, returning.')
+            self._interrupted = True
+            if self.deadline_hit:
+                self._stop_reason = 'Interrupted by the deadline.'
+            else:
+                self._stop_reason = 'Interrupted.'
             # Time to bounce.
             return None
         else:
@@ -2636,6 +5540,85 @@ class GA:
             # updated.
             return None
 
+    def _run_generations(self):
+        """Helper for _run which performs the generational version of
+        the algorithm: evaluate the initial population, then loop over
+        the generations to perform natural selection, crossover, and
+        mutation.
+
+        Like _run, this makes extensive use of _run_if_set, and thus
+        may raise a GAInterruptedError.
+
+        self._stop_reason is set when the loop ends.
+        """
+        for c in self.stopping_criteria:
+            c.reset()
+
+        # Evaluate each individual. This will take some time.
+        t = time.time()
+        self._run_if_set(self.population.evaluate_population)
+        self.log.debug('Initial population evaluation complete.')
+
+        # The initial evaluation is used as a (pessimistic) estimate
+        # of how long each generation will take, since later
+        # generations only evaluate part of the population.
+        gen_time = time.time() - t
+
+        # Loop over the generations to perform natural selection,
+        # crossover, and mutation.
+        g = 1
+        while g <= CONFIG['ga']['generations']:
+            # Don't start a generation we don't expect to finish.
+            if (self.deadline is not None) \
+                    and (time.time() + gen_time > self.deadline):
+                self._stop_reason = ('Skipped the remaining {} generation(s) '
+                                     'to meet the deadline.'
+                                     .format(CONFIG['ga']['generations']
+                                             - g + 1))
+                return
+
+            t = time.time()
+            self._run_if_set(self.population.natural_selection)
+            self.log.debug('Natural selection for generation {} complete.'
+                           .format(g))
+            # The best individual will always be in position 0 after
+            # natural selection.
+            self._run_if_set(self._log_best_each_gen, g)
+
+            self._run_if_set(self.population.crossover_and_mutate)
+            self.log.debug('Crossover and mutation for generation {} '
+                           'complete.'.format(g))
+            self._run_if_set(self.population.evaluate_population)
+            self.log.debug('Population evaluation for new individuals '
+                           'for generation {} complete.'.format(g))
+            gen_time = max(gen_time, time.time() - t)
+
+            # Stop early if we've converged.
+            reason = self._run_if_set(self._check_stopping_criteria)
+            if reason is not None:
+                self._stop_reason = ('Stopped after generation {}: {}'
+                                     .format(g, reason))
+                return
+
+            g += 1
+
+        self._stop_reason = ('Completed all {} generations.'
+                             .format(CONFIG['ga']['generations']))
+
+    def _check_stopping_criteria(self):
+        """Helper for _run_generations to check each of the
+        stopping_criteria.
+
+        :returns: None if the algorithm should continue, otherwise the
+            reason given by the first criterion which was met.
+        """
+        for c in self.stopping_criteria:
+            reason = c.check(self.population)
+            if reason is not None:
+                return reason
+
+        return None
+
     def _run_if_set(self, func, *args, **kwargs):
         """Helper to run a function if self.run_event.is_set() returns
         True. This method should only be called from within the _run
@@ -2710,6 +5693,46 @@ class GA:
         # All done.
         return None
 
+    def _deadline_expired(self):
+        """Helper used by "run" to stop the algorithm once the deadline
+        has passed.
+        """
+        if self.running:
+            self.log.warning('The deadline passed before the genetic '
+                             'algorithm finished. Stopping.')
+            self._deadline_hit = True
+            self.stop()
+
+    def best_so_far(self):
+        """Update self.regulators and self.capacitors with the settings
+        from the best individual evaluated so far. This can be called
+        while the algorithm is running or after it was interrupted, so
+        that some result is available even if the algorithm didn't
+        finish.
+
+        :returns: The best Individual evaluated so far, or None if no
+            individuals have been evaluated (in which case the
+            equipment is not updated).
+        """
+        if self.population is None:
+            return None
+
+        best = self.population.best
+
+        if best is None:
+            self.log.warning('best_so_far called, but no individuals have '
+                             'been evaluated.')
+            return None
+
+        _update_equipment_with_individual(ind=best, regs=self.regulators,
+                                          caps=self.capacitors)
+
+        self.log.info('Equipment updated with settings from the best '
+                      'individual so far: {} with fitness {:.2f}.'
+                      .format(best.uid, best.fitness))
+
+        return best
+
     def _set_run_event_after_run(self):
         """Helper used by "stop" to set the _run_event after the _run
         method finishes (as signaled by setting _not_running_event).
@@ -33,8 +33,15 @@ for the Government, including the right to distribute to other
 Government contractors.
 """
 
+import io
+import os
 import re
+import sys
+import hashlib
+import pickle
+import tempfile
 import warnings
+from contextlib import contextmanager
 from functools import reduce
 from datetime import datetime
 import logging
@@ -60,6 +67,12 @@ GEN_CLASSES = ['inverter', 'battery', 'diesel_dg', 'dc_dc_converter',
                'energy_storage', 'microturbine', 'power_electronics',
                'rectifier', 'solar', 'windturb_dg']
 
+# Extension and format version for files written by
+# GLMManager.save_cache. Bump the version if the format of the
+# GLMManager's attributes changes, so stale cache files are not used.
+CACHE_EXT = '.glm.pkl'
+CACHE_VERSION = 3
+
 # List of valid phases for objects (not including the neutral.
 PHASES = ('A', 'B', 'C')
 
@@ -79,18 +92,194 @@ TRIPLEX_PARAMS = \
      ]
 
 
+# Regular expression used by _scan_glm. Splits a GLM into the same
+# tokens as _tokenize_glm: braces, semicolons, newlines, runs of other
+# non-whitespace characters, and any whitespace characters other than
+# spaces and tabs (which _tokenize_glm keeps as tokens).
+SCAN_RE = re.compile(r'[;{}\n]|[^;{}\s]+|[^\S \t\n]')
+
+# Tokens which end a "full token" while parsing. Note that 'shape'
+# tokens aren't handled by _parse_tokens_fast.
+FULL_TOKEN_ENDS = frozenset(('{', ';', '}', '\n'))
+
+
 def parse(input_str, file_path=True):
     """
     Parse a GLM into an omf.feeder tree. This is so we can walk the tree,
     change things in bulk, etc.
 
     Input can be a file path or GLM string.
+
+    The model is first parsed with the single-pass _parse_tokens_fast.
+    Syntax it does not handle (e.g. ${...} macros, shapes, schedules
+    ending in '}') falls back to _parse_token_list, which produces the
+    same tree.
     """
+    if file_path:
+        with open(input_str, 'r') as glm_file:
+            data = glm_file.read()
+    else:
+        data = input_str
+
+    tokens = _scan_glm(data)
+
+    if tokens is None:
+        # Use the original tokenizer.
+        tokens = _tokenize_glm(data, file_path=False)
+    else:
+        try:
+            return _parse_tokens_fast(tokens)
+        except _FallbackError:
+            pass
 
-    tokens = _tokenize_glm(input_str, file_path)
     return _parse_token_list(tokens)
 
 
+def _scan_glm(data):
+    """Turn a GLM string into the same list of tokens as _tokenize_glm
+    using a single compiled regular expression. Returns None if the
+    string contains ${...} macros, which should be tokenized by
+    _tokenize_glm.
+    """
+    if '${' in data:
+        return None
+
+    # Same clean up as _tokenize_glm, but skip work where possible.
+    if 'http://' in data:
+        data = data.replace('http://', '')
+    if '//' in data:
+        data = re.sub(r'\/\/.*(\s*)', '', data)
+    if '\r' in data:
+        data = data.replace('\r', '')
+
+    return SCAN_RE.findall(data)
+
+
+class _FallbackError(Exception):
+    """Raised by _parse_tokens_fast for token lists it does not handle."""
+    pass
+
+
+def _parse_tokens_fast(token_list):
+    """Single-pass version of _parse_token_list.
+
+    Rather than walking from the root of the tree for every property,
+    an explicit stack of the item dictionaries being built is kept.
+    Raises _FallbackError for anything which _parse_token_list handles
+    specially (shapes, schedules) or would raise an exception for, in
+    which case the caller should use _parse_token_list instead.
+    """
+    tree = {}
+    guid = 0
+    # Stack of dictionaries for the items currently being parsed.
+    stack = []
+    # Dictionary properties are currently added to.
+    current = tree
+    full_token = []
+    ends = FULL_TOKEN_ENDS
+
+    for token in token_list:
+        full_token.append(token)
+        if token not in ends:
+            if token == 'shape':
+                raise _FallbackError
+            continue
+
+        # We have a full token. Start the next one, and work with this
+        # one.
+        ft = full_token
+        full_token = []
+        n = len(ft)
+
+        if n == 1:
+            if token == '}':
+                # Close out the item.
+                if not stack:
+                    raise _FallbackError
+                stack.pop()
+                current = stack[-1] if stack else tree
+            elif token == '{':
+                # Anonymous item.
+                if guid in current:
+                    raise _FallbackError
+                current[guid] = new = {}
+                stack.append(new)
+                current = new
+                guid += 1
+            # Otherwise, a lone ';' or '\n', nothing to do.
+            continue
+
+        first = ft[0]
+        if n == 2 and (token != '{' or first == '#set'
+                       or first == '#include'):
+            # The value would be empty, which _parse_token_list chokes
+            # on (or ignores, for things like 'value }').
+            raise _FallbackError
+
+        if first == '#set' or first == '#include':
+            if token == ';':
+                tree[guid] = {'omftype': first,
+                              'argument': ' '.join(ft[1:-1])}
+            else:
+                tree[guid] = {first: ' '.join(ft[1:-1])}
+            guid += 1
+        elif len(stack) == 1 and 'class' in stack[0]:
+            # Simple class properties, see _parse_token_list.
+            if n != 3 or token != ';':
+                raise _FallbackError
+            entry = stack[0]
+            try:
+                entry['variable_types'].append(first)
+            except KeyError:
+                entry['variable_types'] = [first]
+
+            try:
+                entry['variable_names'].append(ft[1])
+            except KeyError:
+                entry['variable_names'] = [ft[1]]
+        elif token == '{':
+            # New item definition.
+            if guid in current:
+                raise _FallbackError
+            current[guid] = new = {}
+            stack.append(new)
+            current = new
+            guid += 1
+
+            if n < 4:
+                new[first] = ft[-2]
+            elif n == 4:
+                # Embedded/nested object.
+                new['omfEmbeddedConfigObject'] = \
+                    first + ' ' + ft[1] + ' ' + ft[2]
+            else:
+                # Malformed, let _parse_token_list raise.
+                raise _FallbackError
+        elif token == ';' or token == '\n':
+            if not stack:
+                # Zero-attribute items like module.
+                tree[guid] = {'omftype': first,
+                              'argument': ' '.join(ft[1:-1])}
+                guid += 1
+            elif first in current:
+                # Duplicate property, let _parse_token_list raise.
+                raise _FallbackError
+            else:
+                current[first] = ' '.join(ft[1:-1])
+        elif first == 'schedule':
+            raise _FallbackError
+        # Anything else (e.g. 'name value }') is ignored, as in
+        # _parse_token_list.
+
+    if full_token:
+        # Trailing partial token.
+        raise _FallbackError
+
+    _fix_old_syntax(tree)
+
+    return tree
+
+
 # noinspection RegExpRedundantEscape
 def _tokenize_glm(input_str, file_path=True):
     """ Turn a GLM file/string into a linked list of tokens.
@@ -346,36 +535,36 @@ def _fix_old_syntax(tree):
     """Function for 'catching old glm format and translating it.'
     This is intended to work recursively to catch nested objects.
     """
-    for key in list(tree.keys()):
-        if 'object' in list(tree[key].keys()):
-            # if no name is present and the object name is the old syntax we
-            # need to be creative and pull the object name and use it
-            if 'name' not in list(tree[key].keys()) and \
-                    tree[key]['object'].find(':') >= 0:
-                tree[key]['name'] = tree[key]['object'].replace(':', '_')
-
-            # strip the old syntax from the object name
-            tree[key]['object'] = tree[key]['object'].split(':')[0]
+    for item in tree.values():
+        if 'object' in item:
+            obj_type = item['object']
+            if ':' in obj_type:
+                # if no name is present and the object name is the old
+                # syntax we need to be creative and pull the object name
+                # and use it
+                if 'name' not in item:
+                    item['name'] = obj_type.replace(':', '_')
+
+                # strip the old syntax from the object name
+                item['object'] = obj_type.split(':')[0]
 
             # for the remaining syntax we will replace ':' with '_'
-            for line in tree[key]:
-                try:
-                    tree[key][line] = tree[key][line].replace(':', '_')
-                except AttributeError:
-                    # If we've hit a dict, recurse.
-                    if isinstance(tree[key][line], dict):
-                        # Since dicts are mutable, and tree[key][line]
-                        # is a dict, this should work just fine for
-                        # updating in place.
-                        _fix_old_syntax(tree={line: tree[key][line]})
-                    else:
-                        raise TypeError("Something weird is going on.")
+            for key, value in item.items():
+                if isinstance(value, str):
+                    if ':' in value:
+                        item[key] = value.replace(':', '_')
+                elif isinstance(value, dict):
+                    # If we've hit a dict, recurse. Since dicts are
+                    # mutable, this updates in place.
+                    _fix_old_syntax(tree={key: value})
+                else:
+                    raise TypeError("Something weird is going on.")
 
             # if we are working with fuses let's set the mean replace time to 1
             # hour if not specified. Then we aviod a warning!
-            if tree[key]['object'] == 'fuse' \
-                    and 'mean_replacement_time' not in list(tree[key].keys()):
-                tree[key]['mean_replacement_time'] = 3600.0
+            if item['object'] == 'fuse' \
+                    and 'mean_replacement_time' not in item:
+                item['mean_replacement_time'] = 3600.0
 
             # # FNCS is not able to handle names that include "-" so we will
             # # replace that with "_".
@@ -391,21 +580,75 @@ def _fix_old_syntax(tree):
     return None
 
 
-def sorted_write(in_tree):
+def sorted_write(in_tree, out=None, encoding='utf-8'):
     """
     Write out a GLM from a tree, and order all tree objects by their key.
 
     Sometimes GridLAB-D breaks if you rearrange a GLM.
+
+    :param in_tree: Dictionary representing the model, as returned by
+        parse.
+    :param out: If None (the default), the model is returned as a
+        string. Otherwise, a text stream (e.g. a file opened with 'w' or
+        an io.StringIO) or a binary stream (e.g. a file opened with
+        'wb', an io.BytesIO, or a pipe or memfd wrapped with os.fdopen)
+        the model is written to one item at a time. The stream is not
+        closed.
+    :param encoding: Encoding used when out is a binary stream.
+    """
+    if out is None:
+        parts = []
+        _write_tree(in_tree, parts.append)
+        return ''.join(parts)
+
+    with _stream_writer(out, encoding) as write:
+        _write_tree(in_tree, write)
+
+    return None
+
+
+def _write_tree(in_tree, write):
+    """
+    Helper function: call write with the string for each item in the
+    tree, in sorted order.
+    """
+    for key in sorted(in_tree.keys(), key=int):
+        write(_item_string(in_tree[key]) + '\n')
+
+
+@contextmanager
+def _stream_writer(out, encoding='utf-8'):
     """
+    Helper function: yield a function which writes a string to the
+    given text or binary stream.
+    """
+    if isinstance(out, io.TextIOBase):
+        yield out.write
+    elif isinstance(out, io.RawIOBase):
+        # Raw streams (e.g. pipes) may perform partial writes, so wrap
+        # in a buffer. Detach when done so the stream is left open.
+        buffered = io.BufferedWriter(out)
+        try:
+            yield lambda s: buffered.write(s.encode(encoding))
+        finally:
+            buffered.flush()
+            buffered.detach()
+    elif isinstance(out, io.BufferedIOBase):
+        yield lambda s: out.write(s.encode(encoding))
+    else:
+        # Assume anything else accepts strings.
+        yield out.write
 
-    sorted_keys = sorted(list(in_tree.keys()), key=int)
-    output = ''
-    try:
-        for key in sorted_keys:
-            output += _dict_to_string(in_tree[key]) + '\n'
-    except ValueError:
-        raise Exception
-    return output
+
+def _item_string(in_dict):
+    """
+    Helper function: like _dict_to_string, but raise a TypeError for
+    unrecognized items.
+    """
+    parts = []
+    if not _write_dict(in_dict, parts):
+        raise TypeError('Unable to write item: {}'.format(in_dict))
+    return ''.join(parts)
 
 
 def _dict_to_string(in_dict):
@@ -413,94 +656,180 @@ def _dict_to_string(in_dict):
     Helper function: given a single dict representing a GLM object, concatenate
     it into a string.
     """
+    parts = []
+    if _write_dict(in_dict, parts):
+        return ''.join(parts)
+    else:
+        return None
+
+
+def _write_dict(in_dict, parts):
+    """
+    Helper function: given a single dict representing a GLM object,
+    append its strings to the parts list. Returns False if the dict
+    is not a recognized item, else True.
+    """
 
     # Handle the different types of dictionaries that are leafs of the tree
     # root:
     if 'omftype' in in_dict:
-        return in_dict['omftype'] + ' ' + in_dict['argument'] + ';'
+        parts.extend((in_dict['omftype'], ' ', in_dict['argument'], ';'))
     elif 'module' in in_dict:
-        return ('module ' + in_dict['module'] + ' {\n'
-                + _gather_key_values(in_dict, 'module') + '}\n')
+        parts.extend(('module ', in_dict['module'], ' {\n'))
+        _write_key_values(in_dict, 'module', parts)
+        parts.append('}\n')
     elif 'clock' in in_dict:
-        # return 'clock {\n' + gatherKeyValues(in_dict, 'clock') + '};\n'
         # This object has known property order issues writing it out explicitly
-        clock_string = 'clock {\n'
-        if 'timezone' in in_dict:
-            clock_string = clock_string + '\ttimezone ' + in_dict[
-                'timezone'] + ';\n'
-        if 'starttime' in in_dict:
-            clock_string = clock_string + '\tstarttime ' + in_dict[
-                'starttime'] + ';\n'
-        if 'stoptime' in in_dict:
-            clock_string = clock_string + '\tstoptime ' + in_dict[
-                'stoptime'] + ';\n'
-        clock_string = clock_string + '}\n'
-        return clock_string
+        parts.append('clock {\n')
+        for key in ('timezone', 'starttime', 'stoptime'):
+            if key in in_dict:
+                parts.extend(('\t', key, ' ', in_dict[key], ';\n'))
+        parts.append('}\n')
     elif 'object' in in_dict and in_dict['object'] == 'schedule':
-        return 'schedule ' + in_dict['name'] + ' {\n' + in_dict[
-            'cron'] + '\n};\n'
+        parts.extend(('schedule ', in_dict['name'], ' {\n', in_dict['cron'],
+                      '\n};\n'))
     elif 'object' in in_dict:
-        return ('object ' + in_dict['object'] + ' {\n'
-                + _gather_key_values(in_dict, 'object') + '};\n')
+        parts.extend(('object ', in_dict['object'], ' {\n'))
+        _write_key_values(in_dict, 'object', parts)
+        parts.append('};\n')
     elif 'omfEmbeddedConfigObject' in in_dict:
-        return in_dict['omfEmbeddedConfigObject'] + ' {\n' + \
-               _gather_key_values(in_dict, 'omfEmbeddedConfigObject') + '};\n'
+        parts.extend((in_dict['omfEmbeddedConfigObject'], ' {\n'))
+        _write_key_values(in_dict, 'omfEmbeddedConfigObject', parts)
+        parts.append('};\n')
     elif '#include' in in_dict:
-        return '#include ' + in_dict['#include']
+        parts.extend(('#include ', in_dict['#include']))
     elif '#define' in in_dict:
-        return '#define ' + in_dict['#define'] + '\n'
+        parts.extend(('#define ', in_dict['#define'], '\n'))
     elif '#set' in in_dict:
-        return '#set ' + in_dict['#set']
+        parts.extend(('#set ', in_dict['#set']))
     elif 'class' in in_dict:
-        prop = 'class ' + in_dict['class'] + ' {\n'
+        parts.extend(('class ', in_dict['class'], ' {\n'))
         # this section will ensure we can get around the fact that you can't
         # have two key's with the same name!
-        if 'variable_types' in list(
-                in_dict.keys()) and 'variable_names' in list(
-                in_dict.keys()) and len(in_dict['variable_types']) == len(
-                in_dict['variable_names']):
-
-            for x in range(len(in_dict['variable_types'])):
-                prop += '\t' + in_dict['variable_types'][x] + ' ' + \
-                        in_dict['variable_names'][x] + ';\n'
+        if ('variable_types' in in_dict and 'variable_names' in in_dict
+                and len(in_dict['variable_types'])
+                == len(in_dict['variable_names'])):
 
-            prop += '}\n'
+            for v_type, v_name in zip(in_dict['variable_types'],
+                                      in_dict['variable_names']):
+                parts.extend(('\t', v_type, ' ', v_name, ';\n'))
         else:
-            prop += _gather_key_values(in_dict, 'class') + '}\n'
+            _write_key_values(in_dict, 'class', parts)
+
+        parts.append('}\n')
+    else:
+        return False
 
-        return prop
+    return True
 
 
 def _gather_key_values(in_dict, key_to_avoid):
     """
     Helper function: put key/value pairs for objects into the format GLD needs.
     """
+    parts = []
+    _write_key_values(in_dict, key_to_avoid, parts)
+    return ''.join(parts)
+
 
-    other_key_values = ''
+def _write_key_values(in_dict, key_to_avoid, parts):
+    """
+    Helper function: append key/value pairs for objects to the parts
+    list in the format GLD needs.
+    """
     for key in in_dict:
         if type(key) is int:
             # WARNING: RECURSION HERE
-            other_key_values += _dict_to_string(in_dict[key])
+            if not _write_dict(in_dict[key], parts):
+                raise TypeError('Unable to write item: {}'
+                                .format(in_dict[key]))
         elif key != key_to_avoid:
             if key == 'comment':
-                other_key_values += (in_dict[key] + '\n')
+                parts.append(in_dict[key] + '\n')
             elif key == 'name' or key == 'parent':
                 if len(in_dict[key]) <= 62:
-                    other_key_values += (
-                            '\t' + key + ' ' + str(in_dict[key]) + ';\n')
+                    parts.append('\t' + key + ' ' + str(in_dict[key]) + ';\n')
                 else:
                     warnings.warn(
                         ("{:s} argument is longer that 64 characters. "
                          + " Truncating {:s}.").format(key, in_dict[key]),
                         RuntimeWarning)
-                    other_key_values += ('\t' + key + ' '
-                                         + str(in_dict[key])[0:62]
-                                         + '; // truncated from {:s}\n'.format(
-                                            in_dict[key]))
+                    parts.extend(('\t', key, ' ', str(in_dict[key])[0:62],
+                                  '; // truncated from {:s}\n'.format(
+                                      in_dict[key])))
             else:
-                other_key_values += ('\t' + key + ' ' + str(in_dict[key])
-                                     + ';\n')
-    return other_key_values
+                parts.append('\t' + key + ' ' + str(in_dict[key]) + ';\n')
+
+
+def _cache_key(model_str, prep):
+    """Helper for GLMManager.from_cache: hash the model and the prep
+    steps applied to it.
+
+    :param model_str: String of the GridLAB-D model.
+    :param prep: List of (method name, keyword argument dictionary)
+        tuples.
+    """
+    h = hashlib.sha256()
+    h.update(str(CACHE_VERSION).encode('utf-8'))
+    h.update(model_str.encode('utf-8'))
+    for name, kwargs in prep:
+        h.update(repr((name, sorted(kwargs.items()))).encode('utf-8'))
+
+    return h.hexdigest()
+
+
+def _private_cache_dir(cache_dir):
+    """Helper for GLMManager.from_cache and save_cache: create the cache
+    directory if it doesn't exist (accessible only by us), and check
+    that nobody else can write to it. Cache files are unpickled, so
+    anyone who can write to the directory could run code as us.
+
+    :param cache_dir: Cache directory.
+
+    :returns: True if the directory is safe to use, False otherwise.
+
+    :raises OSError: if the directory can't be created.
+    """
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    st = os.stat(cache_dir)
+    return (st.st_uid == os.getuid()) and not (st.st_mode & 0o022)
+
+
+def _evict_cache(cache_dir, max_size, keep=None):
+    """Helper for GLMManager.save_cache: remove the least recently used
+    files from the cache directory until its total size is no more
+    than max_size bytes.
+
+    :param cache_dir: Cache directory.
+    :param max_size: Maximum total size in bytes.
+    :param keep: Path of a file which should not be removed.
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(CACHE_EXT):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                # Removed by someone else.
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(e[1] for e in entries)
+
+    # Oldest first.
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+
+        if path == keep:
+            continue
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        total -= size
 
 
 class GLMManager:
@@ -513,6 +842,8 @@ class GLMManager:
         - get_items_by_type: Lookup all items of a given type. Return a
             dictionary keyed by name.
         - modify_item: Update an item's properties (no renaming, though)
+        - modify_items: Update properties of many objects of the same
+            type at once.
         - remove_properties_from_item: Delete certain properties from
             an item.
         - remove_item: Remove an item from the model
@@ -540,6 +871,25 @@ class GLMManager:
         - remove_all_solar: Remove all solar panels from the model.
         - set_inverter_v_and_i: Add V_In and I_In to inverters according
             to their rated power (essentially giving them a DC source).
+        - compile_template: Pre-render the model so that write_model
+            only needs to re-render a handful of objects which change
+            between writes (e.g. regulators and capacitors).
+        - from_cache: Alternative constructor which loads a parsed and
+            prepped model from an on-disk cache, or parses, preps and
+            caches it.
+        - save_cache: Save the manager to an on-disk cache.
+        - fork: Create a copy-on-write view of the manager (see
+            GLMOverlay) for cheap variants of the model.
+        - compact: Share property names and values between objects to
+            reduce memory usage.
+        - diff: Compute a compact patch describing the changes between
+            two managers.
+        - apply: Apply a patch from diff.
+        - add_index: Index objects by property values for fast lookups.
+        - get_objects_by_property: Look up objects by property value.
+        - get_children: Look up objects by parent.
+        - get_objects_by_groupid: Look up objects by group.
+        - get_links_by_node: Look up links by their from/to nodes.
 
     IMPORTANT NOTE ON MUTABILITY:
         As Python programmers should know, dictionaries are mutable, and
@@ -645,8 +995,368 @@ class GLMManager:
             else:
                 self.model_dict[k] = v
 
+        # Render template (see compile_template). The specification of
+        # which objects get re-rendered on every write is kept
+        # separately from the compiled template itself, so the
+        # template can be dropped and recompiled as needed.
+        self._template_spec = None
+        self._template = None
+        self._template_dynamic = set()
+
+        # Cache of rendered items, keyed by the id of the item
+        # dictionary. Values are (item dictionary, rendered string)
+        # tuples, where keeping the dictionary ensures the id isn't
+        # reused. Entries are dropped via _mark_dirty when items are
+        # modified or removed.
+        self._rendered = {}
+
+        # Secondary indexes of objects by property value, built on
+        # demand (see add_index). Maps property -> value -> id of
+        # object dictionary -> object dictionary. _index_values maps the
+        # id of each indexed object to (object dictionary, {property:
+        # value}) so entries can be found after the object changes.
+        self._indexes = {}
+        self._index_values = {}
+
         self.log.info('GridLAB-D model parsed and mapped.')
 
+    def __getstate__(self):
+        """Don't bother pickling (or copying) the compiled template or
+        rendered items, which are the size of the entire model. They'll
+        be rebuilt on the next call to write_model. The render cache and
+        indexes are keyed by object ids, so they aren't valid for a copy
+        anyways.
+        """
+        state = self.__dict__.copy()
+        state['_template'] = None
+        state['_template_dynamic'] = set()
+        state['_rendered'] = {}
+        # Indexes are also keyed by object ids. They'll be rebuilt on
+        # demand.
+        state['_indexes'] = {}
+        state['_index_values'] = {}
+        return state
+
+    @classmethod
+    def from_cache(cls, model, cache_dir, model_is_path=True, prep=None,
+                   max_size=None):
+        """Initialize from an on-disk cache of parsed models.
+
+        The cache is keyed by a hash of the model text and the prep
+        steps. On a hit, the cached manager is loaded. On a miss (or if
+        the cache file can't be loaded), the model is parsed, the prep
+        steps are run, and the result is saved to the cache via
+        save_cache.
+
+        The cache is only an optimization, so problems with it are
+        logged rather than raised. Since cache files are unpickled, the
+        cache isn't used at all if other users can write to cache_dir.
+
+        :param model: Path to or string of GridLAB-D model.
+        :param cache_dir: Directory cache files are kept in. Created
+            (accessible only by the current user) if it does not
+            exist. "~" is expanded.
+        :param model_is_path: Specifies if model is path (True) or
+            string of model (False)
+        :param prep: Iterable of (method name, keyword argument
+            dictionary) tuples. Each is a GLMManager method which is
+            called after the model is parsed, in order. E.g.
+            [('remove_all_solar', {}),
+             ('convert_switch_status_to_three_phase', {'banked': False})]
+        :param max_size: Maximum total size of the cache directory in
+            bytes, see save_cache. None for no limit.
+        """
+        if model_is_path:
+            with open(model, 'r') as f:
+                model = f.read()
+
+        prep = [(name, dict(kwargs)) for name, kwargs in (prep or [])]
+        key = _cache_key(model, prep)
+        cache_dir = os.path.expanduser(cache_dir)
+        path = os.path.join(cache_dir, key + CACHE_EXT)
+        log = logging.getLogger(cls.__name__)
+
+        try:
+            safe = _private_cache_dir(cache_dir)
+        except OSError as e:
+            log.warning('Unable to create model cache directory {}: {}'
+                        .format(cache_dir, e))
+            safe = False
+        else:
+            if not safe:
+                log.warning('Model cache directory {} can be written to by '
+                            'other users, not using it.'.format(cache_dir))
+
+        mgr = None
+        if safe:
+            try:
+                with open(path, 'rb') as f:
+                    mgr = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                # Truncated or otherwise unreadable. It'll be
+                # overwritten.
+                log.warning('Unable to load cached model {}: {}'
+                            .format(path, e))
+
+        if isinstance(mgr, cls):
+            # Mark as recently used for eviction purposes.
+            try:
+                os.utime(path)
+            except OSError as e:
+                log.warning('Unable to mark cached model {} as recently '
+                            'used: {}'.format(path, e))
+
+            mgr.log.info('GridLAB-D model loaded from cache {}.'
+                         .format(path))
+            return mgr
+
+        mgr = cls(model, model_is_path=False)
+
+        for name, kwargs in prep:
+            getattr(mgr, name)(**kwargs)
+
+        if safe:
+            mgr.save_cache(cache_dir=cache_dir, key=key, max_size=max_size)
+
+        return mgr
+
+    def save_cache(self, cache_dir, key, max_size=None):
+        """Save this manager to the cache directory for later use with
+        from_cache.
+
+        The file is written atomically, so concurrent readers never see
+        a partial file. After writing, the least recently used cache
+        files are removed until the cache is no larger than max_size.
+
+        Failures (e.g. a read-only or full disk) are logged rather than
+        raised, since the cache is only an optimization.
+
+        :param cache_dir: Directory cache files are kept in. Created
+            (accessible only by the current user) if it does not
+            exist. "~" is expanded.
+        :param key: Cache key, e.g. from _cache_key.
+        :param max_size: Maximum total size of the cache directory in
+            bytes. None for no limit. The file just written is never
+            evicted.
+
+        :returns: Path to the cache file, or None if it couldn't be
+            saved.
+        """
+        cache_dir = os.path.expanduser(cache_dir)
+        path = os.path.join(cache_dir, key + CACHE_EXT)
+        tmp_path = None
+
+        try:
+            if not _private_cache_dir(cache_dir):
+                self.log.warning('Model cache directory {} can be written to '
+                                 'by other users, not saving to it.'
+                                 .format(cache_dir))
+                return None
+
+            with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp',
+                                             delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, TypeError,
+                AttributeError) as e:
+            self.log.warning('Unable to save model to cache {}: {}'
+                             .format(path, e))
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+            return None
+
+        self.log.info('GridLAB-D model saved to cache {}.'.format(path))
+
+        if max_size is not None:
+            try:
+                _evict_cache(cache_dir=cache_dir, max_size=max_size,
+                             keep=path)
+            except OSError as e:
+                self.log.warning('Unable to evict old models from cache {}: '
+                                 '{}'.format(cache_dir, e))
+
+        return path
+
+    def fork(self):
+        """Create a copy-on-write view of this manager, which can be
+        modified without affecting this manager and without copying
+        the model. See GLMOverlay.
+
+        This manager must not be modified while the view is in use.
+        """
+        return GLMOverlay(self)
+
+    def compact(self, values=True):
+        """Reduce the memory used by the model by sharing strings.
+
+        Property names are interned, so the many copies of e.g.
+        'phases' or 'nominal_voltage' become a single string. If values
+        is True, equal property values (e.g. 'ABCN', '7200') are
+        de-duplicated too. Item dictionaries are rebuilt in place, so
+        their identity, order, and dict-like access are unchanged.
+
+        Sharing is preserved by pickle, so this also shrinks pickled
+        managers and their copies in worker processes.
+
+        Note that values set by later modifications aren't shared
+        unless this is called again.
+
+        :param values: Whether to de-duplicate property values in
+            addition to property names.
+        """
+        intern = sys.intern
+        # Use a local pool for values rather than interning them, so
+        # unique values (e.g. names) don't end up in the interpreter's
+        # table of interned strings.
+        pool = {}
+
+        for item in self.model_dict.values():
+            if values:
+                pairs = [(intern(k), pool.setdefault(v, v)
+                          if type(v) is str else v)
+                         for k, v in item.items()]
+            else:
+                pairs = [(intern(k), v) for k, v in item.items()]
+
+            # Rebuilding also sizes the dictionary for its contents.
+            item.clear()
+            item.update(pairs)
+
+        self.log.debug('Model compacted, {} unique values shared.'
+                       .format(len(pool)))
+
+    def diff(self, other):
+        """Compute a patch which turns this manager's model into
+        other's model. See apply.
+
+        Named objects, modules, and the clock are matched up by their
+        identity (type and name), and differences in their properties
+        become modifications. Other items (e.g. unnamed objects, #set
+        or #define directives, and classes) are matched up by content.
+
+        The patch is a dictionary of plain lists, dictionaries, and
+        strings, so it can be cheaply pickled (or converted to JSON)
+        and applied to copies of this manager elsewhere, e.g. in worker
+        processes:
+            {'remove': [key, ...],
+             'add': [item_dict, ...],
+             'modify': [[key, {property: value}, [property, ...]], ...]}
+        Keys identify items like remove_item's inputs, e.g.
+        {'object': 'meter', 'name': 'my_meter'} or {'clock': 'clock'}.
+        Modifications list the properties to update and the properties
+        to remove.
+
+        :param other: GLMManager to compare against.
+        :raises ValueError: if an item without an identity (e.g. an
+            unnamed object) would need to be removed, since
+            remove_item can't remove such items.
+        :returns: Patch dictionary.
+        """
+        patch = {'remove': [], 'add': [], 'modify': []}
+        mine, mine_other = self._diff_items()
+        theirs, theirs_other = other._diff_items()
+
+        for k, (key, item) in mine.items():
+            try:
+                _, other_item = theirs[k]
+            except KeyError:
+                patch['remove'].append(key)
+                continue
+
+            if item == other_item:
+                continue
+
+            update = {p: v for p, v in other_item.items()
+                      if p not in key and item.get(p) != v}
+            removed = [p for p in item if p not in other_item]
+            patch['modify'].append([key, update, removed])
+
+        for k, (_, item) in theirs.items():
+            if k not in mine:
+                patch['add'].append(dict(item))
+
+        # Match up everything else by content.
+        for text, items in theirs_other.items():
+            n = len(items) - len(mine_other.get(text, ()))
+            patch['add'].extend(dict(item) for item in items[:max(n, 0)])
+
+        for text, items in mine_other.items():
+            if len(items) > len(theirs_other.get(text, ())):
+                raise ValueError('Cannot create a patch which removes the '
+                                 'following item: {}'.format(items[0]))
+
+        return patch
+
+    def _diff_items(self):
+        """Helper for diff.
+
+        :returns: named, other. named is a dictionary of (key, item
+            dictionary) tuples for named objects, modules, and the
+            clock, where keys are as described in diff. It is keyed by
+            tuples of the key's values. other is a dictionary of lists
+            of all other item dictionaries, keyed by their rendering.
+        """
+        named = {}
+        for obj_type, type_map in self.model_map['object'].items():
+            for name, (_, obj) in type_map.items():
+                named[('object', obj_type, name)] = \
+                    ({'object': obj_type, 'name': name}, obj)
+
+        for name, (_, module) in self.model_map['module'].items():
+            named[('module', name)] = ({'module': name}, module)
+
+        if len(self.model_map['clock']) > 0:
+            named[('clock',)] = \
+                ({'clock': 'clock'}, self.model_map['clock'][1])
+
+        ids = {id(item) for _, item in named.values()}
+        other = {}
+        for item in self.model_dict.values():
+            if id(item) not in ids:
+                other.setdefault(self._render_item(item), []).append(item)
+
+        return named, other
+
+    def apply(self, patch):
+        """Apply a patch created by diff. Items are removed, then added,
+        then modified. As with add_item, added objects are appended to
+        the model while other added items are prepended.
+
+        The patch itself is not modified, so it can be applied to
+        several managers.
+
+        :param patch: Patch dictionary from diff.
+        """
+        for key in patch['remove']:
+            self.remove_item(dict(key))
+
+        for item in patch['add']:
+            # Values came from a model, so unlike add_item there's no
+            # casting to strings (which would mangle class variables).
+            item = dict(item)
+            item_type = self._get_item_type(item)
+            if item_type == 'object':
+                self._add_object(item)
+            else:
+                self._add_non_object(item_type, item)
+
+        for key, update, removed in patch['modify']:
+            if len(update) > 0:
+                item_dict = dict(key)
+                item_dict.update(update)
+                self.modify_item(item_dict)
+
+            if len(removed) > 0:
+                self.remove_properties_from_item(dict(key), removed)
+
     def _update_append_key(self):
         """Add one to the append_key."""
         self.append_key += 1
@@ -912,23 +1622,152 @@ class GLMManager:
     def write_model(self, out_path):
         """Helper to write out the model_dict.
 
+        Each item's rendered text is cached until the item is modified
+        via this class's methods, so only modified items are
+        re-rendered. If compile_template has been called, the template
+        is used to avoid even joining the entire model.
+
         :param out_path: Full path to write model out to. If None, a
-            string will be returned.
+            string will be returned. May also be a text or binary
+            stream (see sorted_write), which is written to but not
+            closed.
         """
+        if out_path is None:
+            # Return the string.
+            parts = []
+            self._write_items(parts.append)
+            return ''.join(parts)
 
-        # Get dictionary as a string.
-        model_string = sorted_write(self.model_dict)
-
-        if out_path is not None:
-            # Write it.
+        if hasattr(out_path, 'write'):
+            with _stream_writer(out_path) as write:
+                self._write_items(write)
+        else:
             with open(out_path, 'w') as f:
-                f.write(model_string)
+                self._write_items(f.write)
 
-            # We're done. explicitly return None.
-            return None
+        # We're done. explicitly return None.
+        return None
+
+    def _write_items(self, write):
+        """Helper for write_model to call write with the string for
+        each item in the model, in order.
+        """
+        if self._template_spec is None:
+            for key in sorted(self.model_dict.keys(), key=int):
+                write(self._render_item(self.model_dict[key]))
         else:
-            # Return the string.
-            return model_string
+            self._write_template(write)
+
+    def _render_item(self, item):
+        """Helper to render an item (followed by a newline), using the
+        render cache if the item hasn't changed since it was last
+        rendered.
+        """
+        try:
+            return self._rendered[id(item)][1]
+        except KeyError:
+            out = _item_string(item) + '\n'
+            self._rendered[id(item)] = (item, out)
+            return out
+
+    def compile_template(self, objects):
+        """Pre-render the model for faster calls to write_model.
+
+        The model is rendered once (in the same order as sorted_write)
+        into a list of chunks. The given objects are kept out of the
+        chunks, and are instead rendered on each call to write_model.
+        So, writing the model costs about as much as joining the chunks
+        and rendering the given objects, rather than rendering the
+        whole model.
+
+        The given objects can be modified freely (via this class's
+        methods) without affecting the template. Any other modification
+        to the model made via this class's methods drops the template,
+        which is then recompiled on the next call to write_model. Only
+        the modified items are re-rendered when recompiling (see
+        _render_item). As usual (see the note on mutability in the
+        class docstring), modifying item dictionaries directly is not
+        tracked.
+
+        :param objects: Iterable of (object type, object name) tuples
+            for the objects which change between writes. If the name
+            is None, all objects of that type are included. E.g.
+            [('regulator', None), ('capacitor', '"cap_1"')]. Object
+            types or names which aren't in the model are ignored.
+        """
+        self._template_spec = list(objects)
+        self._compile_template()
+
+    def _compile_template(self):
+        """Helper to (re)compile the template from _template_spec. See
+        compile_template.
+        """
+        # Collect the model keys of the objects which get rendered on
+        # each write.
+        dynamic = set()
+        for obj_type, obj_name in self._template_spec:
+            type_map = self.model_map['object'].get(obj_type, {})
+            if obj_name is None:
+                dynamic.update(v[0] for v in type_map.values())
+            elif obj_name in type_map:
+                dynamic.add(type_map[obj_name][0])
+
+        # Build the chunks. Consecutive static items are joined into a
+        # single string, while dynamic items are stored as their item
+        # dictionary.
+        template = []
+        static = []
+        for key in sorted(self.model_dict.keys(), key=int):
+            if key in dynamic:
+                if len(static) > 0:
+                    template.append(''.join(static))
+                    static = []
+                template.append(self.model_dict[key])
+            else:
+                static.append(self._render_item(self.model_dict[key]))
+
+        if len(static) > 0:
+            template.append(''.join(static))
+
+        self._template = template
+        # Track dictionary ids so modifications can be checked quickly.
+        self._template_dynamic = {id(self.model_dict[k]) for k in dynamic}
+
+        self.log.debug('Model template compiled with {} dynamic objects.'
+                       .format(len(dynamic)))
+
+    def _write_template(self, write):
+        """Helper for write_model to write the model via the template,
+        compiling it first if necessary.
+        """
+        if self._template is None:
+            self._compile_template()
+
+        for chunk in self._template:
+            if isinstance(chunk, str):
+                write(chunk)
+            else:
+                write(self._render_item(chunk))
+
+    def _mark_dirty(self, item=None):
+        """Drop the cached rendering of an item which is being
+        modified, added, or removed. The compiled template is also
+        dropped, unless the item is one of the template's dynamic
+        objects.
+
+        :param item: Item dictionary which is being modified. If None,
+            all cached renderings and the template are dropped.
+        """
+        if item is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(id(item), None)
+
+            if id(item) in self._template_dynamic:
+                return
+
+        self._template = None
+        self._template_dynamic = set()
 
     def add_item(self, item_dict):
         """Add and map a new item.
@@ -979,10 +1818,135 @@ class GLMManager:
         # Add the object to the end of the model.
         # TODO: which objects need added to the beginning?
         self.model_dict[self.append_key] = object_dict
+        self._mark_dirty(object_dict)
+        self._reindex(object_dict)
 
         # Update append key.
         self._update_append_key()
 
+    def add_index(self, *props):
+        """Index objects by the values of the given properties, so
+        they can be quickly looked up via get_objects_by_property (and
+        helpers like get_children). Indexes are kept up to date by this
+        class's methods which add, modify, and remove objects.
+
+        Properties which are already indexed are skipped, so this is
+        cheap to call repeatedly. Building new indexes requires a
+        single pass over all objects.
+
+        :param props: Property names, e.g. 'parent' or 'groupid'.
+        """
+        new = [p for p in props if p not in self._indexes]
+        if len(new) == 0:
+            return
+
+        for p in new:
+            self._indexes[p] = {}
+
+        # Index both named and unnamed objects.
+        for type_map in self.model_map['object'].values():
+            for _, obj in type_map.values():
+                self._index_object(obj, new)
+
+        for _, obj in self.model_map['object_unnamed']:
+            self._index_object(obj, new)
+
+        self.log.debug('Indexed objects by {}.'.format(new))
+
+    def _index_object(self, obj, props):
+        """Helper to add an object to the given property indexes."""
+        values = None
+        for p in props:
+            try:
+                v = obj[p]
+            except KeyError:
+                continue
+
+            self._indexes[p].setdefault(v, {})[id(obj)] = obj
+
+            if values is None:
+                values = self._index_values.setdefault(id(obj), (obj, {}))[1]
+
+            values[p] = v
+
+    def _unindex(self, obj):
+        """Helper to remove an object from all indexes."""
+        try:
+            _, values = self._index_values.pop(id(obj))
+        except KeyError:
+            return
+
+        for p, v in values.items():
+            bucket = self._indexes[p][v]
+            del bucket[id(obj)]
+            if len(bucket) == 0:
+                del self._indexes[p][v]
+
+    def _reindex(self, item):
+        """Helper to bring the indexes up to date after an item has
+        been added or modified. Non-object items are ignored.
+        """
+        if (len(self._indexes) == 0) or ('object' not in item):
+            return
+
+        self._unindex(item)
+        self._index_object(item, self._indexes)
+
+    def get_objects_by_property(self, prop, value, object_type=None):
+        """Get all objects with the given property value, e.g. all
+        objects with a 'groupid' of 'my_group'.
+
+        The property is indexed on first use (see add_index), so
+        subsequent lookups don't scan the model.
+
+        :param prop: Property name, e.g. 'parent'.
+        :param value: Property value. Note values are strings, and
+            names may be quoted, e.g. '"sourcebus"'.
+        :param object_type: Optionally, only return objects of this
+            type, e.g. 'triplex_load'.
+        :returns: List of object dictionaries, which will be empty if
+            there are no matching objects.
+        """
+        self.add_index(prop)
+
+        objs = self._indexes[prop].get(value, {}).values()
+
+        if object_type is None:
+            return list(objs)
+        else:
+            return [o for o in objs if o['object'] == object_type]
+
+    def get_children(self, parent_name):
+        """Get all objects whose parent is the given object.
+
+        :param parent_name: Name of the parent object.
+        :returns: List of object dictionaries (possibly empty).
+        """
+        return self.get_objects_by_property('parent', parent_name)
+
+    def get_objects_by_groupid(self, groupid):
+        """Get all objects in the given group.
+
+        :param groupid: The groupid, e.g. ga.TRIPLEX_GROUP.
+        :returns: List of object dictionaries (possibly empty).
+        """
+        return self.get_objects_by_property('groupid', groupid)
+
+    def get_links_by_node(self, node_name):
+        """Get all links (e.g. lines, switches, transformers) connected
+        to the given node via their 'from' or 'to' property.
+
+        :param node_name: Name of the node.
+        :returns: List of object dictionaries (possibly empty).
+        """
+        self.add_index('from', 'to')
+        links = {id(o): o for o in self.get_objects_by_property('from',
+                                                                 node_name)}
+        for o in self.get_objects_by_property('to', node_name):
+            links[id(o)] = o
+
+        return list(links.values())
+
     def find_object(self, obj_type, obj_name):
         """Find object by name in the model_map, if it exists.
 
@@ -1096,6 +2060,11 @@ class GLMManager:
             # Map class.
             self._add_class_to_map(self.prepend_key, item_dict)
 
+        elif item_type == 'omftype':
+            # Map (only if it's a module), as in _map_model_dict.
+            if item_dict['omftype'] == 'module':
+                self._add_module_to_map(self.prepend_key, item_dict)
+
         elif item_type in self.NO_MAP:
             # No mapping.
             pass
@@ -1106,6 +2075,7 @@ class GLMManager:
 
         # Add to beginning of model.
         self.model_dict[self.prepend_key] = item_dict
+        self._mark_dirty(item_dict)
 
         # Update prepend key.
         self._update_prepend_key()
@@ -1159,6 +2129,7 @@ class GLMManager:
             # Modify it. Simple if it isn't an 'omftype' style module.
             if 'omftype' in module:
                 # We need to change up this dictionary.
+                self._mark_dirty(module)
                 module['module'] = module['argument']
                 module.pop('omftype')
                 module.pop('argument')
@@ -1170,9 +2141,81 @@ class GLMManager:
             s = 'Cannot modify item of type {}'.format(item_type)
             raise TypeError(s)
 
-    @staticmethod
-    def _modify_item(item, update_dict):
-        """Simple helper to update an existing item.
+    def modify_items(self, object_type, updates, strict=True, cast=True):
+        """Modify many objects of the same type at once. This is
+        equivalent to (but much faster than) calling modify_item for
+        each object.
+
+        NOTE: this method CANNOT be used to change an object's name.
+
+        :param object_type: Type of the objects, e.g. 'triplex_load'.
+        :param updates: Dictionary keyed by object name. Values are
+            dictionaries of properties to modify (or add), e.g.
+            {'tl_1': {'groupid': 'my_group'}}. These dictionaries are
+            not modified.
+        :param strict: If True, all objects must exist, and nothing is
+            modified if any are missing. If False, missing objects are
+            skipped.
+        :param cast: If True, values are cast to strings like
+            modify_item does. Pass False if all values are already
+            strings to skip the conversion.
+
+        :raises KeyError: if strict is True and any objects cannot be
+            found.
+        :raises ValueError: if any update includes the 'object' or
+            'name' properties.
+        :returns: List of names in updates which could not be found
+            (always empty when strict is True). The objects in the model
+            are modified directly.
+        """
+        # Find all the objects and validate the updates before touching
+        # the model.
+        objs, missing = self._match_objects(object_type, updates)
+
+        if strict and (len(missing) > 0):
+            raise KeyError('The following {} objects could not be found: {}'
+                           .format(object_type, missing))
+
+        for name, obj in objs:
+            update_dict = updates[name]
+            self._mark_dirty(obj)
+
+            if cast:
+                obj.update(zip(update_dict.keys(),
+                               map(str, update_dict.values())))
+            else:
+                obj.update(update_dict)
+
+            self._reindex(obj)
+
+        return missing
+
+    def _match_objects(self, object_type, updates):
+        """Helper for modify_items. Pair names in updates with their
+        objects, and validate the updates.
+
+        :returns: objs, missing. objs is a list of (name, object
+            dictionary) tuples, and missing is a list of names which
+            could not be found.
+        """
+        type_map = self.model_map['object'].get(object_type, {})
+        objs = []
+        missing = []
+        for name, update_dict in updates.items():
+            if ('name' in update_dict) or ('object' in update_dict):
+                raise ValueError("The 'object' and 'name' properties cannot "
+                                 "be modified. Update for {}: {}"
+                                 .format(name, update_dict))
+            try:
+                objs.append((name, type_map[name][1]))
+            except KeyError:
+                missing.append(name)
+
+        return objs, missing
+
+    def _modify_item(self, item, update_dict):
+        """Simple helper to update an existing item, marking it dirty
+        (see _mark_dirty).
 
         NOTE: We're casting everything to strings, so if the 'str()'
             method fails, this method fails :)
@@ -1180,9 +2223,13 @@ class GLMManager:
         Note that only properties from update_dict will be modified (or
             added)
         """
+        self._mark_dirty(item)
+
         for k in update_dict:
             item[k] = str(update_dict[k])
 
+        self._reindex(item)
+
         return item
 
     def remove_properties_from_item(self, item_dict, property_list):
@@ -1240,8 +2287,10 @@ class GLMManager:
 
             # Remove from model.
             obj_type = item_dict['object']
-            self.model_dict.pop(self.model_map['object'][obj_type][
-                                    obj_name][0])
+            obj = self.model_dict.pop(
+                self.model_map['object'][obj_type][obj_name][0])
+            self._mark_dirty(obj)
+            self._unindex(obj)
 
             # Remove from the map.
             self.model_map['object'][obj_type].pop(obj_name)
@@ -1251,7 +2300,7 @@ class GLMManager:
             self._lookup_clock()
 
             # Remove from model.
-            self.model_dict.pop(self.model_map['clock'][0])
+            self._mark_dirty(self.model_dict.pop(self.model_map['clock'][0]))
 
             # Remove from the map by resetting clock to empty list.
             self.model_map['clock'] = []
@@ -1262,7 +2311,8 @@ class GLMManager:
             self._lookup_module(module_name)
 
             # Remove from model.
-            self.model_dict.pop(self.model_map['module'][module_name][0])
+            self._mark_dirty(
+                self.model_dict.pop(self.model_map['module'][module_name][0]))
 
             # Remove from the map.
             self.model_map['module'].pop(module_name)
@@ -1309,7 +2359,11 @@ class GLMManager:
             return module
 
     def _remove_from_item(self, item, remove_list):
-        """Simple helper to remove fields from an item."""
+        """Simple helper to remove fields from an item, marking it
+        dirty (see _mark_dirty).
+        """
+        self._mark_dirty(item)
+
         for k in remove_list:
             # Will raise KeyError if asked to remove non-existent item
             try:
@@ -1320,6 +2374,8 @@ class GLMManager:
                 self.log.debug('Unable to remove {} for the following item: '
                                '{}'.format(k, item))
 
+        self._reindex(item)
+
         return item
 
     @staticmethod
@@ -1603,9 +2659,10 @@ class GLMManager:
         TODO: Handle multiple substations.
         TODO: Hard-coding the use of "substation" objects could get us
             into trouble.
-        TODO: This looping to figure out what's connected is NASTY. This
-            class should be augmented to include a graph representation
-            of the model, such as from networkx.
+        TODO: The indexes handle finding what's connected to the
+            substation, but this class could still be augmented to
+            include a graph representation of the model, such as from
+            networkx.
         """
         # Get the substation object - for now, only handle a single one.
         sub = self.get_objects_by_type(object_type='substation')
@@ -1624,40 +2681,17 @@ class GLMManager:
         else:
             meter_name = sub_name + '_meter'
 
-        def check_and_modify(mgr, o, p, old_name, new_name):
-            """Nested helper."""
-            try:
-                # Extract the property.
-                p_val = o[p]
-            except KeyError:
-                # This object doesn't have this property.
-                return
-            else:
-                # This object has the property, see if it matches.
-                if p_val == old_name:
-                    # Change the item to reference the new name.
-                    mgr.modify_item({'object': o['object'],
-                                     'name': o['name'],
-                                     p: new_name})
-
-        # Loop through ALL objects. This is terrible - we should have a
-        # graph representation.
-        for obj_type in self.model_map['object']:
-            for obj_list in self.model_map['object'][obj_type].values():
-                # Extract the object.
-                obj = obj_list[1]
-
-                # Check for parented objects.
-                check_and_modify(mgr=self, o=obj, p='parent',
-                                 old_name=sub_name, new_name=meter_name)
-
-                # Check 'from'
-                check_and_modify(mgr=self, o=obj, p='from',
-                                 old_name=sub_name, new_name=meter_name)
-
-                # Check 'to' (though this shouldn't be necessary, right?
-                check_and_modify(mgr=self, o=obj, p='to',
-                                 old_name=sub_name, new_name=meter_name)
+        # Re-point objects which are parented to or connected to the
+        # substation to the new meter. Only named objects can be
+        # modified.
+        props = ('parent', 'from', 'to')
+        self.add_index(*props)
+        for p in props:
+            for obj in self.get_objects_by_property(p, sub_name):
+                if 'name' in obj:
+                    self.modify_item({'object': obj['object'],
+                                      'name': obj['name'],
+                                      p: meter_name})
 
         # Add the meter to the model.
         self.add_item({'object': 'meter',
@@ -1699,6 +2733,9 @@ class GLMManager:
         ub = int(reg_conf['raise_taps'])
         lb = -int(reg_conf['lower_taps'])
 
+        self._mark_dirty(reg)
+        self._mark_dirty(reg_conf)
+
         # Loop and update. It's a tad dangerous to do this directly,
         # but it kills me to double-loop.
         for phase, tap in pos_dict.items():
@@ -1731,6 +2768,9 @@ class GLMManager:
             reg['tap_' + phase] = str(tap)
             reg_conf['tap_pos_' + phase] = str(tap)
 
+        self._reindex(reg)
+        self._reindex(reg_conf)
+
         # That's it, we're done. Taps have been updated.
 
     def update_cap_switches(self, cap_name, phase_dict):
@@ -1749,6 +2789,8 @@ class GLMManager:
                 'There is no capacitor named {} in the model'.format(cap_name)
             )
 
+        self._mark_dirty(cap)
+
         # Loop and update.
         for phase, status in phase_dict.items():
             # Ensure key is valid.
@@ -1771,6 +2813,8 @@ class GLMManager:
             # Update.
             cap['switch' + phase] = status
 
+        self._reindex(cap)
+
         # Done.
 
     def clear_all_triplex_loads(self):
@@ -1923,6 +2967,8 @@ class GLMManager:
 
         # Function to use with the loop helper.
         def fix_switch(switch):
+            self._mark_dirty(switch)
+
             # Extract phases.
             p_set = set(switch['phases'])
 
@@ -1945,6 +2991,8 @@ class GLMManager:
             # Set operating mode.
             switch['operating_mode'] = operating_mode
 
+            self._reindex(switch)
+
         # Call the loop helper.
         try:
             self.loop_over_objects_helper('switch', fix_switch)
@@ -1957,6 +3005,212 @@ class GLMManager:
                           'three phase notation.')
 
 
+class GLMOverlay:
+    """Copy-on-write view of a GLMManager, created via GLMManager.fork.
+
+    The overlay shares the base manager's model_dict and model_map, and
+    never modifies them. Instead, the first modification of an item
+    copies its dictionary into the overlay's delta, and all further
+    reads and writes of that item go through the copy. So, creating an
+    overlay and modifying a handful of objects is cheap regardless of
+    the size of the model, and many overlays of the same base can be
+    used at once (e.g. in threads).
+
+    Supported methods have the same semantics as their GLMManager
+    counterparts:
+        - write_model
+        - find_object
+        - get_items_by_type
+        - get_objects_by_type
+        - modify_item
+        - modify_items
+        - update_reg_taps
+        - update_cap_switches
+
+    IMPORTANT: The base manager must not be modified while overlays of
+    it are in use. The note on mutability in GLMManager's docstring
+    applies here too: dictionaries returned by this class may belong to
+    the base, and must not be modified directly.
+    """
+
+    def __init__(self, base):
+        """Initialize with the manager to overlay. Use GLMManager.fork
+        rather than calling this directly.
+
+        :param base: GLMManager to overlay.
+        """
+        self.base = base
+        self.log = base.log
+
+        # Modified copies of the base's item dictionaries, keyed by the
+        # id of the base's dictionary.
+        self._delta = {}
+
+        # Rendered text of the copies in _delta, keyed by the id of the
+        # copy. See _mark_dirty.
+        self._rendered = {}
+
+    def _view(self, item):
+        """Return the overlay's copy of a base item if it has one, else
+        the base item itself.
+        """
+        return self._delta.get(id(item), item)
+
+    def _writable(self, item):
+        """Return the overlay's copy of a base item, creating it if
+        necessary.
+        """
+        try:
+            return self._delta[id(item)]
+        except KeyError:
+            copy = self._delta[id(item)] = dict(item)
+            return copy
+
+    def _lookup_object(self, object_type, object_name):
+        return self._writable(
+            self.base._lookup_object(object_type, object_name))
+
+    def _lookup_clock(self):
+        return self._writable(self.base._lookup_clock())
+
+    def _lookup_module(self, module_name):
+        return self._writable(self.base._lookup_module(module_name))
+
+    _get_item_type = staticmethod(GLMManager._get_item_type)
+
+    def _mark_dirty(self, item=None):
+        """Drop the cached rendering of one of the overlay's copies. See
+        GLMManager._mark_dirty.
+        """
+        if item is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(id(item), None)
+
+    def _reindex(self, item):
+        """Overlays don't maintain indexes, and must not touch the
+        base's, which describe the unmodified model.
+        """
+        pass
+
+    def _modify_item(self, item, update_dict):
+        """See GLMManager._modify_item."""
+        return GLMManager._modify_item(self, item, update_dict)
+
+    def _render_item(self, item):
+        """Render a base item, using the overlay's copy if it has
+        one.
+        """
+        try:
+            copy = self._delta[id(item)]
+        except KeyError:
+            return self.base._render_item(item)
+
+        try:
+            return self._rendered[id(copy)]
+        except KeyError:
+            out = self._rendered[id(copy)] = _item_string(copy) + '\n'
+            return out
+
+    def write_model(self, out_path):
+        """See GLMManager.write_model."""
+        return GLMManager.write_model(self, out_path)
+
+    def _write_items(self, write):
+        """Helper for write_model. Uses the base's template if it has
+        one and the overlay has only modified its dynamic objects,
+        otherwise renders item by item.
+        """
+        base = self.base
+        if base._template_spec is not None:
+            if base._template is None:
+                base._compile_template()
+
+            # Grab a reference in case another thread recompiles.
+            template = base._template
+            dynamic = base._template_dynamic
+            if all(k in dynamic for k in self._delta):
+                for chunk in template:
+                    if isinstance(chunk, str):
+                        write(chunk)
+                    else:
+                        write(self._render_item(chunk))
+
+                return None
+
+        for key in sorted(base.model_dict.keys(), key=int):
+            write(self._render_item(base.model_dict[key]))
+
+    def find_object(self, obj_type, obj_name):
+        """See GLMManager.find_object."""
+        obj = self.base.find_object(obj_type, obj_name)
+        if obj is None:
+            return None
+
+        return self._view(obj)
+
+    def get_items_by_type(self, item_type, object_type=None):
+        """See GLMManager.get_items_by_type."""
+        out = self.base.get_items_by_type(item_type, object_type)
+
+        if out is None or len(self._delta) == 0:
+            return out
+        elif item_type == 'clock':
+            return self._view(out)
+        elif isinstance(out, dict):
+            return {k: self._view(v) for k, v in out.items()}
+        else:
+            return [self._view(v) for v in out]
+
+    def get_objects_by_type(self, object_type):
+        """See GLMManager.get_objects_by_type."""
+        out = self.base.get_objects_by_type(object_type)
+
+        if out is None or len(self._delta) == 0:
+            return out
+        else:
+            return [self._view(v) for v in out]
+
+    def modify_item(self, item_dict):
+        """See GLMManager.modify_item."""
+        return GLMManager.modify_item(self, item_dict)
+
+    def modify_items(self, object_type, updates, strict=True, cast=True):
+        """See GLMManager.modify_items."""
+        return GLMManager.modify_items(self, object_type, updates,
+                                       strict=strict, cast=cast)
+
+    def _match_objects(self, object_type, updates):
+        """Like GLMManager._match_objects, but pairs names with the
+        overlay's copies of the objects.
+        """
+        objs, missing = self.base._match_objects(object_type, updates)
+        return [(name, self._writable(obj)) for name, obj in objs], missing
+
+    def update_reg_taps(self, reg_name, pos_dict):
+        """See GLMManager.update_reg_taps."""
+        # Ensure the regulator and its configuration are copied before
+        # they're modified.
+        reg = self.base.find_object(obj_type='regulator', obj_name=reg_name)
+        if reg is not None:
+            reg = self._writable(reg)
+            reg_conf = self.base.find_object(
+                obj_type='regulator_configuration',
+                obj_name=reg['configuration'])
+            if reg_conf is not None:
+                self._writable(reg_conf)
+
+        return GLMManager.update_reg_taps(self, reg_name, pos_dict)
+
+    def update_cap_switches(self, cap_name, phase_dict):
+        """See GLMManager.update_cap_switches."""
+        cap = self.base.find_object(obj_type='capacitor', obj_name=cap_name)
+        if cap is not None:
+            self._writable(cap)
+
+        return GLMManager.update_cap_switches(self, cap_name, phase_dict)
+
+
 class Error(Exception):
     """Base class for exceptions in this module."""
     pass
@@ -1,5 +1,6 @@
 """Miscellaneous utility functions for pyvvo"""
 import re
+import asyncio
 import math
 import cmath
 import subprocess
@@ -174,26 +175,117 @@ def gld_installed(env=None):
         return False
 
 
-def run_gld(model_path, env=None):
+def run_gld(model_path, env=None, timeout=None, cancel_event=None):
     """Helper to run a GRIDLAB-D model. The GridLAB-D executable will be
     run from the same directory as the model.
 
-    If needed, run options can be added in the future.
+    This is a blocking wrapper around run_gld_async, so it must not be
+    called from a running event loop.
 
     :param model_path: path (preferably full path) to GridLAB-D model.
     :param env: used to override the environment for subprocess. Leave
         this as None.
+    :param timeout: See run_gld_async.
+    :param cancel_event: See run_gld_async.
 
     :returns: A subprocess.CompletedProcess object corresponding to the
         GridLAB-D run.
+
+    :raises GLDTimeoutError: See run_gld_async.
+    :raises GLDCancelledError: See run_gld_async.
+    """
+    return asyncio.run(run_gld_async(model_path=model_path, env=env,
+                                     timeout=timeout,
+                                     cancel_event=cancel_event))
+
+
+async def run_gld_async(model_path, env=None, timeout=None,
+                        cancel_event=None, poll_interval=0.05):
+    """Coroutine to run a GridLAB-D model. The GridLAB-D executable will
+    be run from the same directory as the model. stdout and stderr are
+    read as they're written, so a chatty model can't fill up the pipes
+    and stall.
+
+    If the run times out or is cancelled (via cancel_event, or by
+    cancelling the task running this coroutine), GridLAB-D is killed.
+
+    :param model_path: path (preferably full path) to GridLAB-D model.
+    :param env: used to override the environment for subprocess. Leave
+        this as None.
+    :param timeout: Optional time in seconds GridLAB-D is allowed to
+        run.
+    :param cancel_event: Optional object with an is_set method, e.g. a
+        threading.Event or multiprocessing.Event. It is checked every
+        poll_interval seconds, and the run is cancelled once it's set.
+    :param poll_interval: Seconds between checks of cancel_event.
+
+    :returns: A subprocess.CompletedProcess object corresponding to the
+        GridLAB-D run. stdout and stderr are bytes.
+
+    :raises GLDTimeoutError: if GridLAB-D doesn't finish within timeout.
+    :raises GLDCancelledError: if cancel_event is set before GridLAB-D
+        finishes.
     """
     cwd = os.path.dirname(model_path)
     if len(cwd) == 0:
         cwd = None
 
-    result = subprocess.run("gridlabd {}".format(model_path), shell=True,
-                            stderr=subprocess.PIPE, stdout=subprocess.PIPE,
-                            env=env, cwd=cwd)
+    args = "gridlabd {}".format(model_path)
+
+    if (cancel_event is not None) and cancel_event.is_set():
+        raise GLDCancelledError('GridLAB-D model {} was cancelled before '
+                                'starting.'.format(model_path))
+
+    # Use 'exec' so that the shell is replaced by GridLAB-D, and run it
+    # in its own session so the whole process group can be killed.
+    proc = await asyncio.create_subprocess_shell(
+        'exec ' + args, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE, env=env, cwd=cwd,
+        start_new_session=True)
+
+    stdout = []
+    stderr = []
+    readers = asyncio.gather(_read_stream(proc.stdout, stdout),
+                             _read_stream(proc.stderr, stderr))
+
+    loop = asyncio.get_running_loop()
+    t_stop = None if timeout is None else loop.time() + timeout
+    wait = asyncio.ensure_future(proc.wait())
+
+    try:
+        while not wait.done():
+            # Without a cancel_event, there's no need to poll.
+            wait_time = None if cancel_event is None else poll_interval
+            if t_stop is not None:
+                remaining = t_stop - loop.time()
+                if remaining <= 0:
+                    raise GLDTimeoutError(
+                        'GridLAB-D model {} did not finish within {} seconds.'
+                        '\n\tstderr:{}'.format(
+                            model_path, timeout,
+                            b''.join(stderr).decode(errors='replace')))
+
+                wait_time = (remaining if wait_time is None
+                             else min(wait_time, remaining))
+
+            await asyncio.wait([wait], timeout=wait_time)
+
+            if ((not wait.done()) and (cancel_event is not None)
+                    and cancel_event.is_set()):
+                raise GLDCancelledError('GridLAB-D model {} was cancelled.'
+                                        .format(model_path))
+    except BaseException:
+        # Includes asyncio.CancelledError.
+        _kill_process_group(proc)
+        await asyncio.shield(wait)
+        await readers
+        raise
+
+    await readers
+
+    result = subprocess.CompletedProcess(
+        args=args, returncode=proc.returncode, stdout=b''.join(stdout),
+        stderr=b''.join(stderr))
 
     if result.returncode == 0:
         LOG.debug('GridLAB-D model {} ran successfully.'.format(model_path))
@@ -205,6 +297,52 @@ def run_gld(model_path, env=None):
     return result
 
 
+async def run_gld_many(model_paths, max_concurrent=None, **kwargs):
+    """Run several GridLAB-D models concurrently.
+
+    :param model_paths: List of paths to GridLAB-D models.
+    :param max_concurrent: Maximum number of models to run at once.
+        Defaults to the number of CPUs.
+    :param kwargs: Passed to run_gld_async.
+
+    :returns: List with an item for each model, in order. Each is
+        either a subprocess.CompletedProcess or, if the run failed
+        (e.g. GLDTimeoutError), the exception.
+    """
+    if max_concurrent is None:
+        max_concurrent = os.cpu_count()
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run_one(model_path):
+        async with semaphore:
+            return await run_gld_async(model_path=model_path, **kwargs)
+
+    return await asyncio.gather(*[run_one(m) for m in model_paths],
+                                return_exceptions=True)
+
+
+async def _read_stream(stream, chunks):
+    """Helper for run_gld_async to read a stream until EOF, appending
+    to the list chunks.
+    """
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return
+
+        chunks.append(chunk)
+
+
+def _kill_process_group(proc):
+    """Helper for run_gld_async to kill a process and its children."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Already gone.
+        pass
+
+
 def dt_to_us_from_epoch(dt):
     """Convert datetime.datetime object to microseconds since the epoch.
 
@@ -395,6 +533,16 @@ class FunctionTimeoutError(Error):
     pass
 
 
+class GLDTimeoutError(Error):
+    """Raised by run_gld if GridLAB-D doesn't finish in time."""
+    pass
+
+
+class GLDCancelledError(Error):
+    """Raised by run_gld if a run is cancelled."""
+    pass
+
+
 @contextmanager
 def time_limit(seconds: int, msg: str = None):
     """Context manager to run code with a timeout.
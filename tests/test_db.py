@@ -154,5 +154,126 @@ class ExecuteAndFetchAllTestCase(unittest.TestCase):
         self.assertIn((os.environ['DB_DB'],), out)
 
 
+class ListDropTablesTestCase(unittest.TestCase):
+    """Test list_tables and drop_tables."""
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = db.connect_loop()
+
+    def test_list_and_drop(self):
+        cursor = self.conn.cursor()
+        cursor.execute('CREATE TABLE IF NOT EXISTS pyvvo_test_1 (a INT)')
+        cursor.close()
+
+        self.assertListEqual(
+            ['pyvvo_test_1'],
+            db.list_tables(db_conn=self.conn, pattern='pyvvo\\_test\\_%'))
+
+        db.drop_tables(db_conn=self.conn, tables=['pyvvo_test_1'])
+        self.assertListEqual(
+            [], db.list_tables(db_conn=self.conn, pattern='pyvvo\\_test%'))
+
+    def test_drop_nothing(self):
+        with patch('MySQLdb.cursors.Cursor.execute', autospec=True) as p:
+            db.drop_tables(db_conn=self.conn, tables=[])
+
+        p.assert_not_called()
+
+    def test_drop_query(self):
+        with patch('MySQLdb.cursors.Cursor.execute', autospec=True) as p:
+            db.drop_tables(db_conn=self.conn, tables=('t1', 't2'))
+
+        self.assertEqual('DROP TABLE IF EXISTS t1, t2', p.call_args[0][1])
+
+
+class CreateTableTestCase(unittest.TestCase):
+    """Test create_table."""
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = db.connect_loop()
+
+    def test_query(self):
+        with patch('MySQLdb.cursors.Cursor.execute', autospec=True) as p:
+            db.create_table(db_conn=self.conn, table='bleh',
+                            columns={'id': 'INT AUTO_INCREMENT',
+                                     't': 'DATETIME'},
+                            primary_key='id', indexes={'i_t': 't'},
+                            engine='MEMORY')
+
+        self.assertEqual('CREATE TABLE IF NOT EXISTS bleh ('
+                         'id INT AUTO_INCREMENT, t DATETIME, PRIMARY KEY (id),'
+                         ' INDEX i_t (t) USING BTREE) ENGINE=MEMORY',
+                         p.call_args[0][1])
+
+    def test_query_minimal(self):
+        with patch('MySQLdb.cursors.Cursor.execute', autospec=True) as p:
+            db.create_table(db_conn=self.conn, table='bleh',
+                            columns={'a': 'DOUBLE'})
+
+        self.assertEqual('CREATE TABLE IF NOT EXISTS bleh (a DOUBLE)',
+                         p.call_args[0][1])
+
+    def test_create(self):
+        db.create_table(db_conn=self.conn, table='pyvvo_test_2',
+                        columns={'id': 'INT AUTO_INCREMENT',
+                                 't': 'DATETIME', 'v': 'DOUBLE'},
+                        primary_key='id', indexes={'i_t': 't'},
+                        engine='MEMORY')
+        try:
+            out = db.execute_and_fetch_all(
+                db_conn=self.conn,
+                query="SELECT ENGINE FROM information_schema.TABLES WHERE "
+                      "TABLE_NAME = 'pyvvo_test_2'")
+            self.assertEqual((('MEMORY',),), out)
+        finally:
+            db.drop_tables(db_conn=self.conn, tables=['pyvvo_test_2'])
+
+
+class PersistentConnectionTestCase(unittest.TestCase):
+    """Test PersistentConnection. The connection is mocked, so we can
+    pretend it dies.
+    """
+
+    def setUp(self):
+        self.pc = db.PersistentConnection(timeout=1, retry_interval=0.5)
+
+    def test_lazy(self):
+        with patch('pyvvo.db.connect_loop') as p:
+            self.assertFalse(self.pc.connected)
+
+        p.assert_not_called()
+
+    def test_reuse(self):
+        with patch('pyvvo.db.connect_loop') as p:
+            c1 = self.pc.get()
+            c2 = self.pc.get()
+
+        self.assertIs(c1, c2)
+        p.assert_called_once_with(timeout=1, retry_interval=0.5)
+        # The connection should be checked before being reused.
+        c1.ping.assert_called_once_with()
+        self.assertTrue(self.pc.connected)
+
+    def test_reconnect(self):
+        with patch('pyvvo.db.connect_loop') as p:
+            c1 = self.pc.get()
+            c1.ping.side_effect = Error('gone away')
+            p.return_value = unittest.mock.MagicMock()
+            c2 = self.pc.get()
+
+        self.assertIsNot(c1, c2)
+        self.assertEqual(2, p.call_count)
+        c1.close.assert_called_once_with()
+
+    def test_close(self):
+        with patch('pyvvo.db.connect_loop'):
+            c = self.pc.get()
+
+        c.close.side_effect = Error('already closed')
+        self.pc.close()
+        c.close.assert_called_once_with()
+        self.assertFalse(self.pc.connected)
+
+
 if __name__ == '__main__':
     unittest.main()
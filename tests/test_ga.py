@@ -1,12 +1,15 @@
 import unittest
 from unittest.mock import patch, create_autospec, NonCallableMagicMock
 import os
+import tempfile
 from datetime import datetime
 from copy import deepcopy
 import multiprocessing as mp
 import threading
 from time import sleep
-import itertools
+import time
+import queue
+import pickle
 
 import tests.data_files as _df
 from tests.models import IEEE_9500, IEEE_13
@@ -15,6 +18,7 @@ from pyvvo import equipment
 from pyvvo.glm import GLMManager
 from pyvvo.utils import run_gld, time_limit
 from pyvvo import db
+from pyvvo import utils
 
 import numpy as np
 import pandas as pd
@@ -322,6 +326,14 @@ class PrepGLMMGRTestCase(unittest.TestCase):
                                       obj_name=ga.SUBSTATION_RECORDER)
         self.assertIsNotNone(sr)
 
+    def test_template_compiled(self):
+        self.assertEqual(list(ga.TEMPLATE_OBJECTS),
+                         self.glm_mgr._template_spec)
+
+    def test_compacted(self):
+        tl = self.glm_mgr.get_objects_by_type('triplex_load')
+        self.assertIs(tl[0]['groupid'], tl[1]['groupid'])
+
     def test_model_runs(self):
         result = run_gld(self.out_file)
         self.assertEqual(0, result.returncode)
@@ -377,6 +389,67 @@ class PrepGLMMGR9500TestCase(unittest.TestCase):
         self.assertEqual(0, result.returncode)
 
 
+class ModelFingerprintTestCase(unittest.TestCase):
+    """Test model_fingerprint. Use a tiny hand-written model so the
+    tests are quick.
+    """
+
+    MODEL = """
+clock {
+  starttime '2013-04-01 12:00:00';
+  stoptime '2013-04-01 12:01:00';
+}
+object switch {
+  name "swt_1";
+  status CLOSED;
+}
+"""
+
+    def setUp(self):
+        self.glm_mgr = GLMManager(model=self.MODEL, model_is_path=False)
+        self.chrom_map = {'reg_1': {'A': {'idx': (0, 6), 'range': (0, 32)}}}
+        self.starttime = datetime(2013, 4, 1, 12, 0)
+        self.stoptime = datetime(2013, 4, 1, 12, 1)
+
+    def fingerprint(self, starttime=None, stoptime=None, chrom_map=None):
+        return ga.model_fingerprint(
+            glm_mgr=self.glm_mgr,
+            chrom_map=self.chrom_map if chrom_map is None else chrom_map,
+            starttime=self.starttime if starttime is None else starttime,
+            stoptime=self.stoptime if stoptime is None else stoptime)
+
+    def test_deterministic(self):
+        self.assertEqual(self.fingerprint(), self.fingerprint())
+
+    def test_clock_ignored(self):
+        """A new interval of the same duration should not change the
+        fingerprint.
+        """
+        f1 = self.fingerprint()
+        self.glm_mgr.add_or_modify_clock(
+            starttime=datetime(2013, 4, 1, 13, 0),
+            stoptime=datetime(2013, 4, 1, 13, 1))
+        f2 = self.fingerprint(starttime=datetime(2013, 4, 1, 13, 0),
+                              stoptime=datetime(2013, 4, 1, 13, 1))
+        self.assertEqual(f1, f2)
+
+    def test_duration(self):
+        f1 = self.fingerprint()
+        f2 = self.fingerprint(stoptime=datetime(2013, 4, 1, 12, 2))
+        self.assertNotEqual(f1, f2)
+
+    def test_model_change(self):
+        f1 = self.fingerprint()
+        self.glm_mgr.modify_item({'object': 'switch', 'name': '"swt_1"',
+                                  'status': 'OPEN'})
+        self.assertNotEqual(f1, self.fingerprint())
+
+    def test_chrom_map_change(self):
+        f1 = self.fingerprint()
+        chrom_map = {'reg_1': {'B': {'idx': (0, 6), 'range': (0, 32)}}}
+        self.assertNotEqual(f1, self.fingerprint(chrom_map=chrom_map))
+
+
 class IndividualTestCase(unittest.TestCase):
     """Test everything that doesn't involve a glm.GLMManager. Those
     tests are more involved and will be done elsewhere.
@@ -483,9 +556,13 @@ class IndividualTestCase(unittest.TestCase):
         c[idx3[0]:idx3[1]] = ga._int_to_binary_list(25, m=32)
 
         # Patch the 'VREG3' range and run the check. No need to patch
-        # the 'VREG2' range since it's above the maximum.
-        with patch.dict(self.ind._chrom_map['vreg3_c']['C'],
-                        {'range': (31, 32)}):
+        # the 'VREG2' range since it's above the maximum. The ranges
+        # live in the Individual's layout.
+        k = self.ind.layout.eq_objs.index(
+            self.ind._chrom_map['vreg3_c']['C']['eq_obj'])
+        low = self.ind.layout.low.copy()
+        low[k] = 31
+        with patch.object(self.ind.layout, '_low', low):
             c_new = self.ind._check_and_fix_chromosome(c)
 
         # Violations above should be cut down to the top of the range.
@@ -744,8 +821,8 @@ class IndividualTestCase(unittest.TestCase):
                       log.output[0])
 
     def test_special_init_none(self):
-        """Ensure np.random.randint is called once for each piece of
-        equipment."""
+        """Ensure np.random.randint is called once, drawing a value for
+        every piece of equipment."""
 
         with patch('numpy.random.randint', wraps=np.random.randint) as p:
             ga.Individual(uid=0, chrom_len=self.len,
@@ -753,8 +830,24 @@ class IndividualTestCase(unittest.TestCase):
                           chrom_map=self.map, num_eq=self.num_eq,
                           special_init=None)
 
+        p.assert_called_once()
         # 6 three phase regs, 9 single phase caps.
-        self.assertEqual(6 * 3 + 9, p.call_count)
+        self.assertEqual(6 * 3 + 9, len(p.call_args[0][0]))
+
+    def test_layout_bad_type(self):
+        with self.assertRaisesRegex(TypeError, 'layout must be None or a'):
+            ga.Individual(uid=0, chrom_len=self.len, chrom_map=self.map,
+                          num_eq=self.num_eq, layout=self.map)
+
+    def test_layout_shared_with_children(self):
+        ind1 = ga.Individual(uid=0, chrom_len=self.len, chrom_map=self.map,
+                             num_eq=self.num_eq)
+        ind2 = ga.Individual(uid=1, chrom_len=self.len, chrom_map=self.map,
+                             num_eq=self.num_eq, layout=ind1.layout)
+        self.assertIs(ind1.layout, ind2.layout)
+
+        for child in ind1.crossover_by_gene(ind2, 2, 3):
+            self.assertIs(ind1.layout, child.layout)
 
     def test_special_init_max(self):
         """Ensure each piece of equipment is at its max."""
@@ -943,6 +1036,16 @@ class IndividualUpdateModelComputeCostsTestCase(unittest.TestCase):
         self.assertEqual(9, pc.call_count)
         self.assertEqual(18, pr.call_count)
 
+    @patch.dict(ga.CONFIG, {'costs': {'regulator_tap': 10,
+                                      'capacitor_switch': 10}})
+    def test_compute_switching_costs(self):
+        """_compute_switching_costs should agree with
+        _update_model_compute_costs, but not touch a model.
+        """
+        reg_penalty, cap_penalty = self.ind._compute_switching_costs()
+        self.assertEqual(9 * 10, cap_penalty)
+        self.assertEqual(3 * 6 * 32 * 10, reg_penalty)
+
 
 class IndividualUpdateCapBadStateTestCase(unittest.TestCase):
 
@@ -1032,7 +1135,8 @@ class IndividualEvaluateTestCase(unittest.TestCase):
         eval_init_patch.assert_called_once()
         self.assertDictEqual(eval_init_patch.call_args[1],
                              {'uid': self.ind.uid, 'glm_mgr': self.mock_glm,
-                              'db_conn': self.mock_db})
+                              'db_conn': self.mock_db, 'slot': None,
+                              'cancel_event': None})
 
         # Ensure _Evaluator._evaluate is called.
         eval_evaluate_patch.assert_called_once()
@@ -1061,6 +1165,32 @@ class IndividualEvaluateTestCase(unittest.TestCase):
         self.assertEqual(self.ind.fitness, np.inf)
         self.assertIsNone(self.ind.penalties)
 
+    def test_evaluate_from_cache(self):
+        """Switching costs should be recomputed, not taken from the
+        cached penalties.
+        """
+        cached = {**PARTIAL_DICT, 'regulator_tap': 100,
+                  'capacitor_switch': 100}
+        with patch.object(self.ind, '_compute_switching_costs',
+                          autospec=True, return_value=(6, 7)) as p:
+            self.ind.evaluate_from_cache(cached)
+
+        p.assert_called_once()
+        self.assertEqual(28, self.ind.fitness)
+        expected = {**PARTIAL_DICT, 'regulator_tap': 6, 'capacitor_switch': 7}
+        self.assertDictEqual(expected, self.ind.penalties)
+
+        # The input should not have been modified.
+        self.assertEqual(100, cached['regulator_tap'])
+
+    def test_evaluate_from_result(self):
+        self.assertIsNone(self.ind.eval_time)
+        self.ind.evaluate_from_result(fitness=15, penalties=PARTIAL_DICT,
+                                      eval_time=2.5)
+        self.assertEqual(15, self.ind.fitness)
+        self.assertIs(PARTIAL_DICT, self.ind.penalties)
+        self.assertEqual(2.5, self.ind.eval_time)
+
 
 class PatchSubprocessResult:
     def __init__(self):
@@ -1087,6 +1217,13 @@ class EvaluatorTestCase(unittest.TestCase):
         self.db_conn = \
             unittest.mock.create_autospec(MySQLdb.connection)
         self.glm_fresh = deepcopy(self.glm_mgr)
+        # Don't create tables with the mock connection.
+        create_patch = patch('pyvvo.ga.create_recorder_tables', autospec=True)
+        create_patch.start()
+        self.addCleanup(create_patch.stop)
+        drop_patch = patch('pyvvo.ga.db.drop_tables', autospec=True)
+        drop_patch.start()
+        self.addCleanup(drop_patch.stop)
         # Patch the truncate table call for speed.
         with patch('pyvvo.db.truncate_table', autospec=True):
             self.evaluator = ga._Evaluator(uid=23, glm_mgr=self.glm_fresh,
@@ -1119,6 +1256,58 @@ class EvaluatorTestCase(unittest.TestCase):
                          '{}_{}'.format(ga.SUBSTATION_TABLE,
                                         self.evaluator.uid))
 
+    def test_init_slot(self):
+        """Tables should be named by slot rather than uid if given."""
+        with patch('pyvvo.db.truncate_table', autospec=True) as p:
+            evaluator = ga._Evaluator(uid=23, glm_mgr=self.glm_fresh,
+                                      db_conn=self.db_conn, slot=2)
+
+        self.assertEqual('{}_2'.format(ga.TRIPLEX_TABLE),
+                         evaluator.triplex_table)
+        self.assertEqual('{}_2'.format(ga.SUBSTATION_TABLE),
+                         evaluator.substation_table)
+        # Reused tables must still be truncated.
+        self.assertEqual(2, p.call_count)
+
+    def test_init_creates_tables(self):
+        with patch('pyvvo.db.truncate_table', autospec=True):
+            with patch('pyvvo.ga.create_recorder_tables',
+                       autospec=True) as p:
+                evaluator = ga._Evaluator(uid=23, glm_mgr=self.glm_fresh,
+                                          db_conn=self.db_conn)
+
+        p.assert_called_once_with(db_conn=self.db_conn,
+                                  triplex_table=evaluator.triplex_table,
+                                  substation_table=evaluator.substation_table)
+
+    def test_init_no_recorder_engine(self):
+        """GridLAB-D is left to create the tables."""
+        with patch('pyvvo.db.truncate_table', autospec=True):
+            with patch('pyvvo.ga.create_recorder_tables',
+                       autospec=True) as p:
+                with patch.dict(ga.CONFIG['database'],
+                                {'recorder_engine': None}):
+                    ga._Evaluator(uid=23, glm_mgr=self.glm_fresh,
+                                  db_conn=self.db_conn)
+
+        p.assert_not_called()
+
+    def test_init_recreates_slot_tables(self):
+        """Slot tables should be dropped (so they're recreated with the
+        right engine) only the first time they're used.
+        """
+        with patch.object(ga._Evaluator, '_recreated_slots', set()):
+            with patch('pyvvo.db.truncate_table', autospec=True):
+                with patch('pyvvo.ga.db.drop_tables', autospec=True) as p:
+                    for _ in range(2):
+                        evaluator = ga._Evaluator(
+                            uid=23, glm_mgr=deepcopy(self.glm_mgr),
+                            db_conn=self.db_conn, slot=4)
+
+        p.assert_called_once_with(db_conn=self.db_conn,
+                                  tables=[evaluator.triplex_table,
+                                          evaluator.substation_table])
+
     def test_init_truncates_tables(self):
         with patch('pyvvo.db.truncate_table', autospec=True) as p:
             self.evaluator = ga._Evaluator(uid=23, glm_mgr=self.glm_fresh,
@@ -1307,7 +1496,9 @@ class EvaluatorTestCase(unittest.TestCase):
         write_model_patch.assert_called_with(self.glm_fresh, 'model_23.glm')
 
         run_gld_patch.assert_called_once()
-        run_gld_patch.assert_called_with('model_23.glm')
+        run_gld_patch.assert_called_with(
+            'model_23.glm', timeout=ga.CONFIG['ga']['gld_timeout'],
+            cancel_event=None)
 
         hv_patch.assert_called_once()
 
@@ -1332,6 +1523,386 @@ class EvaluatorTestCase(unittest.TestCase):
                              penalties)
 
 
+TAPE_TRIPLEX_CSV = """# file...... triplex_23.csv
+# date...... Mon Apr  1 12:00:00 2013
+# group..... groupid=tl
+# property.. measured_voltage_12
+# limit..... -1
+# interval.. 5
+# timestamp,tl_1,tl_2
+2013-04-01 12:00:00 UTC,+200,+260
+2013-04-01 12:00:05 UTC,+227,+240
+2013-04-01 12:00:10 UTC,+241.5,+254
+"""
+
+TAPE_SUBSTATION_CSV = """# file...... substation_23.csv
+# date...... Mon Apr  1 12:00:00 2013
+# target.... sub_meter
+# trigger... (none)
+# interval.. 5
+# limit..... -1
+# timestamp,measured_real_energy,measured_real_power,measured_reactive_power
+2013-04-01 12:00:00 UTC,+0,+1000,+10
+2013-04-01 12:00:05 UTC,+2000,+1000,+500
+2013-04-01 12:00:10 UTC,+4000,+1000,-500
+"""
+
+
+class FileEvaluatorTestCase(unittest.TestCase):
+    """Test _FileEvaluator and get_evaluator_class."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        config = patch.dict(ga.CONFIG['ga'],
+                            {'results_dir': self.tmp_dir.name,
+                             'results_backend': 'file'})
+        config.start()
+        self.addCleanup(config.stop)
+
+        self.glm_mgr = GLMManager("""
+            clock {
+                starttime '2013-04-01 12:00:00';
+                stoptime '2013-04-01 12:00:10';
+            }
+            object meter {
+                name sub_meter;
+            }
+            """, model_is_path=False)
+        ga._FileEvaluator.add_recorders(self.glm_mgr, sub_meter='sub_meter')
+        self.evaluator = ga._FileEvaluator(uid=23,
+                                           glm_mgr=self.glm_mgr.fork())
+
+    def write_files(self, *args, **kwargs):
+        with open(self.evaluator.triplex_file, 'w') as f:
+            f.write(TAPE_TRIPLEX_CSV)
+        with open(self.evaluator.substation_file, 'w') as f:
+            f.write(TAPE_SUBSTATION_CSV)
+
+        return PatchSubprocessResult()
+
+    def test_get_evaluator_class(self):
+        self.assertIs(ga._FileEvaluator, ga.get_evaluator_class())
+        self.assertFalse(ga.get_evaluator_class().uses_db)
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'mysql'}):
+            self.assertIs(ga._Evaluator, ga.get_evaluator_class())
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'bogus'}):
+            with self.assertRaisesRegex(ValueError, 'Unknown results_back'):
+                ga.get_evaluator_class()
+
+    def test_add_recorders(self):
+        self.assertTrue(self.glm_mgr.module_present('tape'))
+        self.assertFalse(self.glm_mgr.module_present('mysql'))
+        gr = self.glm_mgr.find_object('group_recorder', ga.TRIPLEX_RECORDER)
+        self.assertEqual('"groupid={}"'.format(ga.TRIPLEX_GROUP), gr['group'])
+        r = self.glm_mgr.find_object('recorder', ga.SUBSTATION_RECORDER)
+        self.assertEqual('sub_meter', r['parent'])
+
+    def test_init_files(self):
+        self.assertEqual(os.path.join(self.tmp_dir.name, str(os.getpid()),
+                                      'triplex_23.csv'),
+                         self.evaluator.triplex_file)
+        gr = self.evaluator.glm_mgr.find_object('group_recorder',
+                                                ga.TRIPLEX_RECORDER)
+        self.assertEqual(self.evaluator.triplex_file, gr['file'])
+        r = self.evaluator.glm_mgr.find_object('recorder',
+                                               ga.SUBSTATION_RECORDER)
+        self.assertEqual(self.evaluator.substation_file, r['file'])
+
+    def test_init_slot(self):
+        evaluator = ga._FileEvaluator(uid=23, glm_mgr=self.glm_mgr.fork(),
+                                      slot=1)
+        self.assertEqual('triplex_1.csv',
+                         os.path.basename(evaluator.triplex_file))
+        self.assertEqual('substation_1.csv',
+                         os.path.basename(evaluator.substation_file))
+
+    def test_voltage_penalties(self):
+        self.write_files()
+        # The first time step is skipped, so only 227 (low) and 254
+        # (high) are violations.
+        with patch.dict(ga.CONFIG['costs'], {'voltage_violation_low': 2,
+                                             'voltage_violation_high': 3}):
+            self.assertAlmostEqual((228 - 227) * 2,
+                                   self.evaluator._low_voltage_penalty())
+            self.assertAlmostEqual((254 - 252) * 3,
+                                   self.evaluator._high_voltage_penalty())
+
+    def test_get_substation_data(self):
+        self.write_files()
+        data = self.evaluator._get_substation_data()
+        self.assertEqual(ga.SUBSTATION_COLUMNS, set(data.columns))
+        np.testing.assert_array_equal([2000, 4000],
+                                      data[ga.SUBSTATION_ENERGY].values)
+        np.testing.assert_array_equal([500, -500],
+                                      data[ga.SUBSTATION_REACTIVE_POWER])
+
+    def test_get_substation_data_empty(self):
+        with open(self.evaluator.substation_file, 'w') as f:
+            f.write(TAPE_SUBSTATION_CSV.splitlines(keepends=True)[-3])
+            f.write(TAPE_SUBSTATION_CSV.splitlines(keepends=True)[7])
+
+        with self.assertRaisesRegex(ValueError, 'No substation data'):
+            self.evaluator._get_substation_data()
+
+    def test_evaluate(self):
+        with patch('pyvvo.utils.run_gld', side_effect=self.write_files):
+            penalties = self.evaluator.evaluate()
+
+        self.assertEqual({'voltage_high', 'voltage_low', 'power_factor_lead',
+                          'power_factor_lag', 'energy'}, set(penalties))
+        self.assertAlmostEqual(
+            4000 * ga.TO_KW_FACTOR * ga.CONFIG['costs']['energy'],
+            penalties['energy'])
+
+        # Files should be cleaned up.
+        self.assertFalse(os.path.exists(self.evaluator.triplex_file))
+        self.assertFalse(os.path.exists(self.evaluator.substation_file))
+
+    def test_units(self):
+        """Values with units should be handled."""
+        with open(self.evaluator.substation_file, 'w') as f:
+            f.write(TAPE_SUBSTATION_CSV.replace(',+1000,', ',+1000 W,'))
+
+        data = self.evaluator._get_substation_data()
+        np.testing.assert_array_equal([1000, 1000],
+                                      data[ga.SUBSTATION_REAL_POWER])
+
+
+TAPE_LOW_COLLECTOR_CSV = """# file...... triplex_low_23.csv
+# date...... Mon Apr  1 12:00:00 2013
+# group..... groupid=tl AND measured_voltage_12.mag<228.0
+# interval.. 5
+# limit..... -1
+# timestamp,sum(measured_voltage_12.mag),count(measured_voltage_12.mag)
+2013-04-01 12:00:00 UTC,+1000,+5
+2013-04-01 12:00:05 UTC,+450,+2
+2013-04-01 12:00:10 UTC,+227.5,+1
+"""
+
+TAPE_HIGH_COLLECTOR_CSV = """# file...... triplex_high_23.csv
+# date...... Mon Apr  1 12:00:00 2013
+# group..... groupid=tl AND measured_voltage_12.mag>252.0
+# interval.. 5
+# limit..... -1
+# timestamp,sum(measured_voltage_12.mag),count(measured_voltage_12.mag)
+2013-04-01 12:00:00 UTC,+1300,+5
+2013-04-01 12:00:05 UTC,nan,+0
+2013-04-01 12:00:10 UTC,+508,+2
+"""
+
+
+class AggregateEvaluatorTestCase(unittest.TestCase):
+    """Test _AggregateEvaluator."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        config = patch.dict(ga.CONFIG['ga'],
+                            {'results_dir': self.tmp_dir.name,
+                             'results_backend': 'aggregate'})
+        config.start()
+        self.addCleanup(config.stop)
+
+        self.glm_mgr = GLMManager("""
+            clock {
+                starttime '2013-04-01 12:00:00';
+                stoptime '2013-04-01 12:00:10';
+            }
+            object meter {
+                name sub_meter;
+            }
+            """, model_is_path=False)
+        ga.get_evaluator_class().add_recorders(self.glm_mgr,
+                                               sub_meter='sub_meter')
+        self.evaluator = ga._AggregateEvaluator(uid=23,
+                                                glm_mgr=self.glm_mgr.fork())
+
+    def write_files(self, *args, **kwargs):
+        for name, data in (
+                (ga.TRIPLEX_LOW_COLLECTOR, TAPE_LOW_COLLECTOR_CSV),
+                (ga.TRIPLEX_HIGH_COLLECTOR, TAPE_HIGH_COLLECTOR_CSV),
+                (ga.SUBSTATION_RECORDER, TAPE_SUBSTATION_CSV)):
+            with open(self.evaluator.files[name], 'w') as f:
+                f.write(data)
+
+        return PatchSubprocessResult()
+
+    def test_get_evaluator_class(self):
+        self.assertIs(ga._AggregateEvaluator, ga.get_evaluator_class())
+        self.assertFalse(ga.get_evaluator_class().uses_db)
+
+    def test_add_recorders(self):
+        self.assertTrue(self.glm_mgr.module_present('tape'))
+        self.assertIsNone(
+            self.glm_mgr.find_object('group_recorder', ga.TRIPLEX_RECORDER))
+        low = self.glm_mgr.find_object('collector', ga.TRIPLEX_LOW_COLLECTOR)
+        self.assertEqual('"groupid=tl AND measured_voltage_12.mag<228.0"',
+                         low['group'])
+        self.assertEqual('"sum(measured_voltage_12.mag),'
+                         'count(measured_voltage_12.mag)"', low['property'])
+        high = self.glm_mgr.find_object('collector',
+                                        ga.TRIPLEX_HIGH_COLLECTOR)
+        self.assertEqual('"groupid=tl AND measured_voltage_12.mag>252.0"',
+                         high['group'])
+        r = self.glm_mgr.find_object('recorder', ga.SUBSTATION_RECORDER)
+        self.assertEqual('sub_meter', r['parent'])
+
+    def test_init_files(self):
+        self.assertEqual(3, len(self.evaluator.files))
+        self.assertIsNone(self.evaluator.triplex_file)
+        for obj_type, name, _ in ga._AggregateEvaluator.TAPE_OBJECTS:
+            self.assertEqual(
+                self.evaluator.files[name],
+                self.evaluator.glm_mgr.find_object(obj_type, name)['file'])
+
+    def test_template(self):
+        """The collectors' files change for every Individual, so they
+        shouldn't be pre-rendered.
+        """
+        self.glm_mgr.compile_template(ga.TEMPLATE_OBJECTS)
+        evaluator = ga._AggregateEvaluator(uid=24, glm_mgr=self.glm_mgr.fork())
+        out = os.path.join(self.tmp_dir.name, 'model.glm')
+        evaluator.glm_mgr.write_model(out)
+        with open(out) as f:
+            model = f.read()
+
+        for path in evaluator.files.values():
+            self.assertIn(path, model)
+
+    def test_voltage_penalties(self):
+        self.write_files()
+        # The first time step is skipped.
+        with patch.dict(ga.CONFIG['costs'], {'voltage_violation_low': 2,
+                                             'voltage_violation_high': 3}):
+            self.assertAlmostEqual(((228 * 2 - 450) + (228 - 227.5)) * 2,
+                                   self.evaluator._low_voltage_penalty())
+            self.assertAlmostEqual((508 - 252 * 2) * 3,
+                                   self.evaluator._high_voltage_penalty())
+
+    def test_evaluate(self):
+        with patch('pyvvo.utils.run_gld', side_effect=self.write_files):
+            penalties = self.evaluator.evaluate()
+
+        self.assertEqual({'voltage_high', 'voltage_low', 'power_factor_lead',
+                          'power_factor_lag', 'energy'}, set(penalties))
+
+        for path in self.evaluator.files.values():
+            self.assertFalse(os.path.exists(path))
+
+
+class ResultsBackendsTestCase(unittest.TestCase):
+    """Evaluate the same Individual with each results backend, actually
+    running GridLAB-D, and ensure the penalties agree. The 9500 node
+    model is used, since it has triplex loads. This will be slow.
+    """
+
+    # The Individual's uid, which names the recorder tables.
+    UID = 9999
+
+    @classmethod
+    def setUpClass(cls):
+        reg_df = _df.read_pickle(_df.REGULATORS_9500)
+        cap_df = _df.read_pickle(_df.CAPACITORS_9500)
+        regs = equipment.initialize_regulators(reg_df)
+        caps = equipment.initialize_capacitors(cap_df)
+        chrom_map, chrom_len, num_eq = ga.map_chromosome(regs, caps)
+        cls.ind = ga.Individual(uid=cls.UID, chrom_len=chrom_len,
+                                chrom_map=chrom_map, num_eq=num_eq,
+                                special_init='current_state')
+
+        cls.glm_mgr = GLMManager(IEEE_9500)
+        # 20 second model runtime.
+        cls.starttime = datetime(2013, 4, 1, 12, 0)
+        cls.stoptime = datetime(2013, 4, 1, 12, 0, 20)
+
+        cls.db_conn = db.connect_loop()
+        cls.results_dir = tempfile.TemporaryDirectory()
+
+        # Reference: MySQL recorders writing to tables GridLAB-D
+        # creates itself.
+        cls.expected = cls.evaluate(results_backend='mysql')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.drop_tables()
+        cls.db_conn.close()
+        cls.results_dir.cleanup()
+
+        try:
+            os.remove('gridlabd.xml')
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def drop_tables(cls):
+        db.drop_tables(db_conn=cls.db_conn,
+                       tables=['{}_{}'.format(prefix, cls.UID) for prefix
+                               in (ga.TRIPLEX_TABLE, ga.SUBSTATION_TABLE)])
+
+    @classmethod
+    def evaluate(cls, results_backend, recorder_engine=None):
+        """Prep a copy of the model for the given results backend, and
+        evaluate a copy of the Individual with it.
+
+        The voltage limits are tightened so that every triplex load
+        violates both of them, ensuring the voltage penalties aren't
+        trivially zero.
+
+        :returns: The Individual's penalties.
+        """
+        # Start from scratch, so tables aren't left over from a run
+        # with a different recorder_engine.
+        cls.drop_tables()
+
+        glm_mgr = deepcopy(cls.glm_mgr)
+        ind = deepcopy(cls.ind)
+
+        with patch.dict(ga.CONFIG['ga'],
+                        {'results_backend': results_backend,
+                         'results_dir': cls.results_dir.name}):
+            with patch.dict(ga.CONFIG['database'],
+                            {'recorder_engine': recorder_engine}):
+                with patch.multiple(ga, TRIPLEX_LOW_VOLTAGE=250,
+                                    TRIPLEX_HIGH_VOLTAGE=230):
+                    ga.prep_glm_mgr(glm_mgr, cls.starttime, cls.stoptime)
+                    ind.evaluate(glm_mgr=glm_mgr, db_conn=cls.db_conn)
+
+        return ind.penalties
+
+    def assert_penalties_match(self, expected, actual):
+        self.assertEqual(set(expected), set(actual))
+        self.assertGreater(expected['voltage_low'], 0)
+        self.assertGreater(expected['voltage_high'], 0)
+
+        # MySQL and the tape files may not store values with the same
+        # precision.
+        for k, v in expected.items():
+            np.testing.assert_allclose(actual[k], v, rtol=1e-3, atol=1e-6,
+                                       err_msg=k)
+
+    def test_file(self):
+        self.assert_penalties_match(
+            self.expected, self.evaluate(results_backend='file'))
+
+    def test_recorder_engine(self):
+        """GridLAB-D should append to the tables created by
+        create_recorder_tables just as it does to its own.
+        """
+        self.assert_penalties_match(
+            self.expected, self.evaluate(results_backend='mysql',
+                                         recorder_engine='MEMORY'))
+
+    def test_aggregate(self):
+        """The collectors must pick out the triplex loads which violate
+        the limits at every sample, giving the same voltage penalties as
+        recording every triplex load.
+        """
+        expected = self.evaluate(results_backend='file')
+        actual = self.evaluate(results_backend='aggregate')
+        self.assert_penalties_match(expected, actual)
+
+
 class MockIndividual:
     """Mock objects don't like being pickled.
 
@@ -1354,6 +1925,20 @@ class MockIndividual:
         self.penalties = {'p1': 10, 'p2': 30, 'p3': 0.1}
 
 
+class CacheableMockIndividual(MockIndividual):
+    """MockIndividual with a chromosome, so it can be used with a
+    FitnessCache.
+    """
+
+    def __init__(self, chromosome, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chromosome = chromosome
+
+    def evaluate_from_cache(self, penalties):
+        self.penalties = penalties
+        self.fitness = sum(penalties.values())
+
+
 class MockIndividual2(MockIndividual):
     """Same as MockIndividual, except evaluate throws and exception."""
     def evaluate(self, *args, **kwargs):
@@ -1373,6 +1958,20 @@ class SleepyMockIndividual(MockIndividual):
         self.penalties = {'p1': 10, 'p2': 30, 'p3': 0.1}
 
 
+def _fake_individual_evaluate(self, glm_mgr, db_conn, slot=None,
+                              cancel_event=None):
+    """Module level stand-in for Individual.evaluate which doesn't run
+    GridLAB-D. It has to be module level (rather than a Mock) so that
+    it survives being inherited by the evaluation processes.
+    """
+    self._penalties = {'p1': float(np.count_nonzero(self.chromosome))}
+    self._fitness = self._penalties['p1']
+
+
+def _fake_connect_loop(*args, **kwargs):
+    return None
+
+
 class EvaluateWorkerBadInputTestCase(unittest.TestCase):
 
     def test_bad_input_queue(self):
@@ -1475,6 +2074,671 @@ class EvaluateWorkerTestCase(unittest.TestCase):
         self.assertFalse(self.p.is_alive())
 
 
+class ModelEchoMockIndividual(MockIndividual):
+    """Same as MockIndividual, except evaluate records the model it was
+    given in the penalties.
+    """
+
+    def evaluate(self, glm_mgr, *args, **kwargs):
+        self.fitness = 1
+        self.penalties = {'model': glm_mgr}
+
+
+class VoltageEchoMockIndividual(MockIndividual):
+    """Same as MockIndividual, except evaluate records the nominal
+    voltage of the meter 'm1' in the model it was given.
+    """
+
+    def evaluate(self, glm_mgr, *args, **kwargs):
+        self.fitness = 1
+        self.penalties = {
+            'voltage': glm_mgr.find_object('meter', 'm1')['nominal_voltage']}
+
+
+class KwargsEchoMockIndividual(MockIndividual):
+    """Same as MockIndividual, except evaluate records the database
+    connection and slot it was given in the penalties.
+    """
+
+    def evaluate(self, glm_mgr, db_conn, slot=None, cancel_event=None):
+        self.fitness = 1
+        self.penalties = {'db_conn': db_conn, 'slot': slot}
+
+
+class CancelledMockIndividual(MockIndividual):
+    """Same as MockIndividual, except evaluate raises a
+    utils.GLDCancelledError.
+    """
+
+    def evaluate(self, *args, **kwargs):
+        raise utils.GLDCancelledError('Dummy cancellation for testing.')
+
+
+class GLDMockIndividual(MockIndividual):
+    """Same as MockIndividual, except evaluate runs a fake GridLAB-D
+    which sleeps for a long time.
+    """
+
+    def __init__(self, gld_dir, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gld_dir = gld_dir
+
+    def evaluate(self, glm_mgr, db_conn, slot=None, cancel_event=None):
+        utils.run_gld('model.glm',
+                      env={'PATH': self.gld_dir + ':/usr/bin:/bin',
+                           'FAKE_SLEEP': '30'},
+                      cancel_event=cancel_event)
+        self.fitness = 1
+
+
+class EvaluateItemTestCase(unittest.TestCase):
+    """Test _evaluate_item."""
+
+    def test_fork(self):
+        """Individuals should get a view of the model, not the model
+        itself.
+        """
+        glm_mgr = GLMManager('clock {\n timezone UTC0;\n}\n',
+                             model_is_path=False)
+        logging_queue = queue.Queue()
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            ind = ga._evaluate_item(item=ModelEchoMockIndividual(),
+                                    glm_mgr=glm_mgr, layout=None,
+                                    logging_queue=logging_queue)
+
+        view = ind.penalties['model']
+        self.assertIsInstance(view, ga.glm.GLMOverlay)
+        self.assertIs(glm_mgr, view.base)
+
+    def test_persistent_connection(self):
+        """A given connection should be used rather than connecting,
+        and the slot passed along.
+        """
+        db_conn = unittest.mock.create_autospec(db.PersistentConnection,
+                                                instance=True)
+        logging_queue = queue.Queue()
+        glm_mgr = GLMManager('clock {\n}\n', model_is_path=False)
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'mysql'}):
+            with patch('pyvvo.ga.db.connect_loop') as p_connect:
+                ind = ga._evaluate_item(item=KwargsEchoMockIndividual(),
+                                        glm_mgr=glm_mgr,
+                                        layout=None,
+                                        logging_queue=logging_queue,
+                                        db_conn=db_conn, slot=3)
+
+        p_connect.assert_not_called()
+        db_conn.get.assert_called_once_with()
+        self.assertIs(db_conn.get.return_value, ind.penalties['db_conn'])
+        self.assertEqual(3, ind.penalties['slot'])
+
+    def test_file_backend_no_connection(self):
+        db_conn = unittest.mock.create_autospec(db.PersistentConnection,
+                                                instance=True)
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'file'}):
+            ind = ga._evaluate_item(item=KwargsEchoMockIndividual(),
+                                    glm_mgr=GLMManager('clock {\n}\n',
+                                                       model_is_path=False),
+                                    layout=None,
+                                    logging_queue=queue.Queue(),
+                                    db_conn=db_conn, slot=3)
+
+        db_conn.get.assert_not_called()
+        self.assertIsNone(ind.penalties['db_conn'])
+
+    def test_cancelled_before_start(self):
+        """Cancelled items shouldn't be evaluated at all."""
+        event = threading.Event()
+        event.set()
+        logging_queue = queue.Queue()
+        ind = ga._evaluate_item(item=MockIndividual(), glm_mgr='model',
+                                layout=None, logging_queue=logging_queue,
+                                cancel_event=event)
+        self.assertIsNone(ind.fitness)
+
+        uid, fitness, penalties, _ = ga._evaluate_item(
+            item=(3, b'\x00'), glm_mgr='model', layout=None,
+            logging_queue=logging_queue, cancel_event=event)
+        self.assertEqual((3, np.inf, None), (uid, fitness, penalties))
+
+        self.assertTrue(logging_queue.empty())
+
+    def test_cancelled_mid_run(self):
+        """A cancelled GridLAB-D run isn't an error."""
+        logging_queue = queue.Queue()
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'file'}):
+            ind = ga._evaluate_item(item=CancelledMockIndividual(),
+                                    glm_mgr='model', layout=None,
+                                    logging_queue=logging_queue,
+                                    cancel_event=threading.Event())
+
+        self.assertIsNone(ind.fitness)
+        self.assertTrue(logging_queue.empty())
+
+
+class CatchUpModelTestCase(unittest.TestCase):
+    """Test _catch_up_model."""
+
+    def test_skips_stale_models(self):
+        """Only the newest model should be unpickled."""
+        q = queue.Queue()
+        # Unpickling this would fail.
+        q.put((1, 'model', b'stale'))
+        q.put((2, 'model', pickle.dumps(('model_2', 'map', 3))))
+        q.put((3, 'model', pickle.dumps(('model_3', None, None))))
+
+        out = ga._catch_up_model(control_queue=q, model_version=0,
+                                 version=2, glm_mgr='model_0',
+                                 chrom_map=None, chrom_len=None)
+
+        self.assertEqual((2, 'model_2', 'map', 3), out)
+        # Newer updates stay in the queue.
+        self.assertEqual(3, q.get_nowait()[0])
+
+    def test_patches(self):
+        """Patches after the newest model should be applied, but not
+        those before it.
+        """
+        mgr = GLMManager('object meter {\n name m1;\n'
+                         ' nominal_voltage 120;\n}\n', model_is_path=False)
+        new_mgr = deepcopy(mgr)
+        new_mgr.modify_item({'object': 'meter', 'name': 'm1',
+                             'nominal_voltage': 240})
+
+        q = queue.Queue()
+        q.put((1, 'patch', b'stale'))
+        q.put((2, 'model', pickle.dumps((mgr, None, None))))
+        q.put((3, 'patch', pickle.dumps((mgr.diff(new_mgr), 'map', 2))))
+
+        version, out_mgr, chrom_map, chrom_len = ga._catch_up_model(
+            control_queue=q, model_version=0, version=3, glm_mgr=None,
+            chrom_map=None, chrom_len=None)
+
+        self.assertEqual((3, 'map', 2), (version, chrom_map, chrom_len))
+        self.assertEqual('240', out_mgr.find_object(
+            obj_type='meter', obj_name='m1')['nominal_voltage'])
+
+    def test_worker_failure(self):
+        """If a worker can't catch up, every item in the batch should
+        fail rather than the batch being lost.
+        """
+        control_queue = queue.Queue()
+        # Unpickling this will fail.
+        control_queue.put((1, 'patch', b'bad'))
+        input_queue = queue.Queue()
+        input_queue.put((1, 7, [(3, b'\x00'), (4, b'\x00')]))
+        output_queue = queue.Queue()
+        logging_queue = queue.Queue()
+        busy = [-1]
+
+        with self.assertRaises(pickle.UnpicklingError):
+            ga._evaluate_worker(input_queue=input_queue,
+                                output_queue=output_queue,
+                                logging_queue=logging_queue,
+                                glm_mgr='model_0',
+                                control_queue=control_queue, busy=busy,
+                                worker_id=0)
+
+        self.assertEqual((7, [(3, np.inf, None, 0.0), (4, np.inf, None, 0.0)]),
+                         output_queue.get_nowait())
+        self.assertEqual([-1], busy)
+        self.assertIn('error', logging_queue.get_nowait())
+
+
+class TaskCancelledTestCase(unittest.TestCase):
+    """Test _TaskCancelled."""
+
+    def test_is_set(self):
+        cancelled = mp.Value('q', -1)
+        events = [ga._TaskCancelled(cancelled=cancelled, task_id=i)
+                  for i in range(3)]
+        self.assertFalse(any(e.is_set() for e in events))
+
+        cancelled.value = 1
+        self.assertListEqual([True, True, False],
+                             [e.is_set() for e in events])
+
+
+class CreateRecorderTablesTestCase(unittest.TestCase):
+    """Test create_recorder_tables."""
+
+    def test_create(self):
+        with patch.dict(ga.CONFIG['database'], {'recorder_engine': 'InnoDB'}):
+            with patch('pyvvo.ga.db.create_table') as p:
+                ga.create_recorder_tables(db_conn='conn',
+                                          triplex_table='triplex_1',
+                                          substation_table='substation_1')
+
+        self.assertEqual(2, p.call_count)
+        triplex, substation = [c[1] for c in p.call_args_list]
+        self.assertEqual('triplex_1', triplex['table'])
+        self.assertEqual('substation_1', substation['table'])
+        for kwargs in (triplex, substation):
+            self.assertEqual('conn', kwargs['db_conn'])
+            self.assertEqual('InnoDB', kwargs['engine'])
+            self.assertEqual(ga.ID_COL, kwargs['primary_key'])
+            self.assertEqual({'i_t': ga.TIME_COL}, kwargs['indexes'])
+
+        # The columns must match what the penalty queries expect.
+        self.assertIn(ga.TRIPLEX_PROPERTY_DB, triplex['columns'])
+        self.assertEqual(ga.SUBSTATION_COLUMNS | {ga.ID_COL},
+                         set(substation['columns']))
+
+
+class DropOrphanedTablesTestCase(unittest.TestCase):
+    """Test drop_orphaned_tables."""
+
+    def test_drop(self):
+        tables = {'triplex\\_%': ['triplex_0', 'triplex_1', 'triplex_17',
+                                    'triplex_backup'],
+                  'substation\\_%': ['substation_1', 'substation_42']}
+        with patch('pyvvo.ga.db.list_tables',
+                   side_effect=lambda db_conn, pattern: tables[pattern]):
+            with patch('pyvvo.ga.db.drop_tables') as p_drop:
+                out = ga.drop_orphaned_tables(db_conn='conn', slots=range(2))
+
+        expected = ['triplex_17', 'substation_42']
+        self.assertListEqual(expected, out)
+        p_drop.assert_called_once_with(db_conn='conn', tables=expected)
+
+
+class EvaluatorPoolTestCase(unittest.TestCase):
+    """Test EvaluatorPool."""
+
+    def setUp(self) -> None:
+        # Patch before creating the pool so the processes inherit the
+        # patch.
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            self.pool = ga.EvaluatorPool(processes=2, glm_mgr='model_0')
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+        self.pool.wait(timeout=5)
+
+    def test_bad_processes_type(self):
+        with self.assertRaisesRegex(TypeError, 'processes must be an int'):
+            ga.EvaluatorPool(processes=1.5)
+
+    def test_bad_processes_value(self):
+        with self.assertRaisesRegex(ValueError, 'processes must be at least'):
+            ga.EvaluatorPool(processes=0)
+
+    def test_submit_get(self):
+        self.assertTrue(self.pool.all_alive)
+        self.pool.submit(MockIndividual())
+        self.assertEqual(1, self.pool.n_outstanding)
+
+        ind = self.pool.get(timeout=5)
+        self.assertEqual(1, ind.fitness)
+        self.assertEqual(0, self.pool.n_outstanding)
+
+    def test_set_model(self):
+        self.pool.submit(ModelEchoMockIndividual())
+        self.assertEqual('model_0',
+                         self.pool.get(timeout=5).penalties['model'])
+
+        self.pool.set_model('model_1')
+        self.assertEqual(1, self.pool.model_version)
+
+        # Both workers should pick up the new model.
+        for _ in range(4):
+            self.pool.submit(ModelEchoMockIndividual())
+
+        for _ in range(4):
+            self.assertEqual('model_1',
+                             self.pool.get(timeout=5).penalties['model'])
+
+    def test_set_model_respawn(self):
+        """Respawned workers should get the model as it was when
+        set_model was called, like the other workers.
+        """
+        model = """
+        object meter {
+            name m1;
+            nominal_voltage 120;
+        }
+        """
+        mgr = GLMManager(model, model_is_path=False)
+        self.pool.set_model(mgr)
+        mgr.modify_item({'object': 'meter', 'name': 'm1',
+                         'nominal_voltage': 240})
+
+        p = self.pool.processes[0]
+        p.terminate()
+        p.join(timeout=5)
+
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            with patch.object(self.pool, '_drop_slot_tables'):
+                with self.assertLogs(logger=self.pool.log, level='WARNING'):
+                    self.pool.check_health()
+
+        for _ in range(4):
+            self.pool.submit(VoltageEchoMockIndividual())
+
+        for _ in range(4):
+            self.assertEqual('120',
+                             self.pool.get(timeout=5).penalties['voltage'])
+
+    def test_patch_model(self):
+        model = """
+        object meter {
+            name m1;
+            nominal_voltage 120;
+        }
+        """
+        mgr = GLMManager(model, model_is_path=False)
+        self.pool.set_model(mgr)
+
+        new_mgr = deepcopy(mgr)
+        new_mgr.modify_item({'object': 'meter', 'name': 'm1',
+                             'nominal_voltage': 240})
+        self.pool.patch_model(mgr.diff(new_mgr))
+        self.assertEqual(2, self.pool.model_version)
+
+        # Kill a busy worker, so the patch has to be re-applied after
+        # it's respawned.
+        ind = SleepyMockIndividual()
+        ind.sleep_time = 2
+        self.pool.submit(ind)
+
+        t0 = time.time()
+        while (-1 == max(self.pool._busy)) and (time.time() - t0 < 5):
+            sleep(0.01)
+
+        p = self.pool.processes[int(np.argmax(self.pool._busy[:]))]
+        p.terminate()
+        p.join(timeout=5)
+
+        # The respawned worker needs to inherit the patch too.
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            with patch.object(self.pool, '_drop_slot_tables'):
+                with self.assertLogs(logger=self.pool.log, level='WARNING'):
+                    self.pool.check_health()
+
+        self.assertEqual(1, self.pool.get(timeout=10).fitness)
+
+        for _ in range(4):
+            self.pool.submit(VoltageEchoMockIndividual())
+
+        for _ in range(4):
+            self.assertEqual('240',
+                             self.pool.get(timeout=5).penalties['voltage'])
+
+        # The pool's model is left alone.
+        self.assertEqual('120', mgr.find_object('meter', 'm1')[
+            'nominal_voltage'])
+
+    def test_update_model(self):
+        model = """
+        object meter {
+            name m1;
+            nominal_voltage 120;
+        }
+        """
+        mgr = GLMManager(model, model_is_path=False)
+
+        # The workers' model isn't a GLMManager, so it has to be sent
+        # whole.
+        self.assertFalse(self.pool.update_model(mgr))
+
+        mid_mgr = deepcopy(mgr)
+        mid_mgr.modify_item({'object': 'meter', 'name': 'm1',
+                             'nominal_voltage': 208})
+        self.assertTrue(self.pool.update_model(mid_mgr, chrom_map='map',
+                                               chrom_len=2))
+        self.assertEqual(2, self.pool.model_version)
+        self.assertIs(mid_mgr, self.pool._glm_mgr)
+        self.assertEqual([], self.pool._patches)
+        self.assertEqual(('map', 2),
+                         (self.pool._chrom_map, self.pool._chrom_len))
+
+        # Without a chromosome map, whole individuals are sent, so the
+        # mock individuals can echo the workers' model.
+        new_mgr = deepcopy(mid_mgr)
+        new_mgr.modify_item({'object': 'meter', 'name': 'm1',
+                             'nominal_voltage': 240})
+        self.assertTrue(self.pool.update_model(new_mgr))
+        self.assertEqual(3, self.pool.model_version)
+        self.assertIs(new_mgr, self.pool._glm_mgr)
+        self.assertEqual((None, None),
+                         (self.pool._chrom_map, self.pool._chrom_len))
+
+        for _ in range(4):
+            self.pool.submit(VoltageEchoMockIndividual())
+
+        for _ in range(4):
+            self.assertEqual('240',
+                             self.pool.get(timeout=5).penalties['voltage'])
+
+    def test_cancel(self):
+        for _ in range(4):
+            self.pool.submit(SleepyMockIndividual())
+
+        self.pool.cancel()
+        self.assertEqual(0, self.pool.n_outstanding)
+
+        # Anything which was already in progress gets discarded.
+        with self.assertRaises(queue.Empty):
+            self.pool.get(timeout=0.2)
+
+    def test_check_health_no_respawn(self):
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            pool = ga.EvaluatorPool(processes=1, respawn=False)
+
+        try:
+            p = pool.processes[0]
+            p.terminate()
+            p.join(timeout=5)
+            self.assertFalse(pool.check_health())
+            self.assertIs(p, pool.processes[0])
+        finally:
+            pool.shutdown()
+            pool.wait(timeout=5)
+
+    def test_check_health_respawn(self):
+        """A dead worker should be replaced, and its task resubmitted.
+        """
+        ind = SleepyMockIndividual()
+        ind.sleep_time = 2
+        self.pool.submit(ind)
+
+        # Give a worker a chance to pick up the task.
+        t0 = time.time()
+        while (-1 == max(self.pool._busy)) and (time.time() - t0 < 5):
+            sleep(0.01)
+
+        i = int(np.argmax(self.pool._busy[:]))
+        p = self.pool.processes[i]
+        p.terminate()
+        p.join(timeout=5)
+
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'mysql'}):
+            with patch('pyvvo.ga.db.connect_loop') as p_connect:
+                with patch('pyvvo.ga.db.drop_tables') as p_drop:
+                    with self.assertLogs(logger=self.pool.log,
+                                         level='WARNING'):
+                        self.assertTrue(self.pool.check_health())
+
+        self.assertIsNot(p, self.pool.processes[i])
+        self.assertEqual(1, self.pool.get(timeout=10).fitness)
+
+        # The replacement gets a new slot, and the old slot's tables
+        # are dropped.
+        self.assertEqual(2, self.pool._slots[i])
+        p_drop.assert_called_once_with(
+            db_conn=p_connect.return_value,
+            tables=['{}_{}'.format(ga.TRIPLEX_TABLE, i),
+                    '{}_{}'.format(ga.SUBSTATION_TABLE, i)])
+
+    def test_shutdown_wait(self):
+        self.pool.shutdown()
+        self.pool.wait(timeout=5)
+        self.assertTrue(self.pool.all_dead)
+
+    def test_logging_thread(self):
+        """The logging thread shouldn't keep the interpreter alive, and
+        should be stopped by wait.
+        """
+        self.assertTrue(self.pool.logging_thread.daemon)
+        self.pool.shutdown()
+        self.pool.wait(timeout=5)
+        self.pool.logging_thread.join(timeout=5)
+        self.assertFalse(self.pool.logging_thread.is_alive())
+
+    def test_cancel_kills_gld(self):
+        """Cancelling should kill GridLAB-D runs in progress, freeing
+        the workers up right away.
+        """
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, 'gridlabd')
+        with open(path, 'w') as f:
+            f.write('#!/bin/sh\nsleep "$FAKE_SLEEP"\n')
+        os.chmod(path, 0o755)
+
+        for _ in range(2):
+            self.pool.submit(GLDMockIndividual(gld_dir=tmp_dir.name))
+
+        # Wait for both workers to pick up their tasks.
+        t_stop = time.time() + 10
+        while any(b == -1 for b in self.pool._busy):
+            self.assertLess(time.time(), t_stop)
+            sleep(0.01)
+
+        t0 = time.time()
+        self.pool.cancel()
+        self.pool.submit(MockIndividual())
+        self.assertEqual(1, self.pool.get(timeout=10).fitness)
+        self.assertLess(time.time() - t0, 5)
+
+        # Nothing else should come out.
+        with self.assertRaises(queue.Empty):
+            self.pool.get(timeout=0.5)
+
+    def test_drop_orphaned_tables(self):
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'mysql'}):
+            with patch('pyvvo.ga.db.connect_loop') as p_connect:
+                with patch('pyvvo.ga.drop_orphaned_tables',
+                           return_value=['triplex_7']) as p_drop:
+                    out = self.pool.drop_orphaned_tables()
+
+        self.assertListEqual(['triplex_7'], out)
+        p_drop.assert_called_once_with(db_conn=p_connect.return_value,
+                                       slots=[0, 1])
+        p_connect.return_value.close.assert_called_once_with()
+
+    def test_drop_orphaned_tables_file_backend(self):
+        with patch.dict(ga.CONFIG['ga'], {'results_backend': 'file'}):
+            with patch('pyvvo.ga.db.connect_loop') as p_connect:
+                self.assertListEqual([], self.pool.drop_orphaned_tables())
+
+        p_connect.assert_not_called()
+
+
+def _fake_individual_evaluate_fail(self, glm_mgr, db_conn, slot=None,
+                                   cancel_event=None):
+    """Module level stand-in for Individual.evaluate which fails."""
+    self._fitness = np.inf
+    self._penalties = None
+    raise RuntimeError('Dummy error for testing.')
+
+
+class EvaluatorPoolCompactTestCase(unittest.TestCase):
+    """Test EvaluatorPool when individuals are sent as just their uid
+    and packed chromosome.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        reg_df = _df.read_pickle(_df.REGULATORS_9500)
+        cap_df = _df.read_pickle(_df.CAPACITORS_9500)
+
+        regs = equipment.initialize_regulators(reg_df)
+        caps = equipment.initialize_capacitors(cap_df)
+
+        cls.map, cls.len, cls.num_eq = ga.map_chromosome(regs, caps)
+
+    def setUp(self) -> None:
+        # Patch before creating the pool so the processes inherit the
+        # patch.
+        with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+            with patch('pyvvo.ga.Individual.evaluate',
+                       _fake_individual_evaluate):
+                self.pool = ga.EvaluatorPool(
+                    processes=2, glm_mgr='model_0', chrom_map=self.map,
+                    chrom_len=self.len)
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+        self.pool.wait(timeout=5)
+
+    def helper_inds(self, n):
+        return [ga.Individual(uid=i, chrom_len=self.len, num_eq=self.num_eq,
+                              chrom_map=self.map) for i in range(n)]
+
+    def test_bad_batch_size_type(self):
+        with self.assertRaisesRegex(TypeError, 'batch_size must be an int'):
+            ga.EvaluatorPool(processes=1, batch_size=1.5)
+
+    def test_bad_batch_size_value(self):
+        with self.assertRaisesRegex(ValueError, 'batch_size must be at '):
+            ga.EvaluatorPool(processes=1, batch_size=0)
+
+    def test_compact_task(self):
+        """Only the uid and packed chromosome should go in the queue."""
+        inds = self.helper_inds(1)
+
+        with patch.object(self.pool, '_input_queue') as q:
+            self.pool.submit(inds[0])
+
+        version, task_id, batch = q.put.call_args[0][0]
+        self.assertEqual(1, len(batch))
+        uid, packed = batch[0]
+        self.assertEqual(0, uid)
+        self.assertIsInstance(packed, bytes)
+        np.testing.assert_array_equal(
+            inds[0].chromosome,
+            np.unpackbits(np.frombuffer(packed, dtype=np.uint8),
+                          count=self.len).astype(bool))
+
+    def test_submit_many_get(self):
+        inds = self.helper_inds(5)
+        self.pool.submit_many(inds, batch_size=2)
+        self.assertEqual(5, self.pool.n_outstanding)
+
+        out = [self.pool.get(timeout=5) for _ in range(5)]
+        self.assertEqual(0, self.pool.n_outstanding)
+
+        # The original objects come back, with results filled in.
+        self.assertEqual(sorted(id(ind) for ind in inds),
+                         sorted(id(ind) for ind in out))
+
+        for ind in inds:
+            self.assertEqual(np.count_nonzero(ind.chromosome), ind.fitness)
+            self.assertEqual({'p1': ind.fitness}, ind.penalties)
+            self.assertGreaterEqual(ind.eval_time, 0)
+
+    def test_failed_evaluation(self):
+        with patch('pyvvo.ga.Individual.evaluate',
+                   _fake_individual_evaluate_fail):
+            self.pool.set_model('model_1', chrom_map=self.map,
+                                chrom_len=self.len)
+            # Kill the workers so that their replacements pick up the
+            # patch.
+            for p in self.pool.processes:
+                p.terminate()
+                p.join(timeout=5)
+
+            with patch.object(self.pool, '_drop_slot_tables'):
+                with self.assertLogs(logger=self.pool.log, level='WARNING'):
+                    self.pool.check_health()
+
+        ind = self.helper_inds(1)[0]
+        self.pool.submit(ind)
+        self.assertIs(ind, self.pool.get(timeout=5))
+        self.assertEqual(np.inf, ind.fitness)
+        self.assertIsNone(ind.penalties)
+
+
 class LoggingThreadTestCase(unittest.TestCase):
     """Test _logging_thread function."""
 
@@ -1578,6 +2842,396 @@ class TournamentTestCase(unittest.TestCase):
         self.assertEqual(3, len(best))
 
 
+class TournamentsTestCase(unittest.TestCase):
+    """Test _tournaments"""
+
+    def test_full_tournaments(self):
+        """When everyone participates, the best always win."""
+        fitness = np.array([5, 3, 7, 2, 17])
+        out = ga._tournaments(fitness=fitness, tournament_size=5,
+                              n_tournaments=4, n=2)
+        np.testing.assert_array_equal(np.tile([3, 1], (4, 1)), out)
+
+    def test_shape_and_uniqueness(self):
+        fitness = np.random.random_sample(20)
+        out = ga._tournaments(fitness=fitness, tournament_size=5,
+                              n_tournaments=100, n=3)
+        self.assertEqual((100, 3), out.shape)
+
+        for row in out:
+            # Drawn without replacement, and sorted by fitness.
+            self.assertEqual(3, len(set(row)))
+            self.assertTrue((np.diff(fitness[row]) >= 0).all())
+
+    def test_size_one_is_random(self):
+        """With a single participant, every individual should win
+        sometimes."""
+        out = ga._tournaments(fitness=np.arange(5), tournament_size=1,
+                              n_tournaments=500, n=1)
+        self.assertEqual({0, 1, 2, 3, 4}, set(out[:, 0]))
+
+
+class ChromosomeLayoutTestCase(unittest.TestCase):
+    """Test ChromosomeLayout with a small hand-made map."""
+
+    def setUp(self):
+        self.map = {
+            'reg': {'A': {'idx': (0, 6), 'range': (0, 32), 'eq_obj': 'r_a',
+                          'current_state': 16},
+                    'B': {'idx': (6, 12), 'range': (0, 32), 'eq_obj': 'r_b',
+                          'current_state': 3}},
+            'cap': {'A': {'idx': (12, 13), 'range': (0, 1), 'eq_obj': 'c_a',
+                          'current_state': None}}}
+        self.layout = ga.ChromosomeLayout(self.map)
+
+    def test_inferred_chrom_len(self):
+        self.assertEqual(13, self.layout.chrom_len)
+        self.assertEqual(3, self.layout.num_genes)
+
+    def test_chrom_len_too_short(self):
+        with self.assertRaisesRegex(ValueError, 'chrom_len is too short'):
+            ga.ChromosomeLayout(self.map, chrom_len=12)
+
+    def test_empty_map(self):
+        with self.assertRaisesRegex(ValueError, 'at least one gene'):
+            ga.ChromosomeLayout({})
+
+    def test_ranges(self):
+        np.testing.assert_array_equal([0, 0, 0], self.layout.low)
+        np.testing.assert_array_equal([32, 32, 1], self.layout.high)
+        np.testing.assert_array_equal([False, False, True],
+                                      self.layout.current_missing)
+        self.assertEqual(['r_a', 'r_b', 'c_a'], self.layout.eq_objs)
+
+    def test_to_ints_matches_helpers(self):
+        c = np.random.randint(0, 2, 13).astype(bool)
+        expected = [ga._binary_array_to_scalar(c[0:6]),
+                    ga._binary_array_to_scalar(c[6:12]), c[12]]
+        np.testing.assert_array_equal(expected, self.layout.to_ints(c))
+
+    def test_to_bits_matches_helpers(self):
+        c = self.layout.to_bits(np.array([17, 32, 1]))
+        expected = (ga._int_to_binary_list(17, 32)
+                    + ga._int_to_binary_list(32, 32) + [1])
+        np.testing.assert_array_equal(np.array(expected, dtype=bool), c)
+
+    def test_round_trip_2d(self):
+        c = np.random.randint(0, 2, (10, 13)).astype(bool)
+        ints = self.layout.to_ints(c)
+        self.assertEqual((10, 3), ints.shape)
+        np.testing.assert_array_equal(c, self.layout.to_bits(ints))
+
+    def test_clip(self):
+        np.testing.assert_array_equal(
+            [[32, 0, 1]], self.layout.clip(np.array([[63, -1, 1]])))
+
+    def test_gene_mask_to_bit_mask(self):
+        expected = np.array([True] * 6 + [False] * 6 + [True])
+        np.testing.assert_array_equal(
+            expected,
+            self.layout.gene_mask_to_bit_mask(np.array([True, False, True])))
+
+
+class ChromosomeRegistryTestCase(unittest.TestCase):
+    """Test the ChromosomeRegistry class."""
+
+    def setUp(self):
+        self.registry = ga.ChromosomeRegistry()
+        self.chroms = np.array([[True, False, True, False, True],
+                                [False, False, False, False, True],
+                                [True, True, True, True, True]])
+
+    def test_bad_max_size_type(self):
+        with self.assertRaisesRegex(TypeError, 'max_size must be None or'):
+            ga.ChromosomeRegistry(max_size='10')
+
+    def test_bad_max_size_value(self):
+        with self.assertRaisesRegex(ValueError, 'max_size must be at least'):
+            ga.ChromosomeRegistry(max_size=0)
+
+    def test_add_and_contains(self):
+        self.assertNotIn(self.chroms[0], self.registry)
+        self.assertTrue(self.registry.add(self.chroms[0]))
+        self.assertIn(self.chroms[0], self.registry)
+        self.assertNotIn(self.chroms[1], self.registry)
+        self.assertEqual(1, len(self.registry))
+
+    def test_add_duplicate(self):
+        self.registry.add(self.chroms[0])
+        self.assertFalse(self.registry.add(self.chroms[0].copy()))
+        self.assertEqual(1, len(self.registry))
+
+    def test_length_is_part_of_key(self):
+        """Packing pads with zeros, so a chromosome with trailing
+        zeros must not collide with a shorter one.
+        """
+        self.registry.add(np.array([True, False]))
+        self.assertNotIn(np.array([True, False, False]), self.registry)
+
+    def test_add_many(self):
+        self.assertEqual(3, self.registry.add_many(self.chroms))
+        self.assertEqual(0, self.registry.add_many(list(self.chroms)))
+        self.assertEqual(3, len(self.registry))
+
+    def test_add_many_empty(self):
+        self.assertEqual(0, self.registry.add_many([]))
+
+    def test_add_many_bad_shape(self):
+        with self.assertRaisesRegex(ValueError, 'chromosomes must be two'):
+            self.registry.add_many(self.chroms[0])
+
+    def test_contains_many(self):
+        self.registry.add(self.chroms[1])
+        np.testing.assert_array_equal(
+            np.array([False, True, False]),
+            self.registry.contains_many(self.chroms))
+
+    def test_iter(self):
+        self.registry.add_many(self.chroms)
+        for expected, actual in zip(self.chroms, self.registry):
+            np.testing.assert_array_equal(expected, actual)
+
+    def test_max_size_evicts_oldest(self):
+        registry = ga.ChromosomeRegistry(max_size=2)
+        registry.add_many(self.chroms)
+        self.assertEqual(2, len(registry))
+        np.testing.assert_array_equal(
+            np.array([False, True, True]),
+            registry.contains_many(self.chroms))
+
+
+class FitnessCacheTestCase(unittest.TestCase):
+    """Test the FitnessCache class."""
+
+    def setUp(self):
+        self.cache = ga.FitnessCache(max_size=2)
+        self.c1 = np.array([True, False, True])
+        self.c2 = np.array([False, False, True])
+        self.c3 = np.array([True, True, True])
+        self.penalties = {'voltage_high': 1, 'energy': 2,
+                          'regulator_tap': 3, 'capacitor_switch': 4}
+
+    def test_default_max_size(self):
+        with patch.dict(ga.CONFIG['ga'], {'fitness_cache': {'max_size': 7}}):
+            cache = ga.FitnessCache()
+
+        self.assertEqual(7, cache.max_size)
+
+    def test_bad_max_size_type(self):
+        with self.assertRaisesRegex(TypeError, 'max_size must be an integer'):
+            ga.FitnessCache(max_size=2.0)
+
+    def test_bad_max_size_value(self):
+        with self.assertRaisesRegex(ValueError, 'max_size must be at least'):
+            ga.FitnessCache(max_size=0)
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(self.c1, 'a'))
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(0, self.cache.hits)
+
+    def test_hit_strips_switching_penalties(self):
+        self.cache.put(self.c1, 'a', self.penalties)
+        self.assertDictEqual({'voltage_high': 1, 'energy': 2},
+                             self.cache.get(self.c1, 'a'))
+        self.assertEqual(1, self.cache.hits)
+
+    def test_get_returns_copy(self):
+        self.cache.put(self.c1, 'a', self.penalties)
+        self.cache.get(self.c1, 'a')['energy'] = 10
+        self.assertEqual(2, self.cache.get(self.c1, 'a')['energy'])
+
+    def test_fingerprint_mismatch(self):
+        self.cache.put(self.c1, 'a', self.penalties)
+        self.assertIsNone(self.cache.get(self.c1, 'b'))
+
+    def test_lru_eviction(self):
+        self.cache.put(self.c1, 'a', self.penalties)
+        self.cache.put(self.c2, 'a', self.penalties)
+        # Touch c1 so c2 becomes the least recently used.
+        self.cache.get(self.c1, 'a')
+        self.cache.put(self.c3, 'a', self.penalties)
+
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual(1, self.cache.evictions)
+        self.assertIsNone(self.cache.get(self.c2, 'a'))
+        self.assertIsNotNone(self.cache.get(self.c1, 'a'))
+        self.assertIsNotNone(self.cache.get(self.c3, 'a'))
+
+    def test_clear(self):
+        self.cache.put(self.c1, 'a', self.penalties)
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+
+
+class SurrogateTestCase(unittest.TestCase):
+    """Test the Surrogate class."""
+
+    def setUp(self):
+        self.surrogate = ga.Surrogate(min_samples=5, max_samples=50,
+                                      alpha=1e-6, history=10)
+
+    def test_defaults(self):
+        config = {'min_samples': 3, 'max_samples': 4, 'alpha': 1.0,
+                  'history': 5, 'oversample': 2, 'enabled': True}
+        with patch.dict(ga.CONFIG['ga'], {'surrogate': config}):
+            surrogate = ga.Surrogate()
+
+        self.assertEqual(3, surrogate.min_samples)
+        self.assertEqual(4, surrogate.max_samples)
+        self.assertFalse(surrogate.ready)
+        self.assertEqual(0, len(surrogate))
+
+    def test_bad_type(self):
+        with self.assertRaisesRegex(TypeError, 'history must be an integer'):
+            ga.Surrogate(min_samples=1, max_samples=2, alpha=1, history=1.5)
+
+    def test_bad_value(self):
+        with self.assertRaisesRegex(ValueError, 'min_samples must be at'):
+            ga.Surrogate(min_samples=0, max_samples=2, alpha=1, history=1)
+
+    def test_min_exceeds_max(self):
+        with self.assertRaisesRegex(ValueError, 'min_samples cannot exceed'):
+            ga.Surrogate(min_samples=3, max_samples=2, alpha=1, history=1)
+
+    def test_predict_before_fit(self):
+        with self.assertRaisesRegex(ValueError, 'has not been fit'):
+            self.surrogate.predict(np.zeros((1, 2)))
+
+    def test_fit_and_predict(self):
+        # Learn y = 2*x0 - x1 + 3.
+        x = np.random.randint(0, 10, size=(10, 2))
+        y = 2 * x[:, 0] - x[:, 1] + 3
+
+        for i in range(4):
+            self.surrogate.add(x[i], y[i])
+
+        # Not enough samples yet.
+        self.assertFalse(self.surrogate.fit())
+
+        for i in range(4, 10):
+            self.surrogate.add(x[i], y[i])
+
+        self.assertTrue(self.surrogate.fit())
+        np.testing.assert_allclose(
+            self.surrogate.predict(np.array([[1, 1], [5, 0]])), [4, 13],
+            atol=1e-3)
+
+    def test_max_samples(self):
+        for i in range(60):
+            self.surrogate.add(np.array([i, i]), i)
+
+        self.assertEqual(50, len(self.surrogate))
+
+    def test_num_genes_changed(self):
+        for i in range(5):
+            self.surrogate.add(np.array([i, i]), i)
+
+        self.assertTrue(self.surrogate.fit())
+
+        with self.assertLogs(logger=ga.LOG, level='WARNING'):
+            self.surrogate.add(np.array([1, 2, 3]), 1)
+
+        self.assertEqual(1, len(self.surrogate))
+        self.assertFalse(self.surrogate.ready)
+
+    def test_accuracy(self):
+        self.assertIsNone(self.surrogate.mae)
+        self.assertIsNone(self.surrogate.rank_correlation)
+
+        for predicted, actual in ((1, 2), (2, 4), (3, 5)):
+            self.surrogate.record(predicted=predicted, actual=actual)
+
+        self.assertAlmostEqual(5 / 3, self.surrogate.mae)
+        self.assertAlmostEqual(1, self.surrogate.rank_correlation)
+
+
+class StoppingCriteriaTestCase(unittest.TestCase):
+    """Test the StoppingCriterion subclasses and
+    stopping_criteria_from_config.
+    """
+
+    @staticmethod
+    def mock_pop(fitness, forced_mutation_share=None):
+        pop = NonCallableMagicMock()
+        pop.population = []
+        for f in fitness:
+            ind = MockIndividual()
+            ind.fitness = f
+            pop.population.append(ind)
+
+        pop.best = min(pop.population, key=lambda i: i.fitness)
+        pop.forced_mutation_share = forced_mutation_share
+        return pop
+
+    def test_base(self):
+        with self.assertRaisesRegex(TypeError, 'abstract'):
+            ga.StoppingCriterion()
+
+        class Incomplete(ga.StoppingCriterion):
+            pass
+
+        with self.assertRaisesRegex(TypeError, 'abstract'):
+            Incomplete()
+
+    def test_stagnation_bad_type(self):
+        with self.assertRaisesRegex(TypeError, 'generations must be an int'):
+            ga.StagnationCriterion(generations=2.0)
+
+    def test_stagnation_bad_value(self):
+        with self.assertRaisesRegex(ValueError, 'generations must be at '):
+            ga.StagnationCriterion(generations=0)
+
+    def test_stagnation(self):
+        c = ga.StagnationCriterion(generations=2, tolerance=0.5)
+        self.assertIsNone(c.check(self.mock_pop([10])))
+        # Improvement within the tolerance doesn't count.
+        self.assertIsNone(c.check(self.mock_pop([9.6])))
+        self.assertIsNone(c.check(self.mock_pop([9])))
+        self.assertIsNone(c.check(self.mock_pop([9])))
+        self.assertIn('not improved in 2', c.check(self.mock_pop([9])))
+
+        # After reset, we start fresh.
+        c.reset()
+        self.assertIsNone(c.check(self.mock_pop([9])))
+
+    def test_variance(self):
+        c = ga.VarianceCriterion(threshold=0.1)
+        self.assertIsNone(c.check(self.mock_pop([1, 2, 3])))
+        self.assertIn('variance', c.check(self.mock_pop([1, 1, 1.1, np.inf])))
+        # Not enough finite values to judge.
+        self.assertIsNone(c.check(self.mock_pop([1, np.inf])))
+
+    def test_forced_mutation(self):
+        c = ga.ForcedMutationCriterion(share=0.5)
+        self.assertIsNone(c.check(self.mock_pop([1])))
+        self.assertIsNone(c.check(self.mock_pop([1], 0.5)))
+        self.assertIn('force-mutated', c.check(self.mock_pop([1], 0.6)))
+
+    def test_from_config_disabled(self):
+        config = {'stagnation': {'generations': None, 'tolerance': 0},
+                  'variance': {'threshold': None},
+                  'forced_mutation': {'share': None}}
+        with patch.dict(ga.CONFIG['ga'], {'stopping_criteria': config}):
+            self.assertListEqual([], ga.stopping_criteria_from_config())
+
+    def test_from_config(self):
+        config = {'stagnation': {'generations': 3, 'tolerance': 0.1},
+                  'variance': {'threshold': 0.2},
+                  'forced_mutation': {'share': 0.3}}
+        with patch.dict(ga.CONFIG['ga'], {'stopping_criteria': config}):
+            out = ga.stopping_criteria_from_config()
+
+        self.assertEqual(3, len(out))
+        self.assertIsInstance(out[0], ga.StagnationCriterion)
+        self.assertEqual(3, out[0].generations)
+        self.assertEqual(0.1, out[0].tolerance)
+        self.assertIsInstance(out[1], ga.VarianceCriterion)
+        self.assertEqual(0.2, out[1].threshold)
+        self.assertIsInstance(out[2], ga.ForcedMutationCriterion)
+        self.assertEqual(0.3, out[2].share)
+
+
 class PopulationTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -1625,7 +3279,8 @@ class PopulationTestCase(unittest.TestCase):
 
     # noinspection PyUnresolvedReferences
     @classmethod
-    def helper_create_pop_obj(cls, ga_dict=None):
+    def helper_create_pop_obj(cls, ga_dict=None, fitness_cache=None,
+                              surrogate=None, evaluator_pool=None):
         """Helper to create a population object if we're concerned about
         altering state.
         """
@@ -1637,7 +3292,10 @@ class PopulationTestCase(unittest.TestCase):
                                     capacitors=cls.caps,
                                     glm_mgr=deepcopy(cls.glm_mgr),
                                     starttime=cls.starttime,
-                                    stoptime=cls.stoptime)
+                                    stoptime=cls.stoptime,
+                                    fitness_cache=fitness_cache,
+                                    surrogate=surrogate,
+                                    evaluator_pool=evaluator_pool)
 
         return pop_obj
 
@@ -1768,32 +3426,38 @@ class PopulationTestCase(unittest.TestCase):
         self.assertDictEqual(self.pop_obj.ind_init,
                              {'chrom_len': self.pop_obj.chrom_len,
                               'num_eq': self.pop_obj.num_eq,
-                              'chrom_map': self.pop_obj.chrom_map})
+                              'chrom_map': self.pop_obj.chrom_map,
+                              'layout': self.pop_obj.layout})
 
     def test_all_chromosomes(self):
-        self.assertIsInstance(self.pop_obj.all_chromosomes, list)
+        self.assertIsInstance(self.pop_obj.all_chromosomes,
+                              ga.ChromosomeRegistry)
 
     def test_population(self):
         self.assertIsInstance(self.pop_obj.population, list)
 
     def test_chrom_already_existed(self):
         """Test _chrom_already_existed"""
-        # Create a list to patch our population object's all_chromosomes
-        # attribute.
-        all_chrom = [np.array([1, 2, 3, 4]),
-                     np.array([1., 2., 5., 6.]),
-                     np.array([23, 23, 89, 42, 78])]
+        # Create a registry to patch our population object's
+        # all_chromosomes attribute.
+        all_chrom = ga.ChromosomeRegistry()
+        all_chrom.add(np.array([True, False, True, True]))
+        all_chrom.add(np.array([False, False, True, False]))
+        all_chrom.add(np.array([True, True, False, True, False]))
 
         with patch.object(self.pop_obj, '_all_chromosomes', all_chrom):
             self.assertFalse(
-                self.pop_obj._chrom_already_existed(np.array([1, 2, 3, 5])))
+                self.pop_obj._chrom_already_existed(
+                    np.array([True, False, True, False])))
 
+            # Prefix of a longer chromosome.
             self.assertFalse(
-                self.pop_obj._chrom_already_existed(np.array([1.01, 2, 3, 4])))
+                self.pop_obj._chrom_already_existed(
+                    np.array([True, True, False, True])))
 
             self.assertTrue(
                 self.pop_obj._chrom_already_existed(
-                    np.array([1, 2, 5, 6])))
+                    np.array([False, False, True, False])))
 
     def test_init_individual(self):
         """Large, relatively comprehensive test of _init_individual"""
@@ -1814,11 +3478,7 @@ class PopulationTestCase(unittest.TestCase):
         self.assertEqual(1, len(pop_obj.all_chromosomes))
 
         # The chromosome should be the same as that of our ind.
-        np.testing.assert_array_equal(ind.chromosome,
-                                      pop_obj.all_chromosomes[0])
-
-        # However, it should be a copy.
-        self.assertIsNot(ind.chromosome, pop_obj.all_chromosomes[0])
+        self.assertIn(ind.chromosome, pop_obj.all_chromosomes)
 
         # Initialize another, ensuring we get an exception.
         with self.assertRaises(ga.ChromosomeAlreadyExistedError):
@@ -1850,7 +3510,7 @@ class PopulationTestCase(unittest.TestCase):
 
         self.assertEqual(2, len(pop_obj.all_chromosomes))
 
-        np.testing.assert_array_equal(c, pop_obj.all_chromosomes[1])
+        self.assertIn(c, pop_obj.all_chromosomes)
 
     def test_init_individual_loop_limit(self):
         """Ensure we don't loop forever in _init_individual."""
@@ -1882,13 +3542,9 @@ class PopulationTestCase(unittest.TestCase):
         # There should be a single chromosome in the tracker.
         self.assertEqual(1, len(pop_obj.all_chromosomes))
 
-        # The first element should be equal to our mock_ind's
-        # chromosome.
+        # The element should be equal to our mock_ind's chromosome.
         np.testing.assert_array_equal(mock_ind.chromosome,
-                                      pop_obj.all_chromosomes[0])
-
-        # However, it should be a copy.
-        self.assertIsNot(mock_ind.chromosome, pop_obj.all_chromosomes[0])
+                                      next(iter(pop_obj.all_chromosomes)))
 
     def test_initialize_population_error_1(self):
         with patch.object(self.pop_obj, '_population', [1, 2, 3]):
@@ -1916,10 +3572,16 @@ class PopulationTestCase(unittest.TestCase):
 
         with patch.object(pop_obj, '_init_individual',
                           wraps=pop_obj._init_individual) as p:
-            pop_obj.initialize_population()
+            with patch.object(pop_obj, '_init_random_individuals',
+                              wraps=pop_obj._init_random_individuals) as pr:
+                pop_obj.initialize_population()
 
-        self.assertEqual(pop_obj.population_size, p.call_count)
+        # Three seeds, and the rest of the population in a batch.
+        self.assertEqual(3, p.call_count)
+        pr.assert_called_once_with(pop_obj.population_size - 3)
         self.assertEqual(pop_obj.population_size, len(pop_obj.population))
+        self.assertEqual(pop_obj.population_size,
+                         len(pop_obj.all_chromosomes))
 
         for i in pop_obj.population:
             self.assertIsInstance(i, ga.Individual)
@@ -1932,6 +3594,52 @@ class PopulationTestCase(unittest.TestCase):
         self.assertDictEqual(p.call_args_list[2][1],
                              {'special_init': 'current_state'})
 
+    def test_initialize_population_seeds(self):
+        """Warm start with chromosomes from another population."""
+        pop_a = self.helper_create_pop_obj()
+        pop_a.initialize_population()
+
+        # The 'max' chromosome will be a duplicate, and the short
+        # chromosome should get dropped.
+        seeds = [pop_a.population[0].chromosome,
+                 np.zeros(pop_a.chrom_len - 1, dtype=bool)] \
+            + [i.chromosome for i in pop_a.population[3:]]
+
+        with patch.dict(ga.CONFIG['ga']['warm_start'],
+                        {'top_k': 10, 'random_fraction': 0.25}):
+            pop_b = self.helper_create_pop_obj()
+
+        with self.assertLogs(logger=pop_b.log, level='WARNING'):
+            pop_b.initialize_population(seeds=seeds)
+
+        self.assertEqual(pop_b.population_size, len(pop_b.population))
+
+        # 14 - 3 = 11 free slots, ceil(0.25 * 11) = 3 of which must be
+        # random. So, 8 seeds are used.
+        for i in range(8):
+            np.testing.assert_array_equal(
+                pop_a.population[3 + i].chromosome,
+                pop_b.population[3 + i].chromosome)
+
+        self.assertEqual(pop_b.population_size, len(pop_b.all_chromosomes))
+
+    def test_best_chromosomes(self):
+        pop_obj = self.helper_create_pop_obj()
+        inds = [CacheableMockIndividual(np.array([True, False])),
+                CacheableMockIndividual(np.array([False, True])),
+                CacheableMockIndividual(np.array([True, True]))]
+        inds[0].fitness = 3
+        inds[1].fitness = 1
+        pop_obj._population = inds
+
+        out = pop_obj.best_chromosomes()
+        self.assertEqual(2, len(out))
+        np.testing.assert_array_equal(inds[1].chromosome, out[0])
+        np.testing.assert_array_equal(inds[0].chromosome, out[1])
+        self.assertIsNot(inds[1].chromosome, out[0])
+
+        self.assertEqual(1, len(pop_obj.best_chromosomes(k=1)))
+
     def test_evaluate_population_simple(self):
         """Given a population with no evaluated individuals, ensure
         successful evaluation.
@@ -2001,6 +3709,39 @@ class PopulationTestCase(unittest.TestCase):
         for i in pop_obj.population:
             self.assertIsNotNone(i.fitness)
 
+    def test_evaluate_population_fitness_cache(self):
+        """Cached individuals should not be sent to the workers, and
+        freshly evaluated individuals should be put in the cache.
+        """
+        cache = ga.FitnessCache(max_size=100)
+        pop_obj = self.helper_create_pop_obj(fitness_cache=cache)
+        self.assertIsNotNone(pop_obj.fingerprint)
+
+        pop_obj._population_size = 3
+        chroms = [np.array([True, False, False]),
+                  np.array([False, True, False]),
+                  np.array([False, False, True])]
+        inds = [CacheableMockIndividual(c) for c in chroms]
+        pop_obj._population = list(inds)
+
+        # Put the first individual in the cache.
+        cache.put(chromosome=chroms[0], fingerprint=pop_obj.fingerprint,
+                  penalties={'p1': 1, 'p2': 2})
+
+        pop_obj.evaluate_population()
+
+        # The cached individual never left this process.
+        self.assertIs(inds[0], pop_obj.population[0])
+        self.assertEqual(3, inds[0].fitness)
+        self.assertNotIn(inds[1], pop_obj.population)
+        self.assertNotIn(inds[2], pop_obj.population)
+
+        # The other two should now be cached.
+        self.assertEqual(3, len(cache))
+        self.assertDictEqual(
+            {'p1': 10, 'p2': 30, 'p3': 0.1},
+            cache.get(chromosome=chroms[2], fingerprint=pop_obj.fingerprint))
+
     def test_evaluate_population_error(self):
         with self.assertRaisesRegex(ValueError, 'evaluate_population should '):
             self.pop_obj.evaluate_population()
@@ -2091,7 +3832,7 @@ class PopulationTestCase(unittest.TestCase):
         pop_obj = self.helper_create_pop_obj()
 
         # Create a chromosome.
-        c = np.array([1, 2, 3, 4])
+        c = np.array([True, False, True, True])
 
         # Create mock individual.
         mock_ind = create_autospec(ga.Individual)
@@ -2105,8 +3846,9 @@ class PopulationTestCase(unittest.TestCase):
 
         p.assert_called_once()
 
-        # Now add the chromosome to the record of chromosomes.
-        pop_obj._all_chromosomes = [c.copy()]
+        # The chromosome should have been added to the record of
+        # chromosomes.
+        self.assertIn(c, pop_obj.all_chromosomes)
 
         # Since the mock mutate method won't actually do anything, we'll
         # get an error here.
@@ -2124,9 +3866,8 @@ class PopulationTestCase(unittest.TestCase):
         self.assertEqual(101, c)
 
     def test_crossover_and_mutate(self):
-        """Test crossover_and_mutate. The pieces of this function have
-        been factored to use helper functions, so get ready for plenty
-        of mocking.
+        """Test crossover_and_mutate, which breeds the whole set of
+        offspring at once.
         """
         # Get the initialization configuration so we can override
         # part of it.
@@ -2134,49 +3875,148 @@ class PopulationTestCase(unittest.TestCase):
         config = {**self.ga_config}
         # Use a population size of 10.
         config['population_size'] = 10
-        # Patch the probaility of crossover.
-        # noinspection PyUnresolvedReferences
-        config['probabilities']['crossover'] = 0.2
 
         # Get a population object.
         pop_obj = self.helper_create_pop_obj(ga_dict=config)
+        pop_obj.initialize_population()
 
-        # Give us a half-full population. Just use numbers for
-        # simplicity.
-        pop_obj._population = [1, 2, 3, 4, 5]
+        # Give us a half-full population of "evaluated" individuals.
+        pop_obj._population = pop_obj.population[0:5]
+        for i, ind in enumerate(pop_obj.population):
+            ind._fitness = i
 
-        # We'll be patching np.random.rand with a simple counter.
-        counter = itertools.count(start=0.1, step=0.1)
+        parents = list(pop_obj.population)
+        n_chrom = len(pop_obj.all_chromosomes)
 
-        # Begin the patching bonanza!
-        with patch('numpy.random.rand', wraps=counter.__next__) as p_rand:
-            with patch.object(pop_obj, '_get_two_parents',
-                              return_value=[8, 9]) as p_parents:
-                with patch.object(pop_obj, '_crossover_and_mutate',
-                                  return_value=[1, 2]) as p_cm:
-                    with patch.object(pop_obj, '_asexual_reproduction',
-                                      return_value=[3, 4]) as p_ar:
-                        pop_obj.crossover_and_mutate()
+        with patch('pyvvo.ga._tournaments', wraps=ga._tournaments) as p_t:
+            pop_obj.crossover_and_mutate()
 
-        # Assertion time.
-        # For starters, the random function should be called three times
-        # since we need to replace 5 individuals and each loop creates
-        # two.
-        self.assertEqual(3, p_rand.call_count)
-        # Same goes for _get_two_parents.
-        self.assertEqual(3, p_parents.call_count)
-
-        # Since we made the crossover probability 0.2 and we patched the
-        # random call with a counter with a step of 0.1, we can expect
-        # _crossover_and_mutate to be called once, and
-        # _asexual_reproduction to be called twice.
-        self.assertEqual(1, p_cm.call_count)
-        self.assertEqual(2, p_ar.call_count)
-
-        # Finally, ensure the truncation worked correctly. Three loops
-        # would result in 6 individuals, but we only want to keep 5 so
-        # that the population is the correct size.
+        # All tournaments happen in one call: 5 children means 3 pairs
+        # of parents.
+        p_t.assert_called_once()
+        self.assertEqual(3, p_t.call_args[1]['n_tournaments'])
+        self.assertEqual(2, p_t.call_args[1]['n'])
+
+        # The population should be full, with the parents untouched.
         self.assertEqual(10, len(pop_obj.population))
+        for p, ind in zip(parents, pop_obj.population):
+            self.assertIs(p, ind)
+
+        self.assertTrue(0 <= pop_obj.forced_mutation_share <= 1)
+
+        # The offspring should be unevaluated, in range, unique, and
+        # tracked.
+        offspring = pop_obj.population[5:]
+        self.assertEqual(n_chrom + 5, len(pop_obj.all_chromosomes))
+        self.assertEqual(10, len({ind.chromosome.tobytes()
+                                  for ind in pop_obj.population}))
+        ints = pop_obj.layout.to_ints(
+            np.array([ind.chromosome for ind in offspring]))
+        self.assertTrue((ints >= pop_obj.layout.low).all())
+        self.assertTrue((ints <= pop_obj.layout.high).all())
+        for ind in offspring:
+            self.assertIsNone(ind.fitness)
+            self.assertIn(ind.chromosome, pop_obj.all_chromosomes)
+
+    def test_crossover_and_mutate_surrogate(self):
+        """With a ready surrogate, extra offspring should be bred and
+        only the best (per the surrogate) kept.
+        """
+        config = {**self.ga_config}
+        config['population_size'] = 10
+
+        surrogate = ga.Surrogate(min_samples=1, max_samples=10, alpha=1,
+                                 history=10)
+        pop_obj = self.helper_create_pop_obj(ga_dict=config,
+                                             surrogate=surrogate)
+        pop_obj.initialize_population()
+
+        # Train the surrogate with the first individual.
+        surrogate.add(pop_obj.layout.to_ints(pop_obj.population[0].chromosome),
+                      1)
+
+        pop_obj._population = pop_obj.population[0:5]
+        for i, ind in enumerate(pop_obj.population):
+            ind._fitness = i
+
+        n_chrom = len(pop_obj.all_chromosomes)
+
+        pop_obj._surrogate_oversample = 4
+
+        with patch.object(pop_obj, '_screen_offspring',
+                          wraps=pop_obj._screen_offspring) as p:
+            pop_obj.crossover_and_mutate()
+
+        # 20 offspring were bred, 5 kept.
+        p.assert_called_once()
+        self.assertEqual(20, len(p.call_args[0][0]))
+        self.assertEqual(5, p.call_args[0][1])
+
+        self.assertEqual(10, len(pop_obj.population))
+        self.assertEqual(n_chrom + 5, len(pop_obj.all_chromosomes))
+
+        # Predictions are tracked for the kept offspring.
+        self.assertSetEqual({ind.uid for ind in pop_obj.population[5:]},
+                            set(pop_obj._predictions.keys()))
+
+    def test_update_surrogate(self):
+        surrogate = ga.Surrogate(min_samples=1, max_samples=10, alpha=1,
+                                 history=10)
+        pop_obj = self.helper_create_pop_obj(surrogate=surrogate)
+        pop_obj.initialize_population()
+
+        inds = pop_obj.population[0:3]
+        inds[0]._penalties = {'energy': 2, 'regulator_tap': 10}
+        inds[0]._fitness = 12
+        inds[1]._penalties = None
+        inds[1]._fitness = np.inf
+        inds[2]._penalties = {'energy': 3, 'capacitor_switch': 1}
+        inds[2]._fitness = 4
+        pop_obj._predictions[inds[0].uid] = 10
+        pop_obj._predictions[inds[1].uid] = 10
+
+        pop_obj._update_surrogate(inds)
+
+        # The failed individual is skipped, and the switching penalties
+        # aren't learned.
+        self.assertEqual(2, len(surrogate))
+        self.assertListEqual([2, 3], list(surrogate._y))
+        self.assertEqual(2, surrogate.mae)
+        self.assertDictEqual({}, pop_obj._predictions)
+
+    def test_crossover_and_mutate_full(self):
+        """Nothing should happen if the population is already full."""
+        with patch.object(self.pop_obj, '_population',
+                          list(range(self.pop_obj.population_size))):
+            self.pop_obj.crossover_and_mutate()
+            self.assertEqual(self.pop_obj.population_size,
+                             len(self.pop_obj.population))
+
+    def test_make_unique(self):
+        pop_obj = self.helper_create_pop_obj()
+        chroms = pop_obj.layout.to_bits(
+            np.tile(pop_obj.layout.low, (3, 1)))
+
+        # The first row is already known, and the third duplicates the
+        # second.
+        pop_obj.all_chromosomes.add(chroms[0])
+
+        out = pop_obj._make_unique(chroms, redraw=pop_obj._random_rows)
+        self.assertFalse(pop_obj.all_chromosomes.contains_many(out).any())
+        self.assertEqual(3, len({c.tobytes() for c in out}))
+        # At least the first and third rows were forced. Random redraws
+        # may collide again.
+        self.assertGreaterEqual(pop_obj._last_n_forced, 2)
+
+    def test_make_unique_gives_up(self):
+        pop_obj = self.helper_create_pop_obj()
+        chroms = pop_obj.layout.to_bits(pop_obj.layout.low[np.newaxis, :])
+        pop_obj.all_chromosomes.add(chroms[0])
+
+        with self.assertRaisesRegex(ga.ChromosomeAlreadyExistedError,
+                                    'After 100 attempts, we failed to '
+                                    'create 1'):
+            pop_obj._make_unique(chroms, redraw=lambda c, r: None)
 
     def test_sort_population_simple(self):
         """Test sort_population."""
@@ -2441,6 +4281,187 @@ class PopulationTestCase(unittest.TestCase):
         sleep(0.02)
         self.assertTrue(pop.all_processes_dead)
 
+    def test_graceful_shutdown_sets_event(self):
+        pop = self.helper_create_pop_obj()
+        self.assertFalse(pop._shutdown_event.is_set())
+        pop.graceful_shutdown()
+        self.assertTrue(pop._shutdown_event.is_set())
+
+    def test_mode(self):
+        self.assertEqual('generational', self.pop_obj.mode)
+
+    def test_mode_bad(self):
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['mode'] = 'bad_mode'
+        with self.assertRaisesRegex(ValueError, r"CONFIG\['ga'\]\['mode'\]"):
+            self.helper_create_pop_obj(ga_dict=ga_dict)
+
+    def test_evaluate_steady_state_error(self):
+        with self.assertRaisesRegex(ValueError,
+                                    'evaluate_steady_state should'):
+            self.pop_obj.evaluate_steady_state()
+
+    def test_evaluate_steady_state(self):
+        """Run the steady-state loop with real Individuals, but with
+        evaluation patched out.
+        """
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['population_size'] = 6
+        ga_dict['processes'] = 2
+        ga_dict['mode'] = 'steady_state'
+        ga_dict['evaluations'] = 20
+
+        # Patch before creating the population so the processes
+        # inherit the patches.
+        with patch('pyvvo.ga.Individual.evaluate', _fake_individual_evaluate):
+            with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+                pop = self.helper_create_pop_obj(ga_dict=ga_dict)
+
+        try:
+            pop.initialize_population()
+            with time_limit(30):
+                n = pop.evaluate_steady_state()
+        finally:
+            pop.graceful_shutdown()
+
+        self.assertEqual(20, n)
+        self.assertFalse(pop.out_of_time)
+        self.assertEqual(6, len(pop.population))
+        for ind in pop.population:
+            self.assertIsNotNone(ind.fitness)
+
+        self.assertEqual(min(ind.fitness for ind in pop.population),
+                         pop.best.fitness)
+
+    def test_evaluate_steady_state_deadline(self):
+        """With a deadline in the past, only the initial population
+        should get evaluated.
+        """
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['population_size'] = 6
+        ga_dict['processes'] = 2
+
+        with patch('pyvvo.ga.Individual.evaluate', _fake_individual_evaluate):
+            with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+                pop = self.helper_create_pop_obj(ga_dict=ga_dict)
+
+        try:
+            pop.initialize_population()
+            with time_limit(30):
+                n = pop.evaluate_steady_state(evaluations=20,
+                                              deadline=time.time() - 1)
+        finally:
+            pop.graceful_shutdown()
+
+        self.assertEqual(6, n)
+        self.assertTrue(pop.out_of_time)
+        self.assertEqual(6, len(pop.population))
+
+    def test_evaluate_steady_state_shutdown(self):
+        """Once shut down, no new children should be submitted."""
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['population_size'] = 6
+        ga_dict['processes'] = 2
+
+        with patch('pyvvo.ga.Individual.evaluate', _fake_individual_evaluate):
+            with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+                pop = self.helper_create_pop_obj(ga_dict=ga_dict)
+
+        try:
+            pop.initialize_population()
+            pop._shutdown_event.set()
+            with patch.object(pop, '_breed_pair') as p:
+                with time_limit(30):
+                    n = pop.evaluate_steady_state(evaluations=20)
+        finally:
+            pop.graceful_shutdown()
+
+        p.assert_not_called()
+        self.assertLessEqual(n, 6)
+
+    def test_evaluate_steady_state_cache_hits(self):
+        """Breeding should stop if every child is a cache hit, rather
+        than spinning forever.
+        """
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['population_size'] = 6
+        ga_dict['processes'] = 2
+
+        with patch('pyvvo.ga.Individual.evaluate', _fake_individual_evaluate):
+            with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+                pop = self.helper_create_pop_obj(ga_dict=ga_dict)
+
+        def from_cache(ind):
+            # Only children are cache hits.
+            if id(ind) in initial:
+                return False
+
+            ind.evaluate_from_result(fitness=10, penalties={})
+            return True
+
+        try:
+            pop.initialize_population()
+            initial = {id(ind) for ind in pop.population}
+            with patch.object(pop, '_evaluate_from_cache',
+                              side_effect=from_cache):
+                with time_limit(30):
+                    n = pop.evaluate_steady_state(evaluations=20)
+        finally:
+            pop.graceful_shutdown()
+
+        self.assertEqual(6, n)
+
+    def test_update_best(self):
+        pop_obj = self.helper_create_pop_obj()
+        self.assertIsNone(pop_obj.best)
+
+        inds = [MockIndividual() for _ in range(3)]
+        inds[0].fitness = 3
+        inds[2].fitness = 1
+
+        pop_obj._update_best(inds)
+        self.assertIs(inds[2], pop_obj.best)
+
+        # A worse individual shouldn't replace the best.
+        pop_obj._update_best(inds[0:1])
+        self.assertIs(inds[2], pop_obj.best)
+
+    def test_evaluator_pool(self):
+        """Populations sharing an EvaluatorPool should leave it running
+        on graceful_shutdown.
+        """
+        ga_dict = deepcopy(self.ga_config)
+        ga_dict['population_size'] = 6
+
+        with patch('pyvvo.ga.Individual.evaluate', _fake_individual_evaluate):
+            with patch('pyvvo.ga.db.connect_loop', _fake_connect_loop):
+                pool = ga.EvaluatorPool(processes=2)
+
+        try:
+            for _ in range(2):
+                pop = self.helper_create_pop_obj(ga_dict=ga_dict,
+                                                 evaluator_pool=pool)
+                self.assertIs(pool, pop.evaluator_pool)
+                self.assertIs(pool.processes, pop.processes)
+
+                pop.initialize_population()
+                with time_limit(30):
+                    pop.evaluate_population()
+
+                self.assertEqual(6, len(pop.population))
+                for ind in pop.population:
+                    self.assertIsNotNone(ind.fitness)
+
+                pop.graceful_shutdown()
+                self.assertIsNone(pop.wait_for_processes(timeout=0.01))
+                self.assertTrue(pool.all_alive)
+
+            # The model was sent once per Population.
+            self.assertEqual(2, pool.model_version)
+        finally:
+            pool.shutdown()
+            pool.wait(timeout=5)
+
     def test_wait_for_processes(self):
         """Ensure that wait_for_processes is working as it should."""
         pop = self.helper_create_pop_obj()
@@ -2612,6 +4633,48 @@ class GAInitTestCase(unittest.TestCase):
     def test_stop_timeout(self):
         self.assertEqual(self.stop_timeout, self.ga_obj.stop_timeout)
 
+    def test_fitness_cache(self):
+        self.assertIsNone(self.ga_obj.fitness_cache)
+
+    def test_surrogate(self):
+        self.assertIsNone(self.ga_obj.surrogate)
+
+    def test_evaluator_pool(self):
+        self.assertIsNone(self.ga_obj.evaluator_pool)
+
+    def test_evaluator_pool_bad_type(self):
+        with self.assertRaisesRegex(TypeError, 'evaluator_pool must be None'):
+            ga.GA(regulators=self.regs, capacitors=self.caps,
+                  starttime=self.starttime, stoptime=self.stoptime,
+                  evaluator_pool='pool')
+
+    def test_deadline(self):
+        self.assertIsNone(self.ga_obj.deadline)
+
+    def test_deadline_bad_type(self):
+        with self.assertRaisesRegex(TypeError, 'deadline must be None or a'):
+            ga.GA(regulators=self.regs, capacitors=self.caps,
+                  starttime=self.starttime, stoptime=self.stoptime,
+                  deadline='soon')
+
+    def test_interrupted(self):
+        self.assertFalse(self.ga_obj.interrupted)
+
+    def test_deadline_hit(self):
+        self.assertFalse(self.ga_obj.deadline_hit)
+
+    def test_stop_reason(self):
+        self.assertIsNone(self.ga_obj.stop_reason)
+
+    def test_stopping_criteria_from_config(self):
+        with patch('pyvvo.ga.stopping_criteria_from_config',
+                   return_value=['a']) as p:
+            with self.assertRaisesRegex(TypeError, 'stopping_criteria must'):
+                ga.GA(regulators=self.regs, capacitors=self.caps,
+                      starttime=self.starttime, stoptime=self.stoptime)
+
+        p.assert_called_once()
+
     def test_population(self):
         self.assertIsNone(self.ga_obj.population)
 
@@ -2705,6 +4768,33 @@ class GATestCase(unittest.TestCase):
         # Ensure a copy was made.
         self.assertIsNot(p.call_args[1]['glm_mgr'], mgr)
 
+    def test_run_seeds_from_population(self):
+        """Given a Population, run should pass along its best
+        chromosomes.
+        """
+        pop_mock = create_autospec(ga.Population, instance=True)
+        pop_mock.best_chromosomes.return_value = [1, 2]
+
+        with patch.object(self.ga_obj, '_run') as p:
+            with patch.dict(ga.CONFIG['ga']['warm_start'], {'top_k': 7}):
+                self.ga_obj.run(NonCallableMagicMock(), seeds=pop_mock)
+
+            self.ga_obj.run_thread.join()
+
+        pop_mock.best_chromosomes.assert_called_once_with(k=7)
+        self.assertEqual([1, 2], p.call_args[1]['seeds'])
+
+    def test_run_seeds_from_unrun_ga(self):
+        """A GA which never ran has no population, so no seeds."""
+        other = ga.GA(regulators=self.regs, capacitors=self.caps,
+                      starttime=self.starttime, stoptime=self.stoptime)
+
+        with patch.object(self.ga_obj, '_run') as p:
+            self.ga_obj.run(NonCallableMagicMock(), seeds=other)
+            self.ga_obj.run_thread.join()
+
+        self.assertIsNone(p.call_args[1]['seeds'])
+
     @patch('pyvvo.ga._update_equipment_with_individual')
     def test_running_attribute(self, update_mock):
         """Ensure the "running" attribute properly reflects whether or
@@ -2765,6 +4855,169 @@ class GATestCase(unittest.TestCase):
         # flipping the "running" flag.
         self.assertFalse(self.ga_obj.running)
 
+    @patch('pyvvo.ga._update_equipment_with_individual')
+    def test_run_steady_state(self, update_mock):
+        """In steady-state mode, _run should hand everything off to
+        evaluate_steady_state rather than looping over generations.
+        """
+        pop_mock = NonCallableMagicMock()
+        pop_mock.mode = 'steady_state'
+        pop_mock.population = [MockIndividual()]
+        pop_mock.population[0].fitness = 3
+        pop_mock.evaluate_steady_state.return_value = 10
+        pop_mock.out_of_time = False
+
+        with patch('pyvvo.ga.Population', return_value=pop_mock):
+            self.ga_obj._run(glm_mgr=NonCallableMagicMock())
+
+        pop_mock.evaluate_steady_state.assert_called_once()
+        pop_mock.evaluate_population.assert_not_called()
+        pop_mock.natural_selection.assert_not_called()
+        update_mock.assert_called_once()
+        self.assertEqual('Completed 10 steady-state evaluations.',
+                         self.ga_obj.stop_reason)
+
+        # The stop reason should say if the deadline cut it short.
+        pop_mock.out_of_time = True
+        with patch('pyvvo.ga.Population', return_value=pop_mock):
+            self.ga_obj._run(glm_mgr=NonCallableMagicMock())
+
+        self.assertIn('before stopping to meet the deadline',
+                      self.ga_obj.stop_reason)
+
+    def test_run_interrupted(self):
+        """If interrupted, _run should flag it."""
+        self.ga_obj._run_event.clear()
+
+        with patch('pyvvo.ga.Population'):
+            with self.assertLogs(logger=self.ga_obj.log, level='WARNING'):
+                self.ga_obj._run(glm_mgr=NonCallableMagicMock())
+
+        self.assertTrue(self.ga_obj.interrupted)
+        self.assertEqual('Interrupted.', self.ga_obj.stop_reason)
+
+    def test_run_interrupted_by_deadline(self):
+        self.ga_obj._run_event.clear()
+        self.ga_obj._deadline_hit = True
+
+        with patch('pyvvo.ga.Population'):
+            with self.assertLogs(logger=self.ga_obj.log, level='WARNING'):
+                self.ga_obj._run(glm_mgr=NonCallableMagicMock())
+
+        self.assertTrue(self.ga_obj.interrupted)
+        self.assertEqual('Interrupted by the deadline.',
+                         self.ga_obj.stop_reason)
+
+    def test_run_generations_deadline_passed(self):
+        """No generations should be started if the deadline has
+        passed.
+        """
+        ga_obj = ga.GA(regulators=self.regs, capacitors=self.caps,
+                       starttime=self.starttime, stoptime=self.stoptime,
+                       deadline=time.time() - 1)
+        ga_obj._population = NonCallableMagicMock()
+
+        ga_obj._run_generations()
+
+        self.assertIn('Skipped the remaining 3', ga_obj.stop_reason)
+        ga_obj.population.evaluate_population.assert_called_once()
+        ga_obj.population.natural_selection.assert_not_called()
+
+    def test_run_generations_deadline_future(self):
+        ga_obj = ga.GA(regulators=self.regs, capacitors=self.caps,
+                       starttime=self.starttime, stoptime=self.stoptime,
+                       deadline=time.time() + 100)
+        ga_obj._population = NonCallableMagicMock()
+        ga_obj._population.population = [MockIndividual()]
+        ga_obj._population.population[0].fitness = 1
+
+        with patch.dict(ga.CONFIG['ga'], {'generations': 3}):
+            ga_obj._run_generations()
+
+        self.assertEqual(3, ga_obj.population.natural_selection.call_count)
+        self.assertEqual('Completed all 3 generations.', ga_obj.stop_reason)
+
+    def test_run_generations_stopping_criteria(self):
+        """Stop as soon as a criterion is met."""
+        criterion = create_autospec(ga.StoppingCriterion, instance=True)
+        criterion.check.side_effect = [None, 'Because.']
+
+        ga_obj = ga.GA(regulators=self.regs, capacitors=self.caps,
+                       starttime=self.starttime, stoptime=self.stoptime,
+                       stopping_criteria=[criterion])
+        ga_obj._population = NonCallableMagicMock()
+        ga_obj._population.population = [MockIndividual()]
+        ga_obj._population.population[0].fitness = 1
+
+        with patch.dict(ga.CONFIG['ga'], {'generations': 5}):
+            ga_obj._run_generations()
+
+        criterion.reset.assert_called_once()
+        self.assertEqual(2, criterion.check.call_count)
+        self.assertEqual(2, ga_obj.population.natural_selection.call_count)
+        self.assertEqual('Stopped after generation 2: Because.',
+                         ga_obj.stop_reason)
+
+    def test_run_starts_deadline_timer(self):
+        ga_obj = ga.GA(regulators=self.regs, capacitors=self.caps,
+                       starttime=self.starttime, stoptime=self.stoptime,
+                       deadline=time.time() + 100)
+
+        with patch.object(ga_obj, '_run'):
+            ga_obj.run(NonCallableMagicMock())
+
+        self.assertTrue(ga_obj._deadline_timer.is_alive())
+        ga_obj._deadline_timer.cancel()
+
+    def test_deadline_expired(self):
+        # Not running, so stop shouldn't be called.
+        with patch.object(self.ga_obj, 'stop') as p:
+            self.ga_obj._deadline_expired()
+
+        p.assert_not_called()
+        self.assertFalse(self.ga_obj.deadline_hit)
+
+        # Fake running.
+        self.ga_obj._not_running_event.clear()
+        with patch.object(self.ga_obj, 'stop') as p:
+            with self.assertLogs(logger=self.ga_obj.log, level='WARNING'):
+                self.ga_obj._deadline_expired()
+
+        p.assert_called_once()
+        self.assertTrue(self.ga_obj.deadline_hit)
+
+    def test_run_resets_deadline_hit(self):
+        self.ga_obj._deadline_hit = True
+
+        with patch.object(self.ga_obj, '_run'):
+            self.ga_obj.run(NonCallableMagicMock())
+
+        self.ga_obj.run_thread.join()
+        self.assertFalse(self.ga_obj.deadline_hit)
+
+    def test_best_so_far_no_population(self):
+        self.assertIsNone(self.ga_obj.best_so_far())
+
+    def test_best_so_far_none_evaluated(self):
+        self.ga_obj._population = NonCallableMagicMock()
+        self.ga_obj._population.best = None
+
+        with self.assertLogs(logger=self.ga_obj.log, level='WARNING'):
+            self.assertIsNone(self.ga_obj.best_so_far())
+
+    def test_best_so_far(self):
+        best = MockIndividual()
+        best.fitness = 2
+        self.ga_obj._population = NonCallableMagicMock()
+        self.ga_obj._population.best = best
+
+        with patch('pyvvo.ga._update_equipment_with_individual') as p:
+            with self.assertLogs(logger=self.ga_obj.log, level='INFO'):
+                self.assertIs(best, self.ga_obj.best_so_far())
+
+        p.assert_called_once_with(ind=best, regs=self.ga_obj.regulators,
+                                  caps=self.ga_obj.capacitors)
+
     def test_run_if_set(self):
         """Ensure our _run_if_set method behaves correctly."""
         # The run_event should start set.
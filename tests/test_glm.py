@@ -1,10 +1,14 @@
 # Standard library imports
 import unittest
+import io
 from unittest.mock import patch, Mock
 from datetime import datetime
 import os
 import logging
 import re
+import tempfile
+import pickle
+from copy import deepcopy
 
 # Import module to test
 from pyvvo import glm, db
@@ -99,6 +103,64 @@ class TestParseFile2(unittest.TestCase):
                          '${VSOURCE}')
 
 
+class ParseFastTestCase(unittest.TestCase):
+    """Ensure the fast parser builds the same tree as the original
+    tokenizer and parser.
+    """
+
+    @staticmethod
+    def parse_original(input_str, file_path):
+        return glm._parse_token_list(glm._tokenize_glm(input_str, file_path))
+
+    def helper_compare(self, input_str, file_path=False):
+        self.assertEqual(self.parse_original(input_str, file_path),
+                         glm.parse(input_str, file_path))
+
+    def test_models(self):
+        for f in [TEST_FILE, TEST_FILE3, TEST_FILE4, TEST_SUBSTATION_METER,
+                  TEST_INVERTER, TEST_INVERTER_3_PHASE, TEST_SWITCH_MOD,
+                  IEEE_13, IEEE_123_mod, IEEE_9500]:
+            with self.subTest(model=f):
+                with open(f, 'r') as f_in:
+                    tokens = glm._scan_glm(f_in.read())
+
+                # These models should not need the fallback.
+                self.assertEqual(
+                    self.parse_original(f, True),
+                    glm._parse_tokens_fast(tokens))
+
+    def test_syntax(self):
+        for s in ['#set minimum_timestep=60;\n#include "a.glm"\n'
+                  + 'module tape;\nclock {\n timezone EST+5EDT;\n}\n',
+                  'object house:12 {\n name h:1;\n object ZIPload '
+                  + '{ power 1+2j VA; };\n}\n// comment\r\n'
+                  + 'object fuse { phases ABC; // c\n}\n',
+                  'class player {\n double value;\n int x;\n}\n',
+                  'object a\n{\n x 1;\n}\n',
+                  'object a {\n b c d {\n x y;\n };\n}\n']:
+            with self.subTest(s=s):
+                self.helper_compare(s)
+
+    def test_fallback(self):
+        """Exotic syntax should fall back to the original parser."""
+        for s in ['object a { name x }\nobject b { name y; }\n',
+                  'object a { x ${FOO}; }\n',
+                  'schedule s {\n * * * * * 1.0;\n}\n',
+                  'object a { shape "x" "y"\n; }\n']:
+            with self.subTest(s=s):
+                self.helper_compare(s)
+
+    def test_fallback_errors(self):
+        """Errors should come from the original parser."""
+        for s, e in [('object a { name x; name y; }\n', UserWarning),
+                     ('object a b c d {\n}\n', UserWarning),
+                     ('object a { x; }\n', TypeError),
+                     ('object a { x 1; }}\n', IndexError)]:
+            with self.subTest(s=s):
+                with self.assertRaises(e):
+                    glm.parse(s, False)
+
+
 class TestGLMManager(unittest.TestCase):
     """Test the GLMManager class.
 
@@ -1985,5 +2047,797 @@ class ConvertSwitchStatusToThreePhaseTestCase(unittest.TestCase):
         self.assertEqual(result2.stdout, b'')
 
 
+# Small model for testing templates.
+TEMPLATE_MODEL = """
+clock {
+    timezone UTC0;
+    starttime '2013-01-01 00:00:00';
+    stoptime '2013-01-01 00:01:00';
+}
+module powerflow {
+    solver_method NR;
+}
+object regulator_configuration {
+    name rc1;
+    raise_taps 16;
+    lower_taps 16;
+    tap_pos_A 0;
+}
+object regulator {
+    name reg1;
+    phases ABC;
+    configuration rc1;
+    tap_A 0;
+    from n1;
+    to n2;
+}
+object capacitor {
+    name cap1;
+    phases ABC;
+    switchA OPEN;
+}
+object meter {
+    name n1;
+    phases ABC;
+    nominal_voltage 7200;
+}
+object meter {
+    name n2;
+    phases ABC;
+    nominal_voltage 7200;
+}
+"""
+
+
+class CompileTemplateTestCase(unittest.TestCase):
+    """Test compile_template and its effect on write_model."""
+
+    def setUp(self):
+        self.plain = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        self.mgr = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        self.mgr.compile_template([('regulator', None),
+                                   ('regulator_configuration', None),
+                                   ('capacitor', 'cap1'),
+                                   ('capacitor', 'not_there'),
+                                   ('fuse', None)])
+
+    def helper_modify_both(self, method, *args):
+        # Some methods (e.g. modify_item) alter their inputs, so copy.
+        getattr(self.plain, method)(*deepcopy(args))
+        getattr(self.mgr, method)(*deepcopy(args))
+
+    def test_same_output(self):
+        self.assertEqual(self.plain.write_model(out_path=None),
+                         self.mgr.write_model(out_path=None))
+
+    def test_chunks(self):
+        # clock + module, 3 dynamic objects, 2 meters.
+        self.assertEqual(5, len(self.mgr._template))
+        self.assertEqual(3, len(self.mgr._template_dynamic))
+
+    def test_dynamic_modifications(self):
+        """Modifying dynamic objects should leave the template alone."""
+        template = self.mgr._template
+        self.helper_modify_both('update_reg_taps', 'reg1', {'A': 5})
+        self.helper_modify_both('update_cap_switches', 'cap1',
+                                {'A': 'CLOSED'})
+        self.helper_modify_both('modify_item', {'object': 'capacitor',
+                                                'name': 'cap1',
+                                                'control': 'MANUAL'})
+
+        out = self.mgr.write_model(out_path=None)
+        self.assertIs(template, self.mgr._template)
+        self.assertEqual(self.plain.write_model(out_path=None), out)
+        self.assertIn('tap_A 5;', out)
+        self.assertIn('switchA CLOSED;', out)
+
+    def test_static_modifications(self):
+        """Modifying anything else should drop the template."""
+        self.helper_modify_both('modify_item', {'object': 'meter',
+                                                'name': 'n1',
+                                                'nominal_voltage': 120})
+        self.assertIsNone(self.mgr._template)
+
+        self.helper_modify_both('add_item', {'object': 'meter',
+                                             'name': 'n3'})
+        self.helper_modify_both('remove_item', {'object': 'meter',
+                                                'name': 'n2'})
+
+        # The template is recompiled on the next write.
+        out = self.mgr.write_model(out_path=None)
+        self.assertIsNotNone(self.mgr._template)
+        self.assertEqual(self.plain.write_model(out_path=None), out)
+        self.assertIn('nominal_voltage 120;', out)
+
+    def test_copy(self):
+        """Copies shouldn't carry the compiled template, but should
+        recompile it when written.
+        """
+        mgr = deepcopy(self.mgr)
+        self.assertIsNone(mgr._template)
+        self.assertEqual(self.plain.write_model(out_path=None),
+                         mgr.write_model(out_path=None))
+        self.assertIsNotNone(mgr._template)
+
+
+class SortedWriteStreamTestCase(unittest.TestCase):
+    """Test writing the model to streams via sorted_write and
+    write_model.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mgr = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        cls.expected = glm.sorted_write(cls.mgr.model_dict)
+
+    def test_nested_and_class(self):
+        s = 'class foo {\n\tdouble bar;\n\tint baz;\n}\n\n' \
+            + 'object meter {\n\tname m;\n' \
+            + 'object recorder {\n\tinterval 60;\n};\n};\n\n'
+        tree = glm.parse(s, file_path=False)
+        self.assertEqual(s, glm.sorted_write(tree))
+
+    def test_text_stream(self):
+        out = io.StringIO()
+        self.assertIsNone(glm.sorted_write(self.mgr.model_dict, out))
+        self.assertEqual(self.expected, out.getvalue())
+
+    def test_binary_stream(self):
+        out = io.BytesIO()
+        glm.sorted_write(self.mgr.model_dict, out)
+        self.assertEqual(self.expected.encode('utf-8'), out.getvalue())
+
+    def test_pipe(self):
+        r, w = os.pipe()
+        with os.fdopen(r, 'rb') as f_r:
+            with os.fdopen(w, 'wb', buffering=0) as f_w:
+                self.mgr.write_model(f_w)
+                # Raw streams should be left open.
+                self.assertFalse(f_w.closed)
+
+            self.assertEqual(self.expected.encode('utf-8'), f_r.read())
+
+    def test_write_model_stream(self):
+        out = io.StringIO()
+        self.assertIsNone(self.mgr.write_model(out))
+        self.assertEqual(self.expected, out.getvalue())
+
+    def test_unknown_item(self):
+        with self.assertRaisesRegex(TypeError, 'Unable to write item'):
+            glm.sorted_write({0: {'bad': 'item'}})
+
+
+class FromCacheTestCase(unittest.TestCase):
+    """Test GLMManager.from_cache and save_cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        self.prep = [('update_reg_taps', {'reg_name': 'reg1',
+                                          'pos_dict': {'A': 3}})]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def helper_from_cache(self, prep=None, max_size=None):
+        return glm.GLMManager.from_cache(
+            model=TEMPLATE_MODEL, cache_dir=self.cache_dir,
+            model_is_path=False, prep=prep, max_size=max_size)
+
+    def test_miss_then_hit(self):
+        mgr1 = self.helper_from_cache(prep=self.prep)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+        # The model should not be parsed again.
+        with patch('pyvvo.glm.parse', side_effect=AssertionError):
+            mgr2 = self.helper_from_cache(prep=self.prep)
+
+        self.assertIsNot(mgr1, mgr2)
+        self.assertEqual(mgr1.write_model(out_path=None),
+                         mgr2.write_model(out_path=None))
+        self.assertIn('tap_A 3;', mgr2.write_model(out_path=None))
+
+        # The map should still point at the model's dictionaries.
+        reg = mgr2.find_object(obj_type='regulator', obj_name='reg1')
+        self.assertIs(reg, mgr2.model_dict[
+            mgr2.model_map['object']['regulator']['reg1'][0]])
+
+    def test_prep_in_key(self):
+        self.helper_from_cache(prep=self.prep)
+        mgr = self.helper_from_cache()
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        self.assertNotIn('tap_A 3;', mgr.write_model(out_path=None))
+
+    def test_corrupt_file(self):
+        mgr1 = self.helper_from_cache()
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(path, 'wb') as f:
+            f.write(b'not a pickle')
+
+        with self.assertLogs(logger='GLMManager', level='WARNING'):
+            mgr2 = self.helper_from_cache()
+
+        self.assertEqual(mgr1.write_model(out_path=None),
+                         mgr2.write_model(out_path=None))
+
+        # The file should have been rewritten.
+        with patch('pyvvo.glm.parse', side_effect=AssertionError):
+            self.helper_from_cache()
+
+    def test_eviction(self):
+        self.helper_from_cache()
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        # Make the first file look old.
+        os.utime(path, (0, 0))
+
+        # A max_size of 1 byte only leaves the newest file.
+        self.helper_from_cache(prep=self.prep, max_size=1)
+        files = os.listdir(self.cache_dir)
+        self.assertEqual(1, len(files))
+        self.assertNotEqual(os.path.basename(path), files[0])
+
+    def test_private_dir(self):
+        self.helper_from_cache()
+        self.assertEqual(0o700, os.stat(self.cache_dir).st_mode & 0o777)
+
+    def test_shared_dir(self):
+        """Files in a directory others can write to shouldn't be
+        loaded or written.
+        """
+        os.makedirs(self.cache_dir)
+        os.chmod(self.cache_dir, 0o777)
+
+        with patch('pyvvo.glm.pickle.load', side_effect=AssertionError):
+            with self.assertLogs(logger='GLMManager', level='WARNING'):
+                mgr = self.helper_from_cache()
+
+        self.assertIsInstance(mgr, glm.GLMManager)
+        self.assertListEqual([], os.listdir(self.cache_dir))
+
+    def test_bad_dir(self):
+        """A directory which can't be created shouldn't stop us."""
+        path = os.path.join(self.tmp_dir.name, 'file')
+        with open(path, 'w') as f:
+            f.write('not a directory')
+
+        with self.assertLogs(logger='GLMManager', level='WARNING'):
+            mgr = glm.GLMManager.from_cache(
+                model=TEMPLATE_MODEL, cache_dir=os.path.join(path, 'cache'),
+                model_is_path=False)
+
+        self.assertIsInstance(mgr, glm.GLMManager)
+
+    def test_utime_fails(self):
+        """A cache hit in a directory we can't write to should still
+        load the model.
+        """
+        self.helper_from_cache()
+
+        with patch('pyvvo.glm.os.utime',
+                   side_effect=PermissionError(13, 'Permission denied')):
+            with self.assertLogs(logger='GLMManager', level='WARNING'):
+                with patch('pyvvo.glm.parse', side_effect=AssertionError):
+                    mgr = self.helper_from_cache()
+
+        self.assertIsInstance(mgr, glm.GLMManager)
+
+    def test_save_fails(self):
+        """A failed save should be logged, and the temporary file
+        removed.
+        """
+        with patch('pyvvo.glm.pickle.dump',
+                   side_effect=OSError(28, 'No space left on device')):
+            with self.assertLogs(logger='GLMManager', level='WARNING'):
+                mgr = self.helper_from_cache()
+
+        self.assertIsInstance(mgr, glm.GLMManager)
+        self.assertListEqual([], os.listdir(self.cache_dir))
+
+        with patch('pyvvo.glm.pickle.dump',
+                   side_effect=pickle.PicklingError('nope')):
+            with self.assertLogs(logger='GLMManager', level='WARNING'):
+                self.assertIsNone(mgr.save_cache(cache_dir=self.cache_dir,
+                                                 key='k'))
+
+        self.assertListEqual([], os.listdir(self.cache_dir))
+
+
+class RenderCacheTestCase(unittest.TestCase):
+    """Test that write_model only re-renders modified items."""
+
+    def setUp(self):
+        self.mgr = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        # Render everything once.
+        self.mgr.write_model(out_path=None)
+
+    def helper_renders(self):
+        """Write the model, returning the number of items rendered and
+        the output.
+        """
+        with patch('pyvvo.glm._item_string', wraps=glm._item_string) as p:
+            out = self.mgr.write_model(out_path=None)
+
+        # Output must match a fresh rendering.
+        self.assertEqual(glm.sorted_write(self.mgr.model_dict), out)
+        return p.call_count, out
+
+    def test_no_changes(self):
+        self.assertEqual(0, self.helper_renders()[0])
+
+    def test_modify_item(self):
+        self.mgr.modify_item({'object': 'meter', 'name': 'n1',
+                              'nominal_voltage': 120})
+        self.mgr.modify_item({'clock': 'clock', 'timezone': 'EST+5EDT'})
+        n, out = self.helper_renders()
+        self.assertEqual(2, n)
+        self.assertIn('nominal_voltage 120;', out)
+        self.assertIn('timezone EST+5EDT;', out)
+
+    def test_update_reg_taps_and_cap_switches(self):
+        self.mgr.update_reg_taps('reg1', {'A': 2})
+        self.mgr.update_cap_switches('cap1', {'A': 'CLOSED'})
+        # Regulator, its configuration, and the capacitor.
+        self.assertEqual(3, self.helper_renders()[0])
+
+    def test_remove_properties(self):
+        self.mgr.remove_properties_from_item(
+            {'object': 'meter', 'name': 'n2'}, ['nominal_voltage'])
+        n, out = self.helper_renders()
+        self.assertEqual(1, n)
+        self.assertEqual(1, out.count('nominal_voltage'))
+
+    def test_add_and_remove_item(self):
+        self.mgr.add_item({'object': 'meter', 'name': 'n3'})
+        self.mgr.remove_item({'object': 'meter', 'name': 'n1'})
+        n, out = self.helper_renders()
+        self.assertEqual(1, n)
+        self.assertIn('name n3;', out)
+        self.assertNotIn('name n1;', out)
+
+    def test_convert_switch_status(self):
+        self.mgr.add_item({'object': 'switch', 'name': 'sw1',
+                           'phases': 'ABC', 'status': 'OPEN'})
+        self.helper_renders()
+        self.mgr.convert_switch_status_to_three_phase()
+        n, out = self.helper_renders()
+        self.assertEqual(1, n)
+        self.assertIn('phase_A_state OPEN;', out)
+
+    def test_copy(self):
+        """Copies should not share the render cache."""
+        mgr = deepcopy(self.mgr)
+        self.assertEqual(0, len(mgr._rendered))
+        mgr.modify_item({'object': 'meter', 'name': 'n1',
+                         'nominal_voltage': 120})
+        self.assertNotIn('nominal_voltage 120;',
+                         self.mgr.write_model(out_path=None))
+
+
+class ForkTestCase(unittest.TestCase):
+    """Test GLMManager.fork and GLMOverlay."""
+
+    def setUp(self):
+        self.base = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        self.base_out = self.base.write_model(out_path=None)
+
+    def helper_compare(self, fork, ops):
+        """Apply ops (list of (method, args) tuples) to a fork and to a
+        deepcopy of the base, and ensure the output matches.
+        """
+        mgr = deepcopy(self.base)
+        for method, args in ops:
+            getattr(fork, method)(*deepcopy(args))
+            getattr(mgr, method)(*deepcopy(args))
+
+        out = fork.write_model(out_path=None)
+        self.assertEqual(mgr.write_model(out_path=None), out)
+
+        # The base should be untouched.
+        self.assertEqual(self.base_out, self.base.write_model(out_path=None))
+        return out
+
+    def test_modify(self):
+        fork = self.base.fork()
+        self.assertIsInstance(fork, glm.GLMOverlay)
+        out = self.helper_compare(
+            fork, [('update_reg_taps', ('reg1', {'A': 4})),
+                   ('update_cap_switches', ('cap1', {'A': 'CLOSED'})),
+                   ('modify_item', ({'object': 'meter', 'name': 'n1',
+                                     'nominal_voltage': 120},)),
+                   ('modify_item', ({'clock': 'clock',
+                                     'timezone': 'EST+5EDT'},))])
+        self.assertIn('tap_pos_A 4;', out)
+        self.assertIn('nominal_voltage 120;', out)
+
+    def test_template(self):
+        self.base.compile_template([('regulator', None),
+                                    ('regulator_configuration', None),
+                                    ('capacitor', None)])
+        template = self.base._template
+        self.helper_compare(
+            self.base.fork(), [('update_reg_taps', ('reg1', {'A': -2})),
+                               ('update_cap_switches',
+                                ('cap1', {'A': 'CLOSED'}))])
+
+        # Modifying a static object through a fork shouldn't touch the
+        # base's template.
+        self.helper_compare(
+            self.base.fork(), [('modify_item', ({'object': 'meter',
+                                                 'name': 'n2',
+                                                 'phases': 'A'},))])
+        self.assertIs(template, self.base._template)
+
+    def test_lookups(self):
+        fork = self.base.fork()
+        base_cap = self.base.find_object('capacitor', 'cap1')
+        self.assertIs(base_cap, fork.find_object('capacitor', 'cap1'))
+
+        fork.update_cap_switches('cap1', {'A': 'CLOSED'})
+        cap = fork.find_object('capacitor', 'cap1')
+        self.assertIsNot(base_cap, cap)
+        self.assertEqual('CLOSED', cap['switchA'])
+        self.assertEqual('OPEN', base_cap['switchA'])
+
+        self.assertIs(cap, fork.get_items_by_type(
+            'object', object_type='capacitor')['cap1'])
+        self.assertIs(cap, fork.get_objects_by_type('capacitor')[0])
+        self.assertIsNone(fork.find_object('capacitor', 'nope'))
+        self.assertIsNone(fork.get_objects_by_type('fuse'))
+
+        fork.modify_item({'clock': 'clock', 'timezone': 'EST+5EDT'})
+        self.assertEqual('EST+5EDT', fork.get_items_by_type('clock')[
+            'timezone'])
+        self.assertEqual('UTC0', self.base.get_items_by_type('clock')[
+            'timezone'])
+
+    def test_errors(self):
+        fork = self.base.fork()
+        with self.assertRaises(KeyError):
+            fork.modify_item({'object': 'meter', 'name': 'nope',
+                              'phases': 'A'})
+
+        with self.assertRaises(ValueError):
+            fork.update_reg_taps('reg1', {'A': 17})
+
+        with self.assertRaises(ValueError):
+            fork.update_cap_switches('nope', {'A': 'CLOSED'})
+
+    def test_threads(self):
+        """Forks should be usable concurrently."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def helper(tap):
+            fork = self.base.fork()
+            fork.update_reg_taps('reg1', {'A': tap})
+            return fork.write_model(out_path=None)
+
+        with ThreadPoolExecutor(4) as pool:
+            outs = list(pool.map(helper, range(-8, 9)))
+
+        for tap, out in zip(range(-8, 9), outs):
+            self.assertIn('tap_A {};'.format(tap), out)
+
+        self.assertEqual(self.base_out, self.base.write_model(out_path=None))
+
+
+INDEX_MODEL = TEMPLATE_MODEL + """
+object triplex_load {
+    name tl1;
+    parent n2;
+    groupid tl_group;
+}
+object triplex_load {
+    name tl2;
+    parent n2;
+    groupid tl_group;
+}
+object overhead_line {
+    name ol1;
+    from n2;
+    to n3;
+}
+object meter {
+    name n3;
+    phases ABC;
+    nominal_voltage 7200;
+}
+object recorder {
+    parent n3;
+    property measured_power;
+}
+"""
+
+
+class IndexTestCase(unittest.TestCase):
+    """Test GLMManager's secondary indexes."""
+
+    def setUp(self):
+        self.glm_mgr = glm.GLMManager(INDEX_MODEL, model_is_path=False)
+
+    @staticmethod
+    def names(objs):
+        return sorted(o.get('name', '') for o in objs)
+
+    def test_lookups(self):
+        self.assertEqual(['tl1', 'tl2'],
+                         self.names(self.glm_mgr.get_children('n2')))
+        self.assertEqual(['tl1', 'tl2'], self.names(
+            self.glm_mgr.get_objects_by_groupid('tl_group')))
+        self.assertEqual(['ol1', 'reg1'],
+                         self.names(self.glm_mgr.get_links_by_node('n2')))
+        self.assertEqual(['ol1'], self.names(
+            self.glm_mgr.get_objects_by_property(
+                'from', 'n2', object_type='overhead_line')))
+
+        # Unnamed objects are indexed too.
+        children = self.glm_mgr.get_children('n3')
+        self.assertEqual(1, len(children))
+        self.assertEqual('recorder', children[0]['object'])
+
+    def test_no_match(self):
+        self.assertEqual([], self.glm_mgr.get_children('nope'))
+        self.assertEqual([], self.glm_mgr.get_objects_by_property(
+            'bogus_property', 'bogus_value'))
+
+    def test_modify(self):
+        self.glm_mgr.add_index('parent', 'groupid')
+        self.glm_mgr.modify_item({'object': 'triplex_load', 'name': 'tl1',
+                                  'parent': 'n3', 'groupid': 'other'})
+        self.assertEqual(['tl2'],
+                         self.names(self.glm_mgr.get_children('n2')))
+        self.assertEqual(['', 'tl1'],
+                         self.names(self.glm_mgr.get_children('n3')))
+        self.assertEqual(['tl1'], self.names(
+            self.glm_mgr.get_objects_by_groupid('other')))
+
+    def test_remove_property(self):
+        self.glm_mgr.add_index('groupid')
+        self.glm_mgr.remove_properties_from_item(
+            {'object': 'triplex_load', 'name': 'tl2'}, ['groupid'])
+        self.assertEqual(['tl1'], self.names(
+            self.glm_mgr.get_objects_by_groupid('tl_group')))
+
+    def test_add_and_remove(self):
+        self.glm_mgr.add_index('parent')
+        self.glm_mgr.add_item({'object': 'triplex_load', 'name': 'tl3',
+                               'parent': 'n2'})
+        self.assertEqual(['tl1', 'tl2', 'tl3'],
+                         self.names(self.glm_mgr.get_children('n2')))
+
+        self.glm_mgr.remove_item({'object': 'triplex_load', 'name': 'tl1'})
+        self.assertEqual(['tl2', 'tl3'],
+                         self.names(self.glm_mgr.get_children('n2')))
+
+    def test_update_reg_taps(self):
+        self.glm_mgr.add_index('tap_A')
+        self.glm_mgr.update_reg_taps('reg1', {'A': 3})
+        self.assertEqual(['reg1'], self.names(
+            self.glm_mgr.get_objects_by_property('tap_A', '3')))
+        self.assertEqual([], self.glm_mgr.get_objects_by_property(
+            'tap_A', '0'))
+
+    def test_deepcopy(self):
+        self.glm_mgr.add_index('parent')
+        mgr = deepcopy(self.glm_mgr)
+        self.assertEqual({}, mgr._indexes)
+        self.assertEqual(['tl1', 'tl2'], self.names(mgr.get_children('n2')))
+        self.assertIs(mgr.find_object('triplex_load', 'tl1'),
+                      mgr.find_object('triplex_load', 'tl1'))
+        for o in mgr.get_children('n2'):
+            self.assertIs(o, mgr.find_object('triplex_load', o['name']))
+
+    def test_fork_leaves_base_indexes(self):
+        self.glm_mgr.add_index('parent')
+        fork = self.glm_mgr.fork()
+        fork.modify_item({'object': 'triplex_load', 'name': 'tl1',
+                          'parent': 'n3'})
+        self.assertEqual(['tl1', 'tl2'],
+                         self.names(self.glm_mgr.get_children('n2')))
+
+
+class ModifyItemsTestCase(unittest.TestCase):
+    """Test GLMManager.modify_items."""
+
+    def setUp(self):
+        self.glm_mgr = glm.GLMManager(INDEX_MODEL, model_is_path=False)
+
+    def test_matches_modify_item(self):
+        mgr = deepcopy(self.glm_mgr)
+        for name, v in (('n1', 120), ('n2', 240.5)):
+            mgr.modify_item({'object': 'meter', 'name': name,
+                             'nominal_voltage': v, 'groupid': 'g'})
+
+        updates = {'n1': {'nominal_voltage': 120, 'groupid': 'g'},
+                   'n2': {'nominal_voltage': 240.5, 'groupid': 'g'}}
+        missing = self.glm_mgr.modify_items('meter', updates)
+
+        self.assertEqual([], missing)
+        self.assertEqual(mgr.write_model(out_path=None),
+                         self.glm_mgr.write_model(out_path=None))
+
+        # The updates should be left alone.
+        self.assertEqual(120, updates['n1']['nominal_voltage'])
+
+    def test_no_cast(self):
+        self.glm_mgr.modify_items('triplex_load', {'tl1': {'groupid': 'x'},
+                                                   'tl2': {'groupid': 'y'}},
+                                  cast=False)
+        self.assertEqual(
+            'y', self.glm_mgr.find_object('triplex_load', 'tl2')['groupid'])
+
+    def test_strict(self):
+        before = self.glm_mgr.write_model(out_path=None)
+        with self.assertRaisesRegex(KeyError, 'nope'):
+            self.glm_mgr.modify_items('meter', {'n1': {'phases': 'A'},
+                                                'nope': {'phases': 'A'}})
+
+        # Nothing should have been modified.
+        self.assertEqual(before, self.glm_mgr.write_model(out_path=None))
+
+    def test_lenient(self):
+        missing = self.glm_mgr.modify_items(
+            'meter', {'n1': {'phases': 'A'}, 'nope': {'phases': 'A'}},
+            strict=False)
+        self.assertEqual(['nope'], missing)
+        self.assertEqual('A', self.glm_mgr.find_object('meter', 'n1')[
+            'phases'])
+
+        # Missing object type.
+        self.assertEqual(['f'], self.glm_mgr.modify_items(
+            'fuse', {'f': {'phases': 'A'}}, strict=False))
+
+    def test_rename(self):
+        with self.assertRaises(ValueError):
+            self.glm_mgr.modify_items('meter', {'n1': {'name': 'n7'}})
+
+    def test_index_and_render_cache(self):
+        self.glm_mgr.add_index('groupid')
+        self.glm_mgr.write_model(out_path=None)
+        self.glm_mgr.modify_items('triplex_load', {'tl1': {'groupid': 'x'}})
+        self.assertEqual(['tl1'], [o['name'] for o in
+                                   self.glm_mgr.get_objects_by_groupid('x')])
+        self.assertIn('groupid x;', self.glm_mgr.write_model(out_path=None))
+
+    def test_fork(self):
+        before = self.glm_mgr.write_model(out_path=None)
+        fork = self.glm_mgr.fork()
+        fork.modify_items('meter', {'n1': {'phases': 'A'}})
+        self.assertEqual('A', fork.find_object('meter', 'n1')['phases'])
+        self.assertEqual(before, self.glm_mgr.write_model(out_path=None))
+
+
+class CompactTestCase(unittest.TestCase):
+    """Test GLMManager.compact."""
+
+    def setUp(self):
+        self.glm_mgr = glm.GLMManager(INDEX_MODEL, model_is_path=False)
+        self.out = self.glm_mgr.write_model(out_path=None)
+
+    def test_compact(self):
+        n1 = self.glm_mgr.find_object('meter', 'n1')
+        self.glm_mgr.compact()
+
+        # Same objects, same output.
+        self.assertIs(n1, self.glm_mgr.find_object('meter', 'n1'))
+        self.assertEqual(self.out, self.glm_mgr.write_model(out_path=None))
+
+        n2 = self.glm_mgr.find_object('meter', 'n2')
+        for k1, k2 in zip(n1.keys(), n2.keys()):
+            self.assertIs(k1, k2)
+
+        self.assertIs(n1['phases'], n2['phases'])
+        self.assertIs(n1['nominal_voltage'], n2['nominal_voltage'])
+
+    def test_keys_only(self):
+        self.glm_mgr.compact(values=False)
+        n1 = self.glm_mgr.find_object('meter', 'n1')
+        n2 = self.glm_mgr.find_object('meter', 'n2')
+        self.assertIs(list(n1.keys())[1], list(n2.keys())[1])
+        self.assertIsNot(n1['phases'], n2['phases'])
+
+    def test_modify_after_compact(self):
+        self.glm_mgr.add_index('parent')
+        self.glm_mgr.compact()
+        self.glm_mgr.modify_items('triplex_load', {'tl1': {'parent': 'n3'}})
+        self.assertEqual(['tl1'], [o.get('name') for o in
+                                   self.glm_mgr.get_children('n3')
+                                   if 'name' in o])
+        self.assertIn('parent n3;', self.glm_mgr.write_model(out_path=None))
+
+    def test_pickle(self):
+        import pickle
+        self.glm_mgr.compact()
+        mgr = pickle.loads(pickle.dumps(self.glm_mgr))
+        n1 = mgr.find_object('meter', 'n1')
+        n2 = mgr.find_object('meter', 'n2')
+        self.assertIs(n1['phases'], n2['phases'])
+        self.assertEqual(self.out, mgr.write_model(out_path=None))
+
+
+class DiffApplyTestCase(unittest.TestCase):
+    """Test GLMManager.diff and GLMManager.apply."""
+
+    def setUp(self):
+        self.glm_mgr = glm.GLMManager(INDEX_MODEL, model_is_path=False)
+        self.other = deepcopy(self.glm_mgr)
+
+    def helper_round_trip(self):
+        """Patch glm_mgr to match other, and return the patch."""
+        patch = self.glm_mgr.diff(self.other)
+        self.glm_mgr.apply(patch)
+        self.assertEqual({'remove': [], 'add': [], 'modify': []},
+                         self.glm_mgr.diff(self.other))
+        return patch
+
+    def test_no_changes(self):
+        self.assertEqual({'remove': [], 'add': [], 'modify': []},
+                         self.glm_mgr.diff(self.other))
+
+    def test_modify(self):
+        self.other.modify_items('meter', {'n1': {'nominal_voltage': 120},
+                                          'n2': {'groupid': 'g'}})
+        self.other.remove_properties_from_item(
+            {'object': 'triplex_load', 'name': 'tl1'}, ['groupid'])
+        self.other.modify_item({'clock': 'clock', 'timezone': 'EST+5EDT'})
+
+        patch = self.helper_round_trip()
+        self.assertEqual(0, len(patch['add']) + len(patch['remove']))
+        self.assertEqual(4, len(patch['modify']))
+        self.assertEqual(self.other.write_model(out_path=None),
+                         self.glm_mgr.write_model(out_path=None))
+
+    def test_add_and_remove(self):
+        self.other.remove_item({'object': 'triplex_load', 'name': 'tl2'})
+        self.other.add_item({'object': 'meter', 'name': 'n4'})
+        self.other.add_item({'object': 'recorder', 'parent': 'n4',
+                             'property': 'measured_power'})
+        self.other.add_item({'module': 'tape'})
+        self.other.add_item({'#set': 'profiler=1'})
+
+        patch = self.helper_round_trip()
+        self.assertEqual([{'object': 'triplex_load', 'name': 'tl2'}],
+                         patch['remove'])
+        self.assertEqual(4, len(patch['add']))
+        self.assertIsNone(
+            self.glm_mgr.find_object('triplex_load', 'tl2'))
+        self.assertIsNotNone(self.glm_mgr.find_object('meter', 'n4'))
+        self.assertTrue(self.glm_mgr.module_present('tape'))
+
+    def test_cannot_remove_unnamed(self):
+        other = glm.GLMManager(TEMPLATE_MODEL, model_is_path=False)
+        with self.assertRaisesRegex(ValueError, 'Cannot create a patch'):
+            self.glm_mgr.diff(other)
+
+    def test_patch_is_small_and_reusable(self):
+        import pickle
+        self.other.modify_item({'object': 'meter', 'name': 'n1',
+                                'nominal_voltage': 120})
+        patch = self.glm_mgr.diff(self.other)
+        data = pickle.dumps(patch)
+        self.assertLess(len(data), len(pickle.dumps(self.other)) / 10)
+
+        copy_1 = deepcopy(self.glm_mgr)
+        copy_2 = deepcopy(self.glm_mgr)
+        copy_1.apply(pickle.loads(data))
+        copy_2.apply(pickle.loads(data))
+        self.assertEqual(copy_1.write_model(out_path=None),
+                         copy_2.write_model(out_path=None))
+        self.assertEqual('120',
+                         copy_2.find_object('meter', 'n1')['nominal_voltage'])
+
+    def test_template_and_index(self):
+        self.glm_mgr.compile_template([('meter', None)])
+        self.glm_mgr.add_index('parent')
+        self.other.modify_item({'object': 'triplex_load', 'name': 'tl1',
+                                'parent': 'n3'})
+        self.other.modify_item({'object': 'meter', 'name': 'n1',
+                                'phases': 'A'})
+        self.helper_round_trip()
+        self.assertEqual(self.other.write_model(out_path=None),
+                         self.glm_mgr.write_model(out_path=None))
+        self.assertEqual(['tl2'], [o['name'] for o in
+                                   self.glm_mgr.get_children('n2')])
+
+
 if __name__ == '__main__':
     unittest.main()
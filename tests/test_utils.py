@@ -1,7 +1,7 @@
 import unittest
 import math
 import cmath
-from threading import Lock
+from threading import Lock, Event, Timer
 from unittest.mock import patch
 from pyvvo import utils
 from datetime import datetime, timezone, timedelta, time
@@ -10,6 +10,9 @@ import pandas as pd
 import os
 import numpy as np
 import multiprocessing as mp
+import asyncio
+import tempfile
+import time as _time
 
 # Handle pathing.
 from tests.models import MODEL_DIR
@@ -160,6 +163,111 @@ class RunGLDTestCase(unittest.TestCase):
         self.assertNotEqual(0, result.returncode)
 
 
+# Stand-in for GridLAB-D, so run_gld can be tested without it.
+FAKE_GLD = """#!/bin/sh
+echo "running $1"
+echo "some warning" >&2
+sleep "${FAKE_SLEEP:-0}"
+exit "${FAKE_RC:-0}"
+"""
+
+
+class RunGLDAsyncTestCase(unittest.TestCase):
+    """Test run_gld (and run_gld_async) with a fake gridlabd."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        path = os.path.join(self.tmp_dir.name, 'gridlabd')
+        with open(path, 'w') as f:
+            f.write(FAKE_GLD)
+        os.chmod(path, 0o755)
+        self.env = {'PATH': self.tmp_dir.name + ':/usr/bin:/bin'}
+
+    def test_output(self):
+        result = utils.run_gld('model.glm', env=self.env)
+        self.assertEqual(0, result.returncode)
+        self.assertEqual(b'running model.glm\n', result.stdout)
+        self.assertEqual(b'some warning\n', result.stderr)
+
+    def test_returncode(self):
+        with self.assertLogs(utils.LOG, level='ERROR'):
+            result = utils.run_gld('model.glm',
+                                   env={**self.env, 'FAKE_RC': '3'})
+
+        self.assertEqual(3, result.returncode)
+
+    def test_bad_dir(self):
+        with self.assertRaises(FileNotFoundError):
+            utils.run_gld('/some/bad/path.glm', env=self.env)
+
+    def test_timeout(self):
+        t0 = _time.time()
+        with self.assertRaisesRegex(utils.GLDTimeoutError,
+                                    'did not finish within 0.2 seconds') \
+                as cm:
+            utils.run_gld('model.glm', env={**self.env, 'FAKE_SLEEP': '10'},
+                          timeout=0.2)
+
+        self.assertLess(_time.time() - t0, 2)
+        # stderr should be decoded, rather than shown as bytes.
+        self.assertTrue(str(cm.exception).endswith('stderr:some warning\n'))
+
+    def test_cancel_event(self):
+        event = Event()
+        Timer(0.2, event.set).start()
+        t0 = _time.time()
+        with self.assertRaisesRegex(utils.GLDCancelledError, 'was cancelled'):
+            utils.run_gld('model.glm', env={**self.env, 'FAKE_SLEEP': '10'},
+                          cancel_event=event)
+
+        self.assertLess(_time.time() - t0, 2)
+
+    def test_cancel_event_already_set(self):
+        event = Event()
+        event.set()
+        with patch('asyncio.create_subprocess_shell') as p:
+            with self.assertRaisesRegex(utils.GLDCancelledError,
+                                        'before starting'):
+                utils.run_gld('model.glm', env=self.env, cancel_event=event)
+
+        p.assert_not_called()
+
+    def test_task_cancelled(self):
+        async def run():
+            task = asyncio.ensure_future(utils.run_gld_async(
+                'model.glm', env={**self.env, 'FAKE_SLEEP': '10'}))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await task
+
+        t0 = _time.time()
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(run())
+
+        self.assertLess(_time.time() - t0, 2)
+
+    def test_run_gld_many(self):
+        env = {**self.env, 'FAKE_SLEEP': '0.2'}
+        t0 = _time.time()
+        results = asyncio.run(utils.run_gld_many(
+            ['m1.glm', 'm2.glm', 'm3.glm'], max_concurrent=2, env=env,
+            timeout=5))
+        t1 = _time.time()
+
+        self.assertEqual([b'running m1.glm\n', b'running m2.glm\n',
+                          b'running m3.glm\n'], [r.stdout for r in results])
+        # Two at a time means two rounds.
+        self.assertGreaterEqual(t1 - t0, 0.4)
+
+    def test_run_gld_many_exceptions(self):
+        results = asyncio.run(utils.run_gld_many(
+            ['m1.glm', '/some/bad/path.glm'], env=self.env))
+
+        self.assertEqual(0, results[0].returncode)
+        self.assertIsInstance(results[1], FileNotFoundError)
+
+
 class DTToUSFromEpochTestCase(unittest.TestCase):
     """Test dt_to_us_from_epoch"""
 
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Benchmark parsing GridLAB-D models with pyvvo.glm.
+
+Compares the original tokenizer and parser (glm._tokenize_glm and
+glm._parse_token_list) with glm.parse, which uses the single-pass
+scanner and parser, and checks both produce the same tree.
+
+By default, the IEEE test feeders in tests/models are used. Run from
+the repository root, e.g.:
+
+    python3 utils/benchmark_glm_parse.py -n 5
+"""
+import os
+import argparse
+import timeit
+
+from pyvvo import glm
+
+# Handle pathing.
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(THIS_DIR, '..', 'tests', 'models')
+
+# Test feeders to benchmark by default.
+MODELS = ['ieee_13.glm', 'ieee_123.glm', 'ieee_8500.glm', 'ieee_9500.glm']
+
+
+def parse_original(data):
+    """Parse a GLM string with the original tokenizer and parser."""
+    return glm._parse_token_list(glm._tokenize_glm(data, file_path=False))
+
+
+def parse_fast(data):
+    """Parse a GLM string with glm.parse."""
+    return glm.parse(data, file_path=False)
+
+
+def main(files, number):
+    """Time each parser on each file, printing the best time."""
+    print('{:<20s} {:>12s} {:>10s} {:>8s}'.format('model', 'original (s)',
+                                                  'fast (s)', 'speedup'))
+    for f in files:
+        with open(f, 'r') as f_in:
+            data = f_in.read()
+
+        if parse_original(data) != parse_fast(data):
+            raise UserWarning('Parsers produced different trees for {}!'
+                              .format(f))
+
+        t_orig = min(timeit.repeat(lambda: parse_original(data),
+                                   number=1, repeat=number))
+        t_fast = min(timeit.repeat(lambda: parse_fast(data),
+                                   number=1, repeat=number))
+
+        print('{:<20s} {:>12.4f} {:>10.4f} {:>7.1f}x'.format(
+            os.path.basename(f), t_orig, t_fast, t_orig / t_fast))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs='*',
+                        help="Models to parse. Defaults to the IEEE test "
+                             "feeders in tests/models.",
+                        default=[os.path.join(MODEL_DIR, m) for m in MODELS])
+    parser.add_argument("-n", "--number", type=int, default=3,
+                        help="Number of times to parse each model. The best "
+                             "time is reported.")
+    args = parser.parse_args()
+
+    main(files=args.files, number=args.number)